@@ -0,0 +1,96 @@
+"""Compare DagIndex queries with the per-call maya_fn.dag functions.
+
+Run with mayapy, for example:
+
+    mayapy benchmarks/bench_dag_index.py --width 10 --depth 4
+"""
+
+import argparse
+import os
+import timeit
+
+if os.environ.get("MAYA_FN_BACKEND") == "fake":
+    # Importing maya_fn installs the fake maya package.
+    import maya_fn  # noqa: F401
+
+import maya.standalone
+
+maya.standalone.initialize()
+
+from maya import cmds  # noqa: E402
+
+import maya_fn  # noqa: E402, F811
+
+QUERIES = ["ancestors", "children", "parent", "shapes", "siblings"]
+
+
+def build(width, depth):
+    """Build a hierarchy of transforms with a locator under each one."""
+
+    nodes = []
+    level = [None]
+
+    for _ in range(depth):
+        next_level = []
+
+        for parent in level:
+            for _ in range(width):
+                kwargs = {"parent": parent} if parent else {}
+                node = cmds.createNode("transform", skipSelect=True, **kwargs)
+                cmds.createNode("locator", parent=node, skipSelect=True)
+                next_level.append(node)
+
+        level = next_level
+        nodes.extend(next_level)
+
+    return cmds.ls(nodes, long=True)
+
+
+def main():
+    """Build the scene and print the time per query of each implementation."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cmds.file(new=True, force=True)
+    nodes = build(args.width, args.depth)
+
+    start = timeit.default_timer()
+    index = maya_fn.dag.DagIndex()
+    print(
+        "{} nodes, index built in {:.3f}s".format(
+            len(index), timeit.default_timer() - start
+        )
+    )
+
+    print(
+        "{:<12} {:>14} {:>14} {:>8}".format(
+            "query", "dag (us)", "index (us)", "speedup"
+        )
+    )
+
+    for query in QUERIES:
+        times = []
+
+        for func in (getattr(maya_fn.dag, query), getattr(index, query)):
+            seconds = min(
+                timeit.repeat(
+                    lambda: [func(n) for n in nodes], number=1, repeat=args.repeat
+                )
+            )
+            times.append(seconds / len(nodes) * 1e6)
+
+        print(
+            "{:<12} {:>14.2f} {:>14.2f} {:>7.1f}x".format(
+                query, times[0], times[1], times[0] / times[1]
+            )
+        )
+
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
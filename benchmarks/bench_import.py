@@ -0,0 +1,133 @@
+"""Measure how long it takes to import maya_fn and its submodules.
+
+Each import is timed in a new interpreter, so that nothing is imported
+already. Results can be saved, and compared with the results of another
+release:
+
+    MAYA_FN_BACKEND=fake python benchmarks/bench_import.py --save new.json
+    MAYA_FN_BACKEND=fake python benchmarks/bench_import.py --compare old.json
+
+Run with mayapy to measure the import of the Maya modules as well.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+IMPORTS = [
+    "maya_fn",
+    "maya_fn.ma",
+    "maya_fn.api",
+    "maya_fn.dag",
+    "maya_fn.dg",
+    "maya_fn.plug",
+]
+
+SCRIPT = """
+import sys
+import timeit
+
+start = timeit.default_timer()
+import {}
+elapsed = timeit.default_timer() - start
+
+print(elapsed, len([name for name in sys.modules if name.startswith("maya")]))
+"""
+
+
+def measure(imports, repeat):
+    """Return the milliseconds and number of maya modules of each import."""
+
+    results = {}
+
+    for name in imports:
+        timings = []
+
+        for _ in range(repeat):
+            output = subprocess.check_output(
+                [sys.executable, "-c", SCRIPT.format(name)]
+            )
+            seconds, modules = output.split()
+            timings.append(float(seconds))
+
+        results[name] = {"ms": min(timings) * 1e3, "modules": int(modules)}
+
+    return results
+
+
+def report(results):
+    """Print the time and number of maya modules of each import."""
+
+    print("{:<18} {:>10} {:>8}".format("import", "ms", "modules"))
+
+    for name in IMPORTS:
+        if name in results:
+            result = results[name]
+            print(
+                "{:<18} {:>10.2f} {:>8}".format(name, result["ms"], result["modules"])
+            )
+
+
+def compare(results, baseline, threshold):
+    """Print the change of the import times, and return the regressions."""
+
+    regressions = []
+
+    print("{:<18} {:>10} {:>10} {:>8}".format("import", "before", "after", "change"))
+
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        before = baseline[name]["ms"]
+        after = result["ms"]
+        change = after / before - 1.0
+
+        print(
+            "{:<18} {:>10.2f} {:>10.2f} {:>+8.0%}".format(name, before, after, change)
+        )
+
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main():
+    """Measure the imports, then print, save or compare the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--imports", nargs="+", default=IMPORTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with the results of this JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Largest relative increase of an import time that is not a regression.",
+    )
+    args = parser.parse_args()
+
+    results = measure(args.imports, args.repeat)
+    report(results)
+
+    if args.save:
+        with open(args.save, "w") as stream:
+            json.dump(results, stream, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            baseline = json.load(stream)
+
+        print("")
+        regressions = compare(results, baseline, args.threshold)
+
+        if regressions:
+            print("Import time regressions: {}".format(", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Measure how the cost of maya_fn queries grows with the size of the scene.
+
+For each scene size, a tree of transforms is built and a sample of its nodes
+is queried. The time per call is printed for each size, with the growth
+exponent k of time ~ size^k: 0 for queries that do not depend on the size of
+the scene, 1 for queries that scan it.
+
+Results can be saved, and compared with the results of another release:
+
+    MAYA_FN_BACKEND=fake python benchmarks/bench_scaling.py --save new.json
+    MAYA_FN_BACKEND=fake python benchmarks/bench_scaling.py --compare old.json
+
+Run with mayapy to measure a live Maya session instead of the fake backend.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import timeit
+
+if os.environ.get("MAYA_FN_BACKEND") == "fake":
+    # Importing maya_fn installs the fake maya package.
+    import maya_fn  # noqa: F401
+
+import maya.standalone
+
+maya.standalone.initialize()
+
+from maya import cmds  # noqa: E402
+
+import maya_fn  # noqa: E402, F811
+
+QUERIES = {
+    "api.get_dag_path": lambda nodes: [maya_fn.api.get_dag_path(n) for n in nodes],
+    "dag.ancestors": lambda nodes: [maya_fn.dag.ancestors(n) for n in nodes],
+    "dag.children": lambda nodes: [maya_fn.dag.children(n) for n in nodes],
+    "dag.full_path": lambda nodes: [maya_fn.dag.full_path(n) for n in nodes],
+    "dag.parent": lambda nodes: [maya_fn.dag.parent(n) for n in nodes],
+    "dag.siblings": lambda nodes: [maya_fn.dag.siblings(n) for n in nodes],
+    "plug.get_values": lambda nodes: maya_fn.plug.get_values(
+        [n + ".translate" for n in nodes]
+    ),
+    "plug.source": lambda nodes: [
+        maya_fn.plug.source(n + ".translateX") for n in nodes
+    ],
+}
+
+
+def build(size, width):
+    """Build a tree of the given number of transforms, and return their names."""
+
+    nodes = []
+
+    for i in range(size):
+        kwargs = {"parent": nodes[(i - 1) // width]} if i else {}
+        nodes.append(
+            cmds.createNode(
+                "transform", name="n{}".format(i), skipSelect=True, **kwargs
+            )
+        )
+
+    return cmds.ls(nodes, long=True)
+
+
+def sample(nodes, count):
+    """Return the given number of nodes, evenly spread over the list."""
+
+    step = max(1, len(nodes) // count)
+
+    return nodes[::step][:count]
+
+
+def measure(sizes, width, count, repeat):
+    """Return the microseconds per call of each query, for each size."""
+
+    results = {name: {} for name in QUERIES}
+
+    for size in sizes:
+        cmds.file(new=True, force=True)
+        maya_fn.api.clear_cache()
+
+        nodes = sample(build(size, width), count)
+
+        for name, query in sorted(QUERIES.items()):
+            seconds = min(timeit.repeat(lambda: query(nodes), number=1, repeat=repeat))
+            results[name][str(size)] = seconds / len(nodes) * 1e6
+
+    return results
+
+
+def exponent(timings):
+    """Return the growth exponent of the given {size: time} timings."""
+
+    sizes = sorted(timings, key=int)
+
+    if len(sizes) < 2:
+        return 0.0
+
+    first, last = sizes[0], sizes[-1]
+
+    return math.log(timings[last] / timings[first]) / math.log(int(last) / int(first))
+
+
+def report(results):
+    """Print the time per call for each size, and the growth exponent."""
+
+    sizes = sorted(next(iter(results.values())), key=int)
+
+    print(
+        "{:<18} ".format("query")
+        + " ".join("{:>12}".format(size) for size in sizes)
+        + " {:>8}".format("k")
+    )
+
+    for name, timings in sorted(results.items()):
+        print(
+            "{:<18} ".format(name)
+            + " ".join("{:>12.2f}".format(timings[size]) for size in sizes)
+            + " {:>8.2f}".format(exponent(timings))
+        )
+
+
+def compare(results, baseline, threshold):
+    """Print the change of the growth exponents, and return the regressions."""
+
+    regressions = []
+
+    print("{:<18} {:>8} {:>8} {:>8}".format("query", "before", "after", "change"))
+
+    for name, timings in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        before = exponent(baseline[name])
+        after = exponent(timings)
+        change = after - before
+
+        print("{:<18} {:>8.2f} {:>8.2f} {:>+8.2f}".format(name, before, after, change))
+
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main():
+    """Measure the queries, then print, save or compare the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with the results of this JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Largest growth exponent increase that is not a regression.",
+    )
+    args = parser.parse_args()
+
+    results = measure(args.sizes, args.width, args.count, args.repeat)
+    report(results)
+
+    if args.save:
+        with open(args.save, "w") as stream:
+            json.dump(results, stream, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            baseline = json.load(stream)
+
+        print("")
+        regressions = compare(results, baseline, args.threshold)
+
+        if regressions:
+            print("Scaling regressions: {}".format(", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
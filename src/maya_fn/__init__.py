@@ -1,22 +1,73 @@
 """Maya Function Set.
 
 A set of wrappers around a set of maya.cmds and maya.api behaviors.
+
+Submodules, and the objects exported here, are imported on first access, so
+importing maya_fn does not import Maya, and a script only pays for the
+submodules it uses. `maya_fn.ma` and `maya_fn.scan` work without Maya.
 """
 
 import functools
+import importlib
+import os
+import sys
+import types
 
-from maya import cmds
-
-import maya_fn.dg as dg  # noqa
-import maya_fn.dag as dag  # noqa
-import maya_fn.node as node  # noqa
+if os.environ.get("MAYA_FN_BACKEND") == "fake":
+    import maya_fn.fake
 
-from maya_fn.plug import plug  # noqa
+    maya_fn.fake.install()
 
 __author__ = "Ryan Rorter"
 __version__ = "0.0.1"
 __license__ = "MIT"
 
+# Attribute -> module of the objects imported on first access.
+_LAZY_OBJECTS = {
+    "Node": "maya_fn.objects",
+    "Plug": "maya_fn.objects",
+}
+
+_SUBMODULES = frozenset(
+    [
+        "api",
+        "dag",
+        "dg",
+        "ma",
+        "node",
+        "objects",
+        "plug",
+        "profiler",
+        "scan",
+        "schema",
+    ]
+)
+
+
+def __getattr__(name):
+    """Import the submodule or object of the given attribute on first access.
+
+    Raises:
+        AttributeError: If maya_fn has no such attribute.
+    """
+
+    if name in _SUBMODULES:
+        value = importlib.import_module("maya_fn." + name)
+    elif name in _LAZY_OBJECTS:
+        value = getattr(importlib.import_module(_LAZY_OBJECTS[name]), name)
+    else:
+        raise AttributeError("module 'maya_fn' has no attribute '{}'".format(name))
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    """Return the attributes of maya_fn, including the ones not imported yet."""
+
+    return sorted(set(globals()) | _SUBMODULES | set(_LAZY_OBJECTS))
+
 
 def undoable(name):
     """Create an undo chunk every time the decorated function is called."""
@@ -24,6 +75,8 @@ def undoable(name):
     def wrapper(func):
         @functools.wraps(func)
         def wrapped(*args, **kwargs):
+            from maya import cmds
+
             cmds.undoInfo(chunkName=name, openChunk=True)
             try:
                 return func(*args, **kwargs)
@@ -33,3 +86,58 @@ def undoable(name):
         return wrapped
 
     return wrapper
+
+
+def transaction():
+    """Return a transaction, to use as a context manager or a decorator.
+
+    In a transaction, `dg.create`, `dg.create_many`, `node.add_attr` and
+    `plug.set_values` queue their edits on one modifier instead of applying
+    them, and the modifier is applied once, as a single undoable operation,
+    when the outermost transaction exits. If an exception is raised in the
+    block, no edit is applied. Nested transactions join the running one.
+
+    Nodes are named when they are queued, so the names returned by
+    `dg.create` can be used in the transaction - to connect a plug of a node
+    created in the same transaction, for example - and are the names the
+    nodes have once it is committed. Edits made with maya.cmds in the block
+    are applied immediately, and are not part of the transaction.
+
+        with maya_fn.transaction():
+            a = maya_fn.dg.create("transform", name="a")
+            maya_fn.dg.create("addDoubleLinear", input1=a + ".translateX")
+
+    Returns:
+        maya_fn._modifier.Transaction
+    """
+
+    import maya_fn._modifier
+
+    return maya_fn._modifier.Transaction()
+
+
+class _Module(types.ModuleType):
+    """The maya_fn package, on Pythons that do not call a module __getattr__."""
+
+    def __getattr__(self, name):
+        """Import the submodule or object of the given attribute."""
+
+        value = __getattr__(name)
+        setattr(self, name, value)
+
+        return value
+
+    def __dir__(self):
+        """Return the attributes of maya_fn."""
+
+        return __dir__()
+
+
+if sys.version_info < (3, 7):
+    # Python 2.7 does not call a module __getattr__ (PEP 562); replace the
+    # package with a module whose class does. The original module is kept
+    # alive, since Python 2 clears the globals of a deallocated module.
+    _package = _Module(__name__, __doc__)
+    _package.__dict__.update(globals())
+    _package._original = sys.modules[__name__]
+    sys.modules[__name__] = _package
@@ -0,0 +1,20 @@
+"""Optional dependencies of maya_fn.
+
+They are imported on first use, so that importing maya_fn does not need
+them.
+"""
+
+
+def numpy():
+    """Return the numpy module.
+
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("This function requires numpy, which is not installed.")
+
+    return numpy
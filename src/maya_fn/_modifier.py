@@ -0,0 +1,271 @@
+"""Undoable MDGModifier edits.
+
+Modifiers applied outside of a command are not recorded on the undo queue.
+`commit` applies a modifier through the command of the `maya_fn._plugin`
+plugin instead, so that each commit is a single undoable operation.
+
+While a `transaction` is running, the edits of maya_fn are queued on the
+modifier of the transaction instead, and committed once when it ends.
+"""
+
+import contextlib
+import functools
+import os
+import re
+import sys
+
+import six
+
+from maya import cmds
+from maya.api import OpenMaya
+
+COMMAND = "mayaFnCommit"
+
+_pending = []
+_errors = []
+_transactions = []
+
+_TRAILING_DIGITS = re.compile(r"\d*$")
+
+
+class Transaction(object):
+    """The modifier shared by the maya_fn edits of a `transaction`."""
+
+    def __init__(self):
+        """Initialize an empty transaction."""
+
+        self.modifier = OpenMaya.MDagModifier()
+        self.created = {}
+        self.callbacks = []
+        self.depth = 0
+        self.failed = False
+
+        self._names = set()
+
+    def __call__(self, func):
+        """Run the decorated function in a transaction."""
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            with Transaction():
+                return func(*args, **kwargs)
+
+        return wrapped
+
+    def __enter__(self):
+        """Start this transaction, or join the running one."""
+
+        if not _transactions:
+            _transactions.append(self)
+
+        _transactions[0].depth += 1
+
+        return _transactions[0]
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Commit the transaction when the outermost block exits."""
+
+        outer = _transactions[0]
+        outer.depth -= 1
+        outer.failed = outer.failed or exc_type is not None
+
+        if outer.depth:
+            return
+
+        del _transactions[:]
+
+        if exc_type is not None:
+            return
+
+        if outer.failed:
+            raise RuntimeError(
+                "A nested transaction failed; no edit of the transaction was applied."
+            )
+
+        commit(outer.modifier)
+
+        for callback in outer.callbacks:
+            callback()
+
+    def reserve(self, name):
+        """Return a unique node name for the given name, and reserve it.
+
+        The nodes of a transaction are named when they are queued, so that
+        their names can be returned and used before the transaction is
+        committed. As with `cmds.createNode`, "#" is replaced by a number,
+        and a name that is already taken gets a number appended.
+
+        Args:
+            name (str): Name of a node to create.
+
+        Returns:
+            str
+        """
+
+        if "#" not in name and not self._is_taken(name):
+            self._names.add(name)
+            return name
+
+        if "#" in name:
+            prefix, _, suffix = name.partition("#")
+            suffix = suffix.replace("#", "")
+            number = 1
+        else:
+            digits = _TRAILING_DIGITS.search(name).group()
+            end = len(name) - len(digits)
+            prefix, suffix = name[:end], ""
+            number = int(digits or 0) + 1
+
+        while self._is_taken("{}{}{}".format(prefix, number, suffix)):
+            number += 1
+
+        name = "{}{}{}".format(prefix, number, suffix)
+        self._names.add(name)
+
+        return name
+
+    def _is_taken(self, name):
+        """Return True if a node has, or will have, the given name."""
+
+        return name in self._names or cmds.objExists(name)
+
+
+@contextlib.contextmanager
+def batch():
+    """Yield a new MDagModifier, and commit it if the block succeeds.
+
+    In a transaction, the modifier of the transaction is yielded instead, and
+    committed with the transaction.
+    """
+
+    transaction = current()
+
+    if transaction is not None:
+        yield transaction.modifier
+        return
+
+    modifier = OpenMaya.MDagModifier()
+
+    yield modifier
+
+    commit(modifier)
+
+
+def commit(modifier):
+    """Apply the given modifier as a single undoable operation.
+
+    If the modifier fails part way through, the edits it already made are
+    undone before the error is raised.
+
+    Args:
+        modifier (maya.api.OpenMaya.MDGModifier): Modifier to apply.
+    """
+
+    _load_plugin()
+
+    _pending.append(modifier)
+    del _errors[:]
+
+    try:
+        getattr(cmds, COMMAND)()
+    except RuntimeError:
+        if _errors:
+            six.reraise(*_errors.pop())
+        raise
+    finally:
+        del _pending[:]
+
+
+def current():
+    """Return the running transaction, or None."""
+
+    return _transactions[0] if _transactions else None
+
+
+def set_value(modifier, plug, value):
+    """Queue a value change of the given plug, with the same units as setAttr.
+
+    Args:
+        modifier (maya.api.OpenMaya.MDGModifier): Modifier to queue the edit on.
+        plug (maya.api.OpenMaya.MPlug): Plug to set.
+        value (Any): Number, string or 16 floats of a matrix.
+
+    Raises:
+        TypeError: If the plug does not hold values of this type.
+    """
+
+    attribute = plug.attribute()
+
+    if attribute.hasFn(OpenMaya.MFn.kUnitAttribute):
+        unit = OpenMaya.MFnUnitAttribute(attribute).unitType()
+
+        if unit == OpenMaya.MFnUnitAttribute.kAngle:
+            angle = OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit())
+            modifier.newPlugValueMAngle(plug, angle)
+        elif unit == OpenMaya.MFnUnitAttribute.kDistance:
+            distance = OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit())
+            modifier.newPlugValueMDistance(plug, distance)
+        elif unit == OpenMaya.MFnUnitAttribute.kTime:
+            time = OpenMaya.MTime(value, OpenMaya.MTime.uiUnit())
+            modifier.newPlugValueMTime(plug, time)
+        else:
+            modifier.newPlugValueDouble(plug, value)
+    elif attribute.hasFn(OpenMaya.MFn.kNumericAttribute):
+        numeric_type = OpenMaya.MFnNumericAttribute(attribute).numericType()
+
+        if numeric_type == OpenMaya.MFnNumericData.kBoolean:
+            modifier.newPlugValueBool(plug, bool(value))
+        elif numeric_type == OpenMaya.MFnNumericData.kFloat:
+            modifier.newPlugValueFloat(plug, value)
+        elif numeric_type == OpenMaya.MFnNumericData.kDouble:
+            modifier.newPlugValueDouble(plug, value)
+        else:
+            modifier.newPlugValueInt(plug, int(value))
+    elif attribute.hasFn(OpenMaya.MFn.kEnumAttribute):
+        modifier.newPlugValueInt(plug, int(value))
+    elif is_matrix(attribute) and len(value) == 16:
+        data = OpenMaya.MFnMatrixData().create(OpenMaya.MMatrix(value))
+        modifier.newPlugValue(plug, data)
+    elif is_string(attribute) and isinstance(value, six.string_types):
+        modifier.newPlugValueString(plug, value)
+    else:
+        raise TypeError("Cannot set '{}' to {!r}.".format(plug.name(), value))
+
+
+def is_matrix(attribute):
+    """Return True if the given attribute holds a matrix."""
+
+    if attribute.hasFn(OpenMaya.MFn.kMatrixAttribute):
+        return True
+
+    return _typed_data(attribute) == OpenMaya.MFnData.kMatrix
+
+
+def is_string(attribute):
+    """Return True if the given attribute holds a string."""
+
+    return _typed_data(attribute) == OpenMaya.MFnData.kString
+
+
+def _load_plugin():
+    """Load the plugin that registers the commit command."""
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_plugin.py")
+
+    if not cmds.pluginInfo(path, query=True, loaded=True):
+        cmds.loadPlugin(path, quiet=True)
+
+
+def _on_error():
+    """Record the error raised while applying a modifier."""
+
+    _errors.append(sys.exc_info())
+
+
+def _typed_data(attribute):
+    """Return the MFnData type of the given typed attribute, or None."""
+
+    if not attribute.hasFn(OpenMaya.MFn.kTypedAttribute):
+        return None
+
+    return OpenMaya.MFnTypedAttribute(attribute).attrType()
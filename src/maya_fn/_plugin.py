@@ -0,0 +1,68 @@
+"""Maya plugin that records the modifiers of maya_fn on the undo queue.
+
+This file is loaded by `maya_fn._modifier`; it is not meant to be imported.
+"""
+
+from maya.api import OpenMaya
+
+import maya_fn._modifier
+
+maya_useNewAPI = True
+
+
+class CommitCommand(OpenMaya.MPxCommand):
+    """Apply the pending modifier of `maya_fn._modifier.commit`."""
+
+    def __init__(self):
+        """Initialize the command."""
+
+        OpenMaya.MPxCommand.__init__(self)
+
+        self._modifier = None
+
+    @staticmethod
+    def creator():
+        """Return a new instance of this command."""
+
+        return CommitCommand()
+
+    def doIt(self, args):
+        """Take the pending modifier and apply it."""
+
+        self._modifier = maya_fn._modifier._pending.pop()
+
+        try:
+            self._modifier.doIt()
+        except Exception:
+            maya_fn._modifier._on_error()
+            self._modifier.undoIt()
+            raise
+
+    def isUndoable(self):
+        """Return True; every commit can be undone."""
+
+        return True
+
+    def redoIt(self):
+        """Apply the modifier again."""
+
+        self._modifier.doIt()
+
+    def undoIt(self):
+        """Revert the modifier."""
+
+        self._modifier.undoIt()
+
+
+def initializePlugin(plugin):
+    """Register the commit command."""
+
+    OpenMaya.MFnPlugin(plugin, "maya_fn").registerCommand(
+        maya_fn._modifier.COMMAND, CommitCommand.creator
+    )
+
+
+def uninitializePlugin(plugin):
+    """Deregister the commit command."""
+
+    OpenMaya.MFnPlugin(plugin).deregisterCommand(maya_fn._modifier.COMMAND)
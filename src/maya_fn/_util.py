@@ -0,0 +1,275 @@
+"""Helpers shared by the maya_fn modules.
+
+The modules use these rather than each other's private functions.
+"""
+
+import collections
+import itertools
+
+from maya import cmds
+from maya.api import OpenMaya
+
+import maya_fn._compat
+import maya_fn.api
+
+DEPTH_FIRST = "depth"
+BREADTH_FIRST = "breadth"
+
+SCALAR_TYPES = {
+    "bool",
+    "byte",
+    "char",
+    "short",
+    "long",
+    "int64",
+    "float",
+    "double",
+    "doubleLinear",
+    "doubleAngle",
+    "time",
+    "enum",
+}
+
+_inherited_types = {}
+
+
+class NodeMap(object):
+    """A map of nodes to values, in insertion order.
+
+    Nodes are keyed by MObjectHandle.hashCode(), which different nodes can
+    share, so the entries of a hash code are told apart by their handle.
+    Entries whose node was deleted are never matched.
+    """
+
+    def __init__(self, items=()):
+        """Initialize the map with the given (MObject, value) pairs."""
+
+        self._buckets = {}
+        self._entries = collections.OrderedDict()
+        self._serials = itertools.count()
+
+        for node, value in items:
+            self[node] = value
+
+    def __contains__(self, node):
+        """Return True if the given MObject is in the map."""
+
+        return self._find(OpenMaya.MObjectHandle(node)) is not None
+
+    def __getitem__(self, node):
+        """Return the value of the given MObject."""
+
+        serial = self._find(OpenMaya.MObjectHandle(node))
+
+        if serial is None:
+            raise KeyError(node)
+
+        return self._entries[serial][1]
+
+    def __iter__(self):
+        """Iterate over the MObjectHandles of the map."""
+
+        for handle, _ in list(self._entries.values()):
+            yield handle
+
+    def __len__(self):
+        """Return the number of entries."""
+
+        return len(self._entries)
+
+    def __setitem__(self, node, value):
+        """Set the value of the given MObject."""
+
+        handle = OpenMaya.MObjectHandle(node)
+        serial = self._find(handle)
+
+        if serial is None:
+            serial = next(self._serials)
+            self._buckets.setdefault(_key(handle), []).append((handle, serial))
+
+        self._entries[serial] = (handle, value)
+
+    def get(self, node, default=None):
+        """Return the value of the given MObject, or the default."""
+
+        serial = self._find(OpenMaya.MObjectHandle(node))
+
+        if serial is None:
+            return default
+
+        return self._entries[serial][1]
+
+    def items(self):
+        """Return the (MObjectHandle, value) pairs of the map."""
+
+        return list(self._entries.values())
+
+    def pop(self, node, default=None):
+        """Remove the given MObject, and return its value or the default."""
+
+        handle = OpenMaya.MObjectHandle(node)
+        key = _key(handle)
+        serial = self._find(handle)
+
+        if serial is None:
+            return default
+
+        bucket = [entry for entry in self._buckets[key] if entry[1] != serial]
+
+        if bucket:
+            self._buckets[key] = bucket
+        else:
+            del self._buckets[key]
+
+        return self._entries.pop(serial)[1]
+
+    def _find(self, handle):
+        """Return the serial number of the entry of the given handle, or None."""
+
+        for other, serial in self._buckets.get(_key(handle), ()):
+            if other.isValid() and other == handle:
+                return serial
+
+        return None
+
+
+def attr_name(plug):
+    """Return the attribute path of the given MPlug, with long names."""
+
+    return plug.partialName(
+        includeNonMandatoryIndices=True,
+        includeInstancedIndices=True,
+        useFullAttributePath=True,
+        useLongNames=True,
+    )
+
+
+def child_path(dag_path, index):
+    """Return the path to the given child of the given path."""
+
+    return OpenMaya.MDagPath(dag_path).push(dag_path.child(index))
+
+
+def full_name(node):
+    """Return the name of the given node; the full path for DAG nodes."""
+
+    if node.hasFn(OpenMaya.MFn.kDagNode):
+        return maya_fn.api.full_path_name(node)
+    else:
+        return OpenMaya.MFnDependencyNode(node).name()
+
+
+def get_array_plug(plug):
+    """Return the MPlug of the given array plug.
+
+    Raises:
+        TypeError: If the plug is not an array plug.
+    """
+
+    plug = maya_fn.api.get_plug(plug)
+
+    if not plug.isArray:
+        raise TypeError("'{}' is not an array plug.".format(plug.name()))
+
+    return plug
+
+
+def inherited(node_type):
+    """Return the given node type and the types it inherits from."""
+
+    if node_type not in _inherited_types:
+        _inherited_types[node_type] = cmds.nodeType(
+            node_type, isTypeName=True, inherited=True
+        )
+
+    return _inherited_types[node_type]
+
+
+def iter_descendents(dag_path, order, max_depth, types, prune):
+    """Yield the MDagPaths of the descendents of the given path.
+
+    See `maya_fn.dag.descendents` for the traversal options.
+    """
+
+    if order not in (DEPTH_FIRST, BREADTH_FIRST):
+        raise ValueError(
+            "Invalid order '{}' - expected '{}' or '{}'.".format(
+                order, DEPTH_FIRST, BREADTH_FIRST
+            )
+        )
+
+    if isinstance(types, int):
+        types = (types,)
+
+    queue = collections.deque([(dag_path, 0)])
+    pop = queue.pop if order == DEPTH_FIRST else queue.popleft
+
+    while queue:
+        dag_path, depth = pop()
+
+        if depth:
+            if prune is not None and prune(dag_path.fullPathName()):
+                continue
+
+            if types is None:
+                yield dag_path
+            else:
+                node = dag_path.node()
+
+                if any(node.hasFn(each) for each in types):
+                    yield dag_path
+
+        if max_depth is not None and depth >= max_depth:
+            continue
+
+        children = [
+            (child_path(dag_path, i), depth + 1) for i in range(dag_path.childCount())
+        ]
+
+        if order == DEPTH_FIRST:
+            children.reverse()
+
+        queue.extend(children)
+
+
+def iter_nodes():
+    """Yield every dependency node of the scene."""
+
+    it = OpenMaya.MItDependencyNodes()
+
+    while not it.isDone():
+        yield it.thisNode()
+        it.next()
+
+
+def merge_table(table, other):
+    """Return the names of both tables, and the ids of the other names in it."""
+
+    numpy = maya_fn._compat.numpy()
+
+    ids = {name: i for i, name in enumerate(table)}
+    merged = list(table)
+    other_ids = []
+
+    for name in other:
+        i = ids.get(name)
+
+        if i is None:
+            i = ids[name] = len(merged)
+            merged.append(name)
+
+        other_ids.append(i)
+
+    return merged, numpy.array(other_ids, dtype=numpy.int64)
+
+
+def plug_name(plug):
+    """Return the name of the given MPlug, with the full path of its node."""
+
+    return "{}.{}".format(full_name(plug.node()), attr_name(plug))
+
+
+def _key(handle):
+    """Return the hash code of the given MObjectHandle."""
+
+    return handle.hashCode()
@@ -1,15 +1,290 @@
 """Maya API functions."""
 
+import array
+import collections
+import re
+import sys
+
+import six
+
+from maya import cmds
 from maya.api import OpenMaya
 
 
 __all__ = [
+    "cache_info",
+    "classify_many",
+    "clear_cache",
+    "clear_path_cache",
+    "disable_cache",
+    "disable_path_cache",
+    "enable_cache",
+    "enable_path_cache",
+    "exists_many",
+    "find_plug",
+    "full_path_name",
     "get_dag_path",
+    "get_dag_paths",
     "get_object",
+    "get_objects",
     "get_plug",
+    "get_plugs",
+    "partial_path_name",
+    "path_cache_info",
+    "try_get_dag_path",
+    "try_get_object",
+    "try_get_plug",
 ]
 
 
+class CacheInfo(
+    collections.namedtuple("CacheInfo", ["hits", "misses", "max_size", "size"])
+):
+    """Statistics of a cache."""
+
+    __slots__ = ()
+
+    @property
+    def hit_ratio(self):
+        """Return the fraction of lookups that were hits."""
+
+        lookups = self.hits + self.misses
+
+        return self.hits / float(lookups) if lookups else 0.0
+
+
+class PathCacheInfo(
+    collections.namedtuple(
+        "PathCacheInfo", ["hits", "misses", "max_size", "size", "memory"]
+    )
+):
+    """Statistics of the path cache; memory is the estimated size in bytes."""
+
+    __slots__ = ()
+
+    hit_ratio = CacheInfo.hit_ratio
+
+
+RAISE = "raise"
+SKIP = "skip"
+NONE = "none"
+
+# Kinds of object returned by `classify_many`.
+MISSING = 0
+DG = 1
+DAG = 2
+PLUG = 3
+COMPONENT = 4
+
+_OBJECT = "object"
+_DAG_PATH = "dag_path"
+_PLUG = "plug"
+
+_ERRORS = {
+    (_OBJECT, LookupError): "Object '{}' does not exist.",
+    (_DAG_PATH, LookupError): "Object '{}' does not exist.",
+    (_DAG_PATH, TypeError): "Object '{}' is not a DAG node.",
+    (_PLUG, LookupError): "Object '{}' does not exist.",
+    (_PLUG, TypeError): "Object '{}' is not a plug.",
+}
+
+_NOT_SELECTABLE = (
+    "Cannot select a(n) {} object '{}' - "
+    "expected a string, Node, Plug, MObject, MDagPath, or MPlug."
+)
+
+_INDEX = re.compile(r"\[(\d+)\]")
+
+_cache = None
+_path_cache = None
+
+
+def cache_info():
+    """Return the statistics of the object cache.
+
+    Returns:
+        CacheInfo | None: None if the cache is not enabled.
+    """
+
+    if _cache is None:
+        return None
+
+    return CacheInfo(_cache.hits, _cache.misses, _cache.max_size, len(_cache))
+
+
+def classify_many(objs):
+    """Return the kind of each of the given objects, without raising.
+
+    Names with an attribute, MPlugs and Plugs are plugs, unless the name is
+    of a component, such as "pCube1.vtx[0]"; other objects are DAG or DG
+    nodes. Objects that do not exist, or cannot be selected, are missing.
+
+    The names that exist are found in one batch first, so that missing names
+    are skipped without an exception each.
+
+    Args:
+        objs (Iterable[Any]): Objects to classify.
+
+    Returns:
+        array.array: One of MISSING, DG, DAG, PLUG or COMPONENT for each
+            object, in the same order.
+    """
+
+    objs = list(objs)
+    existing = _existing_names(
+        [obj for obj in objs if isinstance(obj, six.string_types)]
+    )
+    sel = OpenMaya.MSelectionList()
+
+    return array.array("B", (_classify(obj, sel, existing) for obj in objs))
+
+
+def clear_cache():
+    """Remove every entry from the object cache, if it is enabled."""
+
+    if _cache is not None:
+        _cache.clear()
+
+
+def clear_path_cache():
+    """Remove every entry from the path cache, if it is enabled."""
+
+    if _path_cache is not None:
+        _path_cache.clear()
+
+
+def disable_cache():
+    """Disable the object cache and remove its scene callbacks."""
+
+    global _cache
+
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+def disable_path_cache():
+    """Disable the path cache and remove its scene callbacks."""
+
+    global _path_cache
+
+    if _path_cache is not None:
+        _path_cache.close()
+        _path_cache = None
+
+
+def enable_cache(max_size=10000):
+    """Enable the object cache.
+
+    While enabled, the objects returned by `get_object` and `get_dag_path` for
+    a given name are remembered, so that the name is only resolved again after
+    the scene changes in a way that could affect it.
+
+    Args:
+        max_size (int): Maximum number of names to remember. When full, the
+            least recently used name is forgotten first.
+    """
+
+    global _cache
+
+    if max_size < 1:
+        raise ValueError("Cache size must be at least 1, got {}.".format(max_size))
+
+    disable_cache()
+
+    _cache = _ObjectCache(max_size)
+
+
+def enable_path_cache(max_size=100000):
+    """Enable the path cache.
+
+    While enabled, the path names returned by `full_path_name` and
+    `partial_path_name` are remembered per node and instance, so that they
+    are only built again after the node, or one of its ancestors, is renamed
+    or reparented. Equal names are interned, so they share memory.
+
+    Args:
+        max_size (int): Maximum number of node instances to remember. When
+            full, the least recently used one is forgotten first.
+    """
+
+    global _path_cache
+
+    if max_size < 1:
+        raise ValueError("Cache size must be at least 1, got {}.".format(max_size))
+
+    disable_path_cache()
+
+    _path_cache = _PathCache(max_size)
+
+
+def exists_many(objs):
+    """Return whether each of the given objects exists, without raising.
+
+    Args:
+        objs (Iterable[Any]): Objects to check.
+
+    Returns:
+        array.array: 1 for each object that exists and 0 for each one that
+            does not, in the same order.
+    """
+
+    return array.array("B", (kind != MISSING for kind in classify_many(objs)))
+
+
+def find_plug(node, attr):
+    """Return the plug of the given attribute path on the given node.
+
+    Unlike `get_plug`, the node does not need to be selectable by name, so
+    this also works on nodes that a modifier has created but not added yet.
+
+    Args:
+        node (maya.api.OpenMaya.MObject): A dependency node.
+        attr (str): Attribute path, such as "translateX" or "points[2].xValue".
+
+    Returns:
+        maya.api.OpenMaya.MPlug | None: None if the node has no such attribute.
+    """
+
+    fn = OpenMaya.MFnDependencyNode(node)
+    plug = None
+
+    for part in attr.split("."):
+        name = part.split("[", 1)[0]
+
+        if not fn.hasAttribute(name):
+            return None
+
+        attribute = fn.attribute(name)
+
+        if plug is None:
+            plug = OpenMaya.MPlug(node, attribute)
+        else:
+            plug = plug.child(attribute)
+
+        for index in _INDEX.findall(part):
+            plug = plug.elementByLogicalIndex(int(index))
+
+    return plug
+
+
+def full_path_name(node):
+    """Return the full path name of the given DAG node.
+
+    Args:
+        node (maya.api.OpenMaya.MDagPath | maya.api.OpenMaya.MObject): A DAG
+            node, by path, or by MObject for the first instance of the node.
+
+    Returns:
+        str
+    """
+
+    if _path_cache is None:
+        return _full_path_name(node)
+
+    return _path_cache.full_path_name(node)
+
+
 def get_dag_path(obj):
     """Return the MDagPath of the given object.
 
@@ -25,12 +300,29 @@ def get_dag_path(obj):
         ValueError: If the given object is not selectable.
     """
 
-    dag = get_object(obj)
+    (dag_path,) = get_dag_paths([obj])
 
-    try:
-        return OpenMaya.MDagPath.getAPathTo(dag)
-    except RuntimeError:
-        raise TypeError("Object '{}' is not a DAG node.".format(obj))
+    return dag_path
+
+
+def get_dag_paths(objs, missing=RAISE):
+    """Return the MDagPaths of the given objects, in the same order.
+
+    Args:
+        objs (Iterable[Any]): Objects in the current Maya scene.
+        missing (str): What to do with an object that does not exist or is not
+            a DAG node - one of RAISE, SKIP or NONE.
+
+    Returns:
+        list[maya.api.OpenMaya.MDagPath | None]
+
+    Raises:
+        LookupError: If an object does not exist and `missing` is RAISE.
+        TypeError: If an object is not a DAG node and `missing` is RAISE.
+        ValueError: If an object is not selectable.
+    """
+
+    return _resolve(objs, _DAG_PATH, missing)
 
 
 def get_object(obj):
@@ -47,7 +339,28 @@ def get_object(obj):
         ValueError: If the given object is not selectable.
     """
 
-    return _get_selection(obj).getDependNode(0)
+    (node,) = get_objects([obj])
+
+    return node
+
+
+def get_objects(objs, missing=RAISE):
+    """Return the MObjects of the given objects, in the same order.
+
+    Args:
+        objs (Iterable[Any]): Objects in the current Maya scene.
+        missing (str): What to do with an object that does not exist - one of
+            RAISE, SKIP or NONE.
+
+    Returns:
+        list[maya.api.OpenMaya.MObject | None]
+
+    Raises:
+        LookupError: If an object does not exist and `missing` is RAISE.
+        ValueError: If an object is not selectable.
+    """
+
+    return _resolve(objs, _OBJECT, missing)
 
 
 def get_plug(obj):
@@ -65,10 +378,29 @@ def get_plug(obj):
         ValueError: If the given object is not selectable.
     """
 
-    try:
-        return _get_selection(obj).getPlug(0)
-    except TypeError:
-        raise TypeError("Object '{}' is not a plug.".format(obj))
+    (plug,) = get_plugs([obj])
+
+    return plug
+
+
+def get_plugs(objs, missing=RAISE):
+    """Return the MPlugs of the given plugs, in the same order.
+
+    Args:
+        objs (Iterable[Any]): Plugs in the current Maya scene.
+        missing (str): What to do with a plug that does not exist or is not a
+            plug - one of RAISE, SKIP or NONE.
+
+    Returns:
+        list[maya.api.OpenMaya.MPlug | None]
+
+    Raises:
+        LookupError: If a plug does not exist and `missing` is RAISE.
+        TypeError: If an object is not a plug and `missing` is RAISE.
+        ValueError: If an object is not selectable.
+    """
+
+    return _resolve(objs, _PLUG, missing)
 
 
 def _get_selection(obj):
@@ -81,11 +413,707 @@ def _get_selection(obj):
     except RuntimeError:
         raise LookupError("Object '{}' does not exist.".format(obj))
     except TypeError:
+        raise ValueError(_NOT_SELECTABLE.format(type(obj).__name__, obj))
+
+    return sel
+
+
+def partial_path_name(node):
+    """Return the shortest unique path name of the given DAG node.
+
+    Args:
+        node (maya.api.OpenMaya.MDagPath | maya.api.OpenMaya.MObject): A DAG
+            node, by path, or by MObject for the first instance of the node.
+
+    Returns:
+        str
+    """
+
+    if _path_cache is None:
+        return _partial_path_name(node)
+
+    return _path_cache.partial_path_name(node)
+
+
+def path_cache_info():
+    """Return the statistics of the path cache.
+
+    Returns:
+        PathCacheInfo | None: None if the cache is not enabled.
+    """
+
+    if _path_cache is None:
+        return None
+
+    return PathCacheInfo(
+        _path_cache.hits,
+        _path_cache.misses,
+        _path_cache.max_size,
+        len(_path_cache),
+        _path_cache.memory(),
+    )
+
+
+def try_get_dag_path(obj):
+    """Return the MDagPath of the given object, or None.
+
+    Args:
+        obj (Any): An object in the current Maya scene.
+
+    Returns:
+        maya.api.OpenMaya.MDagPath | None: None if the object does not exist,
+            is not a DAG node, or cannot be selected.
+    """
+
+    return _try_get(obj, _DAG_PATH)
+
+
+def try_get_object(obj):
+    """Return the MObject of the given object, or None.
+
+    Args:
+        obj (Any): An object in the current Maya scene.
+
+    Returns:
+        maya.api.OpenMaya.MObject | None: None if the object does not exist,
+            or cannot be selected.
+    """
+
+    return _try_get(obj, _OBJECT)
+
+
+def try_get_plug(obj):
+    """Return the MPlug of the given plug, or None.
+
+    Args:
+        obj (Any): A plug in the current Maya scene.
+
+    Returns:
+        maya.api.OpenMaya.MPlug | None: None if the plug does not exist, is
+            not a plug, or cannot be selected.
+    """
+
+    return _try_get(obj, _PLUG)
+
+
+def _classify(obj, sel, existing):
+    """Return the kind of the given object, using the given selection list.
+
+    Names that are not in the given set of existing names are missing.
+    """
+
+    if isinstance(obj, six.string_types):
+        if obj not in existing:
+            return MISSING
+
+        sel.clear()
+
+        try:
+            sel.add(obj)
+        except (RuntimeError, TypeError):
+            return MISSING
+
+        if "." in obj.rpartition("|")[-1]:
+            if sel.getDependNode(0).hasFn(OpenMaya.MFn.kDagNode):
+                if not sel.getComponent(0)[1].isNull():
+                    return COMPONENT
+
+            return PLUG
+
+        obj = sel.getDependNode(0)
+
+    if isinstance(obj, OpenMaya.MObject):
+        if obj.isNull() or not OpenMaya.MObjectHandle(obj).isValid():
+            return MISSING
+
+        return DAG if obj.hasFn(OpenMaya.MFn.kDagNode) else DG
+
+    if isinstance(obj, OpenMaya.MDagPath):
+        return DAG if obj.isValid() else MISSING
+
+    if isinstance(obj, OpenMaya.MPlug):
+        return MISSING if obj.isNull else PLUG
+
+    if isinstance(obj, _object_types()) and obj.is_valid:
+        import maya_fn.objects
+
+        if isinstance(obj, maya_fn.objects.Plug):
+            return PLUG
+
+        return DAG if obj.is_dag else DG
+
+    return MISSING
+
+
+def _existing_names(names):
+    """Return the set of the given names that exist.
+
+    Names that `ls` lists as they are given, which are most short names and
+    full paths, are found in one call; the rest are checked one by one.
+    """
+
+    if not names:
+        return set()
+
+    names = set(names)
+    existing = names.intersection(cmds.ls(list(names)))
+    rest = names - existing
+
+    if rest:
+        existing.update(rest.intersection(cmds.ls(list(rest), long=True)))
+        rest -= existing
+
+    existing.update(name for name in rest if cmds.objExists(name))
+
+    return existing
+
+
+def _full_path_name(node):
+    """Return the full path name of the given MDagPath or MObject."""
+
+    if isinstance(node, OpenMaya.MDagPath):
+        return node.fullPathName()
+
+    return OpenMaya.MFnDagNode(node).fullPathName()
+
+
+def _get_dag_path(sel, index, node):
+    """Return the MDagPath of the given selection item, or None."""
+
+    if sel is not None:
+        try:
+            return sel.getDagPath(index)
+        except (RuntimeError, TypeError):
+            pass
+
+    try:
+        return OpenMaya.MDagPath.getAPathTo(node)
+    except RuntimeError:
+        return None
+
+
+def _short_name(name):
+    """Return the last part of the given node name or path."""
+
+    return name.rpartition("|")[2]
+
+
+def _partial_path_name(node):
+    """Return the partial path name of the given MDagPath or MObject."""
+
+    if isinstance(node, OpenMaya.MDagPath):
+        return node.partialPathName()
+
+    return OpenMaya.MFnDagNode(node).partialPathName()
+
+
+def _resolve(objs, kind, missing):
+    """Return the MObjects, MDagPaths or MPlugs of the given objects.
+
+    Every object that is not in the object cache is added to one selection
+    list. Failures are recorded per item, and only turned into an exception
+    if the `missing` policy asks for it.
+    """
+
+    if missing not in (RAISE, SKIP, NONE):
         raise ValueError(
-            "Cannot select a(n) {} object '{}' - "
-            "expected a string, MObject, MDagPath, or MPlug.".format(
-                type(obj).__name__, obj
+            "Invalid missing policy '{}' - expected one of {}.".format(
+                missing, ", ".join((RAISE, SKIP, NONE))
             )
         )
 
-    return sel
+    objs = list(objs)
+    results = [None] * len(objs)
+    failures = {}
+
+    sel = OpenMaya.MSelectionList()
+    pending = []
+    selected = {}
+    caching = _cache is not None and kind != _PLUG
+
+    for i, obj in enumerate(objs):
+        is_name = isinstance(obj, six.string_types)
+
+        if not is_name and isinstance(obj, _object_types()):
+            try:
+                results[i] = _unwrap(obj, kind)
+            except (LookupError, TypeError) as error:
+                failures[i] = type(error)
+            continue
+
+        if is_name and obj in selected:
+            pending.append((i,) + selected[obj])
+            continue
+
+        entry = _cache.get(obj) if caching and is_name else None
+
+        if entry is not None:
+            if kind == _OBJECT:
+                results[i] = entry.handle.object()
+            elif entry.dag_path is not None:
+                results[i] = OpenMaya.MDagPath(entry.dag_path)
+            else:
+                pending.append((i, None, entry))
+            continue
+
+        length = sel.length()
+
+        try:
+            sel.add(obj)
+        except RuntimeError:
+            failures[i] = LookupError
+            continue
+        except TypeError:
+            raise ValueError(_NOT_SELECTABLE.format(type(obj).__name__, obj))
+
+        if sel.length() == length:
+            # The item was merged with an earlier item that names the same object.
+            item = (_get_selection(obj), 0)
+        else:
+            item = (sel, length)
+
+        if is_name:
+            selected[obj] = item
+
+        pending.append((i,) + item)
+
+    for i, item_sel, index in pending:
+        if kind == _PLUG:
+            try:
+                results[i] = item_sel.getPlug(index)
+            except TypeError:
+                failures[i] = TypeError
+            continue
+
+        if item_sel is None:
+            entry = index
+            node = entry.handle.object()
+        else:
+            node = item_sel.getDependNode(index)
+            entry = None
+
+            if caching and isinstance(objs[i], six.string_types):
+                entry = _cache.add(objs[i], node)
+
+        if kind == _OBJECT:
+            results[i] = node
+            continue
+
+        dag_path = _get_dag_path(item_sel, index, node)
+
+        if dag_path is None:
+            failures[i] = TypeError
+            continue
+
+        if entry is not None:
+            entry.dag_path = OpenMaya.MDagPath(dag_path)
+
+        results[i] = dag_path
+
+    if not failures:
+        return results
+
+    if missing == RAISE:
+        i = min(failures)
+        raise failures[i](_ERRORS[kind, failures[i]].format(objs[i]))
+
+    if missing == SKIP:
+        return [result for i, result in enumerate(results) if i not in failures]
+
+    return results
+
+
+def _object_types():
+    """Return the Node and Plug types."""
+
+    # Deferred, because maya_fn.objects imports this module.
+    import maya_fn.objects
+
+    return (maya_fn.objects.Node, maya_fn.objects.Plug)
+
+
+def _try_get(obj, kind):
+    """Return the object of the given kind, or None if it cannot be resolved."""
+
+    try:
+        (result,) = _resolve([obj], kind, NONE)
+    except ValueError:
+        return None
+
+    return result
+
+
+def _unwrap(obj, kind):
+    """Return the MObject, MDagPath or MPlug held by the given Node or Plug."""
+
+    import maya_fn.objects
+
+    if not obj.is_valid:
+        raise LookupError()
+
+    if isinstance(obj, maya_fn.objects.Plug):
+        if kind == _PLUG:
+            return obj.mplug
+        node = obj.mplug.node()
+        dag_path = None
+    elif kind == _PLUG:
+        raise TypeError()
+    else:
+        node = obj.object
+        dag_path = obj.dag_path
+
+    if kind == _OBJECT:
+        return node
+
+    dag_path = dag_path or _get_dag_path(None, 0, node)
+
+    if dag_path is None:
+        raise TypeError()
+
+    return dag_path
+
+
+class _CacheEntry(object):
+    """A resolved name in the object cache."""
+
+    __slots__ = ["handle", "dag_path"]
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.dag_path = None
+
+    def is_valid(self):
+        """Return True if the cached objects still exist in the scene."""
+
+        if not (self.handle.isValid() and self.handle.isAlive()):
+            return False
+
+        return self.dag_path is None or self.dag_path.isValid()
+
+
+class _ObjectCache(object):
+    """A name -> MObjectHandle/MDagPath map with LRU eviction.
+
+    Renaming or reparenting any node clears the cache, because either can
+    change what a name resolves to. Deleting a node only forgets the names of
+    that node, and creating a DAG node only forgets the names that end with
+    its name, which it may make ambiguous.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = collections.OrderedDict()
+        self._names = collections.defaultdict(set)
+        self._short_names = collections.defaultdict(set)
+        self._callbacks = [
+            OpenMaya.MNodeMessage.addNameChangedCallback(
+                OpenMaya.MObject.kNullObj, self._on_change
+            ),
+            OpenMaya.MDagMessage.addParentAddedCallback(self._on_change),
+            OpenMaya.MDagMessage.addParentRemovedCallback(self._on_change),
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._on_node_added, "dagNode"),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_node_removed),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeNew, self._on_change
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeOpen, self._on_change
+            ),
+        ]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, name, obj):
+        """Remember the node the given name resolved to, and return its entry."""
+
+        entry = _CacheEntry(OpenMaya.MObjectHandle(obj))
+
+        self._entries[name] = entry
+        self._names[entry.handle.hashCode()].add(name)
+        self._short_names[_short_name(name)].add(name)
+
+        while len(self._entries) > self.max_size:
+            oldest, oldest_entry = self._entries.popitem(last=False)
+            self._forget(oldest, oldest_entry)
+
+        return entry
+
+    def clear(self):
+        """Forget every name."""
+
+        self._entries.clear()
+        self._names.clear()
+        self._short_names.clear()
+
+    def close(self):
+        """Remove the scene callbacks of this cache."""
+
+        OpenMaya.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+        self.clear()
+
+    def get(self, name):
+        """Return the entry for the given name, or None on a miss."""
+
+        entry = self._entries.pop(name, None)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if not entry.is_valid():
+            self._forget(name, entry)
+            self.misses += 1
+            return None
+
+        self._entries[name] = entry
+        self.hits += 1
+
+        return entry
+
+    def _forget(self, name, entry):
+        """Remove the given name from the reverse indices."""
+
+        for index, key in (
+            (self._names, entry.handle.hashCode()),
+            (self._short_names, _short_name(name)),
+        ):
+            names = index.get(key)
+
+            if names is not None:
+                names.discard(name)
+
+                if not names:
+                    del index[key]
+
+    def _on_change(self, *args):
+        """Clear the cache after a change that may affect any name."""
+
+        self.clear()
+
+    def _on_node_added(self, node, *args):
+        """Forget the names that the new DAG node may make ambiguous."""
+
+        short_name = OpenMaya.MFnDependencyNode(node).name()
+
+        for name in list(self._short_names.get(short_name, ())):
+            entry = self._entries.pop(name, None)
+
+            if entry is not None:
+                self._forget(name, entry)
+
+    def _on_node_removed(self, node, *args):
+        """Forget the names of a deleted node."""
+
+        for name in self._names.pop(OpenMaya.MObjectHandle(node).hashCode(), ()):
+            entry = self._entries.pop(name, None)
+
+            if entry is not None:
+                self._forget(name, entry)
+
+
+class _PathEntry(object):
+    """The path names of a node instance in the path cache."""
+
+    __slots__ = ["handle", "full", "partial", "generation"]
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.full = None
+        self.partial = None
+        self.generation = None
+
+
+class _PathCache(object):
+    """A (node, instance) -> path names map with LRU eviction.
+
+    Renaming or reparenting a DAG node forgets the full paths of that node
+    and of its descendents. Partial paths also depend on the names of the
+    other nodes of the scene, so every partial path is built again after any
+    DAG node is created, deleted, renamed or reparented. Deleting a node
+    forgets that node.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = collections.OrderedDict()
+        self._keys = collections.defaultdict(set)
+        self._generation = 0
+        self._callbacks = [
+            OpenMaya.MNodeMessage.addNameChangedCallback(
+                OpenMaya.MObject.kNullObj, self._on_name_changed
+            ),
+            OpenMaya.MDagMessage.addParentAddedCallback(self._on_parent_changed),
+            OpenMaya.MDagMessage.addParentRemovedCallback(self._on_parent_changed),
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._on_node_added, "dagNode"),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_node_removed),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeNew, self._on_scene_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeOpen, self._on_scene_changed
+            ),
+        ]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Forget every path."""
+
+        self._entries.clear()
+        self._keys.clear()
+
+    def close(self):
+        """Remove the scene callbacks of this cache."""
+
+        OpenMaya.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+        self.clear()
+
+    def full_path_name(self, node):
+        """Return the full path name of the given MDagPath or MObject."""
+
+        entry = self._get(node)
+
+        if entry.full is None:
+            self.misses += 1
+            entry.full = self._intern(_full_path_name(node))
+        else:
+            self.hits += 1
+
+        return entry.full
+
+    def memory(self):
+        """Return the estimated number of bytes used by the cached paths."""
+
+        size = sys.getsizeof(self._entries) + sys.getsizeof(self._keys)
+        strings = {}
+
+        for key, entry in six.iteritems(self._entries):
+            size += sys.getsizeof(key) + sys.getsizeof(entry)
+            strings[id(entry.full)] = entry.full
+            strings[id(entry.partial)] = entry.partial
+
+        strings.pop(id(None), None)
+
+        return size + sum(sys.getsizeof(string) for string in strings.values())
+
+    def partial_path_name(self, node):
+        """Return the partial path name of the given MDagPath or MObject."""
+
+        entry = self._get(node)
+
+        if entry.generation != self._generation:
+            self.misses += 1
+            entry.partial = self._intern(_partial_path_name(node))
+            entry.generation = self._generation
+        else:
+            self.hits += 1
+
+        return entry.partial
+
+    def _forget(self, key):
+        """Forget the paths of every instance of the node with the given hash."""
+
+        for instance in self._keys.pop(key, ()):
+            self._entries.pop((key, instance), None)
+
+    def _forget_descendents(self, node):
+        """Forget the full paths of the given node and of its descendents."""
+
+        if not self._entries:
+            return
+
+        queue = [node]
+
+        while queue:
+            node = queue.pop()
+            self._forget(OpenMaya.MObjectHandle(node).hashCode())
+
+            fn = OpenMaya.MFnDagNode(node)
+            queue.extend(fn.child(i) for i in range(fn.childCount()))
+
+    def _get(self, node):
+        """Return the entry of the given MDagPath or MObject, adding it if needed."""
+
+        if isinstance(node, OpenMaya.MDagPath):
+            handle = OpenMaya.MObjectHandle(node.node())
+            instance = node.instanceNumber()
+        else:
+            handle = OpenMaya.MObjectHandle(node)
+            instance = 0
+
+        key = handle.hashCode()
+        entry = self._entries.pop((key, instance), None)
+
+        if entry is None or not entry.handle == handle:
+            entry = _PathEntry(handle)
+            self._keys[key].add(instance)
+
+        self._entries[key, instance] = entry
+
+        while len(self._entries) > self.max_size:
+            (oldest, oldest_instance), _ = self._entries.popitem(last=False)
+            self._keys[oldest].discard(oldest_instance)
+
+            if not self._keys[oldest]:
+                del self._keys[oldest]
+
+        return entry
+
+    def _intern(self, string):
+        """Return the interned copy of the given string."""
+
+        try:
+            return six.moves.intern(string)
+        except TypeError:
+            # Python 2 only interns byte strings.
+            return string
+
+    def _on_name_changed(self, node, *args):
+        """Forget the paths that contain the renamed node."""
+
+        if node.hasFn(OpenMaya.MFn.kDagNode):
+            self._generation += 1
+            self._on_hierarchy_changed(node)
+
+    def _on_hierarchy_changed(self, node):
+        """Forget the full paths below the given node."""
+
+        try:
+            self._forget_descendents(node)
+        except RuntimeError:
+            # The node is being deleted, or is not a DAG node anymore.
+            self.clear()
+
+    def _on_node_added(self, node, *args):
+        """Rebuild the partial paths, which the new node may make ambiguous."""
+
+        self._generation += 1
+
+    def _on_node_removed(self, node, *args):
+        """Forget the paths of a deleted node."""
+
+        if node.hasFn(OpenMaya.MFn.kDagNode):
+            self._generation += 1
+
+        self._forget(OpenMaya.MObjectHandle(node).hashCode())
+
+    def _on_parent_changed(self, child, parent, *args):
+        """Forget the paths of the reparented node."""
+
+        self._generation += 1
+        self._on_hierarchy_changed(child.node())
+
+    def _on_scene_changed(self, *args):
+        """Forget every path before a new scene is opened."""
+
+        self.clear()
@@ -1,23 +1,47 @@
 """DAG node utilities."""
 
-from maya import cmds
+import collections
+
+import six
+
 from maya.api import OpenMaya
 
+import maya_fn._compat
+import maya_fn._modifier
+import maya_fn._util
 import maya_fn.api
 
 __all__ = [
+    "Ancestry",
+    "DagIndex",
     "ancestors",
+    "child_count",
     "children",
+    "delete_many",
     "descendents",
     "full_path",
+    "has_children",
+    "iter_children",
+    "iter_shapes",
+    "iter_siblings",
+    "matrices",
     "name",
     "parent",
     "path",
+    "rename_many",
+    "reparent_many",
     "shapes",
     "siblings",
+    "world_matrices",
 ]
 
 
+DEPTH_FIRST = maya_fn._util.DEPTH_FIRST
+BREADTH_FIRST = maya_fn._util.BREADTH_FIRST
+
+Matrices = collections.namedtuple("Matrices", ["paths", "parents", "world", "local"])
+
+
 def ancestors(dag_node):
     """Return the ancestors of the given dag node, depth first.
 
@@ -34,7 +58,20 @@ def ancestors(dag_node):
 def child(dag_node, dag_name):
     """Return the child of the given dag node."""
 
-    return dag_node + "|" + dag_name
+    return "{}|{}".format(dag_node, dag_name)
+
+
+def child_count(dag_node):
+    """Return the number of children of the given node, shapes included.
+
+    Args:
+        dag_node (str): DAG node in the current scene.
+
+    Returns:
+        int
+    """
+
+    return maya_fn.api.get_dag_path(dag_node).childCount()
 
 
 def children(dag_node):
@@ -47,28 +84,71 @@ def children(dag_node):
         list[str]
     """
 
-    return [
-        child.fullPathName()
-        for child in _iter_children(dag_node)
-        if child.node().hasFn(OpenMaya.MFn.kTransform)
-    ]
+    return list(iter_children(dag_node))
 
 
-def descendents(dag_node):
-    """Yield the descendents of the given dag node, depth first.
+def delete_many(dag_nodes):
+    """Delete the given nodes, with their descendents, as a single undoable operation.
+
+    Args:
+        dag_nodes (Iterable[Any]): Nodes to delete, by name, Node, MObject or
+            MDagPath. Nodes below another given node are deleted with it.
+
+    Raises:
+        LookupError: If a node does not exist; nothing is deleted then.
+    """
+
+    nodes = maya_fn.api.get_objects(dag_nodes)
+    given = maya_fn._util.NodeMap((node, True) for node in nodes)
+    queued = maya_fn._util.NodeMap()
+
+    with maya_fn._modifier.batch() as modifier:
+        for node in nodes:
+            if node in queued or _has_ancestor_in(node, given):
+                continue
+
+            queued[node] = True
+            modifier.deleteNode(node)
+
+
+def descendents(
+    dag_node,
+    order=DEPTH_FIRST,
+    max_depth=None,
+    types=(OpenMaya.MFn.kTransform,),
+    prune=None,
+):
+    """Yield the descendents of the given dag node.
+
+    The hierarchy is walked once with an explicit stack of MDagPaths, so deep
+    hierarchies are neither resolved again at every level nor limited by the
+    recursion limit.
 
     Args:
         dag_node (str): DAG node in the current scene.
+        order (str): DEPTH_FIRST or BREADTH_FIRST.
+        max_depth (int | None): Depth below the given node to stop at; 1 only
+            yields the children. None walks the whole hierarchy.
+        types (int | Iterable[int] | None): MFn type(s) of the nodes to yield.
+            Nodes of other types are still walked through. None yields every
+            DAG node.
+        prune (Callable[[str], bool] | None): Called with the full path of each
+            descendent; if it returns True, that node and its descendents are
+            skipped.
 
     Yields:
         str
+
+    Raises:
+        ValueError: If the given order is not valid.
     """
 
-    for child in children(dag_node):
-        yield child
+    dag_path = maya_fn.api.get_dag_path(dag_node)
 
-        for each in descendents(child):
-            yield each
+    for each in maya_fn._util.iter_descendents(
+        dag_path, order, max_depth, types, prune
+    ):
+        yield each.fullPathName()
 
 
 def full_path(dag_node):
@@ -81,12 +161,143 @@ def full_path(dag_node):
         str
     """
 
-    return maya_fn.api.get_dag_path(dag_node).fullPathName()
+    return maya_fn.api.full_path_name(maya_fn.api.get_dag_path(dag_node))
 
 
 get = maya_fn.api.get_dag_path
 
 
+def has_children(dag_node):
+    """Return True if the given node has children, shapes included.
+
+    Args:
+        dag_node (str): DAG node in the current scene.
+
+    Returns:
+        bool
+    """
+
+    return child_count(dag_node) > 0
+
+
+def iter_children(dag_node):
+    """Yield the children transforms of the given node.
+
+    The full path of each child is only made when it is reached, so stopping
+    early costs nothing for the children that were not reached. Do not edit
+    the children of the node while iterating.
+
+    Args:
+        dag_node (str): DAG node in the current scene.
+
+    Yields:
+        str
+    """
+
+    dag_path = maya_fn.api.get_dag_path(dag_node)
+
+    return _iter_children(dag_path, OpenMaya.MFn.kTransform)
+
+
+def iter_shapes(dag_node):
+    """Yield the shape nodes of the given node; see `iter_children`.
+
+    Args:
+        dag_node (str): DAG path of a transform in the current scene.
+
+    Yields:
+        str
+    """
+
+    dag_path = maya_fn.api.get_dag_path(dag_node)
+
+    return _iter_children(dag_path, OpenMaya.MFn.kShape)
+
+
+def iter_siblings(dag_node):
+    """Yield the siblings of the given dag node; see `iter_children`.
+
+    Args:
+        dag_node (str): DAG node in the current scene.
+
+    Yields:
+        str
+    """
+
+    dag_path = maya_fn.api.get_dag_path(dag_node)
+    node = dag_path.node()
+
+    return _iter_children(dag_path.pop(), OpenMaya.MFn.kDagNode, skip=node)
+
+
+def matrices(dag_nodes, world=True, local=False):
+    """Return the matrices of the given transforms, as (N, 4, 4) arrays.
+
+    Given a single node, that node and every transform below it are read in
+    one MItDag walk, depth first. Given a list of nodes, only those nodes are
+    read. Matrices are read from the API - MDagPath.inclusiveMatrix and
+    MFnTransform.transformationMatrix - without going through plugs.
+
+    Local matrices include the offsetParentMatrix of the transforms, as the
+    world matrices do, so that `world_matrices` of them are the world
+    matrices.
+
+    Args:
+        dag_nodes (str | Iterable[str]): Root of the transforms to read, or
+            the transforms to read.
+        world (bool): Read the world matrices.
+        local (bool): Read the local matrices.
+
+    Returns:
+        Matrices: The full paths of the transforms; the index of the parent
+            of each transform in these paths, or -1 if it is not one of them;
+            and the world and local matrices, or None if they were not read.
+
+    Raises:
+        TypeError: If a given node is not a transform.
+    """
+
+    numpy = maya_fn._compat.numpy()
+
+    if isinstance(dag_nodes, six.string_types) or not hasattr(dag_nodes, "__iter__"):
+        dag_paths = _iter_transforms(maya_fn.api.get_dag_path(dag_nodes))
+    else:
+        dag_paths = maya_fn.api.get_dag_paths(dag_nodes)
+
+    paths = []
+    world_values = []
+    local_values = []
+
+    for dag_path in dag_paths:
+        if not dag_path.hasFn(OpenMaya.MFn.kTransform):
+            raise TypeError("'{}' is not a transform.".format(dag_path.fullPathName()))
+
+        paths.append(dag_path.fullPathName())
+
+        if world:
+            world_values.extend(dag_path.inclusiveMatrix())
+
+        if local:
+            local_values.extend(_local_matrix(dag_path))
+
+    indices = {path: i for i, path in enumerate(paths)}
+    parents = numpy.array(
+        [indices.get(path.rpartition("|")[0], -1) for path in paths],
+        dtype=numpy.intp,
+    )
+
+    shape = (len(paths), 4, 4)
+    world_array = local_array = None
+
+    if world:
+        world_array = numpy.array(world_values, dtype=numpy.float64).reshape(shape)
+
+    if local:
+        local_array = numpy.array(local_values, dtype=numpy.float64).reshape(shape)
+
+    return Matrices(paths, parents, world_array, local_array)
+
+
 def name(dag_node):
     """Return the name of the given dag node.
 
@@ -98,7 +309,9 @@ def name(dag_node):
     """
 
     # Split the full path name because partial path name may not be unique.
-    return maya_fn.api.get_dag_path(dag_node).fullPathName().split("|")[-1]
+    dag_path = maya_fn.api.get_dag_path(dag_node)
+
+    return maya_fn.api.full_path_name(dag_path).rpartition("|")[-1]
 
 
 def parent(dag_node):
@@ -114,7 +327,10 @@ def parent(dag_node):
     dag_path = maya_fn.api.get_dag_path(dag_node)
     dag_path.pop()
 
-    return dag_path.fullPathName() or None
+    if not dag_path.length():
+        return None
+
+    return maya_fn.api.full_path_name(dag_path)
 
 
 def partial_path(dag_node):
@@ -127,12 +343,84 @@ def partial_path(dag_node):
         list[str]
     """
 
-    return maya_fn.api.get_dag_path(dag_node).partialPathName()
+    return maya_fn.api.partial_path_name(maya_fn.api.get_dag_path(dag_node))
 
 
 path = maya_fn.api.get_dag_path
 
 
+def rename_many(renames):
+    """Rename the given nodes as a single undoable operation.
+
+    The nodes are held by MObject while the batch is queued, so renaming a
+    node does not invalidate the other nodes of the batch.
+
+    Args:
+        renames (Iterable[tuple[Any, str]]): (node, new name) of each node to
+            rename; nodes by name, Node, MObject or MDagPath.
+
+    Returns:
+        list[str] | None: The full paths of the renamed nodes, in the same
+            order - Maya makes a name unique among its siblings by adding a
+            number. None in a `maya_fn.transaction`, where the edits are
+            only applied when the transaction is committed.
+
+    Raises:
+        LookupError: If a node does not exist; nothing is renamed then.
+    """
+
+    renames = list(renames)
+    nodes = maya_fn.api.get_objects([node for node, _ in renames])
+
+    with maya_fn._modifier.batch() as modifier:
+        for node, (_, new_name) in zip(nodes, renames):
+            modifier.renameNode(node, new_name)
+
+    return _final_paths(nodes)
+
+
+def reparent_many(reparents):
+    """Parent the given DAG nodes under new parents as a single undoable operation.
+
+    Like `cmds.parent(relative=True)`, the local transforms of the nodes are
+    kept, not their world transforms.
+
+    Args:
+        reparents (Iterable[tuple[Any, Any]]): (node, new parent) of each
+            node to move, with a parent of None for the world; nodes by
+            name, Node, MObject or MDagPath.
+
+    Returns:
+        list[str] | None: The full paths of the moved nodes, in the same
+            order. None in a `maya_fn.transaction`, where the edits are only
+            applied when the transaction is committed.
+
+    Raises:
+        LookupError: If a node or parent does not exist; nothing is moved then.
+        TypeError: If a node or parent is not a DAG node.
+    """
+
+    reparents = list(reparents)
+    nodes = [
+        dag_path.node()
+        for dag_path in maya_fn.api.get_dag_paths([node for node, _ in reparents])
+    ]
+    parents = iter(
+        maya_fn.api.get_dag_paths(
+            [parent for _, parent in reparents if parent is not None]
+        )
+    )
+
+    with maya_fn._modifier.batch() as modifier:
+        for node, (_, parent) in zip(nodes, reparents):
+            if parent is None:
+                modifier.reparentNode(node)
+            else:
+                modifier.reparentNode(node, next(parents).node())
+
+    return _final_paths(nodes)
+
+
 def shapes(dag_node):
     """Return the shape nodes for the given node.
 
@@ -143,11 +431,7 @@ def shapes(dag_node):
         list[str]
     """
 
-    return [
-        child.fullPathName()
-        for child in _iter_children(dag_node)
-        if child.node().hasFn(OpenMaya.MFn.kShape)
-    ]
+    return list(iter_shapes(dag_node))
 
 
 def siblings(dag_node):
@@ -160,27 +444,124 @@ def siblings(dag_node):
         list[str]
     """
 
-    dag_path = path(dag_node)
+    return list(iter_siblings(dag_node))
 
-    _parent = parent(dag_node)
 
-    if not _parent:
-        _siblings = cmds.ls(assemblies=True, long=True)
-    else:
-        _siblings = [each.fullPathName() for each in _iter_children(_parent)]
+def world_matrices(local, parents):
+    """Return the world matrices of a hierarchy from its local matrices.
 
-    _siblings.remove(dag_path.fullPathName())
+    This works on offline data, such as the output of `matrices` or a file
+    read without Maya. The matrices of each depth of the hierarchy are
+    multiplied as one batch.
 
-    return _siblings
+    Args:
+        local (numpy.ndarray): (N, 4, 4) local matrices.
+        parents (Sequence[int]): Index of the parent of each matrix, or -1
+            for the matrices whose local matrix is their world matrix.
 
+    Returns:
+        numpy.ndarray: (N, 4, 4) world matrices.
 
-def _iter_children(dag_node):
-    """Yield the children of the given node."""
+    Raises:
+        ValueError: If the shapes do not match, or the parents form a cycle.
+    """
 
-    dag_path = maya_fn.api.get_dag_path(dag_node)
+    numpy = maya_fn._compat.numpy()
+
+    local = numpy.asarray(local, dtype=numpy.float64)
+    parents = numpy.asarray(parents, dtype=numpy.intp)
+
+    if local.ndim != 3 or local.shape[1:] != (4, 4) or parents.shape != local.shape[:1]:
+        raise ValueError(
+            "Expected (N, 4, 4) matrices and N parents, got {} and {}.".format(
+                local.shape, parents.shape
+            )
+        )
+
+    depths = numpy.zeros(len(parents), dtype=numpy.intp)
+    ancestors = parents.copy()
+
+    while True:
+        has_parent = ancestors >= 0
+
+        if not has_parent.any():
+            break
+
+        depths[has_parent] += 1
+
+        if depths.max() > len(parents):
+            raise ValueError("The parents form a cycle.")
+
+        ancestors[has_parent] = parents[ancestors[has_parent]]
+
+    world = local.copy()
+
+    for depth in range(1, depths.max() + 1 if len(depths) else 0):
+        (level,) = numpy.nonzero(depths == depth)
+        world[level] = numpy.matmul(local[level], world[parents[level]])
+
+    return world
+
+
+def _final_paths(nodes):
+    """Return the full paths of the given nodes, or None in a transaction."""
+
+    if maya_fn._modifier.current() is not None:
+        return None
+
+    return [maya_fn.api.full_path_name(node) for node in nodes]
+
+
+def _has_ancestor_in(node, nodes):
+    """Return True if an ancestor of the given node is in the given NodeMap."""
+
+    if not node.hasFn(OpenMaya.MFn.kDagNode):
+        return False
+
+    dag_path = OpenMaya.MDagPath.getAPathTo(node)
+
+    while dag_path.length() > 1:
+        dag_path.pop()
+
+        if dag_path.node() in nodes:
+            return True
+
+    return False
+
+
+def _iter_children(dag_path, fn_type, skip=None):
+    """Yield the full paths of the children of the given path of an MFn type."""
 
     for i in range(dag_path.childCount()):
-        yield OpenMaya.MDagPath.getAPathTo(dag_path.child(i))
+        child = dag_path.child(i)
+
+        if child.hasFn(fn_type) and child != skip:
+            yield OpenMaya.MDagPath(dag_path).push(child).fullPathName()
+
+
+def _iter_transforms(root):
+    """Yield the MDagPaths of the given transform and of the transforms below it."""
+
+    it = OpenMaya.MItDag()
+    it.reset(root, OpenMaya.MItDag.kDepthFirst, OpenMaya.MFn.kTransform)
+
+    while not it.isDone():
+        yield it.getPath()
+        it.next()
+
+
+def _local_matrix(dag_path):
+    """Return the local matrix of the given transform, with its offset."""
+
+    fn = OpenMaya.MFnTransform(dag_path)
+    matrix = fn.transformationMatrix()
+
+    # offsetParentMatrix is new in Maya 2020.
+    if fn.hasAttribute("offsetParentMatrix"):
+        plug = fn.findPlug("offsetParentMatrix", False)
+        matrix = matrix * OpenMaya.MFnMatrixData(plug.asMObject()).matrix()
+
+    return matrix
 
 
 def _iter_parents(dag_node):
@@ -195,3 +576,656 @@ def _iter_parents(dag_node):
             yield dag_path.fullPathName()
         else:
             break
+
+
+class DagIndex(object):
+    """An in-memory index of the DAG hierarchy of the current scene.
+
+    The index is built in one pass over the scene, then kept up to date by
+    scene callbacks as nodes are added, removed, reparented or renamed. Its
+    queries mirror the module functions of the same name, without going back
+    to Maya.
+
+    Remove the callbacks with `close` when the index is no longer needed, or
+    use the index as a context manager.
+    """
+
+    def __init__(self):
+        """Build the index from the current scene and add its callbacks."""
+
+        self._build()
+
+        self._callbacks = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._on_node_added, "dagNode"),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(
+                self._on_node_removed, "dagNode"
+            ),
+            OpenMaya.MDagMessage.addParentAddedCallback(self._on_parent_added),
+            OpenMaya.MDagMessage.addParentRemovedCallback(self._on_parent_removed),
+            OpenMaya.MNodeMessage.addNameChangedCallback(
+                OpenMaya.MObject.kNullObj, self._on_name_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kAfterNew, self._on_scene_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kAfterOpen, self._on_scene_changed
+            ),
+        ]
+
+    def __enter__(self):
+        """Return this index."""
+
+        return self
+
+    def __exit__(self, *args):
+        """Remove the scene callbacks of this index."""
+
+        self.close()
+
+    def __len__(self):
+        """Return the number of DAG nodes in the index."""
+
+        return len(self._names)
+
+    def ancestors(self, dag_node):
+        """Return the ancestors of the given dag node, depth first.
+
+        Args:
+            dag_node (str): DAG node in the current scene.
+
+        Returns:
+            list[str]
+        """
+
+        chain = self._resolve(dag_node)
+
+        return [self._path(chain[:i]) for i in range(1, len(chain))]
+
+    def children(self, dag_node):
+        """Return the children transforms of the given node.
+
+        Args:
+            dag_node (str): DAG node in the current scene.
+
+        Returns:
+            list[str]
+        """
+
+        chain = self._resolve(dag_node)
+        prefix = self._path(chain)
+
+        return [
+            prefix + "|" + self._names[key]
+            for key in self._children[chain[-1]]
+            if key in self._transforms
+        ]
+
+    def close(self):
+        """Remove the scene callbacks of this index."""
+
+        OpenMaya.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+
+    def parent(self, dag_node):
+        """Return the parent of the given dag node.
+
+        Args:
+            dag_node (str): DAG path of a node in the current scene.
+
+        Returns:
+            str | None
+        """
+
+        chain = self._resolve(dag_node)
+
+        return self._path(chain[:-1]) or None
+
+    def rebuild(self):
+        """Rebuild the whole index from the current scene."""
+
+        self._build()
+
+    def shapes(self, dag_node):
+        """Return the shape nodes for the given node.
+
+        Args:
+            dag_node (str): DAG path of a transform in the current scene.
+
+        Returns:
+            list[str]
+        """
+
+        chain = self._resolve(dag_node)
+        prefix = self._path(chain)
+
+        return [
+            prefix + "|" + self._names[key]
+            for key in self._children[chain[-1]]
+            if key in self._shapes
+        ]
+
+    def siblings(self, dag_node):
+        """Return the siblings of the given dag node.
+
+        Args:
+            dag_node (str): DAG node in the current scene.
+
+        Returns:
+            list[str]
+        """
+
+        chain = self._resolve(dag_node)
+        prefix = self._path(chain[:-1])
+        parent = chain[-2] if len(chain) > 1 else None
+
+        return [
+            prefix + "|" + self._names[key]
+            for key in self._children[parent]
+            if key != chain[-1]
+        ]
+
+    def verify(self):
+        """Compare the index with the current scene.
+
+        Returns:
+            list[str]: A description of every difference; empty if the index
+                matches the scene.
+        """
+
+        scene = DagIndex.__new__(DagIndex)
+        scene._build()
+
+        errors = []
+
+        for key in set(self._names) | set(scene._names):
+            name = self._names.get(key) or scene._names.get(key)
+
+            if key not in scene._names:
+                errors.append("'{}' is not in the scene.".format(name))
+            elif key not in self._names:
+                errors.append("'{}' is not in the index.".format(name))
+            else:
+                for table in ("_names", "_parents", "_children"):
+                    if getattr(self, table)[key] != getattr(scene, table)[key]:
+                        errors.append(
+                            "'{}' has the wrong {}.".format(name, table.strip("_"))
+                        )
+
+        if self._children[None] != scene._children[None]:
+            errors.append("The world has the wrong children.")
+
+        return sorted(errors)
+
+    def _add(self, node):
+        """Add the given node to the index, with its current relatives."""
+
+        key = _key(node)
+
+        if key is None or self._find(node) is not None:
+            return key
+
+        if key in self._names:
+            # The hash is reused by, or collides with, another node.
+            self._remove(key)
+
+        fn = OpenMaya.MFnDagNode(node)
+        name = fn.name()
+
+        self._handles[key] = OpenMaya.MObjectHandle(node)
+        self._names[key] = name
+        self._by_name[name].add(key)
+        self._parents[key] = []
+        self._children.setdefault(key, [])
+
+        if node.hasFn(OpenMaya.MFn.kShape):
+            self._shapes.add(key)
+        elif node.hasFn(OpenMaya.MFn.kTransform):
+            self._transforms.add(key)
+
+        for i in range(fn.parentCount()):
+            self._link(key, self._add(fn.parent(i)))
+
+        return key
+
+    def _build(self):
+        """Build the index from the current scene."""
+
+        self._handles = {}
+        self._names = {}
+        self._by_name = collections.defaultdict(set)
+        self._parents = {}
+        self._children = {}
+        self._shapes = set()
+        self._transforms = set()
+
+        it = OpenMaya.MItDag()
+        world = OpenMaya.MFnDagNode(it.root())
+
+        self._children[None] = [_key(world.child(i)) for i in range(world.childCount())]
+
+        while not it.isDone():
+            node = it.currentItem()
+            key = _key(node)
+
+            if key not in self._children:
+                fn = OpenMaya.MFnDagNode(node)
+                name = fn.name()
+
+                self._handles[key] = OpenMaya.MObjectHandle(node)
+                self._names[key] = name
+                self._by_name[name].add(key)
+                self._parents[key] = [
+                    _key(fn.parent(i)) for i in range(fn.parentCount())
+                ]
+                self._children[key] = [
+                    _key(fn.child(i)) for i in range(fn.childCount())
+                ]
+
+                if node.hasFn(OpenMaya.MFn.kShape):
+                    self._shapes.add(key)
+                elif node.hasFn(OpenMaya.MFn.kTransform):
+                    self._transforms.add(key)
+
+            it.next()
+
+        # Drop the underworld nodes, which MItDag does not walk.
+        for key, children in self._children.items():
+            self._children[key] = [each for each in children if each in self._names]
+
+    def _chain(self, key, parts, absolute):
+        """Return the keys from the world to the given node, if its path matches."""
+
+        stack = [[key]]
+
+        while stack:
+            chain = stack.pop()
+            parents = self._parents[chain[-1]]
+
+            if len(chain) < len(parts):
+                name = parts[-len(chain) - 1]
+
+                for parent in reversed(parents):
+                    if parent is not None and self._names[parent] == name:
+                        stack.append(chain + [parent])
+            elif not absolute:
+                while parents[0] is not None:
+                    chain.append(parents[0])
+                    parents = self._parents[parents[0]]
+
+                return chain[::-1]
+            elif None in parents:
+                return chain[::-1]
+
+        return None
+
+    def _find(self, node):
+        """Return the key of the given node, or None if it is not indexed.
+
+        Entries are keyed by hash, so the handle of the entry is checked too.
+        """
+
+        key = _key(node)
+        handle = self._handles.get(key)
+
+        if handle is None or not handle == OpenMaya.MObjectHandle(node):
+            return None
+
+        return key
+
+    def _link(self, child, parent):
+        """Add the given parent/child relationship, if it does not exist."""
+
+        if parent not in self._parents[child]:
+            self._parents[child].append(parent)
+
+        children = self._children.setdefault(parent, [])
+
+        if child not in children:
+            children.append(child)
+
+    def _on_name_changed(self, node, previous, *args):
+        """Update the name of a renamed node."""
+
+        key = self._find(node)
+
+        if key is None:
+            return
+
+        self._by_name[self._names[key]].discard(key)
+
+        name = OpenMaya.MFnDependencyNode(node).name()
+
+        self._names[key] = name
+        self._by_name[name].add(key)
+
+    def _on_node_added(self, node, *args):
+        """Add a new node to the index."""
+
+        self._add(node)
+
+    def _on_node_removed(self, node, *args):
+        """Remove a deleted node from the index."""
+
+        key = self._find(node)
+
+        if key is not None:
+            self._remove(key)
+
+    def _on_parent_added(self, child, parent, *args):
+        """Add a new parent/child relationship."""
+
+        key = self._add(child.node())
+        parent_key = self._add(parent.node()) if parent.length() else None
+
+        self._link(key, parent_key)
+
+    def _on_parent_removed(self, child, parent, *args):
+        """Remove a parent/child relationship."""
+
+        key = self._find(child.node())
+        parent_key = self._find(parent.node()) if parent.length() else None
+
+        if key is not None:
+            self._unlink(key, parent_key)
+
+    def _on_scene_changed(self, *args):
+        """Rebuild the index for a new scene."""
+
+        self._build()
+
+    def _path(self, chain):
+        """Return the full path of the given keys."""
+
+        return "".join("|" + self._names[key] for key in chain)
+
+    def _remove(self, key):
+        """Remove the node of the given key from the index."""
+
+        for parent in list(self._parents[key]):
+            self._unlink(key, parent)
+
+        for child in list(self._children[key]):
+            self._unlink(child, key)
+
+        del self._children[key]
+
+        self._by_name[self._names.pop(key)].discard(key)
+        del self._parents[key]
+        del self._handles[key]
+
+        self._shapes.discard(key)
+        self._transforms.discard(key)
+
+    def _unlink(self, child, parent):
+        """Remove the given parent/child relationship, if it exists."""
+
+        if parent in self._parents.get(child, ()):
+            self._parents[child].remove(parent)
+
+        if child in self._children.get(parent, ()):
+            self._children[parent].remove(child)
+
+    def _resolve(self, dag_node):
+        """Return the keys from the world to the given node."""
+
+        if not isinstance(dag_node, six.string_types):
+            dag_node = full_path(dag_node)
+
+        parts = dag_node.split("|")
+        absolute = not parts[0]
+
+        if absolute:
+            parts = parts[1:]
+
+        chains = [
+            chain
+            for chain in (
+                self._chain(key, parts, absolute)
+                for key in self._by_name.get(parts[-1], ())
+                if self._handles[key].isValid()
+            )
+            if chain is not None
+        ]
+
+        if not chains:
+            raise LookupError("Object '{}' does not exist.".format(dag_node))
+
+        if len(chains) > 1:
+            raise LookupError(
+                "More than one object matches name '{}'.".format(dag_node)
+            )
+
+        return chains[0]
+
+
+class Ancestry(object):
+    """Ancestry queries over the DAG hierarchy of the current scene.
+
+    The hierarchy is numbered in one walk from the world: every DAG path gets
+    the position of its first and last visit in an Euler tour of the
+    hierarchy, so `is_ancestor` compares two pairs of numbers. The lowest
+    common ancestors of many pairs are found at once, from a sparse table of
+    the depths along the tour.
+
+    Each instance of a node is a separate path, with its own numbers; name
+    instances by full path or MDagPath. The numbers are rebuilt on the next
+    query after a DAG node is added, removed, reparented or renamed.
+
+    Remove the callbacks with `close` when the queries are no longer needed,
+    or use the object as a context manager.
+    """
+
+    def __init__(self):
+        """Build the numbers of the current scene and add the callbacks."""
+
+        self._build()
+
+        self._callbacks = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._on_changed, "dagNode"),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_changed, "dagNode"),
+            OpenMaya.MDagMessage.addParentAddedCallback(self._on_changed),
+            OpenMaya.MDagMessage.addParentRemovedCallback(self._on_changed),
+            OpenMaya.MNodeMessage.addNameChangedCallback(
+                OpenMaya.MObject.kNullObj, self._on_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kAfterNew, self._on_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kAfterOpen, self._on_changed
+            ),
+        ]
+
+    def __enter__(self):
+        """Return this object."""
+
+        return self
+
+    def __exit__(self, *args):
+        """Remove the scene callbacks of this object."""
+
+        self.close()
+
+    def __len__(self):
+        """Return the number of DAG paths in the hierarchy."""
+
+        self._update()
+
+        return len(self._names) - 1
+
+    def close(self):
+        """Remove the scene callbacks of this object."""
+
+        OpenMaya.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+
+    def depth(self, dag_node):
+        """Return the number of ancestors of the given dag node.
+
+        Args:
+            dag_node (str): DAG node in the current scene.
+
+        Returns:
+            int
+        """
+
+        self._update()
+
+        return self._depths[self._id(dag_node)] - 1
+
+    def is_ancestor(self, ancestor, dag_node):
+        """Return True if a node is an ancestor of another node.
+
+        Args:
+            ancestor (str): DAG node in the current scene.
+            dag_node (str): DAG node in the current scene.
+
+        Returns:
+            bool: False if the nodes are the same node.
+        """
+
+        self._update()
+
+        a = self._id(ancestor)
+        b = self._id(dag_node)
+
+        return self._first[a] < self._first[b] and self._last[b] <= self._last[a]
+
+    def lowest_common_ancestors(self, pairs):
+        """Return the lowest common ancestor of each pair of dag nodes.
+
+        A node is its own lowest common ancestor with its descendents.
+
+        Args:
+            pairs (Iterable[tuple[str, str]]): Pairs of DAG nodes in the
+                current scene.
+
+        Returns:
+            list[str | None]: The full path of the lowest common ancestor of
+                each pair, in order; None if it is the world.
+        """
+
+        numpy = maya_fn._compat.numpy()
+
+        self._update()
+
+        ids = numpy.array(
+            [(self._id(a), self._id(b)) for a, b in pairs], dtype=numpy.int64
+        ).reshape(-1, 2)
+        first = self._first_array[ids]
+        start = first.min(axis=1)
+        end = first.max(axis=1)
+
+        # The shallowest position of the tour between the first visits of the
+        # two nodes, from the two power of two ranges that cover it.
+        level = numpy.frexp(end - start + 1)[1] - 1
+        left = self._table[level, start]
+        right = self._table[level, end - (1 << level) + 1]
+        depths = self._tour_depths
+        positions = numpy.where(depths[left] <= depths[right], left, right)
+
+        return [self._names[i] for i in self._tour[positions].tolist()]
+
+    def rebuild(self):
+        """Rebuild the numbers from the current scene."""
+
+        self._build()
+
+    def _build(self):
+        """Build the numbers of the hierarchy of the current scene."""
+
+        numpy = maya_fn._compat.numpy()
+
+        # The world is the path of id 0, with no name.
+        names = [None]
+        depths = [0]
+        first = [0]
+        last = [0]
+        tour = [0]
+        stack = [(OpenMaya.MFnDagNode(OpenMaya.MItDag().root()), 0, 0)]
+
+        while stack:
+            fn, path_id, index = stack[-1]
+
+            if index < fn.childCount():
+                stack[-1] = (fn, path_id, index + 1)
+
+                child = OpenMaya.MFnDagNode(fn.child(index))
+                child_id = len(names)
+
+                names.append((names[path_id] or "") + "|" + child.name())
+                depths.append(len(stack))
+                first.append(len(tour))
+                last.append(len(tour))
+                tour.append(child_id)
+
+                stack.append((child, child_id, 0))
+            else:
+                stack.pop()
+                last[path_id] = len(tour) - 1
+
+                if stack:
+                    tour.append(stack[-1][1])
+
+        self._names = names
+        self._ids = {name: i for i, name in enumerate(names)}
+        self._depths = depths
+        self._first = first
+        self._last = last
+        self._first_array = numpy.array(first, dtype=numpy.int64)
+        self._tour = numpy.array(tour, dtype=numpy.int64)
+        self._tour_depths = numpy.array(depths, dtype=numpy.int64)[self._tour]
+
+        # Row k holds, for each position, the position of the shallowest
+        # visit among the 2 ** k visits that start there.
+        size = len(tour)
+        levels = numpy.frexp(size)[1]
+        table = numpy.zeros((levels, size), dtype=numpy.int64)
+        table[0] = numpy.arange(size)
+
+        for level in range(1, levels):
+            half = 1 << (level - 1)
+            count = size - (1 << level) + 1
+            stop = half + count
+            left = table[level - 1, :count]
+            right = table[level - 1, half:stop]
+            table[level, :count] = numpy.where(
+                self._tour_depths[left] <= self._tour_depths[right], left, right
+            )
+
+        self._table = table
+        self._dirty = False
+
+    def _id(self, dag_node):
+        """Return the id of the path of the given dag node."""
+
+        if isinstance(dag_node, six.string_types) and dag_node in self._ids:
+            return self._ids[dag_node]
+
+        name = full_path(dag_node)
+
+        if name not in self._ids:
+            raise LookupError("Object '{}' is not in the hierarchy.".format(name))
+
+        return self._ids[name]
+
+    def _on_changed(self, *args):
+        """Rebuild the numbers on the next query."""
+
+        self._dirty = True
+
+    def _update(self):
+        """Rebuild the numbers if the hierarchy changed since the last query."""
+
+        if self._dirty:
+            self._build()
+
+
+def _key(node):
+    """Return the index key of the given node; None for the world."""
+
+    if node.hasFn(OpenMaya.MFn.kWorld):
+        return None
+
+    return OpenMaya.MObjectHandle(node).hashCode()
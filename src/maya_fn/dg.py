@@ -1,19 +1,45 @@
 """Dependency node utilities."""
 
+import array
+import collections
+import struct
+
 import six
 
 from maya import cmds
+from maya.api import OpenMaya
 
+import maya_fn._compat
+import maya_fn._modifier
+import maya_fn._util
+import maya_fn.api
+import maya_fn.objects
 import maya_fn.plug
+import maya_fn.schema
 
 __all__ = [
+    "ConnectionDiff",
+    "ConnectionSnapshot",
     "create",
+    "create_many",
+    "snapshot",
 ]
 
+ConnectionDiff = collections.namedtuple("ConnectionDiff", ["added", "removed"])
+
+_SNAPSHOT_MAGIC = b"MAYAFNCG"
+_SNAPSHOT_VERSION = 1
+
+# Magic, version, node count, attribute count, connection count, string bytes.
+_SNAPSHOT_HEADER = struct.Struct("<8sIQQQQ")
+
 
 def create(node_type, name=None, **kwargs):
     """Create a new node in the graph, with connections/values.
 
+    In a `maya_fn.transaction`, the node is queued on the modifier of the
+    transaction, and the name it will have is returned.
+
     Args:
         node_type (str): Type of node to create.
         name (str): Optional name for the new node.
@@ -24,10 +50,25 @@ def create(node_type, name=None, **kwargs):
     """
 
     name = name or "{}#".format(node_type)
+    transaction = maya_fn._modifier.current()
+
+    if transaction is not None:
+        name = transaction.reserve(name)
+        node = _create_node(transaction.modifier, node_type, name)
+        transaction.created[name] = node
+        _queue_attrs(transaction.modifier, transaction.created, node, kwargs)
+
+        return name
+
     node = cmds.createNode(node_type, name=name, skipSelect=True)
 
     for attr, value in kwargs.items():
-        if cmds.attributeQuery(attr, node=node, writable=True):
+        info = maya_fn.schema.get(node, attr)
+
+        if info is None:
+            continue
+
+        if info.writable:
             _set_or_connect_attr(node, attr, value)
         else:
             _connect_attr(node, attr, value)
@@ -35,6 +76,304 @@ def create(node_type, name=None, **kwargs):
     return node
 
 
+def create_many(specs):
+    """Create several nodes in the graph as a single undoable operation.
+
+    Every node, value and connection is queued on one modifier, which is
+    applied once all the specs have been read.
+
+    Args:
+        specs (Iterable[str | tuple]): Node type, or tuple of
+            (node_type, name, kwargs) - name and kwargs are optional - for each
+            node to create. The kwargs use the same grammar as `create`, and a
+            plug value may name a node created anywhere in the same batch.
+
+    Returns:
+        list[str]: The names of the new nodes, in the same order as the specs.
+            In a `maya_fn.transaction`, the names they will have once the
+            transaction is committed.
+    """
+
+    specs = [_spec(each) for each in specs]
+    transaction = maya_fn._modifier.current()
+    created = {}
+
+    if transaction is not None:
+        specs = [
+            (node_type, transaction.reserve(name or node_type + "#"), kwargs)
+            for node_type, name, kwargs in specs
+        ]
+        created = transaction.created
+
+    with maya_fn._modifier.batch() as modifier:
+        nodes = [
+            _create_node(modifier, node_type, name) for node_type, name, _ in specs
+        ]
+        created.update((name, node) for (_, name, _), node in zip(specs, nodes) if name)
+
+        for node, (_, _, kwargs) in zip(nodes, specs):
+            _queue_attrs(modifier, created, node, kwargs)
+
+    if transaction is not None:
+        return [name for _, name, _ in specs]
+
+    return [_node_name(node) for node in nodes]
+
+
+def snapshot(nodes=None):
+    """Return a snapshot of the connections of the dependency graph.
+
+    Args:
+        nodes (Iterable[Any] | None): Dependency nodes, by name or MObject,
+            whose input and output connections are recorded. None records
+            every connection of the scene.
+
+    Returns:
+        ConnectionSnapshot
+
+    Raises:
+        LookupError: If one of the given nodes does not exist.
+    """
+
+    numpy = maya_fn._compat.numpy()
+
+    if nodes is None:
+        objs = maya_fn._util.iter_nodes()
+        subset = None
+    else:
+        objs = maya_fn.api.get_objects(nodes)
+        subset = maya_fn._util.NodeMap((obj, True) for obj in objs)
+
+    node_ids = maya_fn._util.NodeMap()
+    node_names = []
+    attr_ids = {}
+    rows = array.array("i")
+
+    def add(plug):
+        node = plug.node()
+        node_id = node_ids.get(node)
+
+        if node_id is None:
+            node_id = node_ids[node] = len(node_names)
+            node_names.append(six.moves.intern(maya_fn._util.full_name(node)))
+
+        attr = six.moves.intern(maya_fn._util.attr_name(plug))
+
+        rows.extend((node_id, attr_ids.setdefault(attr, len(attr_ids))))
+
+    for obj in objs:
+        for plug in OpenMaya.MFnDependencyNode(obj).getConnections():
+            if plug.isDestination:
+                source = plug.source()
+
+                if not source.isNull:
+                    add(source)
+                    add(plug)
+
+            if subset is None or not plug.isSource:
+                continue
+
+            # Outputs to other nodes of the subset are recorded as their inputs.
+            for destination in plug.destinations():
+                if destination.node() not in subset:
+                    add(plug)
+                    add(destination)
+
+    attr_names = [None] * len(attr_ids)
+
+    for attr, attr_id in attr_ids.items():
+        attr_names[attr_id] = attr
+
+    edges = numpy.array(rows, dtype=numpy.int32).reshape(-1, 4)
+
+    return ConnectionSnapshot(node_names, attr_names, edges)
+
+
+class ConnectionSnapshot(object):
+    """The connections of the dependency graph at one point in time.
+
+    Every connection is a row of (source node, source attribute, destination
+    node, destination attribute) ids, which index the node and attribute
+    tables. Each name is stored once, however many connections use it.
+
+    Save a snapshot with `save`, and compare it with a later snapshot with
+    `diff`. Loaded snapshots map their connections from the file, so a large
+    baseline is only read as far as it is used.
+    """
+
+    def __init__(self, nodes, attrs, edges):
+        """Initialize the snapshot.
+
+        Args:
+            nodes (list[str]): Names of the nodes; full paths for DAG nodes.
+            attrs (list[str]): Long names of the attributes.
+            edges (numpy.ndarray): (N, 4) int32 ids of the connections.
+        """
+
+        self._nodes = nodes
+        self._attrs = attrs
+        self._edges = edges
+
+    def __len__(self):
+        """Return the number of connections in the snapshot."""
+
+        return len(self._edges)
+
+    @property
+    def attrs(self):
+        """Return the attribute table of the snapshot."""
+
+        return self._attrs
+
+    @property
+    def edges(self):
+        """Return the (N, 4) ids of the connections of the snapshot."""
+
+        return self._edges
+
+    @property
+    def nodes(self):
+        """Return the node table of the snapshot."""
+
+        return self._nodes
+
+    def connections(self):
+        """Yield the (source, destination) plugs of every connection.
+
+        Yields:
+            tuple[str, str]
+        """
+
+        nodes = self._nodes
+        attrs = self._attrs
+
+        for src, src_attr, dst, dst_attr in self._edges.tolist():
+            yield (
+                nodes[src] + "." + attrs[src_attr],
+                nodes[dst] + "." + attrs[dst_attr],
+            )
+
+    def diff(self, other):
+        """Return the connections that differ from those of another snapshot.
+
+        The time taken grows linearly with the number of connections and
+        names of both snapshots.
+
+        Args:
+            other (ConnectionSnapshot): The later snapshot.
+
+        Returns:
+            ConnectionDiff: The sorted (source, destination) plugs of the
+                connections that are only in the other snapshot (added), and
+                of those that are only in this snapshot (removed).
+        """
+
+        numpy = maya_fn._compat.numpy()
+
+        nodes, node_map = maya_fn._util.merge_table(self._nodes, other._nodes)
+        attrs, attr_map = maya_fn._util.merge_table(self._attrs, other._attrs)
+        size = max(len(attrs), 1)
+
+        def keys(edges, node_ids, attr_ids):
+            edges = numpy.asarray(edges, dtype=numpy.int64)
+            src = node_ids[edges[:, 0]] * size + attr_ids[edges[:, 1]]
+            dst = node_ids[edges[:, 2]] * size + attr_ids[edges[:, 3]]
+
+            return set(zip(src.tolist(), dst.tolist()))
+
+        before = keys(
+            self._edges,
+            numpy.arange(len(self._nodes)),
+            numpy.arange(len(self._attrs)),
+        )
+        after = keys(other._edges, node_map, attr_map)
+
+        def names(pairs):
+            return sorted(
+                (
+                    nodes[src // size] + "." + attrs[src % size],
+                    nodes[dst // size] + "." + attrs[dst % size],
+                )
+                for src, dst in pairs
+            )
+
+        return ConnectionDiff(names(after - before), names(before - after))
+
+    @classmethod
+    def load(cls, path):
+        """Return the snapshot saved to the given file.
+
+        The connections are mapped from the file rather than read into memory.
+
+        Args:
+            path (str): Path of a file written by `save`.
+
+        Returns:
+            ConnectionSnapshot
+
+        Raises:
+            ValueError: If the file is not a connection snapshot.
+        """
+
+        numpy = maya_fn._compat.numpy()
+
+        with open(path, "rb") as stream:
+            header = stream.read(_SNAPSHOT_HEADER.size)
+
+            if len(header) == _SNAPSHOT_HEADER.size:
+                magic, version, node_count, _, edge_count, size = (
+                    _SNAPSHOT_HEADER.unpack(header)
+                )
+            else:
+                magic = version = None
+
+            if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+                raise ValueError("'{}' is not a connection snapshot.".format(path))
+
+            strings = stream.read(size)
+
+        if six.PY3:
+            # Python 2 only interns byte strings; keep the names as bytes there.
+            strings = strings.decode("utf-8")
+
+        names = [six.moves.intern(name) for name in strings.split("\n")] if size else []
+        offset = _SNAPSHOT_HEADER.size + size + _padding(size)
+
+        if edge_count:
+            edges = numpy.memmap(
+                path, dtype="<i4", mode="r", offset=offset, shape=(edge_count, 4)
+            )
+        else:
+            edges = numpy.zeros((0, 4), dtype=numpy.int32)
+
+        return cls(names[:node_count], names[node_count:], edges)
+
+    def save(self, path):
+        """Write the snapshot to the given file.
+
+        Args:
+            path (str): Path of the file to write.
+        """
+
+        numpy = maya_fn._compat.numpy()
+
+        strings = "\n".join(list(self._nodes) + list(self._attrs)).encode("utf-8")
+        header = _SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC,
+            _SNAPSHOT_VERSION,
+            len(self._nodes),
+            len(self._attrs),
+            len(self._edges),
+            len(strings),
+        )
+
+        with open(path, "wb") as stream:
+            stream.write(header)
+            stream.write(strings)
+            stream.write(b"\0" * _padding(len(strings)))
+            stream.write(numpy.ascontiguousarray(self._edges, dtype="<i4").tobytes())
+
+
 def _connect_attr(node, attr, value):
     """Connect the given output attribute.
 
@@ -44,7 +383,9 @@ def _connect_attr(node, attr, value):
         value (Any): Destination plug(s).
     """
 
-    if not cmds.attributeQuery(attr, node=node, exists=True):
+    info = maya_fn.schema.get(node, attr)
+
+    if info is None:
         return
 
     plug = maya_fn.plug(node, attr)
@@ -53,19 +394,12 @@ def _connect_attr(node, attr, value):
         for k, v in value.items():
             _connect_attr(node, maya_fn.plug(attr, k), v)
     elif isinstance(value, (list, tuple)):
-        (num_attrs,) = cmds.attributeQuery(attr, node=node, numberOfChildren=True) or [
-            0
-        ]
-        num_items = len(value)
-
-        if num_items == num_attrs:
-            children = cmds.attributeQuery(attr, node=node, listChildren=True)
-
-            for child, val in zip(children, value):
+        if len(value) == len(info.children):
+            for child, val in zip(info.children, value):
                 _connect_attr(node, child, val)
             return
 
-        if cmds.attributeQuery(attr, node=node, multi=True):
+        if info.multi:
             for i, v in enumerate(value):
                 _connect_attr(node, maya_fn.plug(attr, i), v)
             return
@@ -77,6 +411,8 @@ def _connect_attr(node, attr, value):
             cmds.connectAttr(plug, value)
         else:
             raise RuntimeError((node, attr, value))
+    elif isinstance(value, maya_fn.objects.Plug):
+        cmds.connectAttr(plug, str(value))
     else:
         raise RuntimeError((node, attr, value))
 
@@ -90,7 +426,9 @@ def _set_or_connect_attr(node, attr, value):
         value (Any): Source plug(s) or value(s)
     """
 
-    if not cmds.attributeQuery(attr, node=node, exists=True):
+    info = maya_fn.schema.get(node, attr)
+
+    if info is None:
         return
 
     plug = maya_fn.plug(node, attr)
@@ -99,23 +437,16 @@ def _set_or_connect_attr(node, attr, value):
         for k, v in value.items():
             _set_or_connect_attr(node, maya_fn.plug(attr, k), v)
     elif isinstance(value, (list, tuple)):
-        if cmds.getAttr(plug, type=True) == "matrix" and len(value) == 16:
+        if info.data_type == "matrix" and len(value) == 16:
             cmds.setAttr(plug, value, type="matrix")
             return
 
-        num_items = len(value)
-        (num_attrs,) = cmds.attributeQuery(attr, node=node, numberOfChildren=True) or [
-            0
-        ]
-
-        if num_items == num_attrs:
-            children = cmds.attributeQuery(attr, node=node, listChildren=True)
-
-            for child, val in zip(children, value):
+        if len(value) == len(info.children):
+            for child, val in zip(info.children, value):
                 _set_or_connect_attr(node, child, val)
             return
 
-        if cmds.attributeQuery(attr, node=node, multi=True):
+        if info.multi:
             for i, v in enumerate(value):
                 _set_or_connect_attr(node, maya_fn.plug(attr, i), v)
             return
@@ -124,9 +455,193 @@ def _set_or_connect_attr(node, attr, value):
     elif isinstance(value, six.string_types):
         if cmds.objExists(value):
             cmds.connectAttr(value, plug)
-        elif cmds.getAttr(plug, type=True) == "string":
+        elif info.data_type == "string":
             cmds.setAttr(plug, value, type="string")
         else:
             raise RuntimeError((node, attr, value))
+    elif isinstance(value, maya_fn.objects.Plug):
+        cmds.connectAttr(str(value), plug)
     else:
         cmds.setAttr(plug, value)
+
+
+def _create_node(modifier, node_type, name):
+    """Queue the creation of a node, and return it."""
+
+    inherited = maya_fn._util.inherited(node_type)
+
+    if "shape" in inherited:
+        node = modifier.createNode(node_type, modifier.createNode("transform"))
+    elif "dagNode" in inherited:
+        node = modifier.createNode(node_type)
+    else:
+        node = OpenMaya.MDGModifier.createNode(modifier, node_type)
+
+    if name:
+        modifier.renameNode(node, name)
+
+    return node
+
+
+def _find_batch_plug(created, value):
+    """Return the plug named by the given value, or None.
+
+    The node of the plug may be in the scene, or one of the created nodes.
+    """
+
+    node, _, attr = value.partition(".")
+
+    if node in created and attr:
+        return maya_fn.api.find_plug(created[node], attr)
+
+    (plug,) = maya_fn.api.get_plugs([value], missing=maya_fn.api.NONE)
+
+    return plug
+
+
+def _node_name(node):
+    """Return the name of the given node; a partial path for DAG nodes."""
+
+    if node.hasFn(OpenMaya.MFn.kDagNode):
+        return OpenMaya.MFnDagNode(node).partialPathName()
+    else:
+        return OpenMaya.MFnDependencyNode(node).name()
+
+
+def _queue_attrs(modifier, created, node, kwargs):
+    """Queue the values and connections of the given `create` kwargs."""
+
+    for attr, value in kwargs.items():
+        info = maya_fn.schema.get(node, attr)
+
+        if info is None:
+            continue
+
+        if info.writable:
+            _queue_set_or_connect_attr(modifier, created, node, attr, value)
+        else:
+            _queue_connect_attr(modifier, created, node, attr, value)
+
+
+def _queue_connect_attr(modifier, created, node, attr, value):
+    """Queue the connections of the given output attribute.
+
+    Args:
+        modifier (maya.api.OpenMaya.MDGModifier): Modifier to queue edits on.
+        created (dict[str, maya.api.OpenMaya.MObject]): Nodes of the batch.
+        node (maya.api.OpenMaya.MObject): A DG node.
+        attr (str): Attribute to connect.
+        value (Any): Destination plug(s).
+    """
+
+    info = maya_fn.schema.get(node, attr)
+
+    if info is None:
+        return
+
+    plug = maya_fn.api.find_plug(node, attr)
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _queue_connect_attr(modifier, created, node, maya_fn.plug(attr, k), v)
+    elif isinstance(value, (list, tuple)):
+        if len(value) == len(info.children):
+            for child, v in zip(info.children, value):
+                _queue_connect_attr(
+                    modifier, created, node, maya_fn.plug(attr, child), v
+                )
+            return
+
+        if info.multi:
+            for i, v in enumerate(value):
+                _queue_connect_attr(modifier, created, node, maya_fn.plug(attr, i), v)
+            return
+
+        for v in value:
+            _queue_connect_attr(modifier, created, node, attr, v)
+    elif isinstance(value, six.string_types):
+        destination = _find_batch_plug(created, value)
+
+        if destination is None:
+            raise RuntimeError((_node_name(node), attr, value))
+
+        modifier.connect(plug, destination)
+    elif isinstance(value, maya_fn.objects.Plug):
+        modifier.connect(plug, value.mplug)
+    else:
+        raise RuntimeError((_node_name(node), attr, value))
+
+
+def _queue_set_or_connect_attr(modifier, created, node, attr, value):
+    """Queue the value or connection of the given input attribute.
+
+    Args:
+        modifier (maya.api.OpenMaya.MDGModifier): Modifier to queue edits on.
+        created (dict[str, maya.api.OpenMaya.MObject]): Nodes of the batch.
+        node (maya.api.OpenMaya.MObject): A DG node.
+        attr (str): Attribute to set or connect.
+        value (Any): Source plug(s) or value(s)
+    """
+
+    info = maya_fn.schema.get(node, attr)
+
+    if info is None:
+        return
+
+    plug = maya_fn.api.find_plug(node, attr)
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _queue_set_or_connect_attr(
+                modifier, created, node, maya_fn.plug(attr, k), v
+            )
+    elif isinstance(value, (list, tuple)):
+        if info.data_type == "matrix" and len(value) == 16:
+            maya_fn._modifier.set_value(modifier, plug, value)
+            return
+
+        if len(value) == len(info.children):
+            for child, v in zip(info.children, value):
+                _queue_set_or_connect_attr(
+                    modifier, created, node, maya_fn.plug(attr, child), v
+                )
+            return
+
+        if info.multi:
+            for i, v in enumerate(value):
+                _queue_set_or_connect_attr(
+                    modifier, created, node, maya_fn.plug(attr, i), v
+                )
+            return
+
+        raise RuntimeError((_node_name(node), attr, value))
+    elif isinstance(value, six.string_types):
+        source = _find_batch_plug(created, value)
+
+        if source is not None:
+            modifier.connect(source, plug)
+        elif info.data_type == "string":
+            maya_fn._modifier.set_value(modifier, plug, value)
+        else:
+            raise RuntimeError((_node_name(node), attr, value))
+    elif isinstance(value, maya_fn.objects.Plug):
+        modifier.connect(value.mplug, plug)
+    else:
+        maya_fn._modifier.set_value(modifier, plug, value)
+
+
+def _padding(size):
+    """Return the bytes that align the connections after the strings of a file."""
+
+    return -(_SNAPSHOT_HEADER.size + size) % 8
+
+
+def _spec(spec):
+    """Return the (node_type, name, kwargs) of the given node spec."""
+
+    if isinstance(spec, six.string_types):
+        spec = (spec,)
+
+    node_type, name, kwargs = (tuple(spec) + (None, None))[:3]
+
+    return node_type, name, kwargs or {}
@@ -0,0 +1,60 @@
+"""In-memory fake of the parts of Maya that maya_fn uses.
+
+Set the ``MAYA_FN_BACKEND`` environment variable to ``fake`` before importing
+maya_fn to run it, its tests and its benchmarks on a plain Python, without
+Maya. `install` makes ``maya.cmds``, ``maya.api.OpenMaya`` and
+``maya.standalone`` import the fake modules.
+
+Only the commands, classes and node types that maya_fn relies on are
+modelled, and there is no evaluation beyond the matrices of transforms and a
+few utility nodes. The scene is indexed by name, type, parent and
+connection, so that synthetic scenes of a million nodes stay usable for
+scaling benchmarks.
+"""
+
+import sys
+import types
+
+from maya_fn.fake import cmds
+from maya_fn.fake import nodetypes
+from maya_fn.fake import openmaya
+from maya_fn.fake import scene  # noqa
+from maya_fn.fake import standalone
+
+BACKEND_VARIABLE = "MAYA_FN_BACKEND"
+
+
+def install():
+    """Make the maya package import the fake modules, and start a new scene.
+
+    Does nothing if a maya package is already installed by this function.
+    """
+
+    maya = sys.modules.get("maya")
+
+    if getattr(maya, "__fake__", False):
+        return
+
+    maya = types.ModuleType("maya")
+    maya.__fake__ = True
+    maya.__path__ = []
+
+    api = types.ModuleType("maya.api")
+    api.__path__ = []
+
+    maya.api = api
+    maya.cmds = cmds
+    maya.standalone = standalone
+    api.OpenMaya = openmaya
+
+    sys.modules.update(
+        {
+            "maya": maya,
+            "maya.api": api,
+            "maya.api.OpenMaya": openmaya,
+            "maya.cmds": cmds,
+            "maya.standalone": standalone,
+        }
+    )
+
+    nodetypes.new_scene()
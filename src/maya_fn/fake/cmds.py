@@ -0,0 +1,1248 @@
+"""Stand-in for the subset of maya.cmds that maya_fn uses.
+
+Commands take the same arguments and flags as in Maya, including the short
+flag names, and raise the same error types. Every edit is recorded as one
+entry of the undo queue of the current scene.
+"""
+
+from __future__ import print_function
+
+import functools
+import os
+
+import six
+
+from maya_fn.fake import matrix
+from maya_fn.fake import nodetypes
+from maya_fn.fake import openmaya
+from maya_fn.fake import scene
+
+# Unit type -> MAngle, MDistance or MTime class to convert values with.
+_UNITS = {
+    "kAngle": openmaya.MAngle,
+    "kDistance": openmaya.MDistance,
+    "kTime": openmaya.MTime,
+}
+
+_INT_TYPES = {"kByte", "kChar", "kShort", "kInt", "kInt64", "kAddr"}
+
+# addAttr -attributeType and -dataType -> (kind, type) of the new attribute.
+_ADD_ATTR_TYPES = dict(
+    [(name, (scene.NUMERIC, key)) for key, name in scene.NUMERIC_TYPE_NAMES.items()]
+    + [(name, (scene.UNIT, key)) for key, name in scene.UNIT_TYPE_NAMES.items()]
+    + [
+        ("enum", (scene.ENUM, None)),
+        ("message", (scene.MESSAGE, None)),
+        ("compound", (scene.COMPOUND, None)),
+        ("matrix", (scene.MATRIX, None)),
+        ("fltMatrix", (scene.MATRIX, None)),
+    ]
+)
+_ADD_DATA_TYPES = dict((name, key) for key, name in scene.TYPED_TYPE_NAMES.items())
+
+# Loaded plugin path -> module namespace; registered command name -> plugin.
+_plugins = {}
+_commands = {}
+
+
+def _flags(**short_names):
+    """Accept the given short flag names as aliases of the long flag names."""
+
+    def wrapper(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            for short_name, long_name in short_names.items():
+                if short_name in kwargs:
+                    kwargs[long_name] = kwargs.pop(short_name)
+
+            return func(*args, **kwargs)
+
+        return wrapped
+
+    return wrapper
+
+
+def _scene():
+    """Return the current scene."""
+
+    return scene.current
+
+
+def _names(args):
+    """Return the names of the given arguments, which may be lists of names."""
+
+    names = []
+
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            names.extend(six.text_type(each) for each in arg)
+        else:
+            names.append(six.text_type(arg))
+
+    return names
+
+
+def _get_node(name):
+    """Return the only node of the given name.
+
+    Raises:
+        ValueError: If no node, or more than one node, matches the name.
+    """
+
+    nodes = _scene().find(name)
+
+    if not nodes:
+        raise ValueError("No object matches name: {}".format(name))
+
+    if len(nodes) > 1:
+        raise ValueError("More than one object matches name: {}".format(name))
+
+    return nodes[0]
+
+
+def _get_plug(name):
+    """Return the (node, path) of the only plug of the given name.
+
+    Raises:
+        ValueError: If no plug, or more than one plug, matches the name.
+    """
+
+    plugs = _scene().find_plug(name)
+
+    if not plugs:
+        raise ValueError("No object matches name: {}".format(name))
+
+    if len(plugs) > 1:
+        raise ValueError("More than one object matches name: {}".format(name))
+
+    return plugs[0]
+
+
+def _node_name(node, long=False):
+    """Return the full or partial path of the given node."""
+
+    current = _scene()
+
+    return current.full_path(node) if long else current.partial_path(node)
+
+
+def _plug_name(plug, long=False):
+    """Return the name of the given (node, path) plug, with long attribute names."""
+
+    return _scene().plug_name(*plug, full_path=long)
+
+
+def _to_ui(attribute, value):
+    """Return the given value of the attribute in the units of maya.cmds."""
+
+    if attribute.kind == scene.MATRIX or attribute.data_type == "kMatrix":
+        return None if value is None else list(value)
+
+    if attribute.kind == scene.UNIT:
+        unit = _UNITS[attribute.unit_type]
+        return unit(value, unit.internalUnit()).asUnits(unit.uiUnit())
+
+    if attribute.numeric_type == "kBoolean":
+        return bool(value)
+
+    if attribute.numeric_type in _INT_TYPES or attribute.kind == scene.ENUM:
+        return int(value)
+
+    return value
+
+
+def _from_ui(attribute, value):
+    """Return the given value of the attribute in internal units."""
+
+    if attribute.kind == scene.MATRIX or attribute.data_type == "kMatrix":
+        return tuple(float(each) for each in value)
+
+    if attribute.kind == scene.UNIT:
+        unit = _UNITS[attribute.unit_type]
+        return unit(value, unit.uiUnit()).asUnits(unit.internalUnit())
+
+    if attribute.numeric_type == "kBoolean":
+        return bool(value)
+
+    if attribute.numeric_type in _INT_TYPES or attribute.kind == scene.ENUM:
+        return int(value)
+
+    if attribute.kind == scene.NUMERIC:
+        return float(value)
+
+    return value
+
+
+def _ui_value(node, path):
+    """Return the value of the given plug, as returned by getAttr."""
+
+    attribute, index = path[-1]
+    current = _scene()
+
+    if attribute.array and index is None:
+        return [
+            _ui_value(node, path[:-1] + ((attribute, each),))
+            for each in current.indices(node, path)
+        ]
+
+    if attribute.children:
+        return [
+            tuple(
+                _ui_value(node, path + ((child, None),)) for child in attribute.children
+            )
+        ]
+
+    return _to_ui(attribute, current.get_value(node, path))
+
+
+def _check_writable(plug):
+    """Raise a RuntimeError if the given plug cannot be set.
+
+    A plug cannot be set if its attribute is not writable, or if it, or its
+    compound parent, is locked or connected.
+    """
+
+    node, path = plug
+
+    if not path[-1][0].writable:
+        raise RuntimeError(
+            "setAttr: The attribute '{}' is not writable.".format(_plug_name(plug))
+        )
+
+    current = _scene()
+
+    if current.is_locked(node, path) or current.source_of(node, path) is not None:
+        raise RuntimeError(
+            "setAttr: The attribute '{}' is locked or connected and cannot be "
+            "modified.".format(_plug_name(plug))
+        )
+
+
+# Nodes
+
+
+def createNode(node_type, name=None, parent=None, skipSelect=False, **kwargs):
+    """Create a node, and return its name.
+
+    A shape created without a parent gets a new transform, named after the
+    node type.
+
+    Raises:
+        RuntimeError: If the node type does not exist.
+    """
+
+    name = kwargs.pop("n", name)
+    parent = kwargs.pop("p", parent)
+    current = _scene()
+
+    parent_node = _get_node(parent) if parent else None
+    node_type_obj = current.node_types.get(node_type)
+
+    with current.command():
+        if parent_node is None and node_type_obj is not None and node_type_obj.is_shape:
+            transform = nodetypes.create_node(current, "transform", node_type + "#")
+            parent_node = current.add_node(transform)
+
+        node = nodetypes.create_node(current, node_type, name, parent_node)
+
+        if parent_node is not None and not node.type.is_dag:
+            raise RuntimeError("createNode: Only DAG nodes can have a parent.")
+
+        current.add_node(node, parent_node)
+
+    return current.partial_path(node)
+
+
+@_flags(f="force", i="ignoreHierarchy", hi="hierarchy")
+def delete(*args, **kwargs):
+    """Delete the given nodes, with their DAG descendents.
+
+    Raises:
+        ValueError: If nothing matches the given names.
+    """
+
+    current = _scene()
+    nodes = []
+
+    for name in _names(args):
+        found = current.find(name)
+
+        if not found:
+            raise ValueError("No object matches name: {}".format(name))
+
+        nodes.extend(found)
+
+    with current.command():
+        for node in nodes:
+            if node.alive:
+                current.delete(node)
+
+
+@_flags(rr="returnRootsOnly", po="parentOnly", n="name")
+def duplicate(*args, **kwargs):
+    """Duplicate the given nodes, with their values and DAG descendents.
+
+    The new top-level nodes get a new number; their descendents keep their
+    names. Connections are not duplicated.
+
+    Returns:
+        list[str]: The new nodes, top-level nodes first.
+    """
+
+    current = _scene()
+    names = _names(args)
+    roots_only = kwargs.get("returnRootsOnly", False)
+    result = []
+
+    with current.command():
+        for name in names:
+            node = _get_node(name)
+            parent = node.parent if node.type.is_dag else None
+            new_name = kwargs.get("name") or node.name
+            copies = _duplicate(current, node, parent, new_name, top=True)
+
+            result.append(current.partial_path(copies[0]))
+
+            if not roots_only:
+                result.extend(current.partial_path(each) for each in copies[1:])
+
+    return result
+
+
+def _duplicate(current, node, parent, name, top=False):
+    """Add a copy of the given node and its descendents, and return the copies."""
+
+    if top:
+        name = current.unique_name(name, node.type.is_dag, parent)
+
+    copy = current.add_node(scene.Node(node.type, name), parent)
+    attributes = {}
+
+    for attribute in node.dynamic:
+        clone = _copy_attribute(attribute, attributes)
+        current.add_attribute(copy, clone)
+
+    for path, value in node.values.items():
+        new_path = tuple((attributes.get(each, each), index) for each, index in path)
+        current.set_value(copy, new_path, value)
+
+    copies = [copy]
+
+    for child in list(node.children):
+        copies.extend(_duplicate(current, child, copy, child.name))
+
+    return copies
+
+
+def _copy_attribute(attribute, copies):
+    """Return a copy of the given attribute, and record it in copies."""
+
+    clone = scene.Attribute(
+        attribute.long_name,
+        attribute.short_name,
+        attribute.kind,
+        numeric_type=attribute.numeric_type,
+        unit_type=attribute.unit_type,
+        data_type=attribute.data_type,
+        array=attribute.array,
+        readable=attribute.readable,
+        writable=attribute.writable,
+        keyable=attribute.keyable,
+        default=attribute.default,
+        children=[_copy_attribute(child, copies) for child in attribute.children],
+        enum_names=list(attribute.enum_names or []) or None,
+    )
+    copies[attribute] = clone
+
+    return clone
+
+
+@_flags(t="type", et="exactType", l="long", assemblies="assemblies")
+def ls(*args, **kwargs):
+    """Return the names of the given nodes and plugs, or of every node.
+
+    Names that do not match anything are skipped.
+
+    Args:
+        *args: Names, patterns or lists of names.
+        type (str | list[str]): Only return nodes of these types or subtypes.
+        exactType (str | list[str]): Only return nodes of these exact types.
+        long (bool): Return full paths.
+        assemblies (bool): Only return the top-level DAG nodes.
+        dag (bool): Only return DAG nodes.
+
+    Returns:
+        list[str]
+    """
+
+    current = _scene()
+    long = kwargs.get("long", False)
+    types = kwargs.get("type")
+    exact_types = kwargs.get("exactType")
+
+    if isinstance(types, six.string_types):
+        types = [types]
+
+    if isinstance(exact_types, six.string_types):
+        exact_types = [exact_types]
+
+    names = _names(args)
+
+    if names:
+        items = []
+
+        for name in names:
+            if "." in name:
+                items.extend(current.find_plug(name))
+            else:
+                items.extend((node, None) for node in current.find(name))
+    elif kwargs.get("assemblies"):
+        items = [(node, None) for node in current.world.children]
+    elif types and not exact_types:
+        nodes = set()
+
+        for each in types:
+            nodes.update(current.nodes_of_type(each))
+
+        items = [(node, None) for node in sorted(nodes, key=lambda node: node.id)]
+    else:
+        items = [(node, None) for node in current.nodes.values()]
+
+    result = []
+    seen = set()
+
+    for node, path in items:
+        key = (node.id, path)
+
+        if key in seen:
+            continue
+
+        seen.add(key)
+
+        if types and not any(each in node.type.inherited for each in types):
+            continue
+
+        if exact_types and node.type.name not in exact_types:
+            continue
+
+        if kwargs.get("dag") and not node.type.is_dag:
+            continue
+
+        if kwargs.get("assemblies") and node.parent is not current.world:
+            continue
+
+        if path is None:
+            result.append(_node_name(node, long))
+        else:
+            result.append(_plug_name((node, path), long))
+
+    return result
+
+
+@_flags(
+    c="children",
+    p="parent",
+    s="shapes",
+    ad="allDescendents",
+    typ="type",
+    f="fullPath",
+)
+def listRelatives(*args, **kwargs):
+    """Return the children, parents or descendents of the given DAG nodes.
+
+    Returns:
+        list[str] | None: None if there are no relatives.
+    """
+
+    types = kwargs.get("type")
+
+    if isinstance(types, six.string_types):
+        types = [types]
+
+    relatives = []
+
+    for name in _names(args):
+        node = _get_node(name)
+
+        if kwargs.get("parent"):
+            if node.parent is not None and node.parent.parent is not None:
+                relatives.append(node.parent)
+        elif kwargs.get("allDescendents"):
+            stack = list(reversed(node.children))
+
+            while stack:
+                each = stack.pop()
+                relatives.append(each)
+                stack.extend(reversed(each.children))
+
+            # Maya lists descendents deepest first.
+            relatives.reverse()
+        else:
+            relatives.extend(node.children)
+
+    if kwargs.get("shapes"):
+        relatives = [node for node in relatives if node.type.is_shape]
+
+    if types:
+        relatives = [
+            node
+            for node in relatives
+            if any(each in node.type.inherited for each in types)
+        ]
+
+    if not relatives:
+        return None
+
+    return [_node_name(node, kwargs.get("fullPath", False)) for node in relatives]
+
+
+def nodeType(name, isTypeName=False, inherited=False, **kwargs):
+    """Return the type of the given node, or its inherited types.
+
+    Raises:
+        RuntimeError: If isTypeName is True and the type does not exist.
+    """
+
+    inherited = kwargs.pop("i", inherited)
+
+    if isTypeName:
+        type_names = nodetypes.inherited(name)
+    else:
+        type_names = list(_get_node(name).type.inherited)
+
+    return type_names if inherited else type_names[-1]
+
+
+def objExists(name):
+    """Return True if a node, plug or component of the given name exists."""
+
+    current = _scene()
+
+    if "." in name:
+        return bool(current.find_plug(name) or current.find_components(name))
+
+    return bool(current.find(name))
+
+
+@_flags(w="world", r="relative", a="absolute", add="addObject", s="shape")
+def parent(*args, **kwargs):
+    """Move the given DAG nodes under the last node, or under the world.
+
+    Unless relative is True, the nodes keep their world transformation.
+
+    Returns:
+        list[str]: The new names of the nodes.
+
+    Raises:
+        RuntimeError: If a node cannot be moved under the new parent.
+    """
+
+    current = _scene()
+    names = _names(args)
+
+    if kwargs.get("world"):
+        new_parent = current.world
+    else:
+        if len(names) < 2:
+            raise RuntimeError("parent: Not enough objects or values.")
+        new_parent = _get_node(names.pop())
+
+    children = [_get_node(name) for name in names]
+    result = []
+
+    with current.command():
+        for child in children:
+            if child.parent is new_parent:
+                result.append(current.partial_path(child))
+                continue
+
+            openmaya._check_reparent(
+                child, None if new_parent is current.world else new_parent
+            )
+
+            world_matrix = current.get_value(child, child.path("worldMatrix", 0))
+            previous = current.get_value(
+                child.parent, child.parent.path("worldMatrix", 0)
+            )
+
+            if child.parent is current.world:
+                previous = matrix.IDENTITY
+
+            current.reparent(child, new_parent)
+
+            name = current.unique_name(child.name, True, new_parent, child)
+
+            if name != child.name:
+                current.rename(child, name)
+
+            if not kwargs.get("relative") and "transform" in child.type.inherited:
+                _keep_world_matrix(current, child, world_matrix, previous)
+
+            result.append(current.partial_path(child))
+
+    return result
+
+
+def _keep_world_matrix(current, node, world_matrix, previous_parent_matrix):
+    """Set the transformation of the node so that it keeps its world matrix."""
+
+    parent_matrix = current.get_value(node, node.path("parentMatrix", 0))
+
+    if tuple(parent_matrix) == tuple(previous_parent_matrix):
+        return
+
+    local = matrix.multiply(world_matrix, matrix.inverse(parent_matrix))
+    translate, rotate, scale = matrix.decompose(local)
+
+    for name, value in (("translate", translate), ("rotate", rotate), ("scale", scale)):
+        if current.source_of(node, node.path(name)) is None:
+            current.set_value(node, node.path(name), value)
+
+
+def rename(*args, **kwargs):
+    """Rename a node, and return its new name.
+
+    The new name gets a number if a sibling already has it.
+    """
+
+    current = _scene()
+
+    if len(args) == 1:
+        raise RuntimeError("rename: The selection is not supported.")
+
+    old_name, new_name = args
+    node = _get_node(old_name)
+
+    if not new_name or "|" in new_name:
+        raise RuntimeError("rename: New name is not valid: '{}'".format(new_name))
+
+    parent_node = node.parent if node.type.is_dag else None
+
+    with current.command():
+        current.rename(
+            node, current.unique_name(new_name, node.type.is_dag, parent_node, node)
+        )
+
+    return current.partial_path(node)
+
+
+# Attributes
+
+
+@_flags(
+    ln="longName",
+    sn="shortName",
+    at="attributeType",
+    dt="dataType",
+    m="multi",
+    p="parent",
+    nc="numberOfChildren",
+    dv="defaultValue",
+    k="keyable",
+    en="enumName",
+)
+def addAttr(*args, **kwargs):
+    """Add a dynamic attribute to the given nodes.
+
+    Children of compound attributes are added with the parent flag.
+
+    Raises:
+        RuntimeError: If the node already has an attribute of the same name,
+            or the parent is not a dynamic compound.
+    """
+
+    current = _scene()
+    long_name = kwargs.get("longName") or kwargs.get("shortName")
+    short_name = kwargs.get("shortName") or long_name
+
+    if not long_name:
+        raise RuntimeError("addAttr: A long name is required.")
+
+    if "dataType" in kwargs:
+        kind = scene.TYPED
+        type_key = _ADD_DATA_TYPES.get(kwargs["dataType"])
+    else:
+        kind, type_key = _ADD_ATTR_TYPES.get(
+            kwargs.get("attributeType", "double"), (None, None)
+        )
+
+    if kind is None or (kind == scene.TYPED and type_key is None):
+        raise RuntimeError("addAttr: Unknown attribute type.")
+
+    with current.command():
+        for name in _names(args):
+            node = _get_node(name)
+
+            if node.attribute(long_name) or node.attribute(short_name):
+                raise RuntimeError(
+                    "Found attribute name conflict: '{}.{}'".format(
+                        node.name, long_name
+                    )
+                )
+
+            parent = None
+
+            if kwargs.get("parent"):
+                parent = node.attribute(kwargs["parent"])
+
+                if parent is None or not parent.dynamic:
+                    raise RuntimeError(
+                        "addAttr: Parent attribute '{}' does not exist.".format(
+                            kwargs["parent"]
+                        )
+                    )
+
+            attribute = scene.Attribute(
+                long_name,
+                short_name,
+                kind,
+                numeric_type=type_key if kind == scene.NUMERIC else None,
+                unit_type=type_key if kind == scene.UNIT else None,
+                data_type=type_key if kind == scene.TYPED else None,
+                array=bool(kwargs.get("multi")),
+                keyable=bool(kwargs.get("keyable")),
+                enum_names=(
+                    _enum_names(kwargs.get("enumName")) if kind == scene.ENUM else None
+                ),
+            )
+
+            if kind == scene.MATRIX:
+                attribute.default = matrix.IDENTITY
+            elif kind in (scene.NUMERIC, scene.UNIT, scene.ENUM):
+                attribute.default = _from_ui(attribute, kwargs.get("defaultValue", 0))
+
+            current.add_attribute(node, attribute, parent)
+
+
+def _enum_names(names):
+    """Return the field names of an addAttr -enumName string, by field value."""
+
+    fields = []
+
+    for field in (names or "").split(":"):
+        name, _, value = field.partition("=")
+
+        if value:
+            while len(fields) < int(value):
+                fields.append("")
+        fields.append(name)
+
+    return fields
+
+
+@_flags(
+    n="node",
+    ex="exists",
+    ln="longName",
+    sn="shortName",
+    m="multi",
+    lc="listChildren",
+    lp="listParent",
+    at="attributeType",
+    k="keyable",
+    w="writable",
+    r="readable",
+)
+def attributeQuery(name, **kwargs):
+    """Return a property of the attribute of the given name, on the given node.
+
+    Raises:
+        RuntimeError: If the attribute does not exist, unless exists is True.
+    """
+
+    node = _get_node(kwargs["node"])
+    attribute = node.attribute(name)
+
+    if kwargs.get("exists"):
+        return attribute is not None
+
+    if attribute is None:
+        raise RuntimeError(
+            "attributeQuery: Node '{}' does not have attribute '{}'.".format(
+                node.name, name
+            )
+        )
+
+    if kwargs.get("longName"):
+        return attribute.long_name
+    if kwargs.get("shortName"):
+        return attribute.short_name
+    if kwargs.get("multi"):
+        return attribute.array
+    if kwargs.get("keyable"):
+        return attribute.keyable
+    if kwargs.get("writable"):
+        return attribute.writable
+    if kwargs.get("readable"):
+        return attribute.readable
+    if kwargs.get("listChildren"):
+        return [child.long_name for child in attribute.children] or None
+    if kwargs.get("listParent"):
+        return [attribute.parent.long_name] if attribute.parent else None
+    if kwargs.get("attributeType"):
+        return attribute.type_name
+
+    raise RuntimeError("attributeQuery: No query flag was given.")
+
+
+@_flags(at="attribute")
+def deleteAttr(*args, **kwargs):
+    """Remove a dynamic attribute, by plug name or by node and attribute flag.
+
+    Raises:
+        RuntimeError: If the attribute is not a dynamic attribute.
+    """
+
+    current = _scene()
+    (name,) = _names(args)
+
+    if "attribute" in kwargs:
+        name = "{}.{}".format(name, kwargs["attribute"])
+
+    node, path = _get_plug(name)
+    attribute = path[-1][0]
+
+    if not attribute.dynamic:
+        raise RuntimeError(
+            "deleteAttr: Attribute '{}' is not a dynamic attribute.".format(name)
+        )
+
+    with current.command():
+        current.remove_attribute(node, attribute)
+
+
+@_flags(typ="type", s="size", l="lock")
+def getAttr(name, **kwargs):
+    """Return the value of a plug, in the units of maya.cmds.
+
+    Compounds return a list holding a tuple of their children, matrices a list
+    of 16 floats.
+
+    Raises:
+        ValueError: If the plug does not exist.
+    """
+
+    current = _scene()
+    node, path = _get_plug(name)
+    attribute = path[-1][0]
+
+    if kwargs.get("type"):
+        return attribute.type_name
+
+    if kwargs.get("lock"):
+        return current.is_locked(node, path)
+
+    if kwargs.get("size"):
+        if attribute.array and path[-1][1] is None:
+            return len(current.indices(node, path))
+        return 1
+
+    return _ui_value(node, path)
+
+
+@_flags(typ="type", c="clamp", l="lock")
+def setAttr(name, *values, **kwargs):
+    """Set the value of a plug, in the units of maya.cmds, or lock it.
+
+    Raises:
+        RuntimeError: If the plug is not writable, or is locked or connected.
+        ValueError: If the plug does not exist.
+    """
+
+    current = _scene()
+    node, path = _get_plug(name)
+    attribute = path[-1][0]
+
+    lock = kwargs.get("lock")
+
+    if not values:
+        if lock is not None:
+            with current.command():
+                current.set_locked(node, path, bool(lock))
+        return
+
+    if lock is not None and not lock:
+        # Unlock before setting the value, and lock after.
+        with current.command():
+            current.set_locked(node, path, False)
+
+    _check_writable((node, path))
+
+    flat = []
+
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            flat.extend(value)
+        else:
+            flat.append(value)
+
+    if attribute.kind == scene.MATRIX or attribute.data_type == "kMatrix":
+        value = _from_ui(attribute, flat)
+    elif attribute.children:
+        if len(flat) != len(attribute.children):
+            raise RuntimeError("setAttr: Wrong number of values for '{}'.".format(name))
+        value = tuple(
+            _from_ui(child, each) for child, each in zip(attribute.children, flat)
+        )
+    elif len(flat) != 1:
+        raise RuntimeError("setAttr: Wrong number of values for '{}'.".format(name))
+    else:
+        value = _from_ui(attribute, flat[0])
+
+    with current.command():
+        current.set_value(node, path, value)
+
+        if lock:
+            current.set_locked(node, path, True)
+
+
+# Connections
+
+
+@_flags(f="force", na="nextAvailable")
+def connectAttr(source, destination, force=False, nextAvailable=False, **kwargs):
+    """Connect a source plug to a destination plug.
+
+    Raises:
+        RuntimeError: If the destination is connected and force is False, or
+            cannot be connected.
+        ValueError: If a plug does not exist.
+    """
+
+    current = _scene()
+    source_plug = _get_plug(source)
+    node, path = _get_plug(destination)
+
+    attribute, index = path[-1]
+
+    if nextAvailable and attribute.array and index is None:
+        indices = current.indices(node, path)
+        path = path[:-1] + ((attribute, _next_index(indices, node, path)),)
+
+    if not attribute.writable:
+        raise RuntimeError(
+            "connectAttr: The destination attribute '{}' cannot be connected.".format(
+                destination
+            )
+        )
+
+    if source_plug == (node, path):
+        raise RuntimeError("connectAttr: A plug cannot be connected to itself.")
+
+    existing = node.inputs.get(path)
+
+    with current.command():
+        if existing is not None:
+            if existing == source_plug:
+                raise RuntimeError(
+                    "connectAttr: '{}' is already connected to '{}'.".format(
+                        source, destination
+                    )
+                )
+
+            if not force:
+                raise RuntimeError(
+                    "connectAttr: The destination attribute '{}' is already connected "
+                    "to '{}'.".format(destination, _plug_name(existing))
+                )
+
+            current.disconnect(existing, (node, path))
+
+        if _needs_conversion(source_plug[1][-1][0], attribute):
+            conversion = current.add_node(
+                nodetypes.create_node(current, "unitConversion")
+            )
+            current.connect(source_plug, (conversion, conversion.path("input")))
+            source_plug = (conversion, conversion.path("output"))
+
+        current.connect(source_plug, (node, path))
+
+
+def _next_index(indices, node, path):
+    """Return the first index of the array plug that has no input."""
+
+    attribute = path[-1][0]
+
+    for index in range(len(indices) + 1):
+        if (path[:-1] + ((attribute, index),)) not in node.inputs:
+            return index
+
+
+def _needs_conversion(source, destination):
+    """Return True if a unitConversion node goes between the given attributes.
+
+    Only scalar attributes are converted; compounds are connected directly.
+    """
+
+    if source.children or destination.children:
+        return False
+
+    units = {
+        attribute.unit_type if attribute.kind == scene.UNIT else None
+        for attribute in (source, destination)
+    }
+
+    return len(units) > 1 and bool(units.intersection(("kAngle", "kTime")))
+
+
+def disconnectAttr(source, destination, **kwargs):
+    """Break the connection of a source plug to a destination plug.
+
+    Raises:
+        RuntimeError: If the plugs are not connected.
+    """
+
+    current = _scene()
+    source_plug = _get_plug(source)
+    node, path = _get_plug(destination)
+
+    if node.inputs.get(path) != source_plug:
+        raise RuntimeError(
+            "disconnectAttr: '{}' is not connected to '{}'.".format(source, destination)
+        )
+
+    with current.command():
+        current.disconnect(source_plug, (node, path))
+
+
+def isConnected(source, destination, **kwargs):
+    """Return True if the source plug is connected to the destination plug."""
+
+    node, path = _get_plug(destination)
+
+    return node.inputs.get(path) == _get_plug(source)
+
+
+@_flags(
+    s="source",
+    d="destination",
+    p="plugs",
+    c="connections",
+    t="type",
+    sh="shapes",
+)
+def listConnections(*args, **kwargs):
+    """Return the nodes or plugs connected to the given nodes or plugs.
+
+    Returns:
+        list[str] | None: None if there are no connections. With connections,
+            pairs of the given plug and the connected plug.
+    """
+
+    current = _scene()
+    want_sources = kwargs.get("source", True)
+    want_destinations = kwargs.get("destination", True)
+    node_type = kwargs.get("type")
+    result = []
+
+    for name in _names(args):
+        if "." in name:
+            node, path = _get_plug(name)
+            paths = [path]
+        else:
+            node = _get_node(name)
+            paths = None
+
+        pairs = []
+
+        if want_sources:
+            pairs.extend(
+                ((node, each), source)
+                for each, source in node.inputs.items()
+                if paths is None or each in paths
+            )
+
+        if want_destinations:
+            pairs.extend(
+                ((node, each), destination)
+                for each, destinations in node.outputs.items()
+                if paths is None or each in paths
+                for destination in destinations
+            )
+
+        for plug, other in pairs:
+            if node_type and node_type not in other[0].type.inherited:
+                continue
+
+            if kwargs.get("connections"):
+                result.append(_plug_name(plug))
+
+            if kwargs.get("plugs"):
+                result.append(_plug_name(other))
+            else:
+                result.append(current.partial_path(other[0]))
+
+    return result or None
+
+
+# Scene
+
+
+@_flags(
+    n="new",
+    f="force",
+)
+def file(*args, **kwargs):
+    """Start a new scene; the only file operation of the fake backend.
+
+    Raises:
+        RuntimeError: If called without the new flag.
+    """
+
+    if not kwargs.get("new"):
+        raise RuntimeError("file: Only new scenes are supported by the fake backend.")
+
+    scene.notify(scene.BEFORE_NEW)
+    nodetypes.new_scene()
+    scene.notify(scene.AFTER_NEW)
+
+    return "untitled"
+
+
+def flushUndo():
+    """Forget the undo and redo queues."""
+
+    _scene().flush_undo()
+
+
+def redo():
+    """Redo the last undone command."""
+
+    try:
+        _scene().redo()
+    except RuntimeError as error:
+        print("# Warning: {}".format(error))
+
+
+def undo():
+    """Undo the last command."""
+
+    try:
+        _scene().undo()
+    except RuntimeError as error:
+        print("# Warning: {}".format(error))
+
+
+@_flags(
+    st="state",
+    q="query",
+    ock="openChunk",
+    cck="closeChunk",
+    cn="chunkName",
+    swf="stateWithoutFlush",
+)
+def undoInfo(**kwargs):
+    """Query or edit the undo queue."""
+
+    current = _scene()
+
+    if kwargs.get("query"):
+        return current.undo_state
+
+    if kwargs.get("openChunk"):
+        current.open_chunk()
+
+    if kwargs.get("closeChunk"):
+        current.close_chunk()
+
+    if "state" in kwargs:
+        current.undo_state = bool(kwargs["state"])
+
+        if not current.undo_state:
+            current.flush_undo()
+
+    if "stateWithoutFlush" in kwargs:
+        current.undo_state = bool(kwargs["stateWithoutFlush"])
+
+
+# Plugins
+
+
+@_flags(q="query", l="loaded")
+def pluginInfo(path, **kwargs):
+    """Return True if the given plugin is loaded."""
+
+    return os.path.normcase(os.path.abspath(path)) in _plugins
+
+
+@_flags(qt="quiet")
+def loadPlugin(path, **kwargs):
+    """Load a Python plugin file, and call its initializePlugin function.
+
+    Returns:
+        list[str]: Name of the plugin.
+    """
+
+    key = os.path.normcase(os.path.abspath(path))
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    if key in _plugins:
+        return [name]
+
+    namespace = {"__name__": "maya_fn_fake_plugin_" + name, "__file__": path}
+
+    with open(path) as stream:
+        code = compile(stream.read(), path, "exec")
+
+    exec(code, namespace)
+
+    _plugins[key] = namespace
+    namespace["initializePlugin"](openmaya._wrap_data(openmaya.MFn.kData, key))
+
+    return [name]
+
+
+@_flags(f="force")
+def unloadPlugin(path, **kwargs):
+    """Call the uninitializePlugin function of a plugin, and unload it."""
+
+    key = os.path.normcase(os.path.abspath(path))
+
+    if key not in _plugins:
+        key = next(
+            (
+                each
+                for each in _plugins
+                if os.path.splitext(os.path.basename(each))[0] == path
+            ),
+            None,
+        )
+
+    if key is None:
+        raise RuntimeError("unloadPlugin: Plugin '{}' is not loaded.".format(path))
+
+    namespace = _plugins.pop(key)
+    namespace["uninitializePlugin"](openmaya._wrap_data(openmaya.MFn.kData, key))
+
+
+def _deregister_command(name):
+    """Remove a plugin command."""
+
+    _commands.pop(name, None)
+    globals().pop(name, None)
+
+
+def _register_command(name, creator, plugin):
+    """Add a plugin command, created by the given function, to this module."""
+
+    def command(*args):
+        current = _scene()
+        instance = creator()
+        edits = []
+
+        try:
+            with current.recording(edits):
+                instance.doIt(openmaya.MArgList(args))
+        except Exception as error:
+            raise RuntimeError(str(error))
+
+        # Edits that the command made outside of its own undoIt are not
+        # undoable, as in Maya.
+        if instance.isUndoable():
+            current.commit([(instance.undoIt, instance.redoIt)])
+
+    command.__name__ = str(name)
+    command.__doc__ = "Plugin command {}.".format(name)
+
+    _commands[name] = plugin
+    globals()[name] = command
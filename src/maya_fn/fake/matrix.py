@@ -0,0 +1,183 @@
+"""4x4 matrix math of the fake Maya backend.
+
+Matrices are tuples of 16 floats in row-major order, and transform row
+vectors, as in Maya.
+"""
+
+import math
+
+IDENTITY = (
+    1.0, 0.0, 0.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    0.0, 0.0, 1.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+)  # fmt: skip
+
+# Rotate order -> order of the axis rotations, matching transform.rotateOrder.
+ROTATE_ORDERS = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+
+
+def compose(translate, rotate, scale, shear=(0.0, 0.0, 0.0), rotate_order=0):
+    """Return the matrix of the given transformation.
+
+    Args:
+        translate (Sequence[float]): Translation.
+        rotate (Sequence[float]): Euler rotation, in radians.
+        scale (Sequence[float]): Scale.
+        shear (Sequence[float]): Shear XY, XZ and YZ.
+        rotate_order (int): Index in ROTATE_ORDERS.
+
+    Returns:
+        tuple[float]
+    """
+
+    sx, sy, sz = scale
+    xy, xz, yz = shear
+
+    matrix = (
+        sx, 0.0, 0.0, 0.0,
+        xy * sy, sy, 0.0, 0.0,
+        xz * sz, yz * sz, sz, 0.0,
+        0.0, 0.0, 0.0, 1.0,
+    )  # fmt: skip
+
+    matrix = multiply(matrix, rotation(rotate, rotate_order))
+
+    return matrix[:12] + (
+        float(translate[0]),
+        float(translate[1]),
+        float(translate[2]),
+        1.0,
+    )
+
+
+def decompose(matrix):
+    """Return the translation, XYZ rotation (radians) and scale of a matrix.
+
+    Shear is ignored.
+
+    Returns:
+        tuple[tuple[float], tuple[float], tuple[float]]
+    """
+
+    rows = [matrix[0:3], matrix[4:7], matrix[8:11]]
+    scale = [math.sqrt(sum(v * v for v in row)) for row in rows]
+
+    if determinant(matrix) < 0:
+        scale[0] = -scale[0]
+
+    r = [[v / s if s else 0.0 for v in row] for row, s in zip(rows, scale)]
+
+    ry = math.asin(max(-1.0, min(1.0, -r[0][2])))
+
+    if abs(r[0][2]) < 1.0 - 1e-9:
+        rx = math.atan2(r[1][2], r[2][2])
+        rz = math.atan2(r[0][1], r[0][0])
+    else:
+        rx = math.atan2(-r[2][1], r[1][1])
+        rz = 0.0
+
+    return tuple(matrix[12:15]), (rx, ry, rz), tuple(scale)
+
+
+def determinant(matrix):
+    """Return the determinant of the upper 3x3 of the given matrix."""
+
+    a, b, c = matrix[0:3]
+    d, e, f = matrix[4:7]
+    g, h, i = matrix[8:11]
+
+    return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+
+def inverse(matrix):
+    """Return the inverse of the given matrix; the identity if it is singular."""
+
+    rows = [matrix[0:4], matrix[4:8], matrix[8:12], matrix[12:16]]
+    m = [list(row) + [float(i == j) for j in range(4)] for i, row in enumerate(rows)]
+
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda row: abs(m[row][col]))
+
+        if abs(m[pivot][col]) < 1e-12:
+            return IDENTITY
+
+        m[col], m[pivot] = m[pivot], m[col]
+        scale = m[col][col]
+        m[col] = [v / scale for v in m[col]]
+
+        for row in range(4):
+            if row != col and m[row][col]:
+                factor = m[row][col]
+                m[row] = [a - factor * b for a, b in zip(m[row], m[col])]
+
+    return tuple(v for row in m for v in row[4:])
+
+
+def multiply(a, b):
+    """Return the product a * b of the given matrices."""
+
+    return tuple(
+        a[row * 4] * b[col]
+        + a[row * 4 + 1] * b[col + 4]
+        + a[row * 4 + 2] * b[col + 8]
+        + a[row * 4 + 3] * b[col + 12]
+        for row in range(4)
+        for col in range(4)
+    )
+
+
+def quaternion(matrix):
+    """Return the XYZW quaternion of the rotation of the given matrix."""
+
+    _, rotate, _ = decompose(matrix)
+    r = rotation(rotate)
+
+    # Maya matrices transform row vectors, so this is the transposed formula.
+    trace = r[0] + r[5] + r[10]
+
+    if trace > 0:
+        s = math.sqrt(trace + 1.0) * 2
+        return ((r[6] - r[9]) / s, (r[8] - r[2]) / s, (r[1] - r[4]) / s, s / 4)
+
+    if r[0] > r[5] and r[0] > r[10]:
+        s = math.sqrt(1.0 + r[0] - r[5] - r[10]) * 2
+        return (s / 4, (r[4] + r[1]) / s, (r[8] + r[2]) / s, (r[6] - r[9]) / s)
+
+    if r[5] > r[10]:
+        s = math.sqrt(1.0 + r[5] - r[0] - r[10]) * 2
+        return ((r[4] + r[1]) / s, s / 4, (r[9] + r[6]) / s, (r[8] - r[2]) / s)
+
+    s = math.sqrt(1.0 + r[10] - r[0] - r[5]) * 2
+    return ((r[8] + r[2]) / s, (r[9] + r[6]) / s, s / 4, (r[1] - r[4]) / s)
+
+
+def rotation(rotate, rotate_order=0):
+    """Return the rotation matrix of the given euler angles, in radians."""
+
+    matrices = {
+        "x": _axis_rotation(rotate[0], 1, 2),
+        "y": _axis_rotation(rotate[1], 2, 0),
+        "z": _axis_rotation(rotate[2], 0, 1),
+    }
+
+    result = IDENTITY
+
+    for axis in ROTATE_ORDERS[rotate_order]:
+        result = multiply(result, matrices[axis])
+
+    return result
+
+
+def _axis_rotation(angle, a, b):
+    """Return the rotation about the axis that is neither row a nor row b."""
+
+    c, s = math.cos(angle), math.sin(angle)
+    m = list(IDENTITY)
+
+    m[a * 4 + a] = c
+    m[a * 4 + b] = s
+    m[b * 4 + a] = -s
+    m[b * 4 + b] = c
+
+    return tuple(m)
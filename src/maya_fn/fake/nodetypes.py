@@ -0,0 +1,652 @@
+"""Node types of the fake Maya backend.
+
+Only the node types, attributes and computations that maya_fn and its tests
+rely on are modelled. Transforms compute their local and world matrices
+(ignoring pivots); a few utility nodes compute their outputs.
+"""
+
+import math
+
+from maya_fn.fake import matrix
+from maya_fn.fake import scene
+from maya_fn.fake.scene import Attribute, NodeType
+
+TYPES = {}
+
+# Default cameras: name -> (translate, rotate in degrees, orthographic).
+_CAMERAS = [
+    ("persp", (28.0, 21.0, 28.0), (-27.938, 45.0, 0.0), False),
+    ("top", (0.0, 1000.1, 0.0), (-90.0, 0.0, 0.0), True),
+    ("front", (0.0, 0.0, 1000.1), (0.0, 0.0, 0.0), True),
+    ("side", (1000.1, 0.0, 0.0), (0.0, 90.0, 0.0), True),
+]
+
+_TRANSFORM_INPUTS = [
+    "translate",
+    "rotate",
+    "scale",
+    "shear",
+    "rotateOrder",
+    "rotatePivot",
+    "scalePivot",
+    "rotateAxis",
+    "inheritsTransform",
+    "offsetParentMatrix",
+]
+
+_WORLD_OUTPUTS = ["worldMatrix", "worldInverseMatrix"]
+
+
+def create_node(current, type_name, name=None, parent=None):
+    """Return a new node of the given type, which is not in the scene yet.
+
+    Args:
+        current (maya_fn.fake.scene.Scene): Scene to name the node in.
+        type_name (str): Node type.
+        name (str | None): Name, which may contain a #. Defaults to the type.
+        parent (maya_fn.fake.scene.Node | None): Parent of a DAG node.
+
+    Raises:
+        RuntimeError: If the node type does not exist, or is abstract.
+    """
+
+    node_type = TYPES.get(type_name)
+
+    if node_type is None or node_type.abstract:
+        raise RuntimeError("Unknown object type: {}".format(type_name))
+
+    if node_type.is_dag:
+        parent = parent or current.world
+    else:
+        parent = None
+
+    name = current.unique_name(
+        name or node_type.default_name + "#", node_type.is_dag, parent
+    )
+
+    return scene.Node(node_type, name)
+
+
+def inherited(type_name):
+    """Return the given node type and its base types, base first.
+
+    Raises:
+        RuntimeError: If the node type does not exist.
+    """
+
+    if type_name not in TYPES:
+        raise RuntimeError("Unknown object type: {}".format(type_name))
+
+    return list(TYPES[type_name].inherited)
+
+
+def new_scene():
+    """Replace the current scene with a new scene, with the default nodes."""
+
+    current = scene.current = scene.Scene(TYPES)
+
+    with current.recording([]):
+        for name, translate, rotate, orthographic in _CAMERAS:
+            transform = current.add_node(create_node(current, "transform", name))
+            shape = current.add_node(
+                create_node(current, "camera", name + "Shape", transform), transform
+            )
+
+            current.set_value(transform, transform.path("translate"), translate)
+            current.set_value(
+                transform,
+                transform.path("rotate"),
+                tuple(math.radians(each) for each in rotate),
+            )
+            current.set_value(shape, shape.path("orthographic"), orthographic)
+
+        current.add_node(create_node(current, "time", "time1"))
+
+    return current
+
+
+def register(node_type):
+    """Add the given node type, and return it."""
+
+    TYPES[node_type.name] = node_type
+
+    return node_type
+
+
+def _angle3(long_name, short_name, **kwargs):
+    """Return a double3 attribute of angles."""
+
+    return _compound3(long_name, short_name, "kAngle", **kwargs)
+
+
+def _compound3(
+    long_name, short_name, unit_type=None, suffixes="XYZ", default=0.0, **kwargs
+):
+    """Return a numeric compound of doubles, or of unit attributes."""
+
+    children = [
+        _double(
+            long_name + each, short_name + each.lower(), unit_type, default, **kwargs
+        )
+        for each in suffixes
+    ]
+
+    return Attribute(
+        long_name,
+        short_name,
+        scene.NUMERIC,
+        numeric_type="k{}Double".format(len(suffixes)),
+        children=children,
+        **kwargs
+    )
+
+
+def _bool(long_name, short_name, default=False, **kwargs):
+    """Return a bool attribute."""
+
+    return Attribute(
+        long_name,
+        short_name,
+        scene.NUMERIC,
+        numeric_type="kBoolean",
+        default=default,
+        **kwargs
+    )
+
+
+def _double(long_name, short_name, unit_type=None, default=0.0, **kwargs):
+    """Return a double attribute, or a unit attribute."""
+
+    if unit_type is None:
+        return Attribute(
+            long_name,
+            short_name,
+            scene.NUMERIC,
+            numeric_type="kDouble",
+            default=default,
+            **kwargs
+        )
+
+    return Attribute(
+        long_name,
+        short_name,
+        scene.UNIT,
+        unit_type=unit_type,
+        default=default,
+        **kwargs
+    )
+
+
+def _enum(long_name, short_name, names, default=0, **kwargs):
+    """Return an enum attribute."""
+
+    return Attribute(
+        long_name, short_name, scene.ENUM, enum_names=names, default=default, **kwargs
+    )
+
+
+def _float3(long_name, short_name, default=0.0, **kwargs):
+    """Return a float3 attribute."""
+
+    children = [
+        Attribute(
+            long_name + each,
+            short_name + each.lower(),
+            scene.NUMERIC,
+            numeric_type="kFloat",
+            default=default,
+            **kwargs
+        )
+        for each in "XYZ"
+    ]
+
+    return Attribute(
+        long_name,
+        short_name,
+        scene.NUMERIC,
+        numeric_type="k3Float",
+        children=children,
+        **kwargs
+    )
+
+
+def _matrix(long_name, short_name, **kwargs):
+    """Return a matrix attribute."""
+
+    return Attribute(
+        long_name, short_name, scene.MATRIX, default=matrix.IDENTITY, **kwargs
+    )
+
+
+def _read(current, node, name, index=None):
+    """Return the value of an attribute of the given node."""
+
+    return current.get_value(node, node.path(name, index))
+
+
+def _typed(long_name, short_name, data_type, **kwargs):
+    """Return a typed attribute."""
+
+    return Attribute(long_name, short_name, scene.TYPED, data_type=data_type, **kwargs)
+
+
+# Computations
+
+
+def _local_matrix(current, node, index=0):
+    if "transform" not in node.type.inherited:
+        return matrix.IDENTITY
+
+    return matrix.compose(
+        _read(current, node, "translate"),
+        _read(current, node, "rotate"),
+        _read(current, node, "scale"),
+        _read(current, node, "shear"),
+        _read(current, node, "rotateOrder"),
+    )
+
+
+def _parent_matrix(current, node, index=0):
+    parent = node.parent
+
+    if parent is None or parent is current.world:
+        return matrix.IDENTITY
+
+    if node.attribute("inheritsTransform") and not _read(
+        current, node, "inheritsTransform"
+    ):
+        return matrix.IDENTITY
+
+    return _read(current, parent, "worldMatrix", 0)
+
+
+def _world_matrix(current, node, index=0):
+    local = matrix.multiply(
+        current.get_value(node, node.path("matrix")),
+        _read(current, node, "offsetParentMatrix"),
+    )
+
+    return matrix.multiply(local, _parent_matrix(current, node))
+
+
+def _inverse(compute):
+    def inverse(current, node, index=0):
+        return matrix.inverse(compute(current, node, index))
+
+    return inverse
+
+
+def _world_position(current, node, index=0):
+    x, y, z = _read(current, node, "localPosition")
+    world = _world_matrix(current, node)
+
+    return tuple(
+        x * world[col] + y * world[col + 4] + z * world[col + 8] + world[col + 12]
+        for col in range(3)
+    )
+
+
+def _decomposed(part):
+    def decompose(current, node, index=0):
+        return matrix.decompose(_read(current, node, "inputMatrix"))[part]
+
+    return decompose
+
+
+def _decomposed_quat(current, node, index=0):
+    return matrix.quaternion(_read(current, node, "inputMatrix"))
+
+
+def _composed(current, node, index=0):
+    return matrix.compose(
+        _read(current, node, "inputTranslate"),
+        _read(current, node, "inputRotate"),
+        _read(current, node, "inputScale"),
+        _read(current, node, "inputShear"),
+        _read(current, node, "inputRotateOrder"),
+    )
+
+
+def _matrix_sum(current, node, index=0):
+    result = matrix.IDENTITY
+
+    for each in _read(current, node, "matrixIn"):
+        result = matrix.multiply(result, each)
+
+    return result
+
+
+def _add_double_linear(current, node, index=0):
+    return _read(current, node, "input1") + _read(current, node, "input2")
+
+
+def _mult_double_linear(current, node, index=0):
+    return _read(current, node, "input1") * _read(current, node, "input2")
+
+
+def _unit_conversion(current, node, index=0):
+    return _read(current, node, "input") * _read(current, node, "conversionFactor")
+
+
+def _multiply_divide(current, node, index=0):
+    operation = _read(current, node, "operation")
+    a = _read(current, node, "input1")
+    b = _read(current, node, "input2")
+
+    if operation == 1:
+        return tuple(x * y for x, y in zip(a, b))
+    if operation == 2:
+        return tuple(x / y if y else 0.0 for x, y in zip(a, b))
+    if operation == 3:
+        return tuple(x**y for x, y in zip(a, b))
+
+    return tuple(a)
+
+
+# Types
+
+register(NodeType("world", abstract=True))
+
+_depend_node = register(
+    NodeType(
+        "dependNode",
+        abstract=True,
+        attributes=[
+            Attribute("message", "msg", scene.MESSAGE, writable=False),
+            _bool("caching", "cch"),
+            _bool("frozen", "fzn"),
+            Attribute(
+                "isHistoricallyInteresting",
+                "ihi",
+                scene.NUMERIC,
+                numeric_type="kByte",
+                default=2,
+            ),
+            _enum(
+                "nodeState",
+                "nds",
+                ["Normal", "HasNoEffect", "Blocking", "Waiting-Normal"],
+            ),
+        ],
+    )
+)
+
+_dag_node = register(
+    NodeType(
+        "dagNode",
+        _depend_node,
+        abstract=True,
+        attributes=[
+            _bool("visibility", "v", default=True, keyable=True),
+            _bool("template", "tmp"),
+            _bool("intermediateObject", "io"),
+            _bool("lodVisibility", "lodv", default=True),
+            _matrix("matrix", "m"),
+            _matrix("inverseMatrix", "im", writable=False),
+            _matrix("worldMatrix", "wm", array=True, writable=False),
+            _matrix("worldInverseMatrix", "wim", array=True, writable=False),
+            _matrix("parentMatrix", "pm", array=True, writable=False),
+            _matrix("parentInverseMatrix", "pim", array=True, writable=False),
+            _matrix("offsetParentMatrix", "opm"),
+        ],
+        affects={"offsetParentMatrix": _WORLD_OUTPUTS},
+        compute={
+            "matrix": _local_matrix,
+            "inverseMatrix": _inverse(_local_matrix),
+            "worldMatrix": _world_matrix,
+            "worldInverseMatrix": _inverse(_world_matrix),
+            "parentMatrix": _parent_matrix,
+            "parentInverseMatrix": _inverse(_parent_matrix),
+        },
+    )
+)
+
+_transform = register(
+    NodeType(
+        "transform",
+        _dag_node,
+        attributes=[
+            _compound3("translate", "t", "kDistance", keyable=True),
+            _angle3("rotate", "r", keyable=True),
+            _compound3("scale", "s", default=1.0, keyable=True),
+            Attribute(
+                "shear",
+                "sh",
+                scene.NUMERIC,
+                numeric_type="k3Double",
+                children=[
+                    _double("shearXY", "shxy"),
+                    _double("shearXZ", "shxz"),
+                    _double("shearYZ", "shyz"),
+                ],
+            ),
+            _enum("rotateOrder", "ro", ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]),
+            _compound3("rotatePivot", "rp", "kDistance"),
+            _compound3("scalePivot", "sp", "kDistance"),
+            _angle3("rotateAxis", "ra"),
+            _bool("inheritsTransform", "it", default=True),
+            _bool("displayHandle", "dh"),
+            _matrix("xformMatrix", "xm"),
+        ],
+        affects={
+            name: ["matrix", "inverseMatrix", "xformMatrix"] + _WORLD_OUTPUTS
+            for name in _TRANSFORM_INPUTS
+        },
+        compute={"xformMatrix": _local_matrix},
+    )
+)
+
+register(
+    NodeType(
+        "joint",
+        _transform,
+        attributes=[
+            _angle3("jointOrient", "jo"),
+            _double("radius", "radi", default=1.0),
+        ],
+    )
+)
+
+_shape = register(NodeType("shape", _dag_node, abstract=True))
+
+register(
+    NodeType(
+        "locator",
+        _shape,
+        attributes=[
+            _compound3("localPosition", "lp", "kDistance"),
+            _compound3("worldPosition", "wp", "kDistance", array=False, writable=False),
+        ],
+        affects={"localPosition": ["worldPosition"]},
+        compute={"worldPosition": _world_position},
+        default_name="locatorShape",
+    )
+)
+
+register(
+    NodeType(
+        "camera",
+        _shape,
+        attributes=[
+            _double("focalLength", "fl", default=35.0),
+            _bool("orthographic", "o"),
+            _double("orthographicWidth", "ow", "kDistance", default=30.0),
+            _double("nearClipPlane", "ncp", "kDistance", default=0.1),
+            _double("farClipPlane", "fcp", "kDistance", default=10000.0),
+        ],
+        default_name="cameraShape",
+    )
+)
+
+register(
+    NodeType(
+        "mesh",
+        _shape,
+        attributes=[
+            _typed("inMesh", "i", "kMesh"),
+            _typed("outMesh", "o", "kMesh", writable=False),
+            _typed("worldMesh", "w", "kMesh", array=True, writable=False),
+        ],
+        affects={"inMesh": ["outMesh", "worldMesh"]},
+        default_name="polySurfaceShape",
+    )
+)
+
+register(
+    NodeType(
+        "nurbsCurve",
+        _shape,
+        attributes=[
+            _typed("create", "cr", "kNurbsCurve"),
+            _typed("local", "l", "kNurbsCurve", writable=False),
+            _typed("worldSpace", "ws", "kNurbsCurve", array=True, writable=False),
+        ],
+        affects={"create": ["local", "worldSpace"]},
+        default_name="curveShape",
+    )
+)
+
+register(
+    NodeType(
+        "time",
+        _depend_node,
+        attributes=[_double("outTime", "o", "kTime", default=1.0)],
+    )
+)
+
+register(NodeType("network", _depend_node))
+
+register(
+    NodeType(
+        "addDoubleLinear",
+        _depend_node,
+        attributes=[
+            _double("input1", "i1"),
+            _double("input2", "i2"),
+            _double("output", "o", writable=False),
+        ],
+        affects={"input1": ["output"], "input2": ["output"]},
+        compute={"output": _add_double_linear},
+    )
+)
+
+register(
+    NodeType(
+        "unitConversion",
+        _depend_node,
+        attributes=[
+            _double("input", "i"),
+            _double("output", "o", writable=False),
+            _double("conversionFactor", "cf", default=1.0),
+        ],
+        affects={"input": ["output"], "conversionFactor": ["output"]},
+        compute={"output": _unit_conversion},
+    )
+)
+
+register(
+    NodeType(
+        "multDoubleLinear",
+        _depend_node,
+        attributes=[
+            _double("input1", "i1", default=1.0),
+            _double("input2", "i2", default=1.0),
+            _double("output", "o", writable=False),
+        ],
+        affects={"input1": ["output"], "input2": ["output"]},
+        compute={"output": _mult_double_linear},
+    )
+)
+
+register(
+    NodeType(
+        "multiplyDivide",
+        _depend_node,
+        attributes=[
+            _enum(
+                "operation",
+                "op",
+                ["No operation", "Multiply", "Divide", "Power"],
+                default=1,
+            ),
+            _float3("input1", "i1"),
+            _float3("input2", "i2", default=1.0),
+            _float3("output", "o", writable=False),
+        ],
+        affects={"operation": ["output"], "input1": ["output"], "input2": ["output"]},
+        compute={"output": _multiply_divide},
+    )
+)
+
+register(
+    NodeType(
+        "multMatrix",
+        _depend_node,
+        attributes=[
+            _matrix("matrixIn", "i", array=True),
+            _matrix("matrixSum", "o", writable=False),
+        ],
+        affects={"matrixIn": ["matrixSum"]},
+        compute={"matrixSum": _matrix_sum},
+    )
+)
+
+register(
+    NodeType(
+        "decomposeMatrix",
+        _depend_node,
+        attributes=[
+            _matrix("inputMatrix", "imat"),
+            _enum("inputRotateOrder", "ro", ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]),
+            _compound3("outputTranslate", "ot", "kDistance", writable=False),
+            _angle3("outputRotate", "or", writable=False),
+            _compound3("outputScale", "os", writable=False),
+            _compound3("outputShear", "osh", writable=False),
+            _compound3("outputQuat", "oq", suffixes="XYZW", writable=False),
+        ],
+        affects={
+            "inputMatrix": [
+                "outputTranslate",
+                "outputRotate",
+                "outputScale",
+                "outputShear",
+                "outputQuat",
+            ]
+        },
+        compute={
+            "outputTranslate": _decomposed(0),
+            "outputRotate": _decomposed(1),
+            "outputScale": _decomposed(2),
+            "outputShear": lambda current, node, index=0: (0.0, 0.0, 0.0),
+            "outputQuat": _decomposed_quat,
+        },
+    )
+)
+
+register(
+    NodeType(
+        "composeMatrix",
+        _depend_node,
+        attributes=[
+            _compound3("inputTranslate", "it", "kDistance"),
+            _angle3("inputRotate", "ir"),
+            _compound3("inputScale", "is", default=1.0),
+            _compound3("inputShear", "ish"),
+            _enum(
+                "inputRotateOrder", "iro", ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+            ),
+            _matrix("outputMatrix", "omat", writable=False),
+        ],
+        affects={
+            name: ["outputMatrix"]
+            for name in (
+                "inputTranslate",
+                "inputRotate",
+                "inputScale",
+                "inputShear",
+                "inputRotateOrder",
+            )
+        },
+        compute={"outputMatrix": _composed},
+    )
+)
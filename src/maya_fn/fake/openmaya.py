@@ -0,0 +1,2904 @@
+"""Stand-in for the subset of maya.api.OpenMaya that maya_fn uses.
+
+The classes keep the names, signatures and error types of the Maya Python
+API 2.0, and work on the nodes of `maya_fn.fake.scene.current`.
+"""
+
+import collections
+import math
+
+import six
+
+from maya_fn.fake import matrix
+from maya_fn.fake import nodetypes
+from maya_fn.fake import scene
+
+_MFN_TYPES = [
+    "kInvalid",
+    "kBase",
+    "kNamedObject",
+    "kDependencyNode",
+    "kDagNode",
+    "kWorld",
+    "kTransform",
+    "kJoint",
+    "kShape",
+    "kLocator",
+    "kCamera",
+    "kMesh",
+    "kNurbsCurve",
+    "kTime",
+    "kAddDoubleLinear",
+    "kMultDoubleLinear",
+    "kMultiplyDivide",
+    "kMultMatrix",
+    "kDecomposeMatrix",
+    "kComposeMatrix",
+    "kAttribute",
+    "kNumericAttribute",
+    "kUnitAttribute",
+    "kTypedAttribute",
+    "kMatrixAttribute",
+    "kEnumAttribute",
+    "kMessageAttribute",
+    "kCompoundAttribute",
+    "kData",
+    "kNumericData",
+    "kStringData",
+    "kMatrixData",
+    "kGeometryData",
+    "kComponent",
+    "kMeshVertComponent",
+    "kMeshEdgeComponent",
+    "kMeshPolygonComponent",
+    "kCurveCVComponent",
+]
+
+# Node type -> MFn type of the nodes of that type and its subtypes.
+_NODE_FN_TYPES = {
+    "world": "kWorld",
+    "dependNode": "kDependencyNode",
+    "dagNode": "kDagNode",
+    "transform": "kTransform",
+    "joint": "kJoint",
+    "shape": "kShape",
+    "locator": "kLocator",
+    "camera": "kCamera",
+    "mesh": "kMesh",
+    "nurbsCurve": "kNurbsCurve",
+    "time": "kTime",
+    "addDoubleLinear": "kAddDoubleLinear",
+    "multDoubleLinear": "kMultDoubleLinear",
+    "multiplyDivide": "kMultiplyDivide",
+    "multMatrix": "kMultMatrix",
+    "decomposeMatrix": "kDecomposeMatrix",
+    "composeMatrix": "kComposeMatrix",
+}
+
+_ATTRIBUTE_FN_TYPES = {
+    scene.NUMERIC: "kNumericAttribute",
+    scene.UNIT: "kUnitAttribute",
+    scene.TYPED: "kTypedAttribute",
+    scene.MATRIX: "kMatrixAttribute",
+    scene.ENUM: "kEnumAttribute",
+    scene.MESSAGE: "kMessageAttribute",
+    scene.COMPOUND: "kCompoundAttribute",
+}
+
+# Component name -> MFn type of the component.
+_COMPONENT_FN_TYPES = {
+    "vtx": "kMeshVertComponent",
+    "e": "kMeshEdgeComponent",
+    "f": "kMeshPolygonComponent",
+    "cv": "kCurveCVComponent",
+}
+
+_NUMERIC_DATA_TYPES = ["kInvalid"] + sorted(scene.NUMERIC_TYPE_NAMES)
+_DATA_TYPES = ["kInvalid", "kNumeric", "kAny"] + sorted(scene.TYPED_TYPE_NAMES)
+_UNIT_TYPES = ["kInvalid"] + sorted(scene.UNIT_TYPE_NAMES)
+
+_node_fn_types = {}
+
+# A component of a selection list item, in place of a plug path.
+_Component = collections.namedtuple("_Component", ["name"])
+
+
+def _scene():
+    """Return the current scene."""
+
+    return scene.current
+
+
+class MFn(object):
+    """Function set types."""
+
+
+for _value, _name in enumerate(_MFN_TYPES):
+    setattr(MFn, _name, _value)
+
+
+class MObject(object):
+    """A node, attribute or data object."""
+
+    __slots__ = ["_node", "_attribute", "_data"]
+
+    kNullObj = None
+
+    def __init__(self, other=None):
+        """Initialize the object, as a copy of the other object or as null."""
+
+        self._node = other._node if other is not None else None
+        self._attribute = other._attribute if other is not None else None
+        self._data = other._data if other is not None else None
+
+    def __eq__(self, other):
+        """Return True if the other object is the same object."""
+
+        if not isinstance(other, MObject):
+            return NotImplemented
+
+        return (
+            self._node is other._node
+            and self._attribute is other._attribute
+            and self._data is other._data
+        )
+
+    def __ne__(self, other):
+        """Return True if the other object is not the same object."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the representation of this object."""
+
+        return "MObject({!r})".format(self._node or self._attribute or self._data)
+
+    def apiType(self):
+        """Return the most specific MFn type of this object."""
+
+        return self._fn_types()[-1]
+
+    def hasFn(self, fn_type):
+        """Return True if this object is compatible with the given MFn type."""
+
+        return fn_type in self._fn_types()
+
+    def isNull(self):
+        """Return True if this object does not hold anything."""
+
+        return self._node is None and self._attribute is None and self._data is None
+
+    def _fn_types(self):
+        """Return the MFn types of this object, most specific last."""
+
+        if self._node is not None:
+            return _node_fn_type_list(self._node.type)
+
+        if self._attribute is not None:
+            fn_types = [MFn.kBase, MFn.kAttribute]
+            fn_types.append(getattr(MFn, _ATTRIBUTE_FN_TYPES[self._attribute.kind]))
+
+            if self._attribute.children and self._attribute.kind == scene.NUMERIC:
+                fn_types.insert(-1, MFn.kCompoundAttribute)
+
+            return fn_types
+
+        if self._data is not None:
+            if self._data[0] == MFn.kComponent:
+                return [MFn.kBase, MFn.kComponent, self._data[1]]
+
+            return [MFn.kBase, MFn.kData, self._data[0]]
+
+        return [MFn.kInvalid]
+
+
+MObject.kNullObj = MObject()
+
+
+def _wrap_node(node):
+    """Return an MObject of the given scene node."""
+
+    obj = MObject()
+    obj._node = node
+
+    return obj
+
+
+def _wrap_attribute(attribute):
+    """Return an MObject of the given attribute."""
+
+    obj = MObject()
+    obj._attribute = attribute
+
+    return obj
+
+
+def _wrap_data(fn_type, value):
+    """Return an MObject of the given data."""
+
+    obj = MObject()
+    obj._data = (fn_type, value)
+
+    return obj
+
+
+def _get_node(obj):
+    """Return the scene node of the given MObject or MDagPath.
+
+    Raises:
+        RuntimeError: If the object is not a node.
+    """
+
+    if isinstance(obj, MDagPath):
+        return obj._node()
+
+    if not isinstance(obj, MObject):
+        raise TypeError("An MObject is required, not {}.".format(type(obj).__name__))
+
+    if obj._node is None:
+        raise RuntimeError(
+            "(kInvalidParameter): Object is incompatible with this method"
+        )
+
+    return obj._node
+
+
+def _get_attribute(obj):
+    """Return the attribute of the given MObject."""
+
+    if not isinstance(obj, MObject) or obj._attribute is None:
+        raise RuntimeError(
+            "(kInvalidParameter): Object is incompatible with this method"
+        )
+
+    return obj._attribute
+
+
+def _node_fn_type_list(node_type):
+    """Return the MFn types of the nodes of the given type."""
+
+    fn_types = _node_fn_types.get(node_type.name)
+
+    if fn_types is None:
+        fn_types = [MFn.kBase, MFn.kNamedObject] + [
+            getattr(MFn, _NODE_FN_TYPES[name])
+            for name in node_type.inherited
+            if name in _NODE_FN_TYPES
+        ]
+
+        if node_type.name == "world":
+            fn_types.insert(-1, MFn.kDagNode)
+
+        _node_fn_types[node_type.name] = fn_types
+
+    return fn_types
+
+
+class MObjectHandle(object):
+    """A handle that tells whether an MObject is still valid."""
+
+    __slots__ = ["_object"]
+
+    def __init__(self, obj=None):
+        """Initialize the handle of the given MObject."""
+
+        self._object = MObject(obj)
+
+    def __eq__(self, other):
+        """Return True if the other handle holds the same object."""
+
+        if not isinstance(other, MObjectHandle):
+            return NotImplemented
+
+        return self._object == other._object
+
+    def __ne__(self, other):
+        """Return True if the other handle holds another object."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def hashCode(self):
+        """Return a hash code of the object, unique while it exists."""
+
+        obj = self._object
+
+        if obj._node is not None:
+            return obj._node.id
+
+        return id(obj._attribute or obj._data)
+
+    def isAlive(self):
+        """Return True if the object is still in memory."""
+
+        return not self._object.isNull()
+
+    def isValid(self):
+        """Return True if the object is still in the scene."""
+
+        node = self._object._node
+
+        return node.alive if node is not None else not self._object.isNull()
+
+    def object(self):
+        """Return the object of this handle."""
+
+        return MObject(self._object)
+
+
+class MDagPath(object):
+    """A path from the world to a DAG node."""
+
+    __slots__ = ["_nodes"]
+
+    def __init__(self, other=None):
+        """Initialize the path, as a copy of the other path or as empty."""
+
+        self._nodes = list(other._nodes) if other is not None else []
+
+    def __eq__(self, other):
+        """Return True if the other path is the same path."""
+
+        if not isinstance(other, MDagPath):
+            return NotImplemented
+
+        return len(self._nodes) == len(other._nodes) and all(
+            a is b for a, b in zip(self._nodes, other._nodes)
+        )
+
+    def __ne__(self, other):
+        """Return True if the other path is another path."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the representation of this path."""
+
+        return "MDagPath({!r})".format(self.fullPathName())
+
+    @staticmethod
+    def getAPathTo(obj):
+        """Return a path to the given DAG node.
+
+        Raises:
+            RuntimeError: If the object is not a DAG node.
+        """
+
+        node = _get_node(obj)
+
+        if not node.type.is_dag and node.type.name != "world":
+            raise RuntimeError(
+                "(kInvalidParameter): Object is incompatible with this method"
+            )
+
+        path = MDagPath()
+
+        while node.parent is not None:
+            path._nodes.append(node)
+            node = node.parent
+
+        path._nodes.reverse()
+
+        return path
+
+    @staticmethod
+    def getAllPathsTo(obj):
+        """Return every path to the given DAG node."""
+
+        return [MDagPath.getAPathTo(obj)]
+
+    def apiType(self):
+        """Return the MFn type of the node of this path."""
+
+        return self.node().apiType()
+
+    def child(self, index):
+        """Return the child of the node of this path at the given index."""
+
+        return _wrap_node(self._node().children[index])
+
+    def childCount(self):
+        """Return the number of children of the node of this path."""
+
+        return len(self._node().children)
+
+    def exclusiveMatrix(self):
+        """Return the world matrix of the parent of the node of this path."""
+
+        return MMatrix(self._world_matrix(self._nodes[:-1]))
+
+    def exclusiveMatrixInverse(self):
+        """Return the inverse of `exclusiveMatrix`."""
+
+        return self.exclusiveMatrix().inverse()
+
+    def extendToShape(self):
+        """Extend this path to the only shape below its transform."""
+
+        shapes = [each for each in self._node().children if each.type.is_shape]
+
+        if len(shapes) != 1:
+            raise RuntimeError("(kInvalidParameter): Object has no unique shape")
+
+        self._nodes.append(shapes[0])
+
+        return self
+
+    def fullPathName(self):
+        """Return the full path name of this path."""
+
+        if not self._nodes:
+            return ""
+
+        return "|" + "|".join(node.name for node in self._nodes)
+
+    def hasFn(self, fn_type):
+        """Return True if the node of this path is compatible with the MFn type."""
+
+        return self.node().hasFn(fn_type)
+
+    def inclusiveMatrix(self):
+        """Return the world matrix of the node of this path."""
+
+        return MMatrix(self._world_matrix(self._nodes))
+
+    def inclusiveMatrixInverse(self):
+        """Return the inverse of `inclusiveMatrix`."""
+
+        return self.inclusiveMatrix().inverse()
+
+    def instanceNumber(self):
+        """Return the instance number of the node of this path.
+
+        The fake backend does not model instances, so this is always 0.
+        """
+
+        return 0
+
+    def isValid(self):
+        """Return True if every node of this path is still in place."""
+
+        parent = None
+
+        for node in self._nodes:
+            if not node.alive or node.parent is None:
+                return False
+
+            if parent is not None and node.parent is not parent:
+                return False
+
+            if parent is None and node.parent.parent is not None:
+                return False
+
+            parent = node
+
+        return True
+
+    def length(self):
+        """Return the number of nodes below the world in this path."""
+
+        return len(self._nodes)
+
+    def node(self):
+        """Return the node of this path."""
+
+        return _wrap_node(self._node())
+
+    def partialPathName(self):
+        """Return the shortest unique path name of this path."""
+
+        if not self._nodes:
+            return ""
+
+        return _scene().partial_path(self._nodes[-1])
+
+    def pop(self, num=1):
+        """Remove the last nodes from this path, and return it."""
+
+        if num > len(self._nodes):
+            raise RuntimeError("(kInvalidParameter): Path is too short")
+
+        for _ in range(num):
+            self._nodes.pop()
+
+        return self
+
+    def push(self, child):
+        """Add a child of the node of this path to this path, and return it."""
+
+        node = _get_node(child)
+
+        if node.parent is not self._node():
+            raise RuntimeError("(kInvalidParameter): Object is not a child")
+
+        self._nodes.append(node)
+
+        return self
+
+    def transform(self):
+        """Return the transform of this path; the parent of a shape."""
+
+        for node in reversed(self._nodes):
+            if not node.type.is_shape:
+                return _wrap_node(node)
+
+        return _wrap_node(_scene().world)
+
+    def _node(self):
+        """Return the scene node of this path."""
+
+        return self._nodes[-1] if self._nodes else _scene().world
+
+    def _world_matrix(self, nodes):
+        """Return the world matrix of the last of the given nodes."""
+
+        if not nodes:
+            return matrix.IDENTITY
+
+        node = nodes[-1]
+
+        return _scene().get_value(node, node.path("worldMatrix", 0))
+
+
+class MMatrix(object):
+    """A 4x4 matrix of doubles, stored row by row."""
+
+    __slots__ = ["_values"]
+
+    kIdentity = None
+
+    def __init__(self, value=None):
+        """Initialize the matrix from 16 numbers, 4 rows, or another matrix."""
+
+        if value is None:
+            values = matrix.IDENTITY
+        else:
+            values = list(value)
+
+            if len(values) == 4:
+                values = [number for row in values for number in row]
+
+        if len(values) != 16:
+            raise ValueError("A matrix needs 16 values.")
+
+        self._values = [float(each) for each in values]
+
+    def __eq__(self, other):
+        """Return True if the other matrix has the same values."""
+
+        if not isinstance(other, MMatrix):
+            return NotImplemented
+
+        return self._values == other._values
+
+    def __ne__(self, other):
+        """Return True if the other matrix has other values."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __getitem__(self, index):
+        """Return the value at the given index, row by row."""
+
+        return self._values[index]
+
+    def __iter__(self):
+        """Iterate over the values, row by row."""
+
+        return iter(self._values)
+
+    def __len__(self):
+        """Return 16."""
+
+        return 16
+
+    def __mul__(self, other):
+        """Return the product of this matrix and the other matrix."""
+
+        return MMatrix(matrix.multiply(self._values, list(other)))
+
+    def __repr__(self):
+        """Return the representation of this matrix."""
+
+        return "MMatrix({!r})".format(self._values)
+
+    def det3x3(self):
+        """Return the determinant of the upper 3x3 of this matrix."""
+
+        return matrix.determinant(self._values)
+
+    def getElement(self, row, col):
+        """Return the value at the given row and column."""
+
+        return self._values[row * 4 + col]
+
+    def inverse(self):
+        """Return the inverse of this matrix."""
+
+        return MMatrix(matrix.inverse(self._values))
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        """Return True if the other matrix has the same values, within tolerance."""
+
+        return all(abs(a - b) <= tolerance for a, b in zip(self._values, other))
+
+    def setElement(self, row, col, value):
+        """Set the value at the given row and column."""
+
+        self._values[row * 4 + col] = float(value)
+
+    def transpose(self):
+        """Return the transpose of this matrix."""
+
+        return MMatrix(
+            [self._values[col * 4 + row] for row in range(4) for col in range(4)]
+        )
+
+
+MMatrix.kIdentity = MMatrix()
+
+
+class _Unit(object):
+    """A value in one of several units."""
+
+    __slots__ = ["value", "unit"]
+
+    # Unit -> number of internal units per unit.
+    _SCALES = {}
+    _INTERNAL = None
+    _ui_unit = None
+
+    def __init__(self, value=0.0, unit=None):
+        """Initialize the value, in the internal unit by default."""
+
+        self.value = float(value)
+        self.unit = self._INTERNAL if unit is None else unit
+
+    def __repr__(self):
+        """Return the representation of this value."""
+
+        return "{}({!r}, {!r})".format(type(self).__name__, self.value, self.unit)
+
+    @classmethod
+    def internalUnit(cls):
+        """Return the internal unit."""
+
+        return cls._INTERNAL
+
+    @classmethod
+    def setUIUnit(cls, unit):
+        """Set the unit of values in the user interface and maya.cmds."""
+
+        cls._ui_unit = unit
+
+    @classmethod
+    def uiUnit(cls):
+        """Return the unit of values in the user interface and maya.cmds."""
+
+        return cls._ui_unit
+
+    def asUnits(self, unit):
+        """Return this value in the given unit."""
+
+        return self.value * self._SCALES[self.unit] / self._SCALES[unit]
+
+    def _internal(self):
+        """Return this value in the internal unit."""
+
+        return self.asUnits(self._INTERNAL)
+
+
+class MAngle(_Unit):
+    """An angle."""
+
+    __slots__ = []
+
+    kInvalid, kRadians, kDegrees, kAngMinutes, kAngSeconds = range(5)
+
+    _SCALES = {
+        kRadians: 1.0,
+        kDegrees: math.pi / 180.0,
+        kAngMinutes: math.pi / 10800.0,
+        kAngSeconds: math.pi / 648000.0,
+    }
+    _INTERNAL = kRadians
+    _ui_unit = kDegrees
+
+    def asDegrees(self):
+        """Return this angle in degrees."""
+
+        return self.asUnits(self.kDegrees)
+
+    def asRadians(self):
+        """Return this angle in radians."""
+
+        return self.asUnits(self.kRadians)
+
+
+class MDistance(_Unit):
+    """A distance."""
+
+    __slots__ = []
+
+    (
+        kInvalid,
+        kInches,
+        kFeet,
+        kYards,
+        kMiles,
+        kMillimeters,
+        kCentimeters,
+        kKilometers,
+        kMeters,
+    ) = range(9)
+
+    _SCALES = {
+        kInches: 2.54,
+        kFeet: 30.48,
+        kYards: 91.44,
+        kMiles: 160934.4,
+        kMillimeters: 0.1,
+        kCentimeters: 1.0,
+        kKilometers: 100000.0,
+        kMeters: 100.0,
+    }
+    _INTERNAL = kCentimeters
+    _ui_unit = kCentimeters
+
+    def asCentimeters(self):
+        """Return this distance in centimeters."""
+
+        return self.asUnits(self.kCentimeters)
+
+    def asMeters(self):
+        """Return this distance in meters."""
+
+        return self.asUnits(self.kMeters)
+
+
+class MTime(_Unit):
+    """A time."""
+
+    __slots__ = []
+
+    (
+        kInvalid,
+        kHours,
+        kMinutes,
+        kSeconds,
+        kMilliseconds,
+        kGames,
+        kFilm,
+        kPALFrame,
+        kNTSCFrame,
+        kShowScan,
+        kPALField,
+        kNTSCField,
+    ) = range(12)
+
+    _SCALES = {
+        kHours: 3600.0,
+        kMinutes: 60.0,
+        kSeconds: 1.0,
+        kMilliseconds: 0.001,
+        kGames: 1.0 / 15,
+        kFilm: 1.0 / 24,
+        kPALFrame: 1.0 / 25,
+        kNTSCFrame: 1.0 / 30,
+        kShowScan: 1.0 / 48,
+        kPALField: 1.0 / 50,
+        kNTSCField: 1.0 / 60,
+    }
+    _INTERNAL = kSeconds
+    _ui_unit = kFilm
+
+    def asUnits(self, unit):
+        """Return this time in the given unit."""
+
+        return _Unit.asUnits(self, unit)
+
+
+class MFnBase(object):
+    """Base class of the function sets."""
+
+    def __init__(self, obj=None):
+        """Initialize the function set, attached to the given object."""
+
+        self._object = None
+
+        if obj is not None:
+            self.setObject(obj)
+
+    def object(self):
+        """Return the object of this function set."""
+
+        return MObject(self._object) if self._object is not None else MObject()
+
+    def setObject(self, obj):
+        """Attach this function set to the given object."""
+
+        self._object = MObject(obj)
+
+        return self
+
+
+class MFnDependencyNode(MFnBase):
+    """Function set of dependency nodes."""
+
+    kNormalAttr, kLocalDynamicAttr, kExtensionAttr, kInvalidAttr = range(4)
+
+    def setObject(self, obj):
+        """Attach this function set to the given node."""
+
+        self._node = _get_node(obj)
+
+        return MFnBase.setObject(self, _wrap_node(self._node))
+
+    @property
+    def typeName(self):
+        """Return the node type of the node."""
+
+        return self._node.type.name
+
+    def attribute(self, name):
+        """Return the attribute of the given name, or a null MObject."""
+
+        if isinstance(name, int):
+            return _wrap_attribute(self._all_attributes()[name])
+
+        attribute = self._node.attribute(name)
+
+        return _wrap_attribute(attribute) if attribute is not None else MObject()
+
+    def attributeClass(self, attribute):
+        """Return whether the given attribute is static or dynamic."""
+
+        if _get_attribute(attribute).dynamic:
+            return self.kLocalDynamicAttr
+
+        return self.kNormalAttr
+
+    def attributeCount(self):
+        """Return the number of attributes of the node."""
+
+        return len(self._all_attributes())
+
+    def findPlug(self, attribute, want_networked_plug=True):
+        """Return the plug of the given attribute, by name or MObject.
+
+        Raises:
+            RuntimeError: If the node does not have the attribute.
+        """
+
+        if isinstance(attribute, MObject):
+            attribute = _get_attribute(attribute)
+        else:
+            attribute = self._node.attribute(attribute)
+
+        if attribute is None:
+            raise RuntimeError("(kInvalidParameter): Cannot find the plug")
+
+        return MPlug(_wrap_node(self._node), _wrap_attribute(attribute))
+
+    def getConnections(self):
+        """Return the plugs of the node that are connected."""
+
+        node = self._node
+        paths = list(node.inputs) + [
+            path for path in node.outputs if path not in node.inputs
+        ]
+
+        return [MPlug._make(node, path) for path in paths]
+
+    def hasAttribute(self, name):
+        """Return True if the node has an attribute of the given name."""
+
+        return self._node.attribute(name) is not None
+
+    def isDefaultNode(self):
+        """Return True if the node is one of the nodes of a new scene."""
+
+        return False
+
+    def name(self):
+        """Return the name of the node."""
+
+        return self._node.name
+
+    def setName(self, name):
+        """Rename the node, and return its new name."""
+
+        current = _scene()
+        node = self._node
+        parent = node.parent if node.type.is_dag else None
+
+        current.rename(node, current.unique_name(name, node.type.is_dag, parent, node))
+
+        return node.name
+
+    def _all_attributes(self):
+        """Return every attribute of the node, parents before children."""
+
+        return [
+            each
+            for attribute in self._node.attributes()
+            for each in attribute.descendents()
+        ]
+
+
+class MFnDagNode(MFnDependencyNode):
+    """Function set of DAG nodes."""
+
+    def setObject(self, obj):
+        """Attach this function set to the given DAG node or path."""
+
+        if isinstance(obj, MDagPath):
+            self._dag_path = MDagPath(obj)
+        else:
+            self._dag_path = MDagPath.getAPathTo(obj)
+
+        return MFnDependencyNode.setObject(self, self._dag_path.node())
+
+    def child(self, index):
+        """Return the child of the node at the given index."""
+
+        return _wrap_node(self._node.children[index])
+
+    def childCount(self):
+        """Return the number of children of the node."""
+
+        return len(self._node.children)
+
+    def dagPath(self):
+        """Return the path of the node."""
+
+        return MDagPath(self._dag_path)
+
+    def fullPathName(self):
+        """Return the full path of the node."""
+
+        return self._dag_path.fullPathName()
+
+    def getPath(self):
+        """Return the path of the node."""
+
+        return self.dagPath()
+
+    def hasChild(self, obj):
+        """Return True if the given node is a child of the node."""
+
+        return _get_node(obj).parent is self._node
+
+    def isChildOf(self, obj):
+        """Return True if the node is a child of the given node."""
+
+        return self._node.parent is _get_node(obj)
+
+    def isParentOf(self, obj):
+        """Return True if the node is the parent of the given node."""
+
+        return self.hasChild(obj)
+
+    def parent(self, index):
+        """Return the parent of the node at the given index."""
+
+        if self._node.parent is None or index:
+            raise IndexError("Parent index out of range.")
+
+        return _wrap_node(self._node.parent)
+
+    def parentCount(self):
+        """Return the number of parents of the node."""
+
+        return 0 if self._node.parent is None else 1
+
+    def partialPathName(self):
+        """Return the shortest unique path of the node."""
+
+        return self._dag_path.partialPathName()
+
+
+class MFnTransform(MFnDagNode):
+    """Function set of transforms."""
+
+    def setObject(self, obj):
+        """Attach this function set to the given transform or path.
+
+        Raises:
+            RuntimeError: If the node is not a transform.
+        """
+
+        MFnDagNode.setObject(self, obj)
+
+        if not self._dag_path.hasFn(MFn.kTransform):
+            raise RuntimeError(
+                "(kInvalidParameter): Object is incompatible with this method"
+            )
+
+        return self
+
+    def transformationMatrix(self):
+        """Return the local matrix of the transform."""
+
+        return MMatrix(_scene().get_value(self._node, self._node.path("matrix")))
+
+
+class MFnAttribute(MFnBase):
+    """Function set of attributes."""
+
+    def setObject(self, obj):
+        """Attach this function set to the given attribute."""
+
+        self._attribute = _get_attribute(obj)
+
+        return MFnBase.setObject(self, obj)
+
+    @property
+    def array(self):
+        """Return True if the attribute is an array."""
+
+        return self._attribute.array
+
+    @array.setter
+    def array(self, value):
+        self._attribute.array = bool(value)
+
+    @property
+    def dynamic(self):
+        """Return True if the attribute was added to a node."""
+
+        return self._attribute.dynamic
+
+    @property
+    def keyable(self):
+        """Return True if the attribute is keyable."""
+
+        return self._attribute.keyable
+
+    @keyable.setter
+    def keyable(self, value):
+        self._attribute.keyable = bool(value)
+
+    @property
+    def name(self):
+        """Return the long name of the attribute."""
+
+        return self._attribute.long_name
+
+    @property
+    def parent(self):
+        """Return the compound parent of the attribute, or a null MObject."""
+
+        parent = self._attribute.parent
+
+        return _wrap_attribute(parent) if parent is not None else MObject()
+
+    @property
+    def readable(self):
+        """Return True if the attribute is readable."""
+
+        return self._attribute.readable
+
+    @readable.setter
+    def readable(self, value):
+        self._attribute.readable = bool(value)
+
+    @property
+    def shortName(self):
+        """Return the short name of the attribute."""
+
+        return self._attribute.short_name
+
+    @property
+    def writable(self):
+        """Return True if the attribute is writable."""
+
+        return self._attribute.writable
+
+    @writable.setter
+    def writable(self, value):
+        self._attribute.writable = bool(value)
+
+    def _create(self, long_name, short_name, kind, **kwargs):
+        """Create a new attribute, attach this function set to it and return it."""
+
+        obj = _wrap_attribute(scene.Attribute(long_name, short_name, kind, **kwargs))
+        self.setObject(obj)
+
+        return MObject(obj)
+
+
+class MFnCompoundAttribute(MFnAttribute):
+    """Function set of compound attributes."""
+
+    def addChild(self, child):
+        """Add the given attribute as a child of the attribute."""
+
+        self._attribute.add_child(_get_attribute(child))
+
+    def child(self, index):
+        """Return the child of the attribute at the given index."""
+
+        return _wrap_attribute(self._attribute.children[index])
+
+    def create(self, long_name, short_name):
+        """Create a new compound attribute."""
+
+        return self._create(long_name, short_name, scene.COMPOUND)
+
+    def numChildren(self):
+        """Return the number of children of the attribute."""
+
+        return len(self._attribute.children)
+
+
+class MFnEnumAttribute(MFnAttribute):
+    """Function set of enum attributes."""
+
+    def addField(self, name, value):
+        """Add a field to the attribute."""
+
+        names = self._attribute.enum_names
+
+        while len(names) <= value:
+            names.append("")
+
+        names[value] = name
+
+    def create(self, long_name, short_name, default=0):
+        """Create a new enum attribute."""
+
+        return self._create(
+            long_name, short_name, scene.ENUM, enum_names=[], default=default
+        )
+
+    def fieldName(self, value):
+        """Return the name of the given field value."""
+
+        return self._attribute.enum_names[value]
+
+    def fieldValue(self, name):
+        """Return the value of the given field name."""
+
+        return self._attribute.enum_names.index(name)
+
+
+class MFnMatrixAttribute(MFnAttribute):
+    """Function set of matrix attributes."""
+
+    kFloat, kDouble = range(2)
+
+    def create(self, long_name, short_name, matrix_type=kDouble):
+        """Create a new matrix attribute."""
+
+        return self._create(
+            long_name, short_name, scene.MATRIX, default=matrix.IDENTITY
+        )
+
+
+class MFnMessageAttribute(MFnAttribute):
+    """Function set of message attributes."""
+
+    def create(self, long_name, short_name):
+        """Create a new message attribute."""
+
+        return self._create(long_name, short_name, scene.MESSAGE)
+
+
+class MFnNumericData(MFnBase):
+    """Function set of numeric data."""
+
+
+for _value, _name in enumerate(_NUMERIC_DATA_TYPES):
+    setattr(MFnNumericData, _name, _value)
+
+MFnNumericData.kLong = MFnNumericData.kInt
+MFnNumericData.k2Long = MFnNumericData.k2Int
+MFnNumericData.k3Long = MFnNumericData.k3Int
+
+
+class MFnNumericAttribute(MFnAttribute):
+    """Function set of numeric attributes."""
+
+    def create(self, long_name, short_name, numeric_type, default=0.0):
+        """Create a new numeric attribute."""
+
+        return self._create(
+            long_name,
+            short_name,
+            scene.NUMERIC,
+            numeric_type=_NUMERIC_DATA_TYPES[numeric_type],
+            default=default,
+        )
+
+    def createColor(self, long_name, short_name):
+        """Create a new float3 color attribute."""
+
+        return self.createPoint(long_name, short_name, "RGB")
+
+    def createPoint(self, long_name, short_name, suffixes="XYZ"):
+        """Create a new float3 point attribute."""
+
+        children = [
+            scene.Attribute(
+                long_name + each,
+                short_name + each.lower(),
+                scene.NUMERIC,
+                numeric_type="kFloat",
+                default=0.0,
+            )
+            for each in suffixes
+        ]
+
+        return self._create(
+            long_name,
+            short_name,
+            scene.NUMERIC,
+            numeric_type="k3Float",
+            children=children,
+        )
+
+    @property
+    def default(self):
+        """Return the default value of the attribute."""
+
+        return self._attribute.default
+
+    @default.setter
+    def default(self, value):
+        self._attribute.default = value
+
+    def numericType(self):
+        """Return the MFnNumericData type of the attribute."""
+
+        return getattr(MFnNumericData, self._attribute.numeric_type)
+
+
+class MFnData(MFnBase):
+    """Function set of data."""
+
+
+for _value, _name in enumerate(_DATA_TYPES):
+    setattr(MFnData, _name, _value)
+
+
+class MFnTypedAttribute(MFnAttribute):
+    """Function set of typed attributes."""
+
+    def attrType(self):
+        """Return the MFnData type of the attribute."""
+
+        return getattr(MFnData, self._attribute.data_type)
+
+    def create(self, long_name, short_name, data_type, default=None):
+        """Create a new typed attribute."""
+
+        value = None
+
+        if default is not None and not default.isNull():
+            value = default._data[1]
+
+        return self._create(
+            long_name,
+            short_name,
+            scene.TYPED,
+            data_type=_DATA_TYPES[data_type],
+            default=value,
+        )
+
+
+class MFnUnitAttribute(MFnAttribute):
+    """Function set of unit attributes."""
+
+    def create(self, long_name, short_name, unit_type, default=0.0):
+        """Create a new unit attribute."""
+
+        if isinstance(default, _Unit):
+            default = default._internal()
+
+        return self._create(
+            long_name,
+            short_name,
+            scene.UNIT,
+            unit_type=_UNIT_TYPES[unit_type],
+            default=default,
+        )
+
+    def unitType(self):
+        """Return the unit type of the attribute."""
+
+        return getattr(MFnUnitAttribute, self._attribute.unit_type)
+
+
+for _value, _name in enumerate(_UNIT_TYPES):
+    setattr(MFnUnitAttribute, _name, _value)
+
+
+class MFnMatrixData(MFnBase):
+    """Function set of matrix data."""
+
+    def create(self, value=None):
+        """Create new matrix data, and return it."""
+
+        self._object = _wrap_data(MFn.kMatrixData, tuple(MMatrix(value)))
+
+        return MObject(self._object)
+
+    def matrix(self):
+        """Return the matrix of the data."""
+
+        return MMatrix(self._object._data[1])
+
+    def set(self, value):
+        """Set the matrix of the data."""
+
+        self._object._data = (MFn.kMatrixData, tuple(MMatrix(value)))
+
+
+class MFnStringData(MFnBase):
+    """Function set of string data."""
+
+    def create(self, value=""):
+        """Create new string data, and return it."""
+
+        self._object = _wrap_data(MFn.kStringData, value)
+
+        return MObject(self._object)
+
+    def set(self, value):
+        """Set the string of the data."""
+
+        self._object._data = (MFn.kStringData, value)
+
+    def string(self):
+        """Return the string of the data."""
+
+        return self._object._data[1]
+
+
+class MPlug(object):
+    """An attribute of a node, with the indices of its array elements."""
+
+    __slots__ = ["_node", "_path"]
+
+    def __init__(self, node=None, attribute=None):
+        """Initialize the plug of the given node and attribute, or a copy."""
+
+        if isinstance(node, MPlug):
+            self._node = node._node
+            self._path = node._path
+        elif node is None:
+            self._node = None
+            self._path = ()
+        else:
+            self._node = _get_node(node)
+            attribute = _get_attribute(attribute)
+            self._path = tuple((each, None) for each in attribute.ancestors())
+
+    def __eq__(self, other):
+        """Return True if the other plug is the same plug."""
+
+        if not isinstance(other, MPlug):
+            return NotImplemented
+
+        return self._node is other._node and self._path == other._path
+
+    def __ne__(self, other):
+        """Return True if the other plug is another plug."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the representation of this plug."""
+
+        return "MPlug({!r})".format(self.name() if self._node else None)
+
+    @classmethod
+    def _make(cls, node, path):
+        """Return the plug of the given scene node and path."""
+
+        plug = cls()
+        plug._node = node
+        plug._path = path
+
+        return plug
+
+    @property
+    def info(self):
+        """Return the name of this plug, without the node name."""
+
+        return scene.attribute_path(self._path, long_names=False, full_attr=False)
+
+    @property
+    def isArray(self):
+        """Return True if this plug is an array, rather than an element."""
+
+        attribute, index = self._path[-1]
+
+        return attribute.array and index is None
+
+    @property
+    def isChild(self):
+        """Return True if this plug is the child of a compound."""
+
+        return self._path[-1][0].parent is not None
+
+    @property
+    def isCompound(self):
+        """Return True if this plug has children."""
+
+        return bool(self._path[-1][0].children)
+
+    @property
+    def isConnected(self):
+        """Return True if this plug is connected."""
+
+        return self.isDestination or self.isSource
+
+    @property
+    def isDestination(self):
+        """Return True if this plug has a source."""
+
+        return self._path in self._node.inputs
+
+    @property
+    def isDynamic(self):
+        """Return True if the attribute of this plug was added to the node."""
+
+        return self._path[-1][0].dynamic
+
+    @property
+    def isElement(self):
+        """Return True if this plug is an element of an array."""
+
+        return self._path[-1][1] is not None
+
+    @property
+    def isKeyable(self):
+        """Return True if the attribute of this plug is keyable."""
+
+        return self._path[-1][0].keyable
+
+    @property
+    def isLocked(self):
+        """Return True if this plug, or its compound parent, is locked."""
+
+        return _scene().is_locked(self._node, self._path)
+
+    @property
+    def isNetworked(self):
+        """Return True if this plug is connected."""
+
+        return self.isConnected
+
+    @property
+    def isNull(self):
+        """Return True if this plug does not refer to an attribute."""
+
+        return self._node is None
+
+    @property
+    def isSource(self):
+        """Return True if this plug has destinations."""
+
+        return self._path in self._node.outputs
+
+    def array(self):
+        """Return the array plug of this element."""
+
+        if not self.isElement:
+            raise TypeError("'{}' is not an array element.".format(self.name()))
+
+        return MPlug._make(self._node, self._path[:-1] + ((self._path[-1][0], None),))
+
+    def asBool(self):
+        """Return the value of this plug as a bool."""
+
+        return bool(self._number())
+
+    def asDouble(self):
+        """Return the value of this plug as a float, in internal units."""
+
+        return float(self._number())
+
+    def asFloat(self):
+        """Return the value of this plug as a float, in internal units."""
+
+        return float(self._number())
+
+    def asInt(self):
+        """Return the value of this plug as an int."""
+
+        return int(self._number())
+
+    asChar = asInt
+    asShort = asInt
+
+    def asMAngle(self):
+        """Return the value of this plug as an MAngle."""
+
+        return MAngle(self._number(), MAngle.kRadians)
+
+    def asMDistance(self):
+        """Return the value of this plug as an MDistance."""
+
+        return MDistance(self._number(), MDistance.kCentimeters)
+
+    def asMObject(self):
+        """Return the data of this plug."""
+
+        attribute = self._path[-1][0]
+        value = self._value()
+
+        if value is None:
+            return MObject()
+
+        if attribute.kind == scene.MATRIX or attribute.data_type == "kMatrix":
+            return _wrap_data(MFn.kMatrixData, tuple(value))
+
+        if attribute.data_type == "kString":
+            return _wrap_data(MFn.kStringData, value)
+
+        if attribute.kind == scene.NUMERIC:
+            return _wrap_data(MFn.kNumericData, value)
+
+        return _wrap_data(MFn.kGeometryData, value)
+
+    def asMTime(self):
+        """Return the value of this plug as an MTime."""
+
+        return MTime(self._number(), MTime.kSeconds)
+
+    def asString(self):
+        """Return the value of this plug as a string."""
+
+        value = self._value()
+
+        return "" if value is None else six.text_type(value)
+
+    def attribute(self):
+        """Return the attribute of this plug."""
+
+        return _wrap_attribute(self._path[-1][0])
+
+    def child(self, child):
+        """Return the child of this compound plug, by index or attribute."""
+
+        attribute = self._path[-1][0]
+
+        if isinstance(child, int):
+            return MPlug._make(
+                self._node, self._path + ((attribute.children[child], None),)
+            )
+
+        chain = _get_attribute(child).ancestors()
+
+        if attribute not in chain[:-1]:
+            raise RuntimeError("(kInvalidParameter): Attribute is not a child")
+
+        start = chain.index(attribute) + 1
+        rest = chain[start:]
+
+        return MPlug._make(
+            self._node, self._path + tuple((each, None) for each in rest)
+        )
+
+    def connectedTo(self, as_dst, as_src):
+        """Return the plugs connected to this plug."""
+
+        plugs = []
+
+        if as_dst:
+            source = self._node.inputs.get(self._path)
+
+            if source is not None:
+                plugs.append(MPlug._make(*source))
+
+        if as_src:
+            plugs.extend(
+                MPlug._make(*each) for each in self._node.outputs.get(self._path, ())
+            )
+
+        return plugs
+
+    def destinations(self):
+        """Return the destinations of this plug."""
+
+        return self.connectedTo(False, True)
+
+    def elementByLogicalIndex(self, index):
+        """Return the element of this array plug at the given logical index."""
+
+        if not self.isArray:
+            raise TypeError("'{}' is not an array.".format(self.name()))
+
+        return MPlug._make(self._node, self._path[:-1] + ((self._path[-1][0], index),))
+
+    def elementByPhysicalIndex(self, index):
+        """Return the element of this array plug at the given physical index."""
+
+        return self.elementByLogicalIndex(
+            self.getExistingArrayAttributeIndices()[index]
+        )
+
+    def evaluateNumElements(self):
+        """Return the number of elements of this array plug."""
+
+        return self.numElements()
+
+    def getExistingArrayAttributeIndices(self):
+        """Return the logical indices of the elements of this array plug."""
+
+        if not self.isArray:
+            raise TypeError("'{}' is not an array.".format(self.name()))
+
+        return _scene().indices(self._node, self._path)
+
+    def logicalIndex(self):
+        """Return the logical index of this element."""
+
+        if not self.isElement:
+            raise TypeError("'{}' is not an array element.".format(self.name()))
+
+        return self._path[-1][1]
+
+    def name(self):
+        """Return the name of this plug, with the shortest unique node name."""
+
+        return _scene().plug_name(self._node, self._path)
+
+    def node(self):
+        """Return the node of this plug."""
+
+        return _wrap_node(self._node)
+
+    def numChildren(self):
+        """Return the number of children of this compound plug."""
+
+        return len(self._path[-1][0].children)
+
+    def numElements(self):
+        """Return the number of elements of this array plug."""
+
+        return len(self.getExistingArrayAttributeIndices())
+
+    def parent(self):
+        """Return the compound parent of this plug."""
+
+        if not self.isChild:
+            raise TypeError("'{}' is not a child plug.".format(self.name()))
+
+        return MPlug._make(self._node, self._path[:-1])
+
+    def partialName(
+        self,
+        includeNodeName=False,
+        includeNonMandatoryIndices=False,
+        includeInstancedIndices=False,
+        useAlias=False,
+        useFullAttributePath=False,
+        useLongNames=False,
+    ):
+        """Return the attribute path of this plug."""
+
+        name = scene.attribute_path(self._path, useLongNames, useFullAttributePath)
+
+        if includeNodeName:
+            name = self._node.name + "." + name
+
+        return name
+
+    def source(self):
+        """Return the source of this plug, or a null plug."""
+
+        plugs = self.connectedTo(True, False)
+
+        return plugs[0] if plugs else MPlug()
+
+    sourceWithConversion = source
+
+    def setBool(self, value):
+        """Set the value of this plug."""
+
+        self._set(bool(value))
+
+    def setDouble(self, value):
+        """Set the value of this plug, in internal units."""
+
+        self._set(float(value))
+
+    setFloat = setDouble
+
+    def setInt(self, value):
+        """Set the value of this plug."""
+
+        self._set(int(value))
+
+    setChar = setInt
+    setShort = setInt
+
+    def setMAngle(self, value):
+        """Set the value of this plug."""
+
+        self._set(value._internal())
+
+    setMDistance = setMAngle
+    setMTime = setMAngle
+
+    def setMObject(self, value):
+        """Set the data of this plug."""
+
+        self._set(value._data[1])
+
+    def setString(self, value):
+        """Set the value of this plug."""
+
+        self._set(value)
+
+    def _number(self):
+        """Return the value of this plug, which must be a number."""
+
+        value = self._value()
+
+        if not isinstance(value, (bool, int, float)):
+            raise RuntimeError("(kFailure): Unexpected Internal Failure")
+
+        return value
+
+    def _set(self, value):
+        """Set the value of this plug, in internal units."""
+
+        _scene().set_value(self._node, self._path, value)
+
+    def _value(self):
+        """Return the value of this plug, in internal units."""
+
+        return _scene().get_value(self._node, self._path)
+
+
+class MSelectionList(object):
+    """A list of nodes, DAG paths and plugs."""
+
+    def __init__(self, other=None):
+        """Initialize the list, as a copy of the other list or as empty."""
+
+        self._items = list(other._items) if other is not None else []
+        self._keys = set(other._keys) if other is not None else set()
+
+    def add(self, item, merge_with_existing=True):
+        """Add a node, path or plug, by object or by name, and return this list.
+
+        Raises:
+            RuntimeError: If the named object does not exist.
+            TypeError: If the item cannot be selected.
+        """
+
+        if isinstance(item, six.string_types):
+            items = self._find(item)
+        elif isinstance(item, MPlug):
+            items = [(item._node, item._path)]
+        elif isinstance(item, (MObject, MDagPath)):
+            items = [(_get_node(item), None)]
+        else:
+            raise TypeError(
+                "an item of type {} cannot be selected".format(type(item).__name__)
+            )
+
+        for node, path in items:
+            key = (node.id, path)
+
+            if merge_with_existing and key in self._keys:
+                continue
+
+            self._keys.add(key)
+            self._items.append((node, path))
+
+        return self
+
+    def clear(self):
+        """Remove every item, and return this list."""
+
+        del self._items[:]
+        self._keys.clear()
+
+        return self
+
+    def getComponent(self, index):
+        """Return the (DAG path, component) of the item at the given index.
+
+        The component is null unless the item is a component.
+
+        Raises:
+            TypeError: If the item is not a DAG node.
+        """
+
+        path = self._items[index][1]
+        component = MObject()
+
+        if isinstance(path, _Component):
+            fn_type = _COMPONENT_FN_TYPES[path.name.partition("[")[0]]
+            component._data = (MFn.kComponent, getattr(MFn, fn_type), path.name)
+
+        return self.getDagPath(index), component
+
+    def getDagPath(self, index):
+        """Return the DAG path of the item at the given index.
+
+        Raises:
+            TypeError: If the item is not a DAG node.
+        """
+
+        node = self._items[index][0]
+
+        if not node.type.is_dag:
+            raise TypeError("item is not a DAG path")
+
+        return MDagPath.getAPathTo(_wrap_node(node))
+
+    def getDependNode(self, index):
+        """Return the node of the item at the given index."""
+
+        return _wrap_node(self._items[index][0])
+
+    def getPlug(self, index):
+        """Return the plug of the item at the given index.
+
+        Raises:
+            TypeError: If the item is not a plug.
+        """
+
+        node, path = self._items[index]
+
+        if path is None or isinstance(path, _Component):
+            raise TypeError("item is not a plug")
+
+        return MPlug._make(node, path)
+
+    def getSelectionStrings(self, index=None):
+        """Return the names of the items, or of the item at the given index."""
+
+        current = _scene()
+        items = self._items if index is None else [self._items[index]]
+
+        names = []
+
+        for node, path in items:
+            if path is None:
+                names.append(current.partial_path(node))
+            elif isinstance(path, _Component):
+                names.append("{}.{}".format(current.partial_path(node), path.name))
+            else:
+                names.append(current.plug_name(node, path))
+
+        return names
+
+    def isEmpty(self):
+        """Return True if the list is empty."""
+
+        return not self._items
+
+    def length(self):
+        """Return the number of items."""
+
+        return len(self._items)
+
+    def remove(self, index):
+        """Remove the item at the given index, and return this list."""
+
+        node, path = self._items.pop(index)
+        self._keys.discard((node.id, path))
+
+        return self
+
+    @staticmethod
+    def _find(name):
+        """Return the (node, path) items of the given name."""
+
+        current = _scene()
+
+        if "." in name:
+            items = current.find_plug(name) or [
+                (node, _Component(component))
+                for node, component in current.find_components(name)
+            ]
+        else:
+            items = [(node, None) for node in current.find(name)]
+
+        if not items:
+            raise RuntimeError("(kInvalidParameter): Object does not exist")
+
+        if len(items) > 1 and "*" not in name and "?" not in name:
+            raise RuntimeError("(kInvalidParameter): More than one object matches name")
+
+        return items
+
+
+class MItDag(object):
+    """Iterator over the DAG, starting at the world."""
+
+    kDepthFirst, kBreadthFirst = range(2)
+
+    def __init__(self, traversal_type=kDepthFirst, filter_type=MFn.kInvalid):
+        """Initialize the iterator."""
+
+        self._traversal = traversal_type
+        self._filter = filter_type
+        self.reset()
+
+    def currentItem(self):
+        """Return the current node."""
+
+        return _wrap_node(self._current[0])
+
+    def depth(self):
+        """Return the depth of the current node below the world."""
+
+        return self._current[1]
+
+    def fullPathName(self):
+        """Return the full path of the current node."""
+
+        return self.getPath().fullPathName()
+
+    def getPath(self):
+        """Return the path of the current node."""
+
+        return MDagPath.getAPathTo(self.currentItem())
+
+    def isDone(self):
+        """Return True if every node was visited."""
+
+        return self._current is None
+
+    def next(self):
+        """Move to the next node, and return this iterator."""
+
+        while True:
+            self._advance()
+
+            if self._current is None or self._matches(self._current[0]):
+                return self
+
+    def partialPathName(self):
+        """Return the partial path of the current node."""
+
+        return self.getPath().partialPathName()
+
+    def prune(self):
+        """Do not walk below the current node."""
+
+        self._pruned = True
+
+    def reset(self, root=None, traversal_type=None, filter_type=None):
+        """Restart the iteration at the world, or at the given node or path."""
+
+        if traversal_type is not None:
+            self._traversal = traversal_type
+
+        if filter_type is not None:
+            self._filter = filter_type
+
+        if root is None:
+            node = _scene().world
+        elif isinstance(root, MDagPath):
+            node = root._node()
+        else:
+            node = _get_node(root)
+
+        self._queue = collections.deque()
+        self._current = (node, 0)
+        self._pruned = False
+
+        if not self._matches(self._current[0]):
+            self.next()
+
+    def root(self):
+        """Return the world node."""
+
+        return _wrap_node(_scene().world)
+
+    def _advance(self):
+        """Move to the next node, whether it matches the filter or not."""
+
+        node, depth = self._current
+
+        if not self._pruned:
+            children = [(child, depth + 1) for child in node.children]
+
+            if self._traversal == self.kDepthFirst:
+                self._queue.extend(reversed(children))
+            else:
+                self._queue.extendleft(children)
+
+        self._pruned = False
+        self._current = self._queue.pop() if self._queue else None
+
+    def _matches(self, node):
+        """Return True if the given node passes the filter."""
+
+        return self._filter == MFn.kInvalid or _wrap_node(node).hasFn(self._filter)
+
+
+class MItDependencyGraph(object):
+    """Iterator over the nodes or plugs connected to a node or plug."""
+
+    kDownstream, kUpstream = range(2)
+    kDepthFirst, kBreadthFirst = range(2)
+    kNodeLevel, kPlugLevel = range(2)
+
+    def __init__(
+        self,
+        root,
+        filter=MFn.kInvalid,
+        direction=kDownstream,
+        traversal=kDepthFirst,
+        level=kNodeLevel,
+    ):
+        """Initialize the iterator at the given node or plug."""
+
+        if isinstance(root, MPlug):
+            self._root = (root._node, root._path)
+        else:
+            self._root = (_get_node(root), None)
+
+        self._filter = filter
+        self._direction = direction
+        self._traversal = traversal
+        self._level = level
+
+        self.reset()
+
+    def currentNode(self):
+        """Return the current node."""
+
+        return _wrap_node(self._current[0][0])
+
+    currentItem = currentNode
+
+    def currentPlug(self):
+        """Return the current plug, or a null plug at the root node."""
+
+        node, path = self._current[0]
+
+        return MPlug._make(node, path) if path is not None else MPlug()
+
+    def getNodePath(self):
+        """Return the nodes from the root to the current node."""
+
+        return [_wrap_node(node) for node, _ in self._chain()]
+
+    def getPlugPath(self):
+        """Return the plugs from the root to the current plug."""
+
+        return [MPlug._make(node, path) for node, path in self._chain() if path]
+
+    def isDone(self):
+        """Return True if every item was visited."""
+
+        return self._current is None
+
+    def next(self):
+        """Move to the next item, and return this iterator."""
+
+        while True:
+            self._advance()
+
+            if self._current is None or self._matches(self._current[0][0]):
+                return self
+
+    def prune(self):
+        """Do not walk past the current item."""
+
+        self._pruned = True
+
+    def reset(self):
+        """Restart the iteration at the root."""
+
+        self._queue = collections.deque()
+        self._current = (self._root, None)
+        self._visited = {self._key(self._root)}
+        self._pruned = False
+
+    def rootNode(self):
+        """Return the root node."""
+
+        return _wrap_node(self._root[0])
+
+    def rootPlug(self):
+        """Return the root plug, or a null plug for a root node."""
+
+        node, path = self._root
+
+        return MPlug._make(node, path) if path is not None else MPlug()
+
+    def _advance(self):
+        """Move to the next unvisited item."""
+
+        if not self._pruned:
+            items = [
+                (each, self._current) for each in self._neighbors(self._current[0])
+            ]
+
+            if self._traversal == self.kDepthFirst:
+                self._queue.extend(reversed(items))
+            else:
+                self._queue.extendleft(items)
+
+        self._pruned = False
+
+        while self._queue:
+            item = self._queue.pop()
+            key = self._key(item[0])
+
+            if key not in self._visited:
+                self._visited.add(key)
+                self._current = item
+                return
+
+        self._current = None
+
+    def _chain(self):
+        """Return the (node, path) items from the root to the current item."""
+
+        items = []
+        current = self._current
+
+        while current is not None:
+            items.append(current[0])
+            current = current[1]
+
+        return items[::-1]
+
+    def _connections(self, node, paths):
+        """Return the plugs connected to the given plugs, in the direction."""
+
+        plugs = []
+
+        if self._direction == self.kDownstream:
+            for path, destinations in node.outputs.items():
+                if paths is None or any(path[: len(each)] == each for each in paths):
+                    plugs.extend(destinations)
+        else:
+            for path, source in node.inputs.items():
+                if paths is None or any(path[: len(each)] == each for each in paths):
+                    plugs.append(source)
+
+        return plugs
+
+    def _key(self, item):
+        """Return the visited key of the given item."""
+
+        node, path = item
+
+        return node.id if self._level == self.kNodeLevel else (node.id, path)
+
+    def _matches(self, node):
+        """Return True if the given node passes the filter."""
+
+        return self._filter == MFn.kInvalid or _wrap_node(node).hasFn(self._filter)
+
+    def _neighbors(self, item):
+        """Return the items connected to the given item."""
+
+        node, path = item
+
+        if self._level == self.kNodeLevel:
+            paths = [path] if item == self._root and path is not None else None
+
+            return [(each, None) for each, _ in self._connections(node, paths)]
+
+        if item == self._root:
+            paths = None if path is None else [path]
+        else:
+            paths = self._affected(node, path)
+
+        return self._connections(node, paths)
+
+    def _affected(self, node, path):
+        """Return the paths that the given plug affects, or is affected by."""
+
+        names = set(attribute.long_name for attribute, _ in path)
+        affects = node.type.affects
+
+        if self._direction == self.kDownstream:
+            affected = set(output for name in names for output in affects.get(name, ()))
+        else:
+            affected = set(
+                source
+                for source, outputs in affects.items()
+                if names.intersection(outputs)
+            )
+
+        return [node.path(name) for name in affected if node.attribute(name)] + [path]
+
+
+class MItDependencyNodes(object):
+    """Iterator over the dependency nodes of the scene, in creation order."""
+
+    def __init__(self, filter=MFn.kInvalid):
+        """Initialize the iterator."""
+
+        self.reset(filter)
+
+    def isDone(self):
+        """Return True if every node was visited."""
+
+        return self._index >= len(self._nodes)
+
+    def next(self):
+        """Move to the next node, and return this iterator."""
+
+        self._index += 1
+
+        return self
+
+    def reset(self, filter=None):
+        """Restart the iteration, optionally with another filter."""
+
+        if filter is not None:
+            self._filter = filter
+
+        self._nodes = [
+            node
+            for node in _scene().nodes.values()
+            if self._filter == MFn.kInvalid or _wrap_node(node).hasFn(self._filter)
+        ]
+        self._index = 0
+
+    def thisNode(self):
+        """Return the current node."""
+
+        return _wrap_node(self._nodes[self._index])
+
+
+class MArgList(object):
+    """The arguments of a command."""
+
+    def __init__(self, args=()):
+        """Initialize the list with the given arguments."""
+
+        self._args = list(args)
+
+    def __len__(self):
+        """Return the number of arguments."""
+
+        return len(self._args)
+
+    def asDouble(self, index):
+        """Return the argument at the given index as a float."""
+
+        return float(self._args[index])
+
+    def asInt(self, index):
+        """Return the argument at the given index as an int."""
+
+        return int(self._args[index])
+
+    def asString(self, index):
+        """Return the argument at the given index as a string."""
+
+        return six.text_type(self._args[index])
+
+
+class MPxCommand(object):
+    """Base class of plugin commands."""
+
+    def __init__(self):
+        """Initialize the command."""
+
+    def doIt(self, args):
+        """Run the command."""
+
+    def isUndoable(self):
+        """Return True if the command can be undone."""
+
+        return False
+
+    def redoIt(self):
+        """Run the command again."""
+
+    def undoIt(self):
+        """Revert the command."""
+
+
+class MFnPlugin(MFnBase):
+    """Function set of plugins."""
+
+    def __init__(
+        self, obj=None, vendor="Unknown", version="Unknown", api_version="Any"
+    ):
+        """Initialize the function set of the given plugin."""
+
+        self._plugin = obj._data[1] if obj is not None else None
+
+    def deregisterCommand(self, name):
+        """Remove the given command from maya.cmds."""
+
+        from maya_fn.fake import cmds
+
+        cmds._deregister_command(name)
+
+    def registerCommand(self, name, creator, syntax_creator=None):
+        """Add a command to maya.cmds, created by the given function."""
+
+        from maya_fn.fake import cmds
+
+        cmds._register_command(name, creator, self._plugin)
+
+
+class MGlobal(object):
+    """Global functions."""
+
+    kInteractive, kBatch, kLibraryApp, kBaseUIMode = range(4)
+
+    @staticmethod
+    def displayError(message):
+        """Print an error."""
+
+        print("# Error: {}".format(message))
+
+    @staticmethod
+    def displayInfo(message):
+        """Print a message."""
+
+        print(message)
+
+    @staticmethod
+    def displayWarning(message):
+        """Print a warning."""
+
+        print("# Warning: {}".format(message))
+
+    @staticmethod
+    def getActiveSelectionList():
+        """Return the selection, which is always empty."""
+
+        return MSelectionList()
+
+    @staticmethod
+    def mayaState():
+        """Return kLibraryApp."""
+
+        return MGlobal.kLibraryApp
+
+
+class MDGModifier(object):
+    """A queue of edits, applied by doIt and reverted by undoIt."""
+
+    def __init__(self):
+        """Initialize the modifier."""
+
+        self._operations = []
+        self._done = 0
+        self._edits = []
+
+    def addAttribute(self, node, attribute):
+        """Queue the addition of a dynamic attribute to a node."""
+
+        node = _get_node(node)
+        attribute = _get_attribute(attribute)
+
+        def add_attribute(current):
+            if node.attribute(attribute.long_name) is not None:
+                raise RuntimeError(
+                    "Found attribute name conflict: '{}'".format(attribute.long_name)
+                )
+            current.add_attribute(node, attribute)
+
+        return self._queue(add_attribute)
+
+    def commandToExecute(self, command):
+        """Queue a MEL command, which the fake backend cannot run.
+
+        Raises:
+            RuntimeError: Always.
+        """
+
+        raise RuntimeError("MEL commands are not supported by the fake backend.")
+
+    def connect(self, *args):
+        """Queue a connection of a source plug to a destination plug."""
+
+        source, destination = self._plugs(args)
+
+        def connect(current):
+            _check_destination(destination)
+            current.connect(
+                (source._node, source._path), (destination._node, destination._path)
+            )
+
+        return self._queue(connect)
+
+    def createNode(self, node_type):
+        """Queue the creation of a dependency node, and return it.
+
+        Raises:
+            TypeError: If the node type is a DAG node type.
+        """
+
+        node = nodetypes.create_node(_scene(), _type_name(node_type))
+
+        if node.type.is_dag:
+            raise TypeError("Use an MDagModifier to create DAG nodes.")
+
+        self._queue(lambda current: _add_node(current, node, None))
+
+        return _wrap_node(node)
+
+    def deleteNode(self, node):
+        """Queue the deletion of a node, with its DAG descendents."""
+
+        node = _get_node(node)
+
+        return self._queue(lambda current: current.delete(node))
+
+    def disconnect(self, *args):
+        """Queue the removal of a connection."""
+
+        source, destination = self._plugs(args)
+
+        def disconnect(current):
+            key = (destination._node, destination._path)
+
+            if destination._node.inputs.get(destination._path) != (
+                source._node,
+                source._path,
+            ):
+                raise RuntimeError(
+                    "'{}' is not connected to '{}'.".format(
+                        source.name(), destination.name()
+                    )
+                )
+            current.disconnect((source._node, source._path), key)
+
+        return self._queue(disconnect)
+
+    def doIt(self):
+        """Apply the queued edits that were not applied yet."""
+
+        current = _scene()
+
+        with current.recording(self._edits):
+            while self._done < len(self._operations):
+                operation = self._operations[self._done]
+                self._done += 1
+                operation(current)
+
+    def newPlugValue(self, plug, data):
+        """Queue a data change of the given plug."""
+
+        return self._set(plug, data._data[1])
+
+    def newPlugValueBool(self, plug, value):
+        """Queue a value change of the given plug."""
+
+        return self._set(plug, bool(value))
+
+    def newPlugValueDouble(self, plug, value):
+        """Queue a value change of the given plug, in internal units."""
+
+        return self._set(plug, float(value))
+
+    newPlugValueFloat = newPlugValueDouble
+
+    def newPlugValueInt(self, plug, value):
+        """Queue a value change of the given plug."""
+
+        return self._set(plug, int(value))
+
+    newPlugValueChar = newPlugValueInt
+    newPlugValueShort = newPlugValueInt
+
+    def newPlugValueMAngle(self, plug, value):
+        """Queue a value change of the given plug."""
+
+        return self._set(plug, value._internal())
+
+    newPlugValueMDistance = newPlugValueMAngle
+    newPlugValueMTime = newPlugValueMAngle
+
+    def newPlugValueString(self, plug, value):
+        """Queue a value change of the given plug."""
+
+        return self._set(plug, value)
+
+    def pythonCommandToExecute(self, command):
+        """Queue Python code, run with maya.cmds edits recorded on this modifier."""
+
+        def execute(current):
+            exec(command, {"__name__": "__main__"})
+
+        return self._queue(execute)
+
+    def removeAttribute(self, node, attribute):
+        """Queue the removal of a dynamic attribute of a node."""
+
+        node = _get_node(node)
+        attribute = _get_attribute(attribute)
+
+        return self._queue(lambda current: current.remove_attribute(node, attribute))
+
+    def renameNode(self, node, name):
+        """Queue the renaming of a node."""
+
+        node = _get_node(node)
+
+        def rename(current):
+            parent = node.parent if node.type.is_dag else None
+            current.rename(
+                node, current.unique_name(name, node.type.is_dag, parent, node)
+            )
+
+        return self._queue(rename)
+
+    def undoIt(self):
+        """Revert the applied edits."""
+
+        current = _scene()
+
+        with current.recording([]):
+            while self._edits:
+                undo, _ = self._edits.pop()
+                undo()
+
+        self._done = 0
+
+    def _plugs(self, args):
+        """Return the source and destination plugs of connect arguments."""
+
+        if len(args) == 4:
+            return MPlug(args[0], args[1]), MPlug(args[2], args[3])
+
+        source, destination = args
+
+        if source.isNull or destination.isNull:
+            raise RuntimeError("(kInvalidParameter): Plug is null")
+
+        return MPlug(source), MPlug(destination)
+
+    def _queue(self, operation):
+        """Add an edit to the queue, and return this modifier."""
+
+        self._operations.append(operation)
+
+        return self
+
+    def _set(self, plug, value):
+        """Queue a value change of the given plug, in internal units."""
+
+        plug = MPlug(plug)
+
+        def set_value(current):
+            if current.is_locked(plug._node, plug._path):
+                raise RuntimeError("(kFailure): Unexpected Internal Failure")
+
+            current.set_value(plug._node, plug._path, value)
+
+        return self._queue(set_value)
+
+
+class MDagModifier(MDGModifier):
+    """A queue of edits, including DAG edits."""
+
+    def createNode(self, node_type, parent=MObject.kNullObj):
+        """Queue the creation of a DAG node, and return it.
+
+        A shape created without a parent gets a new transform, which is
+        returned instead.
+
+        Raises:
+            TypeError: If the node type is not a DAG node type.
+        """
+
+        current = _scene()
+        type_name = _type_name(node_type)
+        parent_node = None if parent.isNull() else _get_node(parent)
+
+        if "dagNode" not in nodetypes.inherited(type_name):
+            raise TypeError("Use an MDGModifier to create dependency nodes.")
+
+        result = None
+
+        if parent_node is None and "shape" in nodetypes.inherited(type_name):
+            parent_node = nodetypes.create_node(current, "transform")
+            self._queue(lambda current: _add_node(current, parent_node, None))
+            result = parent_node
+
+        node = nodetypes.create_node(current, type_name, parent=parent_node)
+        self._queue(lambda current: _add_node(current, node, parent_node))
+
+        return _wrap_node(result or node)
+
+    def reparentNode(self, node, new_parent=MObject.kNullObj):
+        """Queue the reparenting of a DAG node; under the world by default."""
+
+        node = _get_node(node)
+        parent = None if new_parent.isNull() else _get_node(new_parent)
+
+        def reparent(current):
+            _check_reparent(node, parent)
+            current.reparent(node, parent)
+
+        return self._queue(reparent)
+
+
+def _add_node(current, node, parent):
+    """Add a node created by a modifier, with a name that is unique now."""
+
+    parent = parent or (current.world if node.type.is_dag else None)
+    node.name = current.unique_name(node.name, node.type.is_dag, parent, node)
+
+    return current.add_node(node, parent)
+
+
+def _check_destination(plug):
+    """Raise a RuntimeError if a connection cannot be made to the given plug."""
+
+    attribute = plug._path[-1][0]
+
+    if not attribute.writable:
+        raise RuntimeError(
+            "The destination attribute '{}' cannot be connected.".format(plug.name())
+        )
+
+    if plug._path in plug._node.inputs:
+        raise RuntimeError(
+            "The destination attribute '{}' is already connected.".format(plug.name())
+        )
+
+
+def _check_reparent(node, parent):
+    """Raise a RuntimeError if the node cannot be moved under the parent."""
+
+    if not node.type.is_dag or (parent is not None and not parent.type.is_dag):
+        raise RuntimeError("Only DAG nodes can be parented.")
+
+    ancestor = parent
+
+    while ancestor is not None:
+        if ancestor is node:
+            raise RuntimeError("A node cannot be parented under itself.")
+        ancestor = ancestor.parent
+
+    if parent is not None and parent.type.is_shape:
+        raise RuntimeError("A shape cannot have children.")
+
+
+def _type_name(node_type):
+    """Return the given node type name, checking that it exists."""
+
+    nodetypes.inherited(node_type)
+
+    return node_type
+
+
+# Messages
+
+
+class MMessage(object):
+    """Base class of the callback messages."""
+
+    @staticmethod
+    def removeCallback(callback_id):
+        """Remove the given callback."""
+
+        scene.remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        """Remove the given callbacks."""
+
+        for callback_id in callback_ids:
+            scene.remove_callback(callback_id)
+
+
+def _parent_path(node):
+    """Return the path of the given parent node; an empty path for the world."""
+
+    if node.parent is None:
+        return MDagPath()
+
+    return MDagPath.getAPathTo(_wrap_node(node))
+
+
+class MDGMessage(MMessage):
+    """Dependency graph callbacks."""
+
+    @staticmethod
+    def addConnectionCallback(function, client_data=None):
+        """Call the function with (source, destination, made, client_data)."""
+
+        return scene.add_callback(
+            scene.CONNECTION,
+            lambda source, destination, made: function(
+                MPlug._make(*source), MPlug._make(*destination), made, client_data
+            ),
+        )
+
+    @staticmethod
+    def addNodeAddedCallback(function, node_type="dependNode", client_data=None):
+        """Call the function with (node, client_data) when a node is added."""
+
+        return scene.add_callback(
+            scene.NODE_ADDED,
+            lambda node: function(_wrap_node(node), client_data),
+            node_type=node_type,
+        )
+
+    @staticmethod
+    def addNodeRemovedCallback(function, node_type="dependNode", client_data=None):
+        """Call the function with (node, client_data) when a node is removed."""
+
+        return scene.add_callback(
+            scene.NODE_REMOVED,
+            lambda node: function(_wrap_node(node), client_data),
+            node_type=node_type,
+        )
+
+
+class MDagMessage(MMessage):
+    """DAG callbacks."""
+
+    @staticmethod
+    def addParentAddedCallback(function, client_data=None):
+        """Call the function with (child, parent, client_data) on reparenting."""
+
+        return scene.add_callback(
+            scene.PARENT_ADDED,
+            lambda child, parent: function(
+                MDagPath.getAPathTo(_wrap_node(child)),
+                _parent_path(parent),
+                client_data,
+            ),
+        )
+
+    @staticmethod
+    def addParentRemovedCallback(function, client_data=None):
+        """Call the function with (child, parent, client_data) on reparenting."""
+
+        return scene.add_callback(
+            scene.PARENT_REMOVED,
+            lambda child, parent: function(
+                MDagPath.getAPathTo(_wrap_node(child)),
+                _parent_path(parent),
+                client_data,
+            ),
+        )
+
+
+class MNodeMessage(MMessage):
+    """Node callbacks."""
+
+    kConnectionMade = 0x01
+    kConnectionBroken = 0x02
+    kAttributeEval = 0x04
+    kAttributeSet = 0x08
+    kAttributeLocked = 0x10
+    kAttributeUnlocked = 0x20
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+    kAttributeRenamed = 0x100
+    kAttributeKeyable = 0x200
+    kAttributeUnkeyable = 0x400
+    kIncomingDirection = 0x800
+    kAttributeArrayAdded = 0x1000
+    kAttributeArrayRemoved = 0x2000
+    kOtherPlugSet = 0x4000
+
+    _MESSAGES = {
+        scene.ATTRIBUTE_SET: kAttributeSet,
+        scene.CONNECTION_MADE: kConnectionMade,
+        scene.CONNECTION_BROKEN: kConnectionBroken,
+        scene.ATTRIBUTE_ADDED: kAttributeAdded,
+        scene.ATTRIBUTE_REMOVED: kAttributeRemoved,
+    }
+
+    @staticmethod
+    def addAttributeAddedOrRemovedCallback(node, function, client_data=None):
+        """Call the function with (message, plug, client_data) on new attributes."""
+
+        def on_change(event, changed, path, other, incoming):
+            if event in (scene.ATTRIBUTE_ADDED, scene.ATTRIBUTE_REMOVED):
+                message = MNodeMessage._MESSAGES[event]
+                function(message, MPlug._make(changed, path), client_data)
+
+        return scene.add_callback(
+            scene.ATTRIBUTE_CHANGED, on_change, node=_get_node(node)
+        )
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, client_data=None):
+        """Call the function with (message, plug, other_plug, client_data)."""
+
+        def on_change(event, changed, path, other, incoming):
+            message = MNodeMessage._MESSAGES[event]
+
+            if incoming:
+                message |= MNodeMessage.kIncomingDirection
+
+            if other is not None:
+                message |= MNodeMessage.kOtherPlugSet
+                other = MPlug._make(*other)
+            else:
+                other = MPlug()
+
+            function(message, MPlug._make(changed, path), other, client_data)
+
+        return scene.add_callback(
+            scene.ATTRIBUTE_CHANGED, on_change, node=_get_node(node)
+        )
+
+    @staticmethod
+    def addNameChangedCallback(node, function, client_data=None):
+        """Call the function with (node, previous_name, client_data) on renames.
+
+        A null node gets the renames of every node.
+        """
+
+        filters = {} if node.isNull() else {"node": _get_node(node)}
+
+        return scene.add_callback(
+            scene.NAME_CHANGED,
+            lambda renamed, previous: function(
+                _wrap_node(renamed), previous, client_data
+            ),
+            **filters
+        )
+
+    @staticmethod
+    def addNodePreRemovalCallback(node, function, client_data=None):
+        """Call the function with (node, client_data) before the node is removed."""
+
+        return scene.add_callback(
+            scene.NODE_REMOVED,
+            lambda removed: function(_wrap_node(removed), client_data),
+            node=_get_node(node),
+        )
+
+
+class MSceneMessage(MMessage):
+    """Scene callbacks."""
+
+    (
+        kSceneUpdate,
+        kBeforeNew,
+        kAfterNew,
+        kBeforeImport,
+        kAfterImport,
+        kBeforeOpen,
+        kAfterOpen,
+        kBeforeSave,
+        kAfterSave,
+        kMayaExiting,
+    ) = range(10)
+
+    _EVENTS = {kBeforeNew: scene.BEFORE_NEW, kAfterNew: scene.AFTER_NEW}
+
+    @staticmethod
+    def addCallback(message, function, client_data=None):
+        """Call the function with (client_data) on the given scene message.
+
+        The fake backend only sends kBeforeNew and kAfterNew.
+        """
+
+        event = MSceneMessage._EVENTS.get(message, "scene_message_{}".format(message))
+
+        return scene.add_callback(event, lambda: function(client_data))
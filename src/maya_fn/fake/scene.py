@@ -0,0 +1,1175 @@
+"""In-memory scene of the fake Maya backend.
+
+The scene keeps an index for every lookup that maya_fn makes - short name ->
+nodes, node type -> nodes, node -> children, and per node connection tables -
+so that no query walks the whole scene, and synthetic scenes of a million
+nodes stay usable.
+
+Every edit goes through one of the primitive methods of `Scene`, which
+records how to undo and redo it, and notifies the registered callbacks. The
+`maya.cmds` and `maya.api.OpenMaya` stand-ins are built on top of these.
+"""
+
+from __future__ import print_function
+
+import collections
+import contextlib
+import fnmatch
+import itertools
+import re
+import sys
+import traceback
+
+NUMERIC = "numeric"
+UNIT = "unit"
+TYPED = "typed"
+MATRIX = "matrix"
+ENUM = "enum"
+MESSAGE = "message"
+COMPOUND = "compound"
+
+NUMERIC_TYPE_NAMES = {
+    "kBoolean": "bool",
+    "kByte": "byte",
+    "kChar": "char",
+    "kShort": "short",
+    "k2Short": "short2",
+    "k3Short": "short3",
+    "kInt": "long",
+    "k2Int": "long2",
+    "k3Int": "long3",
+    "kInt64": "int64",
+    "kFloat": "float",
+    "k2Float": "float2",
+    "k3Float": "float3",
+    "kDouble": "double",
+    "k2Double": "double2",
+    "k3Double": "double3",
+    "k4Double": "double4",
+    "kAddr": "addr",
+}
+
+UNIT_TYPE_NAMES = {
+    "kAngle": "doubleAngle",
+    "kDistance": "doubleLinear",
+    "kTime": "time",
+}
+
+TYPED_TYPE_NAMES = {
+    "kString": "string",
+    "kMatrix": "matrix",
+    "kStringArray": "stringArray",
+    "kDoubleArray": "doubleArray",
+    "kIntArray": "Int32Array",
+    "kPointArray": "pointArray",
+    "kVectorArray": "vectorArray",
+    "kMatrixArray": "matrixArray",
+    "kComponentList": "componentList",
+    "kMesh": "mesh",
+    "kNurbsCurve": "nurbsCurve",
+    "kNurbsSurface": "nurbsSurface",
+}
+
+# Node type -> names of the components of the nodes of that type.
+COMPONENT_NAMES = {
+    "mesh": ["vtx", "e", "f"],
+    "nurbsCurve": ["cv"],
+}
+
+# Scene events, and the arguments their callbacks are called with.
+NODE_ADDED = "node_added"  # (node)
+NODE_REMOVED = "node_removed"  # (node)
+NAME_CHANGED = "name_changed"  # (node, previous_name)
+PARENT_ADDED = "parent_added"  # (child, parent)
+PARENT_REMOVED = "parent_removed"  # (child, parent)
+CONNECTION = "connection"  # (source, destination, made)
+ATTRIBUTE_CHANGED = "attribute_changed"  # (event, node, path, other, incoming)
+BEFORE_NEW = "before_new"  # ()
+AFTER_NEW = "after_new"  # ()
+
+# Events of ATTRIBUTE_CHANGED.
+ATTRIBUTE_SET = "set"
+CONNECTION_MADE = "connection_made"
+CONNECTION_BROKEN = "connection_broken"
+ATTRIBUTE_ADDED = "added"
+ATTRIBUTE_REMOVED = "removed"
+
+UNDO_QUEUE_LENGTH = 50
+
+# Value of `Scene.set_value` that removes the stored value of a plug.
+MISSING = object()
+_PART = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)((?:\[\d+\])*)$")
+_INDEX = re.compile(r"\[(\d+)\]")
+_COMPONENT = re.compile(r"^([A-Za-z]+)\[(?:\*|\d+(?::\d+)?)\]$")
+_TRAILING_DIGITS = re.compile(r"^(.*?)(\d*)$")
+
+_ids = itertools.count(1)
+_callback_ids = itertools.count(1)
+_callbacks = collections.defaultdict(collections.OrderedDict)
+
+# The current scene; replaced by a new scene on `cmds.file(new=True)`.
+current = None
+
+
+class Attribute(object):
+    """An attribute of a node type, or a dynamic attribute of one node."""
+
+    __slots__ = [
+        "long_name",
+        "short_name",
+        "kind",
+        "numeric_type",
+        "unit_type",
+        "data_type",
+        "array",
+        "readable",
+        "writable",
+        "keyable",
+        "default",
+        "children",
+        "parent",
+        "dynamic",
+        "enum_names",
+        "__weakref__",
+    ]
+
+    def __init__(
+        self,
+        long_name,
+        short_name=None,
+        kind=NUMERIC,
+        numeric_type=None,
+        unit_type=None,
+        data_type=None,
+        array=False,
+        readable=True,
+        writable=True,
+        keyable=False,
+        default=None,
+        children=(),
+        dynamic=False,
+        enum_names=None,
+    ):
+        """Initialize the attribute; see the slots for the meaning of each argument."""
+
+        self.long_name = long_name
+        self.short_name = short_name or long_name
+        self.kind = kind
+        self.numeric_type = numeric_type
+        self.unit_type = unit_type
+        self.data_type = data_type
+        self.array = array
+        self.readable = readable
+        self.writable = writable
+        self.keyable = keyable
+        self.default = default
+        self.children = list(children)
+        self.parent = None
+        self.dynamic = dynamic
+        self.enum_names = enum_names
+
+        for child in self.children:
+            child.parent = self
+
+    def __repr__(self):
+        """Return the representation of this attribute."""
+
+        return "Attribute({!r})".format(self.long_name)
+
+    @property
+    def type_name(self):
+        """Return the type of this attribute, as named by getAttr -type."""
+
+        if self.kind == NUMERIC:
+            return NUMERIC_TYPE_NAMES.get(self.numeric_type)
+        if self.kind == UNIT:
+            return UNIT_TYPE_NAMES.get(self.unit_type)
+        if self.kind == TYPED:
+            return TYPED_TYPE_NAMES.get(self.data_type)
+        if self.kind == COMPOUND:
+            return "TdataCompound"
+
+        return self.kind
+
+    def add_child(self, child):
+        """Add a child to this compound attribute."""
+
+        child.parent = self
+        child.dynamic = self.dynamic
+        self.children.append(child)
+
+    def ancestors(self):
+        """Return the attributes from the top-level attribute to this one."""
+
+        chain = [self]
+
+        while chain[-1].parent is not None:
+            chain.append(chain[-1].parent)
+
+        return chain[::-1]
+
+    def descendents(self):
+        """Yield this attribute and all of its descendents."""
+
+        yield self
+
+        for child in self.children:
+            for each in child.descendents():
+                yield each
+
+
+class NodeType(object):
+    """A node type, with its static attributes."""
+
+    def __init__(
+        self,
+        name,
+        parent=None,
+        attributes=(),
+        affects=None,
+        compute=None,
+        abstract=False,
+        default_name=None,
+    ):
+        """Initialize the node type, with the attributes of its parent type."""
+
+        self.name = name
+        self.parent = parent
+        self.abstract = abstract
+        self.default_name = default_name or name
+
+        self.inherited = (parent.inherited if parent else []) + [name]
+        self.is_dag = "dagNode" in self.inherited
+        self.is_shape = "shape" in self.inherited
+        self.attributes = (parent.attributes if parent else []) + list(attributes)
+        self.affects = dict(parent.affects) if parent else {}
+        self.compute = dict(parent.compute) if parent else {}
+
+        self.compute.update(compute or {})
+
+        for source, outputs in (affects or {}).items():
+            self.affects[source] = self.affects.get(source, []) + list(outputs)
+
+        self.by_name = {}
+
+        for attribute in self.attributes:
+            for each in attribute.descendents():
+                self.by_name.setdefault(each.long_name, each)
+                self.by_name.setdefault(each.short_name, each)
+
+
+class Node(object):
+    """A node of the scene.
+
+    DAG nodes have the world node, or another DAG node, as their parent. DG
+    nodes have no parent.
+    """
+
+    __slots__ = [
+        "id",
+        "type",
+        "name",
+        "parent",
+        "children",
+        "values",
+        "inputs",
+        "outputs",
+        "dynamic",
+        "dynamic_by_name",
+        "locked",
+        "alive",
+        "__weakref__",
+    ]
+
+    def __init__(self, node_type, name):
+        """Initialize a node, which is not in the scene until it is added."""
+
+        self.id = next(_ids)
+        self.type = node_type
+        self.name = name
+        self.parent = None
+        self.children = []
+        self.values = {}
+        self.inputs = {}
+        self.outputs = {}
+        self.dynamic = []
+        self.dynamic_by_name = {}
+        self.locked = set()
+        self.alive = False
+
+    def __repr__(self):
+        """Return the representation of this node."""
+
+        return "Node({!r}, {!r})".format(self.type.name, self.name)
+
+    @property
+    def is_dag(self):
+        """Return True if this is a DAG node."""
+
+        return self.type.is_dag
+
+    def attribute(self, name):
+        """Return the attribute of the given long or short name, or None."""
+
+        return self.dynamic_by_name.get(name) or self.type.by_name.get(name)
+
+    def attributes(self):
+        """Return the top-level attributes of this node."""
+
+        return self.type.attributes + self.dynamic
+
+    def path(self, name, index=None):
+        """Return the plug path of the given attribute; the key of its value."""
+
+        attribute = self.attribute(name)
+        path = tuple((each, None) for each in attribute.ancestors())
+
+        return path[:-1] + ((attribute, index),)
+
+
+class Scene(object):
+    """The nodes, values and connections of the current scene."""
+
+    def __init__(self, node_types):
+        """Initialize an empty scene of the given {name: NodeType} types."""
+
+        self.node_types = node_types
+
+        self.world = Node(node_types["world"], "")
+        self.world.alive = True
+
+        self.nodes = collections.OrderedDict()
+        self.by_name = collections.defaultdict(set)
+        self.by_type = collections.defaultdict(set)
+
+        self.undo_state = True
+        self.undo_queue = collections.deque(maxlen=UNDO_QUEUE_LENGTH)
+        self.redo_queue = []
+
+        self._chunks = []
+        self._recorders = []
+        self._name_hints = {}
+
+    # Queries
+
+    def find(self, name):
+        """Return the nodes that match the given name or path, in creation order.
+
+        The name may be a short name, a partial or full DAG path, or a pattern
+        with * and ? wildcards in its last part.
+        """
+
+        parts = name.split("|")
+        absolute = not parts[0]
+
+        if absolute:
+            parts = parts[1:]
+
+        if not parts or not all(parts):
+            return []
+
+        if "*" in parts[-1] or "?" in parts[-1]:
+            candidates = [
+                node
+                for short_name in fnmatch.filter(list(self.by_name), parts[-1])
+                for node in self.by_name[short_name]
+            ]
+        else:
+            candidates = self.by_name.get(parts[-1], ())
+
+        matches = []
+
+        for node in candidates:
+            current = node
+
+            for part in reversed(parts[:-1]):
+                current = current.parent
+
+                if current is None or current is self.world or current.name != part:
+                    break
+            else:
+                if not absolute or current.parent is self.world:
+                    matches.append(node)
+
+        return sorted(matches, key=lambda node: node.id)
+
+    def find_components(self, name):
+        """Return the (shape, component) components that match the given name.
+
+        The node may be a shape, or a transform whose shapes have the
+        component, as in "pCube1.vtx[0]".
+        """
+
+        node_name, _, component = name.partition(".")
+        match = _COMPONENT.match(component)
+
+        if match is None:
+            return []
+
+        components = []
+
+        for node in self.find(node_name):
+            shapes = [node] if node.type.is_shape else node.children
+
+            for shape in shapes:
+                names = COMPONENT_NAMES.get(shape.type.name, ())
+
+                if match.group(1) in names:
+                    components.append((shape, component))
+
+        return components
+
+    def find_plug(self, name):
+        """Return the (node, path) plugs that match the given plug name."""
+
+        node_name, _, attr = name.partition(".")
+
+        if not attr:
+            return []
+
+        plugs = []
+
+        for node in self.find(node_name):
+            path = self.plug_path(node, attr)
+
+            if path is not None:
+                plugs.append((node, path))
+
+        return plugs
+
+    def full_path(self, node):
+        """Return the full path of a DAG node, or the name of a DG node."""
+
+        if node.parent is None:
+            return node.name
+
+        names = []
+
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+
+        return "|" + "|".join(reversed(names))
+
+    def nodes_of_type(self, node_type):
+        """Return the nodes of the given type or its subtypes, in creation order."""
+
+        nodes = []
+
+        for name, each in self.node_types.items():
+            if node_type in each.inherited:
+                nodes.extend(self.by_type.get(name, ()))
+
+        return sorted(nodes, key=lambda node: node.id)
+
+    def partial_path(self, node):
+        """Return the shortest unique path of a DAG node, or the name of a DG node."""
+
+        if node.parent is None:
+            return node.name
+
+        others = [
+            (other, other)
+            for other in self.by_name.get(node.name, ())
+            if other is not node
+        ]
+        names = [node.name]
+        current = node
+
+        while others:
+            current = current.parent
+
+            if current is self.world:
+                return "|" + "|".join(names)
+
+            names.insert(0, current.name)
+            others = [
+                (other, ancestor.parent)
+                for other, ancestor in others
+                if ancestor.parent is not self.world
+                and ancestor.parent.name == current.name
+            ]
+
+        return "|".join(names)
+
+    def plug_path(self, node, attr):
+        """Return the path of the given attribute path on the given node, or None.
+
+        A child attribute may be named without its parent, like "translateX".
+        """
+
+        path = []
+
+        for part in attr.split("."):
+            match = _PART.match(part)
+
+            if match is None:
+                return None
+
+            attribute = node.attribute(match.group(1))
+            indices = [int(each) for each in _INDEX.findall(match.group(2))]
+
+            if attribute is None or len(indices) > 1:
+                return None
+
+            chain = attribute.ancestors()
+
+            if path:
+                if path[-1][0] not in chain:
+                    return None
+                start = chain.index(path[-1][0]) + 1
+                chain = chain[start:]
+
+            path.extend((each, None) for each in chain[:-1])
+
+            if indices and not attribute.array:
+                return None
+
+            path.append((attribute, indices[0] if indices else None))
+
+        return tuple(path)
+
+    def plug_name(self, node, path, full_path=False, long_names=True, full_attr=False):
+        """Return the name of the given plug."""
+
+        node_name = self.full_path(node) if full_path else self.partial_path(node)
+
+        return node_name + "." + attribute_path(path, long_names, full_attr)
+
+    def unique_name(self, name, is_dag, parent, exclude=None):
+        """Return the given name, or a numbered name if it is already taken.
+
+        A # in the name is replaced with the lowest free number. A DAG node only
+        needs a name that is unique among its siblings, but numbered names are
+        unique in the whole scene.
+        """
+
+        def is_taken(candidate, siblings_only=False):
+            for other in self.by_name.get(candidate, ()):
+                if other is exclude:
+                    continue
+                if not (
+                    siblings_only
+                    and is_dag
+                    and other.parent is not None
+                    and other.parent is not parent
+                ):
+                    return True
+            return False
+
+        if "#" in name:
+            base, _, suffix = name.partition("#")
+            start = 1
+        elif not is_taken(name, siblings_only=True):
+            return name
+        else:
+            base, digits = _TRAILING_DIGITS.match(name).groups()
+            suffix = ""
+            start = int(digits) + 1 if digits else 1
+
+        # When the lowest number is taken, continue from the highest number
+        # given so far, so that naming many nodes does not scan every number.
+        number = start
+        hint = self._name_hints.get(base, 0)
+
+        if is_taken(base + str(number) + suffix):
+            number = max(start, hint) + 1
+
+        while is_taken(base + str(number) + suffix):
+            number += 1
+
+        self._name_hints[base] = max(number, hint)
+
+        return base + str(number) + suffix
+
+    # Values
+
+    def get_value(self, node, path):
+        """Return the value of the given plug, in internal units.
+
+        Connected plugs return the value of their source, and output
+        attributes of node types with a compute function are computed.
+        Compounds return a tuple of their children, and arrays a list of their
+        elements.
+        """
+
+        source = self.source_of(node, path)
+
+        if source is not None:
+            return self.get_value(*source)
+
+        value = self._computed(node, path)
+
+        if value is not MISSING:
+            return value
+
+        attribute, index = path[-1]
+
+        if attribute.array and index is None:
+            return [
+                self.get_value(node, path[:-1] + ((attribute, i),))
+                for i in self.indices(node, path)
+            ]
+
+        if attribute.children:
+            return tuple(
+                self.get_value(node, path + ((child, None),))
+                for child in attribute.children
+            )
+
+        return node.values.get(path, attribute.default)
+
+    def indices(self, node, path):
+        """Return the existing logical indices of the given array plug."""
+
+        depth = len(path) - 1
+        attribute = path[-1][0]
+        prefix = path[:-1]
+        indices = set()
+
+        for table in (node.values, node.inputs, node.outputs):
+            for key in table:
+                if (
+                    len(key) > depth
+                    and key[depth][0] is attribute
+                    and key[depth][1] is not None
+                    and key[:depth] == prefix
+                ):
+                    indices.add(key[depth][1])
+
+        if attribute.long_name in node.type.compute and not attribute.dynamic:
+            # Computed arrays, like worldMatrix, have an element per instance.
+            indices.add(0)
+
+        return sorted(indices)
+
+    def source_of(self, node, path):
+        """Return the (node, path) of the source of the given plug, or None.
+
+        A plug whose compound parent is connected gets its value from the child
+        at the same position of the source compound.
+        """
+
+        source = node.inputs.get(path)
+
+        if source is not None:
+            return source
+
+        for depth in range(len(path) - 1, 0, -1):
+            source = node.inputs.get(path[:depth])
+
+            if source is None:
+                continue
+
+            source_node, source_path = source
+
+            for attribute, index in path[depth:]:
+                children = source_path[-1][0].children
+                position = attribute.parent.children.index(attribute)
+
+                if position >= len(children):
+                    return None
+
+                source_path = source_path + ((children[position], index),)
+
+            return source_node, source_path
+
+        return None
+
+    def _computed(self, node, path):
+        """Return the computed value of the given plug, or MISSING."""
+
+        compute = node.type.compute
+
+        for depth in range(len(path), 0, -1):
+            attribute, index = path[depth - 1]
+            function = compute.get(attribute.long_name)
+
+            if function is None or attribute.dynamic:
+                continue
+
+            if attribute.array and index is None:
+                return MISSING
+
+            value = function(self, node, index or 0)
+
+            for child, _ in path[depth:]:
+                value = value[child.parent.children.index(child)]
+
+            return value
+
+        return MISSING
+
+    # Edits
+
+    def add_node(self, node, parent=None, index=None):
+        """Add a new, or removed, node to the scene."""
+
+        if node.type.is_dag:
+            parent = parent or self.world
+            node.parent = parent
+            if index is None:
+                parent.children.append(node)
+            else:
+                parent.children.insert(index, node)
+
+        node.alive = True
+        self.nodes[node.id] = node
+        self.by_name[node.name].add(node)
+        self.by_type[node.type.name].add(node)
+
+        self._record(
+            lambda: self.remove_node(node), lambda: self.add_node(node, parent, index)
+        )
+        self._notify(NODE_ADDED, node)
+
+        return node
+
+    def remove_node(self, node):
+        """Remove a node, and its connections, from the scene.
+
+        The children of a DAG node must be removed first.
+        """
+
+        for path, source in list(node.inputs.items()):
+            self.disconnect(source, (node, path))
+
+        for path, destinations in list(node.outputs.items()):
+            for destination in list(destinations):
+                self.disconnect((node, path), destination)
+
+        self._notify(NODE_REMOVED, node)
+
+        parent = node.parent
+        index = None
+
+        if parent is not None:
+            index = parent.children.index(node)
+            del parent.children[index]
+
+        node.alive = False
+        del self.nodes[node.id]
+        self._discard(self.by_name, node.name, node)
+        self._discard(self.by_type, node.type.name, node)
+
+        self._record(
+            lambda: self.add_node(node, parent, index), lambda: self.remove_node(node)
+        )
+
+    def delete(self, node):
+        """Remove a node, after its DAG descendents, from the scene."""
+
+        stack = [node]
+        order = []
+
+        while stack:
+            each = stack.pop()
+            order.append(each)
+            stack.extend(each.children)
+
+        for each in reversed(order):
+            self.remove_node(each)
+
+    def rename(self, node, name):
+        """Rename a node."""
+
+        previous = node.name
+
+        if name == previous:
+            return
+
+        self._discard(self.by_name, previous, node)
+        node.name = name
+        self.by_name[name].add(node)
+
+        self._record(
+            lambda: self.rename(node, previous), lambda: self.rename(node, name)
+        )
+        self._notify(NAME_CHANGED, node, previous)
+
+    def reparent(self, node, parent, index=None):
+        """Move a DAG node under another parent; the world if parent is None."""
+
+        parent = parent or self.world
+        previous = node.parent
+        previous_index = previous.children.index(node)
+
+        self._notify(PARENT_REMOVED, node, previous)
+
+        del previous.children[previous_index]
+        node.parent = parent
+
+        if index is None:
+            parent.children.append(node)
+        else:
+            parent.children.insert(index, node)
+
+        self._record(
+            lambda: self.reparent(node, previous, previous_index),
+            lambda: self.reparent(node, parent, index),
+        )
+        self._notify(PARENT_ADDED, node, parent)
+
+    def connect(self, source, destination):
+        """Connect the source (node, path) to the destination (node, path)."""
+
+        source_node, source_path = source
+        node, path = destination
+
+        node.inputs[path] = source
+        source_node.outputs.setdefault(source_path, []).append(destination)
+
+        self._record(
+            lambda: self.disconnect(source, destination),
+            lambda: self.connect(source, destination),
+        )
+        self._notify(CONNECTION, source, destination, True)
+        self._notify(ATTRIBUTE_CHANGED, CONNECTION_MADE, node, path, source, True)
+        self._notify(
+            ATTRIBUTE_CHANGED,
+            CONNECTION_MADE,
+            source_node,
+            source_path,
+            destination,
+            False,
+        )
+
+    def disconnect(self, source, destination):
+        """Break the connection of the source and destination plugs."""
+
+        source_node, source_path = source
+        node, path = destination
+
+        del node.inputs[path]
+
+        destinations = source_node.outputs[source_path]
+        destinations.remove(destination)
+
+        if not destinations:
+            del source_node.outputs[source_path]
+
+        self._record(
+            lambda: self.connect(source, destination),
+            lambda: self.disconnect(source, destination),
+        )
+        self._notify(CONNECTION, source, destination, False)
+        self._notify(ATTRIBUTE_CHANGED, CONNECTION_BROKEN, node, path, source, True)
+        self._notify(
+            ATTRIBUTE_CHANGED,
+            CONNECTION_BROKEN,
+            source_node,
+            source_path,
+            destination,
+            False,
+        )
+
+    def set_value(self, node, path, value):
+        """Set the value of a plug, in internal units."""
+
+        attribute = path[-1][0]
+
+        if attribute.children and not (attribute.array and path[-1][1] is None):
+            for child, each in zip(attribute.children, value):
+                self.set_value(node, path + ((child, None),), each)
+            return
+
+        previous = node.values.get(path, MISSING)
+
+        if value is MISSING:
+            node.values.pop(path, None)
+        else:
+            node.values[path] = value
+
+        self._record(
+            lambda: self.set_value(node, path, previous),
+            lambda: self.set_value(node, path, value),
+        )
+
+        if value is not MISSING:
+            self._notify(ATTRIBUTE_CHANGED, ATTRIBUTE_SET, node, path, None, False)
+
+    def is_locked(self, node, path):
+        """Return True if the given plug, or its compound parent, is locked."""
+
+        return any(path[:i] in node.locked for i in range(1, len(path) + 1))
+
+    def set_locked(self, node, path, locked):
+        """Lock or unlock a plug."""
+
+        previous = path in node.locked
+
+        if locked:
+            node.locked.add(path)
+        else:
+            node.locked.discard(path)
+
+        self._record(
+            lambda: self.set_locked(node, path, previous),
+            lambda: self.set_locked(node, path, locked),
+        )
+
+    def add_attribute(self, node, attribute, parent=None):
+        """Add a dynamic attribute, or a child of a dynamic compound, to a node."""
+
+        if parent is None:
+            node.dynamic.append(attribute)
+        else:
+            parent.add_child(attribute)
+
+        attribute.dynamic = True
+
+        for each in attribute.descendents():
+            node.dynamic_by_name.setdefault(each.long_name, each)
+            node.dynamic_by_name.setdefault(each.short_name, each)
+
+        self._record(
+            lambda: self.remove_attribute(node, attribute),
+            lambda: self.add_attribute(node, attribute, parent),
+        )
+        self._notify(
+            ATTRIBUTE_CHANGED,
+            ATTRIBUTE_ADDED,
+            node,
+            node.path(attribute.long_name),
+            None,
+            False,
+        )
+
+    def remove_attribute(self, node, attribute):
+        """Remove a dynamic attribute, with its values and connections."""
+
+        attributes = set(attribute.descendents())
+
+        def uses(path):
+            return any(each in attributes for each, _ in path)
+
+        for path, source in list(node.inputs.items()):
+            if uses(path):
+                self.disconnect(source, (node, path))
+
+        for path, destinations in list(node.outputs.items()):
+            if uses(path):
+                for destination in list(destinations):
+                    self.disconnect((node, path), destination)
+
+        for path in [each for each in node.values if uses(each)]:
+            self.set_value(node, path, MISSING)
+
+        self._notify(
+            ATTRIBUTE_CHANGED,
+            ATTRIBUTE_REMOVED,
+            node,
+            node.path(attribute.long_name),
+            None,
+            False,
+        )
+
+        parent = attribute.parent
+
+        if parent is None:
+            node.dynamic.remove(attribute)
+        else:
+            parent.children.remove(attribute)
+
+        for each in attributes:
+            for name in (each.long_name, each.short_name):
+                if node.dynamic_by_name.get(name) is each:
+                    del node.dynamic_by_name[name]
+
+        self._record(
+            lambda: self.add_attribute(node, attribute, parent),
+            lambda: self.remove_attribute(node, attribute),
+        )
+
+    # Undo
+
+    @contextlib.contextmanager
+    def command(self):
+        """Record the edits of a block as one entry of the undo queue."""
+
+        edits = []
+        self._recorders.append(edits)
+
+        try:
+            yield
+        finally:
+            self._recorders.pop()
+            self.commit(edits)
+
+    def commit(self, edits):
+        """Add the given (undo, redo) edits to the undo queue."""
+
+        if not edits:
+            return
+
+        if self._recorders:
+            self._recorders[-1].extend(edits)
+        elif not self.undo_state:
+            return
+        elif self._chunks:
+            self._chunks[-1].extend(edits)
+        else:
+            self.undo_queue.append(edits)
+            del self.redo_queue[:]
+
+    @contextlib.contextmanager
+    def recording(self, edits):
+        """Record the edits of a block into the given list, and nowhere else."""
+
+        self._recorders.append(edits)
+
+        try:
+            yield
+        finally:
+            self._recorders.pop()
+
+    def close_chunk(self):
+        """Close the innermost undo chunk."""
+
+        if self._chunks:
+            self.commit(self._chunks.pop())
+
+    def flush_undo(self):
+        """Forget the undo and redo queues."""
+
+        self.undo_queue.clear()
+        del self.redo_queue[:]
+
+    def open_chunk(self):
+        """Open an undo chunk; its edits are undone together."""
+
+        self._chunks.append([])
+
+    def redo(self):
+        """Redo the last undone entry of the undo queue."""
+
+        if not self.redo_queue:
+            raise RuntimeError("There are no more commands to redo.")
+
+        edits = self.redo_queue.pop()
+
+        with self.recording([]):
+            for _, redo in edits:
+                redo()
+
+        self.undo_queue.append(edits)
+
+    def undo(self):
+        """Undo the last entry of the undo queue."""
+
+        if not self.undo_queue:
+            raise RuntimeError("There are no more commands to undo.")
+
+        edits = self.undo_queue.pop()
+
+        with self.recording([]):
+            for undo, _ in reversed(edits):
+                undo()
+
+        self.redo_queue.append(edits)
+
+    def _record(self, undo, redo):
+        """Record an edit on the innermost recorder."""
+
+        if self._recorders:
+            self._recorders[-1].append((undo, redo))
+
+    @staticmethod
+    def _discard(index, key, node):
+        """Remove a node from an index of sets."""
+
+        nodes = index.get(key)
+
+        if nodes is not None:
+            nodes.discard(node)
+
+            if not nodes:
+                del index[key]
+
+    @staticmethod
+    def _notify(event, *args):
+        """Call the callbacks of the given event."""
+
+        notify(event, *args)
+
+
+def add_callback(event, function, **filters):
+    """Call the given function with the arguments of each event.
+
+    Args:
+        event (str): Scene event.
+        function (Callable): Called with the arguments of the event.
+        **filters: node_type (str) to only get events of nodes of that type,
+            or node (Node) to only get the events of that node.
+
+    Returns:
+        int: Callback id.
+    """
+
+    callback_id = next(_callback_ids)
+    _callbacks[event][callback_id] = (function, filters)
+
+    return callback_id
+
+
+def attribute_path(path, long_names=True, full_attr=True):
+    """Return the attribute path of the given plug path.
+
+    Parents that are not array elements are left out, as in "translateX"
+    rather than "translate.translateX", unless full_attr is True and the parent
+    is a compound attribute, rather than a numeric compound.
+    """
+
+    parts = []
+
+    for i, (attribute, index) in enumerate(path):
+        is_last = i == len(path) - 1
+        is_full = full_attr and attribute.kind == COMPOUND
+
+        if not (is_full or is_last or index is not None or attribute.array):
+            continue
+
+        name = attribute.long_name if long_names else attribute.short_name
+        parts.append(name if index is None else "{}[{}]".format(name, index))
+
+    return ".".join(parts)
+
+
+def notify(event, *args):
+    """Call the callbacks of the given event.
+
+    Errors raised by a callback are printed, and do not stop the edit.
+    """
+
+    callbacks = _callbacks.get(event)
+
+    if not callbacks:
+        return
+
+    node = args[1] if event == ATTRIBUTE_CHANGED else (args[0] if args else None)
+
+    for function, filters in list(callbacks.values()):
+        if "node" in filters and filters["node"] is not node:
+            continue
+
+        if "node_type" in filters and filters["node_type"] not in node.type.inherited:
+            continue
+
+        try:
+            function(*args)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+
+def remove_callback(callback_id):
+    """Remove a callback.
+
+    Raises:
+        RuntimeError: If the callback does not exist.
+    """
+
+    for callbacks in _callbacks.values():
+        if callbacks.pop(callback_id, None) is not None:
+            return
+
+    raise RuntimeError("Callback {} does not exist.".format(callback_id))
@@ -0,0 +1,16 @@
+"""Stand-in for maya.standalone.
+
+The fake backend needs no initialization; these only start a new scene.
+"""
+
+from maya_fn.fake import nodetypes
+
+
+def initialize(name="python"):
+    """Start a new scene."""
+
+    nodetypes.new_scene()
+
+
+def uninitialize():
+    """Do nothing; there is nothing to shut down."""
@@ -0,0 +1,826 @@
+"""Offline reading of Maya ASCII (.ma) files.
+
+A .ma file is read as a stream of MEL statements - `createNode`, `parent`,
+`connectAttr`, `setAttr` and so on - into a compact graph of its nodes and
+connections, without Maya. The graph answers the queries of `maya_fn.dag`
+and `maya_fn.plug` for the nodes of the file.
+
+    scene = maya_fn.ma.read("/publish/char.ma")
+    scene.children("|char|geo")
+    scene.source("|char|geo|bodyShape.inMesh")
+
+Files are memory-mapped and tokenized in place, so reading a multi-GB file
+does not load it into memory. The values of `setAttr` statements, which make
+up most of a large file, are skipped unless they are asked for.
+
+Attribute names are kept as they are written in the file, which are mostly
+short names, such as "t" for "translate".
+"""
+
+import array
+import collections
+import contextlib
+import mmap
+import os
+import re
+
+import six
+
+__all__ = [
+    "MayaAsciiScene",
+    "TRANSFORM_TYPES",
+    "read",
+    "statements",
+]
+
+# Node types that are transforms; other node types created under a DAG node
+# are taken as shapes.
+TRANSFORM_TYPES = frozenset(
+    [
+        "aimConstraint",
+        "dagContainer",
+        "follicle",
+        "hikIKEffector",
+        "ikEffector",
+        "ikHandle",
+        "joint",
+        "lodGroup",
+        "orientConstraint",
+        "parentConstraint",
+        "place3dTexture",
+        "pointConstraint",
+        "poleVectorConstraint",
+        "scaleConstraint",
+        "transform",
+    ]
+)
+
+# Command -> {flag: number of arguments} of the flags that do not take one
+# argument. Flags that are not listed take one argument.
+_FLAG_ARGUMENTS = {
+    "addAttr": {"-m": 0, "-im": 0, "-uac": 0, "-h": 1},
+    "connectAttr": {"-na": 0, "-f": 0},
+    "createNode": {"-s": 0, "-ss": 0},
+    "file": {"-r": 0, "-rpr": 1},
+    "parent": {"-s": 0, "-nc": 0, "-r": 0, "-add": 0, "-w": 0, "-a": 0},
+    "select": {"-ne": 0, "-add": 0, "-r": 0, "-noExpand": 0},
+    "setAttr": {"-av": 0, "-ca": 0, "-c": 0},
+}
+
+_BOOLEANS = {
+    "on": True,
+    "yes": True,
+    "true": True,
+    "off": False,
+    "no": False,
+    "false": False,
+}
+
+_TOKEN = re.compile(
+    br"\s*(?:(//[^\n]*)|(\"(?:[^\"\\]|\\.)*\")|(;)|([^\s;\"]+))", re.DOTALL
+)
+# Unrolled so that a statement without a closing ";" fails in linear time.
+_SKIP = re.compile(br"[^;\"]*(?:\"(?:[^\"\\]|\\.)*\"[^;\"]*)*;", re.DOTALL)
+_FLAG = re.compile(r"^-[A-Za-z]")
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+_WORLD = -1
+_NO_PARENT = -2
+
+# Commands that change the scene, other than setAttr.
+_READERS = frozenset(
+    ["connectAttr", "createNode", "file", "parent", "requires", "select"]
+)
+
+
+def read(path, values=False):
+    """Read the given .ma file.
+
+    Args:
+        path (str): Path to a Maya ASCII file.
+        values (bool | Iterable[str]): True to keep the values of every
+            `setAttr` statement, or the names of the attributes to keep the
+            values of, as they are written in the file. False skips every
+            value, which keeps memory use proportional to the number of
+            nodes and connections rather than to the size of the file.
+
+    Returns:
+        MayaAsciiScene
+    """
+
+    scene = MayaAsciiScene(path)
+
+    with _open(path) as buffer:
+        scene._read(buffer, values)
+
+    return scene
+
+
+def statements(path):
+    """Yield the command and arguments of each statement of the given .ma file.
+
+    Strings are unquoted; every other argument, including flags and
+    numbers, is yielded as it is written.
+
+    Args:
+        path (str): Path to a Maya ASCII file.
+
+    Yields:
+        tuple[str, list[str]]
+    """
+
+    with _open(path) as buffer:
+        for statement in _commands(buffer):
+            yield statement.command, statement.arguments()
+
+
+class MayaAsciiScene(object):
+    """The nodes, hierarchy and connections of a .ma file.
+
+    DAG queries take a node name, partial path or full path, and return full
+    paths, like `maya_fn.dag`. Plug queries take and return "node.attribute"
+    names, like `maya_fn.plug`.
+
+    Nodes that are used by the file without being created in it - such as
+    the default nodes of every scene, like "time1", and nodes of referenced
+    files - are added as nodes without a type.
+    """
+
+    def __init__(self, path=None):
+        """Initialize an empty scene, read from the given path."""
+
+        self.path = path
+        self.references = []
+        self.requires = collections.OrderedDict()
+
+        self._names = []
+        self._types = array.array("i")
+        self._parents = array.array("i")
+        self._type_names = []
+        self._type_ids = {}
+        self._by_name = collections.defaultdict(list)
+        self._children = {_WORLD: []}
+        self._instances = collections.defaultdict(list)
+        self._sources = {}
+        self._destinations = collections.defaultdict(list)
+        self._values = {}
+
+    def __contains__(self, node):
+        """Return True if exactly one node matches the given name or path."""
+
+        return len(self._find(node)) == 1
+
+    def __len__(self):
+        """Return the number of nodes."""
+
+        return len(self._names)
+
+    def ancestors(self, dag_node):
+        """Return the ancestors of the given dag node, depth first.
+
+        Args:
+            dag_node (str): DAG node of the file.
+
+        Returns:
+            list[str]
+        """
+
+        chain = self._chain(self._resolve(dag_node))
+
+        return [self._path(chain[:i]) for i in range(1, len(chain))]
+
+    def children(self, dag_node):
+        """Return the children transforms of the given node.
+
+        Args:
+            dag_node (str): DAG node of the file.
+
+        Returns:
+            list[str]
+        """
+
+        key = self._resolve(dag_node)
+        prefix = self._path(self._chain(key))
+
+        return [
+            prefix + "|" + self._names[child]
+            for child in self._children.get(key, ())
+            if self._is_transform(child)
+        ]
+
+    def connections(self):
+        """Yield the (source, destination) plugs of every connection.
+
+        Yields:
+            tuple[str, str]
+        """
+
+        for destination, source in six.iteritems(self._sources):
+            yield self._plug_name(source), self._plug_name(destination)
+
+    def destinations(self, plug):
+        """Return the outputs of the given plug.
+
+        Args:
+            plug (str): Plug of the file.
+
+        Returns:
+            list[str]
+        """
+
+        return [
+            self._plug_name(each)
+            for each in self._destinations.get(self._resolve_plug(plug), ())
+        ]
+
+    def downstream(self, plug):
+        """Return the nodes downstream the given plug.
+
+        Args:
+            plug (str): Plug of the file.
+
+        Returns:
+            list[str]
+        """
+
+        return [
+            self._node_name(node)
+            for node, _ in self._destinations.get(self._resolve_plug(plug), ())
+        ]
+
+    def full_path(self, dag_node):
+        """Return the full path of the given dag node.
+
+        Args:
+            dag_node (str): DAG node of the file.
+
+        Returns:
+            str
+        """
+
+        return self._path(self._chain(self._resolve(dag_node)))
+
+    def get_value(self, plug):
+        """Return the value of the given plug, as set by the file.
+
+        Numbers are returned in the units of the file, on/off and yes/no as
+        bools, and strings unquoted.
+
+        Args:
+            plug (str): Plug of the file, with the attribute name of the
+                `setAttr` statement.
+
+        Returns:
+            list[float | int | bool | str] | None: None if the file does not
+                set the plug, or its value was skipped.
+        """
+
+        value = self._values.get(self._resolve_plug(plug))
+
+        if value is None:
+            return None
+
+        return [_parse_value(each) for each in value]
+
+    def name(self, dag_node):
+        """Return the name of the given dag node.
+
+        Args:
+            dag_node (str): DAG node of the file.
+
+        Returns:
+            str
+        """
+
+        return self._names[self._resolve(dag_node)]
+
+    def node_type(self, node):
+        """Return the type of the given node; None if the file does not create it.
+
+        Args:
+            node (str): Node of the file.
+
+        Returns:
+            str | None
+        """
+
+        return self._type_names[self._types[self._resolve(node)]]
+
+    def nodes(self, node_type=None):
+        """Return the nodes of the file; full paths for DAG nodes.
+
+        Args:
+            node_type (str | None): Only return the nodes of this exact type.
+
+        Returns:
+            list[str]
+        """
+
+        if node_type is None:
+            keys = range(len(self._names))
+        elif node_type in self._type_ids:
+            type_id = self._type_ids[node_type]
+            keys = (key for key, each in enumerate(self._types) if each == type_id)
+        else:
+            keys = ()
+
+        return [self._node_name(key) for key in keys]
+
+    def parent(self, dag_node):
+        """Return the parent of the given dag node.
+
+        Args:
+            dag_node (str): DAG node of the file.
+
+        Returns:
+            str | None
+        """
+
+        return self._path(self._chain(self._resolve(dag_node))[:-1]) or None
+
+    def shapes(self, dag_node):
+        """Return the shape nodes for the given node.
+
+        Args:
+            dag_node (str): DAG path of a transform of the file.
+
+        Returns:
+            list[str]
+        """
+
+        key = self._resolve(dag_node)
+        prefix = self._path(self._chain(key))
+
+        return [
+            prefix + "|" + self._names[child]
+            for child in self._children.get(key, ())
+            if not self._is_transform(child)
+        ]
+
+    def siblings(self, dag_node):
+        """Return the siblings of the given dag node.
+
+        Args:
+            dag_node (str): DAG node of the file.
+
+        Returns:
+            list[str]
+        """
+
+        key = self._resolve(dag_node)
+        chain = self._chain(key)
+        prefix = self._path(chain[:-1])
+        parent = chain[-2] if len(chain) > 1 else _WORLD
+
+        return [
+            prefix + "|" + self._names[child]
+            for child in self._children.get(parent, ())
+            if child != key
+        ]
+
+    def source(self, plug):
+        """Return the source of the given plug.
+
+        Args:
+            plug (str): Plug of the file.
+
+        Returns:
+            str | None
+        """
+
+        source = self._sources.get(self._resolve_plug(plug))
+
+        return None if source is None else self._plug_name(source)
+
+    def source_node(self, plug):
+        """Return the node of the source of the given plug.
+
+        There is no `upstream` query: `maya_fn.plug.upstream` returns the
+        source of the source plug, which is a plug, rather than a node.
+
+        Args:
+            plug (str): Plug of the file.
+
+        Returns:
+            str | None
+        """
+
+        source = self._sources.get(self._resolve_plug(plug))
+
+        return None if source is None else self._node_name(source[0])
+
+    def _add_node(self, name, node_type, parent=_NO_PARENT):
+        """Add a node, and return its key."""
+
+        if node_type not in self._type_ids:
+            self._type_ids[node_type] = len(self._type_names)
+            self._type_names.append(node_type)
+
+        if parent == _NO_PARENT and node_type in TRANSFORM_TYPES:
+            parent = _WORLD
+
+        key = len(self._names)
+
+        self._names.append(name)
+        self._types.append(self._type_ids[node_type])
+        self._parents.append(parent)
+        self._by_name[name].append(key)
+
+        if parent != _NO_PARENT:
+            self._link(key, parent)
+
+        return key
+
+    def _chain(self, key):
+        """Return the keys from the world to the given node."""
+
+        chain = []
+
+        while key >= 0:
+            chain.append(key)
+            key = self._parents[key]
+
+        return chain[::-1]
+
+    def _connect(self, source, destination):
+        """Connect the given plugs, replacing the input of the destination."""
+
+        previous = self._sources.get(destination)
+
+        if previous is not None:
+            self._destinations[previous].remove(destination)
+
+        self._sources[destination] = source
+        self._destinations[source].append(destination)
+
+    def _find(self, name):
+        """Return the keys of the nodes that match the given name or path."""
+
+        parts = name.lstrip(":").split("|")
+        absolute = not parts[0]
+
+        if absolute:
+            parts = [part.lstrip(":") for part in parts[1:]]
+
+        matches = []
+
+        for key in self._by_name.get(parts[-1], ()):
+            current = key
+
+            for part in reversed(parts[:-1]):
+                current = self._parents[current]
+
+                if current < 0 or self._names[current] != part:
+                    break
+            else:
+                if not absolute or self._parents[current] == _WORLD:
+                    matches.append(key)
+
+        return matches
+
+    def _is_transform(self, key):
+        """Return True if the given node is a transform."""
+
+        return self._type_names[self._types[key]] in TRANSFORM_TYPES
+
+    def _link(self, child, parent):
+        """Add the given child to the children of the parent."""
+
+        if parent >= 0 and self._parents[parent] == _NO_PARENT:
+            # A node with children is a DAG node, under the world until it
+            # is parented.
+            self._parents[parent] = _WORLD
+            self._children[_WORLD].append(parent)
+
+        self._children.setdefault(parent, []).append(child)
+
+    def _node_name(self, key):
+        """Return the full path of a DAG node, or the name of a DG node."""
+
+        if self._parents[key] == _NO_PARENT:
+            return self._names[key]
+
+        return self._path(self._chain(key))
+
+    def _path(self, chain):
+        """Return the full path of the given keys."""
+
+        return "".join("|" + self._names[key] for key in chain)
+
+    def _plug_name(self, plug):
+        """Return the name of the given (key, attribute) plug."""
+
+        return self._node_name(plug[0]) + "." + plug[1]
+
+    def _reparent(self, child, parent):
+        """Move a node under another parent, or under the world."""
+
+        previous = self._parents[child]
+
+        if previous != _NO_PARENT:
+            self._children[previous].remove(child)
+
+        self._parents[child] = parent
+        self._link(child, parent)
+
+    def _resolve(self, name):
+        """Return the key of the only node that matches the given name.
+
+        Raises:
+            LookupError: If no node, or more than one node, matches the name.
+        """
+
+        keys = self._find(name)
+
+        if not keys:
+            raise LookupError("Object '{}' does not exist.".format(name))
+
+        if len(keys) > 1:
+            raise LookupError("More than one object matches name '{}'.".format(name))
+
+        return keys[0]
+
+    def _resolve_plug(self, plug):
+        """Return the (key, attribute) of the given plug name."""
+
+        node, _, attr = plug.partition(".")
+
+        if not attr:
+            raise LookupError("Plug '{}' has no attribute.".format(plug))
+
+        return self._resolve(node), attr
+
+    def _used(self, name):
+        """Return the key of the given node, adding it if it is not created."""
+
+        name = name.lstrip(":")
+        keys = self._find(name)
+
+        if len(keys) == 1:
+            return keys[0]
+
+        if keys:
+            raise LookupError("More than one object matches name '{}'.".format(name))
+
+        return self._add_node(name.rsplit("|", 1)[-1], None)
+
+    def _read(self, buffer, values):
+        """Add the nodes, connections and values of the statements of a buffer."""
+
+        keep = values if isinstance(values, bool) else frozenset(values)
+        current = None
+
+        for statement in _commands(buffer):
+            command = statement.command
+
+            if command == "setAttr":
+                if current is not None and keep is not False:
+                    self._read_set_attr(statement, current, keep)
+                continue
+
+            if command not in _READERS:
+                continue
+
+            args = statement.arguments()
+            flags = _flags(command, args)
+            positional = _positional(command, args)
+
+            if command == "createNode":
+                parent = flags.get("-p")
+                parent = _NO_PARENT if parent is None else self._used(parent)
+                name = flags.get("-n") or positional[0] + "1"
+                current = self._add_node(name, positional[0], parent)
+            elif command == "select":
+                current = self._used(positional[0]) if positional else None
+            elif command == "connectAttr":
+                source = self._used_plug(positional[0])
+                destination = self._used_plug(positional[1])
+                self._connect(source, destination)
+            elif command == "parent":
+                self._read_parent(flags, positional)
+            elif command == "file":
+                is_reference = "-r" in flags or "-rdi" in flags
+                if (
+                    positional
+                    and is_reference
+                    and positional[-1] not in self.references
+                ):
+                    self.references.append(positional[-1])
+            elif command == "requires" and len(positional) >= 2:
+                self.requires[positional[0]] = positional[1]
+
+    def _read_set_attr(self, statement, node, keep):
+        """Keep the value of a setAttr statement, if its attribute is kept."""
+
+        positional = _positional("setAttr", statement.arguments(limit=1))
+
+        if not positional:
+            return
+
+        attr = positional[0].lstrip(".")
+
+        if keep is True or attr in keep:
+            positional = _positional("setAttr", statement.arguments())
+            self._values[(node, attr)] = tuple(positional[1:])
+
+    def _read_parent(self, flags, names):
+        """Apply a parent statement."""
+
+        if "-w" in flags:
+            parent = _WORLD
+        else:
+            parent = self._used(names.pop())
+
+        for name in names:
+            child = self._used(name)
+
+            if "-add" in flags:
+                self._instances[child].append(parent)
+                self._link(child, parent)
+            else:
+                self._reparent(child, parent)
+
+    def _used_plug(self, plug):
+        """Return the (key, attribute) of the given plug, adding its node."""
+
+        node, _, attr = plug.partition(".")
+
+        return self._used(node), attr
+
+
+@contextlib.contextmanager
+def _open(path):
+    """Yield the content of the given file, memory-mapped."""
+
+    with open(path, "rb") as stream:
+        if not os.fstat(stream.fileno()).st_size:
+            yield b""
+            return
+
+        buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def _commands(buffer):
+    """Yield a `_Statement` for each statement of the given buffer.
+
+    Statements whose arguments are not read are skipped without being
+    tokenized.
+    """
+
+    position = 0
+    size = len(buffer)
+
+    while position < size:
+        match = _TOKEN.match(buffer, position)
+
+        if match is None:
+            break
+
+        position = match.end()
+        comment, string, end, word = match.groups()
+
+        if comment or end:
+            continue
+
+        if string:
+            # A statement cannot start with a string; skip it.
+            position = _skip(buffer, position)
+            continue
+
+        statement = _Statement(buffer, word.decode("utf-8"), position)
+
+        yield statement
+
+        position = statement.end or _skip(buffer, statement.start)
+
+
+class _Statement(object):
+    """A statement of a .ma file, whose arguments are read on demand."""
+
+    __slots__ = ["buffer", "command", "start", "end"]
+
+    def __init__(self, buffer, command, start):
+        """Initialize the statement of the given command."""
+
+        self.buffer = buffer
+        self.command = command
+        self.start = start
+        self.end = None
+
+    def arguments(self, limit=None):
+        """Return the arguments of this statement.
+
+        Args:
+            limit (int | None): Stop reading once this many positional
+                arguments are read.
+
+        Returns:
+            list[str]
+        """
+
+        args = []
+        position = self.start
+
+        while True:
+            match = _TOKEN.match(self.buffer, position)
+
+            if match is None:
+                return args
+
+            position = match.end()
+            comment, string, end, word = match.groups()
+
+            if end:
+                self.end = position
+                return args
+
+            if comment:
+                continue
+
+            if string is not None:
+                args.append(_unquote(string[1:-1].decode("utf-8")))
+            else:
+                args.append(word.decode("utf-8"))
+
+            if limit is not None and len(_positional(self.command, args)) >= limit:
+                return args
+
+
+def _skip(buffer, position):
+    """Return the position after the end of the statement at the given position."""
+
+    match = _SKIP.match(buffer, position)
+
+    return match.end() if match else len(buffer)
+
+
+def _flags(command, args):
+    """Return the {flag: argument} of the given statement arguments.
+
+    Flags without arguments map to True.
+    """
+
+    flags = {}
+    arities = _FLAG_ARGUMENTS.get(command, {})
+    i = 0
+
+    while i < len(args):
+        if _FLAG.match(args[i]):
+            count = arities.get(args[i], 1)
+            flags[args[i]] = args[i + 1] if count and i + 1 < len(args) else True
+            i += 1 + count
+        else:
+            i += 1
+
+    return flags
+
+
+def _positional(command, args):
+    """Return the arguments that are not flags or flag arguments."""
+
+    positional = []
+    arities = _FLAG_ARGUMENTS.get(command, {})
+    i = 0
+
+    while i < len(args):
+        if _FLAG.match(args[i]):
+            i += 1 + arities.get(args[i], 1)
+        else:
+            positional.append(args[i])
+            i += 1
+
+    return positional
+
+
+def _parse_value(token):
+    """Return the given value token as a number or bool, if it is one."""
+
+    if token in _BOOLEANS:
+        return _BOOLEANS[token]
+
+    try:
+        return int(token)
+    except ValueError:
+        pass
+
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _unquote(string):
+    """Return the given quoted string content, with its escapes replaced."""
+
+    if "\\" not in string:
+        return string
+
+    return _ESCAPE.sub(
+        lambda match: _ESCAPES.get(match.group(1), match.group(1)), string
+    )
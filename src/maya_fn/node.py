@@ -1,28 +1,80 @@
 """Maya attribute function set."""
 
+import collections
+import functools
+import math
+
+import six
+
 from maya import cmds
+from maya.api import OpenMaya
 
+import maya_fn._compat
+import maya_fn._modifier
+import maya_fn._util
+import maya_fn.api
 import maya_fn.plug
+import maya_fn.schema
 
 __all__ = [
+    "TypeIndex",
+    "ValueDiff",
+    "ValueSnapshot",
     "add_attr",
     "of_type",
+    "snapshot",
 ]
 
 
-def of_type(nodes, node_type):
-    """Yield the nodes of the given type."""
+KEYABLE = "keyable"
+SETTABLE = "settable"
+
+ValueDiff = collections.namedtuple("ValueDiff", ["plugs", "before", "after"])
+
+
+def of_type(nodes, node_type, index=None):
+    """Return the nodes of the given type.
+
+    Args:
+        nodes (Iterable[Any]): Dependency nodes, by name, Node, MObject or
+            MDagPath.
+        node_type (str | int): Node type name, or MFn type.
+        index (TypeIndex | None): Index of the scene to filter the nodes with,
+            instead of `cmds.ls`; required for MFn types.
+
+    Returns:
+        list[str]: The full paths of DAG nodes, and the names of DG nodes.
+
+    Raises:
+        LookupError: If one of the given Node or MObject nodes does not exist.
+    """
 
-    return cmds.ls(list(nodes), type=node_type, long=True)
+    if index is not None:
+        return index.filter(nodes, node_type)
+
+    if not isinstance(node_type, six.string_types):
+        raise TypeError("Filtering by MFn type requires a TypeIndex.")
+
+    names = [_node_name(node) for node in nodes]
+
+    return cmds.ls(names, type=node_type, long=True) if names else []
 
 
 def add_attr(*args, **kwargs):
     """Add an attribute to the node(s) and return the new plug(s).
 
-    See cmds.addAttr for a list of flags (kwargs).
+    See cmds.addAttr for a list of flags (kwargs). In a
+    `maya_fn.transaction`, the attributes are added when the transaction is
+    committed, and the nodes may be nodes created by the transaction. The
+    command is queued as Python code, so the flag values must then be
+    strings, numbers, booleans, None or lists of those.
 
     Returns:
         str | list[str]
+
+    Raises:
+        LookupError: If one of the given nodes does not exist.
+        TypeError: If a flag of a transaction is not a literal value.
     """
 
     attr_name = kwargs.get("longName") or kwargs.get("ln")
@@ -31,11 +83,37 @@ def add_attr(*args, **kwargs):
     if not attr_name:
         raise ValueError("An attribute name was not specified.")
 
-    cmds.addAttr(*args, **kwargs)
-
+    args = [str(arg) for arg in args]
     values = [parent, attr_name] if parent else [attr_name]
+    transaction = maya_fn._modifier.current()
+
+    if transaction is None:
+        cmds.addAttr(*args, **kwargs)
+        nodes = cmds.ls(args, long=True)
+        maya_fn.schema.invalidate(nodes)
+    else:
+        for key, value in kwargs.items():
+            if not _is_literal(value):
+                raise TypeError(
+                    "Flag '{}' of add_attr must be a literal in a transaction, "
+                    "got {!r}.".format(key, value)
+                )
+
+        transaction.modifier.pythonCommandToExecute(
+            "import maya.cmds; maya.cmds.addAttr(*{!r}, **{!r})".format(args, kwargs)
+        )
+        nodes = []
+
+        for arg in args:
+            if arg not in transaction.created:
+                arg = maya_fn._util.full_name(maya_fn.api.get_object(arg))
+
+            nodes.append(arg)
+
+        transaction.callbacks.append(
+            functools.partial(maya_fn.schema.invalidate, nodes)
+        )
 
-    nodes = cmds.ls(args, long=True)
     plugs = [maya_fn.plug(node, *values) for node in nodes]
 
     if len(plugs) == 1:
@@ -45,3 +123,427 @@ def add_attr(*args, **kwargs):
 
 
 get = maya_fn.api.get_object
+
+
+def snapshot(nodes, attrs=KEYABLE):
+    """Return a snapshot of the numeric attribute values of the given nodes.
+
+    Only attributes that hold a single number are recorded; compounds, such
+    as translate, are recorded through their children. Elements of array
+    attributes are not recorded. Values are read in internal units:
+    centimeters and radians.
+
+    Args:
+        nodes (Iterable[Any]): Dependency nodes, by name or MObject.
+        attrs (str): KEYABLE records the keyable attributes; SETTABLE records
+            the attributes that are writable, unlocked and not connected.
+
+    Returns:
+        ValueSnapshot
+
+    Raises:
+        LookupError: If one of the given nodes does not exist.
+        ValueError: If `attrs` is not KEYABLE or SETTABLE.
+    """
+
+    if attrs not in (KEYABLE, SETTABLE):
+        raise ValueError(
+            "Invalid attrs '{}' - expected one of {}, {}.".format(
+                attrs, KEYABLE, SETTABLE
+            )
+        )
+
+    numpy = maya_fn._compat.numpy()
+
+    node_names = []
+    attr_ids = {}
+    node_column = []
+    attr_column = []
+    values = []
+
+    seen = maya_fn._util.NodeMap()
+
+    for obj in maya_fn.api.get_objects(nodes):
+        if obj in seen:
+            continue
+
+        seen[obj] = True
+        node_id = len(node_names)
+        node_names.append(maya_fn._util.full_name(obj))
+        fn = OpenMaya.MFnDependencyNode(obj)
+
+        for i in range(fn.attributeCount()):
+            plug = OpenMaya.MPlug(obj, fn.attribute(i))
+            info = maya_fn.schema.of_plug(plug)
+
+            if info.data_type not in maya_fn._util.SCALAR_TYPES or info.multi:
+                continue
+
+            if attrs == KEYABLE:
+                if not plug.isKeyable:
+                    continue
+            elif not info.writable or plug.isLocked or plug.isDestination:
+                continue
+
+            if _in_array(plug.attribute()):
+                continue
+
+            attr = six.moves.intern(maya_fn.plug.attr(plug))
+
+            node_column.append(node_id)
+            attr_column.append(attr_ids.setdefault(attr, len(attr_ids)))
+            values.append(plug.asDouble())
+
+    attr_names = [None] * len(attr_ids)
+
+    for attr, attr_id in attr_ids.items():
+        attr_names[attr_id] = attr
+
+    return ValueSnapshot(
+        node_names,
+        attr_names,
+        numpy.array(node_column, dtype=numpy.int32),
+        numpy.array(attr_column, dtype=numpy.int32),
+        numpy.array(values, dtype=numpy.float64),
+    )
+
+
+class ValueSnapshot(object):
+    """The numeric attribute values of a set of nodes at one point in time.
+
+    The values are stored in columns: the node id, attribute id and value of
+    each plug, where the ids index the node and attribute tables.
+    """
+
+    def __init__(self, nodes, attrs, node_ids, attr_ids, values):
+        """Initialize the snapshot.
+
+        Args:
+            nodes (list[str]): Names of the nodes; full paths for DAG nodes.
+            attrs (list[str]): Long names of the attributes.
+            node_ids (numpy.ndarray): (N,) node of each plug.
+            attr_ids (numpy.ndarray): (N,) attribute of each plug.
+            values (numpy.ndarray): (N,) value of each plug.
+        """
+
+        self._nodes = nodes
+        self._attrs = attrs
+        self._node_ids = node_ids
+        self._attr_ids = attr_ids
+        self._values = values
+
+    def __len__(self):
+        """Return the number of plugs in the snapshot."""
+
+        return len(self._values)
+
+    @property
+    def values(self):
+        """Return the (N,) values of the plugs of the snapshot."""
+
+        return self._values
+
+    def diff(self, other, tolerance=1e-6):
+        """Return the plugs whose values differ from those of another snapshot.
+
+        Plugs that are only in one of the snapshots are not compared.
+
+        Args:
+            other (ValueSnapshot): The later snapshot.
+            tolerance (float): Largest absolute change that is not a change.
+
+        Returns:
+            ValueDiff: The changed plugs, in the order of this snapshot, with
+                their (N,) values before and after.
+        """
+
+        numpy = maya_fn._compat.numpy()
+
+        if (
+            self._nodes == other._nodes
+            and self._attrs == other._attrs
+            and numpy.array_equal(self._node_ids, other._node_ids)
+            and numpy.array_equal(self._attr_ids, other._attr_ids)
+        ):
+            indices = numpy.arange(len(self))
+            other_indices = indices
+        else:
+            indices, other_indices = self._match(other)
+
+        before = self._values[indices]
+        after = other._values[other_indices]
+        changed = numpy.abs(after - before) > tolerance
+
+        return ValueDiff(self._plugs(indices[changed]), before[changed], after[changed])
+
+    def plugs(self):
+        """Return the names of the plugs of the snapshot, in order.
+
+        Returns:
+            list[str]
+        """
+
+        return self._plugs(range(len(self)))
+
+    def restore(self):
+        """Set every plug back to its value in the snapshot.
+
+        Plugs that are locked or connected are skipped, as they cannot be set.
+        The other values are set as a single undoable operation.
+
+        Returns:
+            list[str]: The names of the skipped plugs.
+        """
+
+        numpy = maya_fn._compat.numpy()
+
+        names = self.plugs()
+        plugs = maya_fn.api.get_plugs(names)
+        settable = numpy.array(
+            [not (plug.isLocked or plug.isDestination) for plug in plugs], dtype=bool
+        )
+
+        if settable.any():
+            maya_fn.plug.set_values(
+                [plug for plug, keep in zip(plugs, settable) if keep],
+                self._values[settable],
+            )
+
+        return [name for name, keep in zip(names, settable) if not keep]
+
+    def _match(self, other):
+        """Return the indices of the plugs of both snapshots that are in both."""
+
+        numpy = maya_fn._compat.numpy()
+
+        nodes, node_map = maya_fn._util.merge_table(self._nodes, other._nodes)
+        attrs, attr_map = maya_fn._util.merge_table(self._attrs, other._attrs)
+        size = max(len(attrs), 1)
+
+        keys = self._node_ids.astype(numpy.int64) * size + self._attr_ids
+        other_keys = node_map[other._node_ids] * size + attr_map[other._attr_ids]
+
+        _, indices, other_indices = numpy.intersect1d(
+            keys, other_keys, assume_unique=True, return_indices=True
+        )
+        order = numpy.argsort(indices)
+
+        return indices[order], other_indices[order]
+
+    def _plugs(self, indices):
+        """Return the names of the plugs at the given indices."""
+
+        nodes = self._nodes
+        attrs = self._attrs
+        node_ids = self._node_ids.tolist()
+        attr_ids = self._attr_ids.tolist()
+
+        return [nodes[node_ids[i]] + "." + attrs[attr_ids[i]] for i in indices]
+
+
+class TypeIndex(object):
+    """An in-memory index of the nodes of the current scene, by type.
+
+    The index is built in one pass over the scene, then kept up to date by
+    scene callbacks as nodes are added and removed. A type matches its own
+    nodes and the nodes of every type that inherits from it, so "shape" and
+    MFn.kShape both match meshes.
+
+    Remove the callbacks with `close` when the index is no longer needed, or
+    use the index as a context manager.
+    """
+
+    def __init__(self):
+        """Build the index from the current scene and add its callbacks."""
+
+        self._build()
+
+        self._callbacks = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._on_node_added),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_node_removed),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kAfterNew, self._on_scene_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kAfterOpen, self._on_scene_changed
+            ),
+        ]
+
+    def __enter__(self):
+        """Return this index."""
+
+        return self
+
+    def __exit__(self, *args):
+        """Remove the scene callbacks of this index."""
+
+        self.close()
+
+    def __len__(self):
+        """Return the number of nodes in the index."""
+
+        return len(self._types)
+
+    def close(self):
+        """Remove the scene callbacks of this index."""
+
+        OpenMaya.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+
+    def filter(self, nodes, node_type):
+        """Return the given nodes that are of the given type.
+
+        Each node is looked up once, so the time taken grows with the number
+        of given nodes, not with the size of the scene.
+
+        Args:
+            nodes (Iterable[Any]): Dependency nodes, by name, Node or MObject.
+            node_type (str | int): Node type name, or MFn type.
+
+        Returns:
+            list[str]: The full paths of DAG nodes, and the names of DG nodes,
+                in the given order.
+
+        Raises:
+            LookupError: If one of the given nodes does not exist.
+        """
+
+        types = set(self._matching_types(node_type))
+
+        return [
+            maya_fn._util.full_name(obj)
+            for obj in maya_fn.api.get_objects(nodes)
+            if self._types.get(obj) in types
+        ]
+
+    def nodes(self, node_type):
+        """Return every node of the given type.
+
+        Args:
+            node_type (str | int): Node type name, or MFn type.
+
+        Returns:
+            list[str]: The full paths of DAG nodes, and the names of DG nodes,
+                grouped by node type.
+        """
+
+        return [
+            maya_fn._util.full_name(handle.object())
+            for type_name in self._matching_types(node_type)
+            for handle in self._by_type[type_name]
+        ]
+
+    def rebuild(self):
+        """Rebuild the whole index from the current scene."""
+
+        self._build()
+
+    def _add(self, node):
+        """Add the given node to the index."""
+
+        if node.hasFn(OpenMaya.MFn.kWorld):
+            return
+
+        type_name = OpenMaya.MFnDependencyNode(node).typeName
+
+        if not self._by_type.get(type_name):
+            # The MFn matches of a type are only known while it has nodes.
+            self._by_type.setdefault(type_name, maya_fn._util.NodeMap())
+            self._matches.clear()
+
+        self._types[node] = type_name
+        self._by_type[type_name][node] = True
+
+    def _build(self):
+        """Build the index from the current scene."""
+
+        self._types = maya_fn._util.NodeMap()
+        self._by_type = collections.OrderedDict()
+        self._matches = {}
+
+        for node in maya_fn._util.iter_nodes():
+            self._add(node)
+
+    def _matching_types(self, node_type):
+        """Return the indexed type names that match the given type."""
+
+        types = self._matches.get(node_type)
+
+        if types is not None:
+            return types
+
+        if isinstance(node_type, six.string_types):
+            types = [
+                type_name
+                for type_name in self._by_type
+                if node_type in maya_fn._util.inherited(type_name)
+            ]
+        else:
+            # Every node of a type has the same MFn types; ask one of them.
+            types = [
+                type_name
+                for type_name, handles in self._by_type.items()
+                if handles and next(iter(handles)).object().hasFn(node_type)
+            ]
+
+        self._matches[node_type] = types
+
+        return types
+
+    def _on_node_added(self, node, *args):
+        """Add a new node to the index."""
+
+        self._add(node)
+
+    def _on_node_removed(self, node, *args):
+        """Remove a deleted node from the index."""
+
+        type_name = self._types.pop(node)
+
+        if type_name is not None:
+            self._by_type[type_name].pop(node)
+
+    def _on_scene_changed(self, *args):
+        """Rebuild the index for a new scene."""
+
+        self._build()
+
+
+def _in_array(attribute):
+    """Return True if the given attribute is below an array attribute."""
+
+    fn = OpenMaya.MFnAttribute(attribute)
+
+    while not fn.parent.isNull():
+        fn = OpenMaya.MFnAttribute(fn.parent)
+
+        if fn.array:
+            return True
+
+    return False
+
+
+def _is_literal(value):
+    """Return True if the repr of the given flag value evaluates back to it."""
+
+    if isinstance(value, (list, tuple)):
+        return all(_is_literal(each) for each in value)
+
+    if isinstance(value, float):
+        return not math.isnan(value) and not math.isinf(value)
+
+    return value is None or isinstance(
+        value, six.string_types + six.integer_types + (bool,)
+    )
+
+
+def _node_name(node):
+    """Return the name of the given node, by name, Node, MObject or MDagPath."""
+
+    if isinstance(node, six.string_types):
+        return node
+
+    if isinstance(node, OpenMaya.MDagPath):
+        return node.fullPathName()
+
+    return maya_fn._util.full_name(maya_fn.api.get_object(node))
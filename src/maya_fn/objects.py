@@ -0,0 +1,454 @@
+"""Handle-backed node and plug objects.
+
+A `Node` holds an MObjectHandle (and an MDagPath for DAG nodes) and a `Plug`
+holds an MPlug, so chained queries on them never resolve a name again. Names
+are only built when asked for. Every maya_fn function also accepts these
+objects wherever it accepts a name.
+"""
+
+from maya.api import OpenMaya
+
+import maya_fn._util
+import maya_fn.api
+import maya_fn.dag
+import maya_fn.plug
+
+__all__ = [
+    "Node",
+    "Plug",
+]
+
+
+class Node(object):
+    """A dependency node in the current scene."""
+
+    __slots__ = ["_handle", "_dag_path"]
+
+    def __init__(self, node):
+        """Initialize the node.
+
+        Args:
+            node (Any): A node, by name, Node, MObject or MDagPath.
+
+        Raises:
+            LookupError: If the given node does not exist.
+            ValueError: If the given node is not selectable.
+        """
+
+        if isinstance(node, Node):
+            self._handle = node._handle
+            self._dag_path = node._dag_path
+            return
+
+        if isinstance(node, OpenMaya.MDagPath):
+            dag_path = OpenMaya.MDagPath(node)
+        else:
+            (dag_path,) = maya_fn.api.get_dag_paths([node], missing=maya_fn.api.NONE)
+
+        if dag_path is not None:
+            obj = dag_path.node()
+        elif isinstance(node, OpenMaya.MObject):
+            obj = node
+        else:
+            obj = maya_fn.api.get_object(node)
+
+        self._handle = OpenMaya.MObjectHandle(obj)
+        self._dag_path = dag_path
+
+    def __eq__(self, other):
+        """Return True if the other object is the same node (and DAG path)."""
+
+        if not isinstance(other, Node):
+            return NotImplemented
+
+        if self._dag_path is not None and other._dag_path is not None:
+            return self._dag_path == other._dag_path
+
+        return self._handle == other._handle
+
+    def __hash__(self):
+        """Return the hash code of the node."""
+
+        return self._handle.hashCode()
+
+    def __ne__(self, other):
+        """Return True if the other object is not the same node."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        """Return the representation of this node."""
+
+        return "{}({!r})".format(type(self).__name__, str(self))
+
+    def __str__(self):
+        """Return the full path of a DAG node, or the name of a DG node."""
+
+        if not self.is_valid:
+            return "<deleted node>"
+
+        return self.full_path
+
+    @property
+    def dag_path(self):
+        """Return a copy of the MDagPath of this node, or None for DG nodes."""
+
+        if self._dag_path is None:
+            return None
+
+        return OpenMaya.MDagPath(self._dag_path)
+
+    @property
+    def full_path(self):
+        """Return the full path of a DAG node, or the name of a DG node."""
+
+        if self._dag_path is None:
+            return OpenMaya.MFnDependencyNode(self.object).name()
+
+        return self._dag_path.fullPathName()
+
+    @property
+    def handle(self):
+        """Return the MObjectHandle of this node."""
+
+        return self._handle
+
+    @property
+    def is_dag(self):
+        """Return True if this node is a DAG node."""
+
+        return self._dag_path is not None
+
+    @property
+    def is_valid(self):
+        """Return True if this node still exists in the scene."""
+
+        return self._handle.isValid() and self._handle.isAlive()
+
+    @property
+    def name(self):
+        """Return the short name of this node."""
+
+        return self.full_path.rsplit("|", 1)[-1]
+
+    @property
+    def object(self):
+        """Return the MObject of this node."""
+
+        return self._handle.object()
+
+    @property
+    def partial_path(self):
+        """Return the shortest unique path of this node."""
+
+        if self._dag_path is None:
+            return self.full_path
+
+        return self._dag_path.partialPathName()
+
+    @property
+    def type_name(self):
+        """Return the node type of this node."""
+
+        return OpenMaya.MFnDependencyNode(self.object).typeName
+
+    def ancestors(self):
+        """Return the ancestors of this DAG node, depth first.
+
+        Returns:
+            list[Node]
+        """
+
+        dag_path = self._get_dag_path()
+        nodes = []
+
+        while dag_path.length() > 1:
+            dag_path = OpenMaya.MDagPath(dag_path).pop()
+            nodes.append(Node(dag_path))
+
+        return nodes[::-1]
+
+    def children(self):
+        """Return the children transforms of this DAG node.
+
+        Returns:
+            list[Node]
+        """
+
+        return self._children(OpenMaya.MFn.kTransform)
+
+    def descendents(self, **kwargs):
+        """Yield the descendents of this DAG node.
+
+        Args:
+            **kwargs: Traversal options of `maya_fn.dag.descendents`.
+
+        Yields:
+            Node
+        """
+
+        options = dict(
+            order=maya_fn.dag.DEPTH_FIRST,
+            max_depth=None,
+            types=(OpenMaya.MFn.kTransform,),
+            prune=None,
+        )
+        options.update(kwargs)
+
+        for dag_path in maya_fn._util.iter_descendents(
+            self._get_dag_path(),
+            options["order"],
+            options["max_depth"],
+            options["types"],
+            options["prune"],
+        ):
+            yield Node(dag_path)
+
+    def parent(self):
+        """Return the parent of this DAG node.
+
+        Returns:
+            Node | None
+        """
+
+        dag_path = self._get_dag_path()
+
+        if dag_path.length() < 2:
+            return None
+
+        return Node(OpenMaya.MDagPath(dag_path).pop())
+
+    def plug(self, *args):
+        """Return a plug of this node.
+
+        Args:
+            *args (str | int): Token(s) of the attribute path, as for
+                `maya_fn.plug.make`.
+
+        Returns:
+            Plug
+
+        Raises:
+            LookupError: If this node does not have the attribute.
+        """
+
+        attr = maya_fn.plug.make(*args)
+        plug = maya_fn.api.find_plug(self.object, attr)
+
+        if plug is None:
+            raise LookupError(
+                "Object '{}' does not exist.".format(maya_fn.plug.make(self, attr))
+            )
+
+        return Plug(plug)
+
+    def shapes(self):
+        """Return the shape nodes of this DAG node.
+
+        Returns:
+            list[Node]
+        """
+
+        return self._children(OpenMaya.MFn.kShape)
+
+    def siblings(self):
+        """Return the siblings of this DAG node.
+
+        Returns:
+            list[Node]
+        """
+
+        dag_path = self._get_dag_path()
+
+        if dag_path.length() > 1:
+            parent = OpenMaya.MDagPath(dag_path).pop()
+        else:
+            parent = OpenMaya.MDagPath.getAPathTo(OpenMaya.MItDag().root())
+
+        return [
+            Node(each)
+            for each in (
+                maya_fn._util.child_path(parent, i) for i in range(parent.childCount())
+            )
+            if each != dag_path
+        ]
+
+    def _children(self, fn_type):
+        """Return the children of this node of the given MFn type."""
+
+        dag_path = self._get_dag_path()
+
+        return [
+            Node(maya_fn._util.child_path(dag_path, i))
+            for i in range(dag_path.childCount())
+            if dag_path.child(i).hasFn(fn_type)
+        ]
+
+    def _get_dag_path(self):
+        """Return the MDagPath of this node, which must be a DAG node."""
+
+        if self._dag_path is None:
+            raise TypeError("Object '{}' is not a DAG node.".format(self))
+
+        return self._dag_path
+
+
+class Plug(object):
+    """A plug in the current scene."""
+
+    __slots__ = ["_plug"]
+
+    def __init__(self, plug):
+        """Initialize the plug.
+
+        Args:
+            plug (Any): A plug, by name, Plug or MPlug.
+
+        Raises:
+            LookupError: If the given plug does not exist.
+            TypeError: If the given object is not a plug.
+            ValueError: If the given object is not selectable.
+        """
+
+        if isinstance(plug, Plug):
+            self._plug = plug._plug
+        elif isinstance(plug, OpenMaya.MPlug):
+            self._plug = OpenMaya.MPlug(plug)
+        else:
+            self._plug = maya_fn.api.get_plug(plug)
+
+    def __eq__(self, other):
+        """Return True if the other object is the same plug."""
+
+        if not isinstance(other, Plug):
+            return NotImplemented
+
+        return self._plug == other._plug
+
+    def __hash__(self):
+        """Return the hash code of the plug."""
+
+        return hash(
+            (
+                OpenMaya.MObjectHandle(self._plug.node()).hashCode(),
+                maya_fn._util.attr_name(self._plug),
+            )
+        )
+
+    def __ne__(self, other):
+        """Return True if the other object is not the same plug."""
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        """Return the representation of this plug."""
+
+        return "{}({!r})".format(type(self).__name__, str(self))
+
+    def __str__(self):
+        """Return the name of this plug."""
+
+        if not self.is_valid:
+            return "<deleted plug>"
+
+        return self.name
+
+    @property
+    def attr(self):
+        """Return the attribute path of this plug."""
+
+        return maya_fn._util.attr_name(self._plug)
+
+    @property
+    def is_array(self):
+        """Return True if this plug is an array."""
+
+        return self._plug.isArray
+
+    @property
+    def is_valid(self):
+        """Return True if the node of this plug still exists in the scene."""
+
+        handle = OpenMaya.MObjectHandle(self._plug.node())
+
+        return handle.isValid() and handle.isAlive()
+
+    @property
+    def mplug(self):
+        """Return a copy of the MPlug of this plug."""
+
+        return OpenMaya.MPlug(self._plug)
+
+    @property
+    def name(self):
+        """Return the name of this plug, with the full path of its node."""
+
+        return maya_fn._util.plug_name(self._plug)
+
+    @property
+    def node(self):
+        """Return the node of this plug."""
+
+        return Node(self._plug.node())
+
+    def child(self, attr):
+        """Return the given child of this compound plug.
+
+        Args:
+            attr (str): Name of the child attribute.
+
+        Returns:
+            Plug
+        """
+
+        return self.node.plug(self.attr, attr)
+
+    def destinations(self):
+        """Return the outputs of this plug.
+
+        Returns:
+            list[Plug]
+        """
+
+        return [Plug(each) for each in self._plug.connectedTo(False, True)]
+
+    def element(self, index):
+        """Return the element of this array plug at the given logical index.
+
+        Args:
+            index (int): Logical index of the element.
+
+        Returns:
+            Plug
+        """
+
+        return Plug(maya_fn._util.get_array_plug(self).elementByLogicalIndex(index))
+
+    def elements(self):
+        """Return the existing elements of this array plug.
+
+        Returns:
+            list[Plug]
+        """
+
+        plug = maya_fn._util.get_array_plug(self)
+
+        return [
+            Plug(plug.elementByLogicalIndex(i))
+            for i in plug.getExistingArrayAttributeIndices()
+        ]
+
+    def source(self):
+        """Return the source of this plug.
+
+        Returns:
+            Plug | None
+        """
+
+        plugs = self._plug.connectedTo(True, False)
+
+        return Plug(plugs[0]) if plugs else None
@@ -1,18 +1,55 @@
-"""Maya Plug functions."""
+"""Maya Plug functions.
+
+The module itself can be called like `make`: `maya_fn.plug(node, "tx")`.
+"""
+
+import sys
+import types
 
-import inspect
 import six
 
 from maya import cmds
 from maya.api import OpenMaya
 
+import maya_fn._compat
+import maya_fn._modifier
+import maya_fn._util
 import maya_fn.api
+import maya_fn.schema
 
 __all__ = [
     "plug",
 ]
 
 
+UPSTREAM = "upstream"
+DOWNSTREAM = "downstream"
+
+NODE_LEVEL = "node"
+PLUG_LEVEL = "plug"
+
+DEPTH_FIRST = "depth"
+BREADTH_FIRST = "breadth"
+
+_CONVERTED_TYPES = {"doubleAngle", "time"}
+_INT_TYPES = {"byte", "char", "short", "long", "int64", "enum"}
+_COMPOUND_TYPES = {
+    "short2": ("short", 2),
+    "short3": ("short", 3),
+    "long2": ("long", 2),
+    "long3": ("long", 3),
+    "float2": ("float", 2),
+    "float3": ("float", 3),
+    "double2": ("double", 2),
+    "double3": ("double", 3),
+    "double4": ("double", 4),
+}
+
+_DIRECTIONS = {UPSTREAM: "kUpstream", DOWNSTREAM: "kDownstream"}
+_LEVELS = {NODE_LEVEL: "kNodeLevel", PLUG_LEVEL: "kPlugLevel"}
+_ORDERS = {DEPTH_FIRST: "kDepthFirst", BREADTH_FIRST: "kBreadthFirst"}
+
+
 def attr(plug):
     """Return the attribute of the given plug.
 
@@ -23,14 +60,88 @@ def attr(plug):
         str
     """
 
-    plug = maya_fn.api.get_plug(plug)
+    return maya_fn._util.attr_name(maya_fn.api.get_plug(plug))
 
-    return plug.partialName(
-        includeNonMandatoryIndices=True,
-        includeInstancedIndices=True,
-        useFullAttributePath=True,
-        useLongNames=True,
-    )
+
+def connect_many(pairs, force=False):
+    """Connect the given plugs as a single undoable operation.
+
+    Every plug is looked up in one pass, and every connection is checked
+    before anything is connected: if any of them cannot be made, nothing is
+    connected and the error lists all of them. Pairs that are connected
+    already are skipped. Angle and time plugs connected to plugs of another
+    unit are connected with cmds.connectAttr, in the same undo, so that Maya
+    inserts their unitConversion nodes.
+
+    Args:
+        pairs (Iterable[tuple[Any, Any]]): (source, destination) plugs, by
+            name, Plug or MPlug.
+        force (bool): Replace the existing inputs of the destinations, instead
+            of failing on them.
+
+    Raises:
+        RuntimeError: If a plug does not exist, or a connection cannot be made.
+    """
+
+    pairs, plugs, errors = _resolve_pairs(pairs)
+    connections = []
+    destinations = set()
+
+    for (source_name, destination_name), (src, dst) in zip(pairs, plugs):
+        if src is None or dst is None:
+            continue
+
+        inputs = dst.connectedTo(True, False)
+
+        if inputs and inputs[0] == src:
+            continue
+
+        name = dst.name()
+        info = maya_fn.schema.of_plug(dst)
+
+        if not info.writable:
+            errors.append("'{}' cannot be connected.".format(destination_name))
+        elif name in destinations:
+            errors.append("'{}' is connected twice.".format(destination_name))
+        elif inputs and not force:
+            errors.append(
+                "'{}' is already connected to '{}'.".format(
+                    destination_name, maya_fn._util.plug_name(inputs[0])
+                )
+            )
+        elif not _compatible(maya_fn.schema.of_plug(src).data_type, info.data_type):
+            errors.append(
+                "'{}' ({}) cannot be connected to '{}' ({}).".format(
+                    source_name,
+                    maya_fn.schema.of_plug(src).data_type,
+                    destination_name,
+                    info.data_type,
+                )
+            )
+        else:
+            previous = inputs[0] if inputs else None
+            connections.append((src, dst, previous, _needs_conversion(src, dst)))
+
+        destinations.add(name)
+
+    _raise_errors("connect", errors)
+
+    with maya_fn._modifier.batch() as modifier:
+        for src, dst, previous, convert in connections:
+            if convert:
+                modifier.pythonCommandToExecute(
+                    "import maya.cmds; maya.cmds.connectAttr({!r}, {!r}, "
+                    "force=True)".format(
+                        str(maya_fn._util.plug_name(src)),
+                        str(maya_fn._util.plug_name(dst)),
+                    )
+                )
+                continue
+
+            if previous is not None:
+                modifier.disconnect(previous, dst)
+
+            modifier.connect(src, dst)
 
 
 def destinations(plug):
@@ -50,6 +161,43 @@ def destinations(plug):
     return cmds.ls([p.name() for p in plugs], long=True)
 
 
+def disconnect_many(pairs):
+    """Disconnect the given plugs as a single undoable operation.
+
+    Like `connect_many`, every pair is checked first, and nothing is
+    disconnected if any of them is not connected.
+
+    Args:
+        pairs (Iterable[tuple[Any, Any]]): (source, destination) plugs, by
+            name, Plug or MPlug.
+
+    Raises:
+        RuntimeError: If a plug does not exist, or a pair is not connected.
+    """
+
+    pairs, plugs, errors = _resolve_pairs(pairs)
+    connections = []
+
+    for (source_name, destination_name), (src, dst) in zip(pairs, plugs):
+        if src is None or dst is None:
+            continue
+
+        inputs = dst.connectedTo(True, False)
+
+        if inputs and inputs[0] == src:
+            connections.append((src, dst))
+        else:
+            errors.append(
+                "'{}' is not connected to '{}'.".format(source_name, destination_name)
+            )
+
+    _raise_errors("disconnect", errors)
+
+    with maya_fn._modifier.batch() as modifier:
+        for src, dst in connections:
+            modifier.disconnect(src, dst)
+
+
 def downstream(plug):
     """Return the nodes downstream the given plug.
 
@@ -76,7 +224,7 @@ def elements(plug):
         TypeError: If the given plug is not an array.
     """
 
-    plug = _get_array_plug(plug)
+    plug = maya_fn._util.get_array_plug(plug)
 
     for i in plug.getExistingArrayAttributeIndices():
         yield plug.elementByLogicalIndex(i).name()
@@ -85,6 +233,57 @@ def elements(plug):
 get = maya_fn.api.get_plug
 
 
+def get_element_values(plug):
+    """Return the indices and values of the elements of the given array plug.
+
+    Args:
+        plug (str): Path to an array plug.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The (N,) logical indices, and the
+            values of the elements, shaped as by `get_values`.
+
+    Raises:
+        TypeError: If the given plug is not an array of numbers or matrices.
+    """
+
+    numpy = maya_fn._compat.numpy()
+
+    plug = maya_fn._util.get_array_plug(plug)
+    indices = plug.getExistingArrayAttributeIndices()
+    data_type = maya_fn.schema.of_plug(plug).data_type
+
+    values = _read_values(
+        [plug.elementByLogicalIndex(i) for i in indices],
+        _value_shape(data_type, plug),
+    )
+
+    return numpy.array(indices, dtype=numpy.int64), values
+
+
+def get_values(plugs):
+    """Return the values of the given plugs, as one array.
+
+    Values are read in internal units: centimeters and radians.
+
+    Args:
+        plugs (Iterable[str]): Paths to plugs that hold the same kind of value.
+
+    Returns:
+        numpy.ndarray: (N,) for numbers, (N, K) for compounds of K numbers,
+            such as (N, 3) for double3, or (N, 4, 4) for matrices.
+
+    Raises:
+        TypeError: If a plug does not hold numbers or a matrix, or if the
+            plugs hold different kinds of value.
+    """
+
+    plugs = maya_fn.api.get_plugs(plugs)
+    data_types = [maya_fn.schema.of_plug(each).data_type for each in plugs]
+
+    return _read_values(plugs, _common_shape(plugs, data_types))
+
+
 def indices(plug):
     """Yield the indices of the given array plug.
 
@@ -98,7 +297,7 @@ def indices(plug):
         TypeError: If the given plug is not an array.
     """
 
-    plug = _get_array_plug(plug)
+    plug = maya_fn._util.get_array_plug(plug)
 
     for i in plug.getExistingArrayAttributeIndices():
         yield i
@@ -108,7 +307,7 @@ def make(*args):
     """Return the plug built up from the given arguments.
 
     Args:
-        *args (str | int): Token(s) to build the plug name from.
+        *args (str | int | Node | Plug): Token(s) to build the plug name from.
 
     Returns:
         str
@@ -119,10 +318,12 @@ def make(*args):
     for arg in args:
         if isinstance(arg, int):
             parts[-1] = "{}[{}]".format(parts[-1], arg)
-        elif isinstance(arg, six.string_types) and len(arg) == 1:
+        elif isinstance(arg, six.string_types) and len(arg) == 1 and parts:
             parts[-1] = "{}{}".format(parts[-1], arg)
-        else:
+        elif isinstance(arg, six.string_types):
             parts.append(arg)
+        else:
+            parts.append(str(arg))
 
     return ".".join(parts)
 
@@ -138,12 +339,51 @@ def node(plug):
     """
 
     plug = maya_fn.api.get_plug(plug)
-    obj = plug.node()
 
-    if obj.hasFn(OpenMaya.MFn.kDagNode):
-        return OpenMaya.MFnDagNode(obj).fullPathName()
-    else:
-        return OpenMaya.MFnDependencyNode(obj).name()
+    return maya_fn._util.full_name(plug.node())
+
+
+def set_values(plugs, values):
+    """Set the values of the given plugs as a single undoable operation.
+
+    Values are written in internal units: centimeters and radians.
+
+    Args:
+        plugs (Iterable[str]): Paths to plugs that hold the same kind of value.
+        values (numpy.ndarray): Values shaped as returned by `get_values`.
+
+    Raises:
+        TypeError: If a plug does not hold numbers or a matrix, or if the
+            plugs hold different kinds of value.
+        ValueError: If the values do not have the expected shape.
+    """
+
+    numpy = maya_fn._compat.numpy()
+
+    plugs = maya_fn.api.get_plugs(plugs)
+    data_types = [maya_fn.schema.of_plug(each).data_type for each in plugs]
+    shape = (len(plugs),) + _common_shape(plugs, data_types)
+
+    values = numpy.asarray(values, dtype=numpy.float64)
+
+    if values.shape != shape:
+        raise ValueError(
+            "Expected values of shape {}, got {}.".format(shape, values.shape)
+        )
+
+    with maya_fn._modifier.batch() as modifier:
+        for each, data_type, value in zip(plugs, data_types, values):
+            if data_type == "matrix":
+                matrix = OpenMaya.MMatrix(value.ravel().tolist())
+                data = OpenMaya.MFnMatrixData().create(matrix)
+                modifier.newPlugValue(each, data)
+            elif value.ndim:
+                child_type = _COMPOUND_TYPES[data_type][0]
+
+                for i, number in enumerate(value.tolist()):
+                    _queue_number(modifier, each.child(i), child_type, number)
+            else:
+                _queue_number(modifier, each, data_type, float(value))
 
 
 def source(plug):
@@ -159,7 +399,7 @@ def source(plug):
     plug = maya_fn.api.get_plug(plug)
 
     plugs = plug.connectedTo(True, False)
-    plugs = [make(node(p), attr(p)) for p in plugs]
+    plugs = [maya_fn._util.plug_name(p) for p in plugs]
 
     if plugs:
         return plugs[0]
@@ -173,6 +413,92 @@ def split(plug):
     return node(plug), attr(plug)
 
 
+def traverse(
+    plug,
+    direction=DOWNSTREAM,
+    level=NODE_LEVEL,
+    types=None,
+    max_depth=None,
+    prune=None,
+    order=DEPTH_FIRST,
+):
+    """Yield the nodes or plugs reachable from the given plug or node.
+
+    The graph is walked with an MItDependencyGraph, which visits every node
+    (or plug) once, even when the graph has cycles.
+
+    Args:
+        plug (str): Path to a plug, or name of a node, to start from.
+        direction (str): UPSTREAM or DOWNSTREAM.
+        level (str): NODE_LEVEL yields node names; PLUG_LEVEL yields plug
+            names, and follows the attribute dependencies inside each node.
+        types (int | Iterable[int] | None): MFn type(s) of the nodes to yield.
+            Nodes of other types are still walked through. None yields all.
+        max_depth (int | None): Number of connections to follow; 1 only yields
+            the direct connections. None walks the whole graph. With a
+            limit, the graph is always walked breadth first, so that each
+            node is reached by its shortest path.
+        prune (Callable[[str], bool] | None): Called with each name before it
+            is yielded; if it returns True, it is skipped and not walked past.
+        order (str): DEPTH_FIRST or BREADTH_FIRST.
+
+    Yields:
+        str
+
+    Raises:
+        ValueError: If a traversal option is not valid.
+    """
+
+    flags = [
+        _iterator_flag("direction", direction, _DIRECTIONS),
+        _iterator_flag("order", order, _ORDERS),
+        _iterator_flag("level", level, _LEVELS),
+    ]
+
+    if max_depth is not None:
+        # Each node is visited once, at the depth of the first path that
+        # reaches it; only a breadth first walk finds the shortest path first.
+        flags[1] = OpenMaya.MItDependencyGraph.kBreadthFirst
+
+    if isinstance(types, int):
+        types = (types,)
+
+    (root,) = maya_fn.api.get_plugs([plug], missing=maya_fn.api.NONE)
+
+    if root is None:
+        root = maya_fn.api.get_object(plug)
+
+    it = OpenMaya.MItDependencyGraph(root, OpenMaya.MFn.kInvalid, *flags)
+    plug_level = level == PLUG_LEVEL
+
+    # The first item is the root itself.
+    it.next()
+
+    while not it.isDone():
+        node = it.currentNode()
+        depth = None
+
+        if max_depth is not None:
+            path = it.getPlugPath() if plug_level else it.getNodePath()
+            depth = len(path) - 1
+
+        if plug_level:
+            name = maya_fn._util.plug_name(it.currentPlug())
+        else:
+            name = maya_fn._util.full_name(node)
+
+        if prune is not None and prune(name):
+            it.prune()
+        else:
+            if types is None or any(node.hasFn(each) for each in types):
+                yield name
+
+            if depth is not None and depth >= max_depth:
+                it.prune()
+
+        it.next()
+
+
 def upstream(plug):
     """Return the node upstream the given plug.
 
@@ -188,24 +514,181 @@ def upstream(plug):
     return p if p is None else source(p)
 
 
-def _get_array_plug(plug):
-    """Return the given array plug."""
+def _common_shape(plugs, data_types):
+    """Return the shape of the values of the given plugs."""
 
-    plug = maya_fn.api.get_plug(plug)
+    shapes = {
+        _value_shape(data_type, each) for each, data_type in zip(plugs, data_types)
+    }
 
-    if not plug.isArray:
-        raise TypeError("'{}' is not an array plug.".format(plug.name()))
+    if len(shapes) > 1:
+        raise TypeError(
+            "Plugs hold different kinds of value: {}.".format(
+                ", ".join(sorted(set(data_types)))
+            )
+        )
 
-    return plug
+    return shapes.pop() if shapes else ()
 
 
-__functions__ = dict(
-    __call__=staticmethod(make),
-    **{
-        obj.__name__: staticmethod(obj)
-        for obj in locals().values()
-        if inspect.isfunction(obj)
-    }
-)
+def _compatible(source_type, destination_type):
+    """Return True if plugs of the given data types can be connected.
+
+    Numbers of any kind can be connected, as Maya converts between them.
+    Unknown types are left for Maya to check.
+    """
+
+    if source_type == destination_type or None in (source_type, destination_type):
+        return True
+
+    if maya_fn._util.SCALAR_TYPES.issuperset((source_type, destination_type)):
+        return True
+
+    return (
+        source_type in _COMPOUND_TYPES
+        and destination_type in _COMPOUND_TYPES
+        and _COMPOUND_TYPES[source_type][1] == _COMPOUND_TYPES[destination_type][1]
+    )
+
+
+def _iterator_flag(option, value, values):
+    """Return the MItDependencyGraph flag of the given traversal option."""
+
+    if value not in values:
+        raise ValueError(
+            "Invalid {} '{}' - expected one of {}.".format(
+                option, value, ", ".join(sorted(values))
+            )
+        )
+
+    return getattr(OpenMaya.MItDependencyGraph, values[value])
+
+
+def _needs_conversion(source, destination):
+    """Return True if Maya converts units between the given MPlugs.
+
+    cmds.connectAttr inserts a unitConversion node between an angle or time
+    plug and a plug of another unit; MDGModifier.connect does not.
+    """
+
+    return any(
+        a != b and (a in _CONVERTED_TYPES or b in _CONVERTED_TYPES)
+        for a, b in zip(_unit_types(source), _unit_types(destination))
+    )
+
+
+def _queue_number(modifier, plug, data_type, value):
+    """Queue a change of the given numeric plug, in internal units."""
+
+    if data_type == "bool":
+        modifier.newPlugValueBool(plug, bool(value))
+    elif data_type in _INT_TYPES:
+        modifier.newPlugValueInt(plug, int(round(value)))
+    elif data_type == "float":
+        modifier.newPlugValueFloat(plug, value)
+    else:
+        modifier.newPlugValueDouble(plug, value)
+
+
+def _raise_errors(action, errors):
+    """Raise a RuntimeError that lists the given errors, if there are any."""
+
+    if errors:
+        raise RuntimeError(
+            "Cannot {} the plugs:\n{}".format(
+                action, "\n".join("  " + error for error in errors)
+            )
+        )
+
+
+def _read_values(plugs, shape):
+    """Return the values of the given MPlugs, as an array of the given shape."""
+
+    numpy = maya_fn._compat.numpy()
+    values = []
+
+    if shape == (4, 4):
+        for each in plugs:
+            values.extend(OpenMaya.MFnMatrixData(each.asMObject()).matrix())
+    elif shape:
+        for each in plugs:
+            values.extend(each.child(i).asDouble() for i in range(shape[0]))
+    else:
+        values = [each.asDouble() for each in plugs]
+
+    return numpy.array(values, dtype=numpy.float64).reshape((len(plugs),) + shape)
+
+
+def _resolve_pairs(pairs):
+    """Return the names, MPlugs and lookup errors of (source, destination) pairs.
+
+    The plugs of every pair are looked up with one selection list; a plug that
+    does not exist is None, and is reported in the errors.
+    """
+
+    objs = [obj for pair in pairs for obj in pair]
+    plugs = maya_fn.api.get_plugs(objs, missing=maya_fn.api.NONE)
+    names = [
+        obj.name() if isinstance(obj, OpenMaya.MPlug) else str(obj) for obj in objs
+    ]
+    errors = [
+        "'{}' does not exist or is not a plug.".format(name)
+        for name, plug in zip(names, plugs)
+        if plug is None
+    ]
+
+    return (
+        list(zip(names[::2], names[1::2])),
+        list(zip(plugs[::2], plugs[1::2])),
+        errors,
+    )
+
+
+def _unit_types(plug):
+    """Return the data types of the given MPlug, or of its children."""
+
+    if plug.isCompound:
+        plugs = [plug.child(i) for i in range(plug.numChildren())]
+    else:
+        plugs = [plug]
+
+    return [maya_fn.schema.of_plug(each).data_type for each in plugs]
+
+
+def _value_shape(data_type, plug):
+    """Return the shape of the value of a plug of the given data type."""
+
+    if data_type in maya_fn._util.SCALAR_TYPES:
+        return ()
+
+    if data_type in _COMPOUND_TYPES:
+        return (_COMPOUND_TYPES[data_type][1],)
+
+    if data_type == "matrix":
+        return (4, 4)
+
+    raise TypeError(
+        "'{}' does not hold numbers or a matrix ({}).".format(plug.name(), data_type)
+    )
+
+
+class _PlugModule(types.ModuleType):
+    """The maya_fn.plug module, which builds plug names when called."""
+
+    def __call__(self, *args):
+        """Return the plug built up from the given arguments; see `make`."""
+
+        return self.make(*args)
+
 
-plug = type("plug", (), __functions__)()
+if six.PY2:
+    # The class of a module cannot be changed on Python 2; replace the module
+    # with a callable copy, and keep the original alive, since Python 2 clears
+    # the globals of a deallocated module.
+    plug = _PlugModule(__name__, __doc__)
+    plug.__dict__.update(globals())
+    plug._original = sys.modules[__name__]
+    sys.modules[__name__] = plug
+else:
+    plug = sys.modules[__name__]
+    plug.__class__ = _PlugModule
@@ -0,0 +1,351 @@
+"""Opt-in profiling of maya_fn calls.
+
+While profiling is on, the public functions of maya_fn.api, dag, dg, node,
+plug and schema are replaced with wrappers that record the number of calls,
+the cumulative and self time, and the number of Maya calls (maya.cmds
+commands and OpenMaya methods) made while each function was running. When
+profiling is off nothing is patched, so it costs nothing.
+
+Maya calls are counted with a `sys.setprofile` function, which passes every
+event on to a profile function that was already set. Profilers that are not
+Python functions, such as cProfile, cannot be passed on to; profiling does
+not start while one of them is running.
+
+    with maya_fn.profiler.profile() as result:
+        maya_fn.dg.create("transform", translate=[1, 2, 3])
+
+    print(result.report())
+"""
+
+import collections
+import contextlib
+import functools
+import importlib
+import sys
+import timeit
+import types
+
+__all__ = [
+    "FunctionStats",
+    "Profile",
+    "disable",
+    "enable",
+    "is_enabled",
+    "profile",
+    "report",
+    "reset",
+    "stats",
+]
+
+MODULES = [
+    "maya_fn.api",
+    "maya_fn.dag",
+    "maya_fn.dg",
+    "maya_fn.node",
+    "maya_fn.plug",
+    "maya_fn.schema",
+]
+
+FunctionStats = collections.namedtuple(
+    "FunctionStats", ["calls", "cumulative_time", "self_time", "maya_calls"]
+)
+
+_clock = timeit.default_timer
+
+_default = None
+_active = []
+_patches = []
+_stack = []
+_previous_profile_func = None
+
+
+class Profile(object):
+    """The calls recorded while profiling."""
+
+    def __init__(self):
+        """Initialize the profile."""
+
+        self._stats = {}
+
+    def report(self, sort="cumulative_time", limit=None):
+        """Return a table of the recorded calls.
+
+        Args:
+            sort (str): FunctionStats field to sort the rows by, descending.
+            limit (int): Optional maximum number of rows.
+
+        Returns:
+            str
+        """
+
+        rows = sorted(
+            self.stats().items(), key=lambda item: getattr(item[1], sort), reverse=True
+        )[:limit]
+
+        width = max([len("function")] + [len(name) for name, _ in rows])
+        header = "{:<{}}  {:>8}  {:>14}  {:>10}  {:>10}".format(
+            "function", width, "calls", "cumulative (s)", "self (s)", "maya calls"
+        )
+        lines = [header, "-" * len(header)]
+
+        for name, each in rows:
+            lines.append(
+                "{:<{}}  {:>8}  {:>14.6f}  {:>10.6f}  {:>10}".format(
+                    name,
+                    width,
+                    each.calls,
+                    each.cumulative_time,
+                    each.self_time,
+                    each.maya_calls,
+                )
+            )
+
+        return "\n".join(lines)
+
+    def reset(self):
+        """Forget the recorded calls."""
+
+        self._stats.clear()
+
+    def stats(self):
+        """Return the recorded calls.
+
+        Returns:
+            dict[str, FunctionStats]: Map of qualified function name -> stats.
+        """
+
+        return {name: FunctionStats(*values) for name, values in self._stats.items()}
+
+    def _record(self, name, elapsed, own, maya_calls):
+        """Add one call of the given function."""
+
+        values = self._stats.setdefault(name, [0, 0.0, 0.0, 0])
+        values[0] += 1
+        values[1] += elapsed
+        values[2] += own
+        values[3] += maya_calls
+
+
+def disable():
+    """Stop recording calls into the default profile."""
+
+    if _default is not None and _default in _active:
+        _stop(_default)
+
+
+def enable():
+    """Start recording calls into the default profile.
+
+    Raises:
+        RuntimeError: If a profiler that is not a Python function is running.
+    """
+
+    global _default
+
+    if _default is None:
+        _default = Profile()
+
+    if _default not in _active:
+        _start(_default)
+
+
+def is_enabled():
+    """Return True if maya_fn functions are being profiled."""
+
+    return bool(_patches)
+
+
+@contextlib.contextmanager
+def profile():
+    """Record the calls made in a block into a new profile.
+
+    Yields:
+        Profile
+
+    Raises:
+        RuntimeError: If a profiler that is not a Python function is running.
+    """
+
+    result = Profile()
+    _start(result)
+
+    try:
+        yield result
+    finally:
+        _stop(result)
+
+
+def report(sort="cumulative_time", limit=None):
+    """Return a table of the calls recorded into the default profile.
+
+    Args:
+        sort (str): FunctionStats field to sort the rows by, descending.
+        limit (int): Optional maximum number of rows.
+
+    Returns:
+        str
+    """
+
+    return (_default or Profile()).report(sort, limit)
+
+
+def reset():
+    """Forget the calls recorded into the default profile."""
+
+    if _default is not None:
+        _default.reset()
+
+
+def stats():
+    """Return the calls recorded into the default profile.
+
+    Returns:
+        dict[str, FunctionStats]: Map of qualified function name -> stats.
+    """
+
+    return (_default or Profile()).stats()
+
+
+def _instrument():
+    """Replace the public maya_fn functions with profiling wrappers."""
+
+    global _previous_profile_func
+
+    previous = sys.getprofile()
+
+    if previous is not None and not callable(previous):
+        raise RuntimeError(
+            "Another profiler is running ({}); stop it before profiling "
+            "maya_fn.".format(type(previous).__name__)
+        )
+
+    wrappers = {}
+
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+
+        for name, value in list(vars(module).items()):
+            _patch(module, name, value, wrappers)
+
+    _previous_profile_func = previous
+    sys.setprofile(_on_profile_event)
+
+
+def _uninstrument():
+    """Restore the public maya_fn functions."""
+
+    sys.setprofile(_previous_profile_func)
+
+    while _patches:
+        module, name, func = _patches.pop()
+        setattr(module, name, func)
+
+
+def _patch(module, name, func, wrappers):
+    """Replace the given attribute, if it holds a public maya_fn function."""
+
+    if name.startswith("_"):
+        return
+
+    if not isinstance(func, types.FunctionType):
+        return
+
+    if not (func.__module__ or "").startswith("maya_fn."):
+        return
+
+    if func not in wrappers:
+        wrappers[func] = _wrap(func)
+
+    _patches.append((module, name, func))
+    setattr(module, name, wrappers[func])
+
+
+def _wrap(func):
+    """Return a wrapper that records the calls of the given function."""
+
+    name = "{}.{}".format(func.__module__.rpartition(".")[-1], func.__name__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        frame = [0.0, 0]
+        _stack.append(frame)
+        start = _clock()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = _clock() - start
+            _stack.pop()
+
+            if _stack:
+                _stack[-1][0] += elapsed
+                _stack[-1][1] += frame[1]
+
+            for each in _active:
+                each._record(name, elapsed, elapsed - frame[0], frame[1])
+
+    return wrapper
+
+
+def _is_maya_function(func):
+    """Return True if the given builtin function belongs to Maya."""
+
+    module = getattr(func, "__module__", None)
+
+    if not module:
+        owner = getattr(func, "__self__", None)
+
+        if isinstance(owner, types.ModuleType):
+            module = owner.__name__
+        else:
+            module = type(owner).__module__
+
+    return module == "maya" or module.startswith(("maya.", "OpenMaya"))
+
+
+def _is_fake_frame(frame):
+    """Return True if the given frame runs code of the fake Maya backend."""
+
+    return frame.f_globals.get("__name__", "").startswith("maya_fn.fake.")
+
+
+def _on_profile_event(frame, event, arg):
+    """Count the Maya calls made by the running maya_fn function.
+
+    With the fake Maya backend, Maya functions are Python functions, so calls
+    into the fake modules from outside of them are counted instead. Every
+    event is passed on to the profile function that was set before.
+    """
+
+    if _previous_profile_func is not None:
+        _previous_profile_func(frame, event, arg)
+
+    if not _stack:
+        return
+
+    if event == "c_call" and _is_maya_function(arg):
+        _stack[-1][1] += 1
+    elif (
+        event == "call"
+        and _is_fake_frame(frame)
+        and not (frame.f_back is not None and _is_fake_frame(frame.f_back))
+    ):
+        _stack[-1][1] += 1
+
+
+def _start(result):
+    """Start recording calls into the given profile."""
+
+    if not _active:
+        _instrument()
+
+    _active.append(result)
+
+
+def _stop(result):
+    """Stop recording calls into the given profile."""
+
+    _active.remove(result)
+
+    if not _active:
+        _uninstrument()
@@ -0,0 +1,552 @@
+"""Parallel scanning of Maya ASCII files into an SQLite index.
+
+The .ma files of a set of directories are read with `maya_fn.ma` across a
+pool of processes, and the node counts by type, DAG hierarchy, connections
+and references of each file are written to an SQLite database that can be
+queried without reading the files again.
+
+    result = maya_fn.scan.scan(["/publish/chars"], "/tmp/chars.db")
+
+    with maya_fn.scan.ScanIndex("/tmp/chars.db") as index:
+        index.referencing("/publish/rigs/biped.ma")
+
+Scanning is resumable: the index is committed after every file, and a file
+is only read again when its modification time changed and its content hash
+differs from the one in the index, or when it could not be read before. Files
+that no longer exist are dropped.
+
+From the command line:
+
+    python -m maya_fn.scan /tmp/chars.db /publish/chars --workers 8 --timeout 600
+"""
+
+import argparse
+import collections
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import sys
+
+import maya_fn.ma
+
+__all__ = [
+    "FileSummary",
+    "ScanIndex",
+    "ScanResult",
+    "find_files",
+    "scan",
+    "summarize",
+]
+
+FileSummary = collections.namedtuple(
+    "FileSummary", ["path", "node_types", "nodes", "connections", "references"]
+)
+
+ScanResult = collections.namedtuple(
+    "ScanResult", ["scanned", "unchanged", "removed", "failed"]
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL,
+    size INTEGER,
+    digest TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS node_types (
+    file_id INTEGER NOT NULL,
+    node_type TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    file_id INTEGER NOT NULL,
+    node TEXT NOT NULL,
+    node_type TEXT NOT NULL,
+    parent TEXT
+);
+CREATE TABLE IF NOT EXISTS connections (
+    file_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    destination TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_references (
+    file_id INTEGER NOT NULL,
+    reference TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS node_types_file ON node_types (file_id);
+CREATE INDEX IF NOT EXISTS node_types_type ON node_types (node_type);
+CREATE INDEX IF NOT EXISTS nodes_file ON nodes (file_id);
+CREATE INDEX IF NOT EXISTS connections_file ON connections (file_id);
+CREATE INDEX IF NOT EXISTS file_references_file ON file_references (file_id);
+CREATE INDEX IF NOT EXISTS file_references_reference ON file_references (reference);
+"""
+
+_TABLES = ["node_types", "nodes", "connections", "file_references"]
+
+_CHUNK_SIZE = 1 << 20
+
+
+def find_files(paths):
+    """Return the .ma files of the given files and directories.
+
+    Directories are searched recursively.
+
+    Args:
+        paths (Iterable[str]): Files and directories.
+
+    Returns:
+        list[str]: Sorted absolute paths.
+    """
+
+    files = set()
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.update(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.lower().endswith(".ma")
+                )
+        else:
+            files.add(path)
+
+    return sorted(os.path.abspath(each) for each in files)
+
+
+def summarize(path):
+    """Read the summary of the given .ma file.
+
+    Args:
+        path (str): Path to a Maya ASCII file.
+
+    Returns:
+        FileSummary: The node counts by type, the (node, type, parent) of
+            each node the file creates, the (source, destination) of each
+            connection, and the referenced files.
+    """
+
+    scene = maya_fn.ma.read(path)
+
+    node_types = collections.Counter()
+    nodes = []
+
+    for node in scene.nodes():
+        node_type = scene.node_type(node)
+
+        if node_type is None:
+            continue
+
+        node_types[node_type] += 1
+        parent = node.rpartition("|")[0] if node.startswith("|") else ""
+        nodes.append((node, node_type, parent or None))
+
+    return FileSummary(
+        path, dict(node_types), nodes, list(scene.connections()), scene.references
+    )
+
+
+def scan(paths, index, workers=None, timeout=None):
+    """Scan the .ma files of the given paths into the given index.
+
+    Args:
+        paths (Iterable[str]): Files and directories to scan.
+        index (str): Path to the SQLite database; created if it does not exist.
+        workers (int | None): Number of processes; defaults to the number of
+            CPUs. With 1, files are read in this process.
+        timeout (float | None): Seconds to wait for each file before it is
+            failed with a TimeoutError, and its process terminated once the
+            other files are read. Ignored with a single worker.
+
+    Returns:
+        ScanResult: The number of files read, skipped because they did not
+            change, dropped from the index because they no longer exist, and
+            that could not be read.
+    """
+
+    files = find_files(paths)
+
+    with ScanIndex(index) as db:
+        removed = db._prune()
+        known = db._states()
+
+        jobs = []
+        unchanged = 0
+
+        for path in files:
+            state = known.get(path)
+
+            if state is not None and state[3] is None and state[:2] == _stat(path):
+                unchanged += 1
+            else:
+                jobs.append((path, state[2] if state else None))
+
+        scanned = failed = 0
+
+        for path, stat, digest, summary, error in _run(jobs, workers, timeout):
+            if summary is None and error is None:
+                db._touch(path, stat)
+                unchanged += 1
+                continue
+
+            db._store(path, stat, digest, summary, error)
+
+            if error is None:
+                scanned += 1
+            else:
+                failed += 1
+
+    return ScanResult(scanned, unchanged, removed, failed)
+
+
+class ScanIndex(object):
+    """An SQLite index of scanned .ma files.
+
+    File arguments are paths as they were scanned, which are absolute.
+    """
+
+    def __init__(self, path):
+        """Open the index at the given path, creating it if it does not exist."""
+
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        """Return this index."""
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close this index."""
+
+        self.close()
+
+    def close(self):
+        """Commit and close this index."""
+
+        self._connection.commit()
+        self._connection.close()
+
+    def connections(self, path):
+        """Return the (source, destination) plugs of the connections of a file.
+
+        Args:
+            path (str): Scanned file.
+
+        Returns:
+            list[tuple[str, str]]
+        """
+
+        return self._query(
+            "SELECT source, destination FROM connections WHERE file_id = ?",
+            self._file_id(path),
+        )
+
+    def errors(self):
+        """Return the error of each file that could not be read.
+
+        Returns:
+            dict[str, str]
+        """
+
+        return dict(
+            self._query("SELECT path, error FROM files WHERE error IS NOT NULL")
+        )
+
+    def files(self, node_type=None):
+        """Return the scanned files.
+
+        Args:
+            node_type (str | None): Only return the files with nodes of this
+                exact type.
+
+        Returns:
+            list[str]
+        """
+
+        if node_type is None:
+            rows = self._query("SELECT path FROM files ORDER BY path")
+        else:
+            rows = self._query(
+                "SELECT path FROM files JOIN node_types ON files.id = file_id "
+                "WHERE node_type = ? ORDER BY path",
+                node_type,
+            )
+
+        return [path for path, in rows]
+
+    def node_counts(self, path=None):
+        """Return the number of nodes of each type.
+
+        Args:
+            path (str | None): Scanned file; the totals of every file if None.
+
+        Returns:
+            dict[str, int]
+        """
+
+        if path is None:
+            rows = self._query(
+                "SELECT node_type, SUM(count) FROM node_types GROUP BY node_type"
+            )
+        else:
+            rows = self._query(
+                "SELECT node_type, count FROM node_types WHERE file_id = ?",
+                self._file_id(path),
+            )
+
+        return dict(rows)
+
+    def nodes(self, path):
+        """Return the (node, type, parent) of the nodes of a file.
+
+        DAG nodes are full paths, with None as the parent of world nodes; the
+        parent of DG nodes is None too.
+
+        Args:
+            path (str): Scanned file.
+
+        Returns:
+            list[tuple[str, str, str | None]]
+        """
+
+        return self._query(
+            "SELECT node, node_type, parent FROM nodes WHERE file_id = ? ORDER BY rowid",
+            self._file_id(path),
+        )
+
+    def references(self, path):
+        """Return the files referenced by a file.
+
+        Args:
+            path (str): Scanned file.
+
+        Returns:
+            list[str]
+        """
+
+        rows = self._query(
+            "SELECT reference FROM file_references WHERE file_id = ?",
+            self._file_id(path),
+        )
+
+        return [reference for reference, in rows]
+
+    def referencing(self, reference):
+        """Return the files that reference the given file.
+
+        Args:
+            reference (str): Referenced file, as it is written in the files.
+
+        Returns:
+            list[str]
+        """
+
+        rows = self._query(
+            "SELECT DISTINCT path FROM files JOIN file_references ON files.id = file_id "
+            "WHERE reference = ? ORDER BY path",
+            reference,
+        )
+
+        return [path for path, in rows]
+
+    def _file_id(self, path):
+        """Return the id of the given file.
+
+        Raises:
+            LookupError: If the file is not in the index.
+        """
+
+        rows = self._query("SELECT id FROM files WHERE path = ?", path)
+
+        if not rows:
+            raise LookupError("File '{}' is not in the index.".format(path))
+
+        return rows[0][0]
+
+    def _prune(self):
+        """Drop the files that no longer exist, and return how many there were."""
+
+        missing = [
+            (file_id,)
+            for file_id, path in self._query("SELECT id, path FROM files")
+            if not os.path.isfile(path)
+        ]
+
+        for table in _TABLES:
+            self._connection.executemany(
+                "DELETE FROM {} WHERE file_id = ?".format(table), missing
+            )
+
+        self._connection.executemany("DELETE FROM files WHERE id = ?", missing)
+        self._connection.commit()
+
+        return len(missing)
+
+    def _query(self, sql, *args):
+        """Return the rows of the given query."""
+
+        return self._connection.execute(sql, args).fetchall()
+
+    def _states(self):
+        """Return the (mtime, size, digest, error) of each file, by path."""
+
+        return {
+            row[0]: row[1:]
+            for row in self._query("SELECT path, mtime, size, digest, error FROM files")
+        }
+
+    def _store(self, path, stat, digest, summary, error):
+        """Replace the summary of the given file, and commit."""
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO files (path) VALUES (?)", (path,)
+            )
+            file_id = self._file_id(path)
+
+            self._connection.execute(
+                "UPDATE files SET mtime = ?, size = ?, digest = ?, error = ? "
+                "WHERE id = ?",
+                stat + (digest, error, file_id),
+            )
+
+            for table in _TABLES:
+                self._connection.execute(
+                    "DELETE FROM {} WHERE file_id = ?".format(table), (file_id,)
+                )
+
+            if summary is None:
+                return
+
+            self._connection.executemany(
+                "INSERT INTO node_types VALUES (?, ?, ?)",
+                [(file_id, k, v) for k, v in sorted(summary.node_types.items())],
+            )
+            self._connection.executemany(
+                "INSERT INTO nodes VALUES (?, ?, ?, ?)",
+                [(file_id,) + node for node in summary.nodes],
+            )
+            self._connection.executemany(
+                "INSERT INTO connections VALUES (?, ?, ?)",
+                [(file_id,) + connection for connection in summary.connections],
+            )
+            self._connection.executemany(
+                "INSERT INTO file_references VALUES (?, ?)",
+                [(file_id, reference) for reference in summary.references],
+            )
+
+    def _touch(self, path, stat):
+        """Update the modification time of a file whose content did not change."""
+
+        with self._connection:
+            self._connection.execute(
+                "UPDATE files SET mtime = ?, size = ? WHERE path = ?", stat + (path,)
+            )
+
+
+def _run(jobs, workers, timeout=None):
+    """Yield the result of `_scan_file` for each (path, digest) job.
+
+    Results are waited on in order, each for at most the timeout. The pool
+    is terminated rather than joined if a file timed out, as its process may
+    never return.
+    """
+
+    if workers == 1:
+        for job in jobs:
+            yield _scan_file(*job)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    timed_out = False
+
+    try:
+        results = [(job[0], pool.apply_async(_scan_file, job)) for job in jobs]
+
+        for path, result in results:
+            try:
+                yield result.get(timeout)
+            except multiprocessing.TimeoutError:
+                timed_out = True
+                error = "TimeoutError: Not read within {} seconds.".format(timeout)
+                yield path, _stat(path), None, None, error
+    finally:
+        if timed_out:
+            pool.terminate()
+        else:
+            pool.close()
+
+        pool.join()
+
+
+def _scan_file(path, previous_digest):
+    """Summarize a file, unless its content hash is the given one.
+
+    Returns:
+        tuple: The path, (mtime, size), digest, summary and error of the
+            file. The summary and error are None if the file did not change.
+    """
+
+    stat = _stat(path)
+
+    try:
+        digest = _digest(path)
+
+        if digest == previous_digest:
+            return path, stat, digest, None, None
+
+        return path, stat, digest, summarize(path), None
+    except Exception as error:
+        return path, stat, None, None, "{}: {}".format(type(error).__name__, error)
+
+
+def _digest(path):
+    """Return the SHA-1 of the content of the given file."""
+
+    digest = hashlib.sha1()
+
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _stat(path):
+    """Return the (mtime, size) of the given file."""
+
+    stat = os.stat(path)
+
+    return stat.st_mtime, stat.st_size
+
+
+def main(argv=None):
+    """Scan the files given on the command line, and print the result."""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m maya_fn.scan", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("index", help="SQLite database to write.")
+    parser.add_argument("paths", nargs="+", help=".ma files and directories.")
+    parser.add_argument("--workers", type=int, help="Number of processes.")
+    parser.add_argument("--timeout", type=float, help="Seconds to wait for each file.")
+    args = parser.parse_args(argv)
+
+    result = scan(args.paths, args.index, workers=args.workers, timeout=args.timeout)
+
+    print(
+        "{} scanned, {} unchanged, {} removed, {} failed".format(
+            result.scanned, result.unchanged, result.removed, result.failed
+        )
+    )
+
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Attribute schema cache.
+
+The properties of a static attribute are the same on every node of a type, so
+they are queried once per (node type, attribute) and served from memory after
+that. Dynamic attributes are cached per node instead, and forgotten whenever
+an attribute is added to or removed from that node.
+"""
+
+import collections
+import re
+
+import six
+
+from maya.api import OpenMaya
+
+import maya_fn.api
+
+__all__ = [
+    "AttributeInfo",
+    "cache_info",
+    "clear",
+    "get",
+    "invalidate",
+    "of_plug",
+]
+
+
+AttributeInfo = collections.namedtuple(
+    "AttributeInfo", ["name", "writable", "children", "multi", "data_type"]
+)
+
+_NUMERIC_TYPES = {
+    "kBoolean": "bool",
+    "kByte": "byte",
+    "kChar": "char",
+    "kShort": "short",
+    "k2Short": "short2",
+    "k3Short": "short3",
+    "kInt": "long",
+    "k2Int": "long2",
+    "k3Int": "long3",
+    "kInt64": "int64",
+    "kFloat": "float",
+    "k2Float": "float2",
+    "k3Float": "float3",
+    "kDouble": "double",
+    "k2Double": "double2",
+    "k3Double": "double3",
+    "k4Double": "double4",
+    "kAddr": "addr",
+}
+
+_TYPED_TYPES = {
+    "kString": "string",
+    "kMatrix": "matrix",
+    "kStringArray": "stringArray",
+    "kDoubleArray": "doubleArray",
+    "kIntArray": "Int32Array",
+    "kPointArray": "pointArray",
+    "kVectorArray": "vectorArray",
+    "kMatrixArray": "matrixArray",
+    "kComponentList": "componentList",
+    "kMesh": "mesh",
+    "kNurbsCurve": "nurbsCurve",
+    "kNurbsSurface": "nurbsSurface",
+}
+
+_UNIT_TYPES = {
+    "kAngle": "doubleAngle",
+    "kDistance": "doubleLinear",
+    "kTime": "time",
+}
+
+_INDEX = re.compile(r"\[\d+\]")
+
+_static = {}
+_dynamic = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def cache_info():
+    """Return the statistics of the schema cache.
+
+    Returns:
+        maya_fn.api.CacheInfo
+    """
+
+    size = len(_static) + sum(len(attrs) for _, attrs, _ in _dynamic.values())
+
+    return maya_fn.api.CacheInfo(_stats["hits"], _stats["misses"], None, size)
+
+
+def clear():
+    """Forget every cached attribute, and reset the statistics."""
+
+    _static.clear()
+    _forget(list(_dynamic))
+    _stats.update(hits=0, misses=0)
+
+
+def get(node, attr):
+    """Return the properties of the given attribute.
+
+    Args:
+        node (Any): A dependency node, by name or MObject.
+        attr (str): Attribute path, such as "translateX" or "points[2].xValue".
+
+    Returns:
+        AttributeInfo | None: None if the node does not have the attribute.
+
+    Raises:
+        LookupError: If the given node does not exist.
+    """
+
+    if not isinstance(node, OpenMaya.MObject):
+        node = maya_fn.api.get_object(node)
+
+    def find_attribute():
+        plug = maya_fn.api.find_plug(node, attr)
+
+        return None if plug is None else plug.attribute()
+
+    return _get(node, _INDEX.sub("", attr), find_attribute)
+
+
+def invalidate(nodes=None):
+    """Forget the dynamic attributes of the given nodes.
+
+    Args:
+        nodes (Iterable[Any] | None): Dependency nodes, by name or MObject.
+            None forgets the dynamic attributes of every node.
+    """
+
+    if nodes is None:
+        _forget(list(_dynamic))
+        return
+
+    if isinstance(nodes, six.string_types):
+        nodes = [nodes]
+
+    for node in maya_fn.api.get_objects(nodes, missing=maya_fn.api.SKIP):
+        _forget([OpenMaya.MObjectHandle(node).hashCode()])
+
+
+def of_plug(plug):
+    """Return the properties of the attribute of the given plug.
+
+    Args:
+        plug (maya.api.OpenMaya.MPlug): A plug in the current scene.
+
+    Returns:
+        AttributeInfo
+    """
+
+    attribute = plug.attribute()
+
+    return _get(plug.node(), OpenMaya.MFnAttribute(attribute).name, lambda: attribute)
+
+
+def _attribute_info(attribute):
+    """Return the properties of the given attribute."""
+
+    fn = OpenMaya.MFnAttribute(attribute)
+    children = ()
+
+    if attribute.hasFn(OpenMaya.MFn.kCompoundAttribute):
+        compound = OpenMaya.MFnCompoundAttribute(attribute)
+        children = tuple(
+            OpenMaya.MFnAttribute(compound.child(i)).name
+            for i in range(compound.numChildren())
+        )
+
+    return AttributeInfo(
+        fn.name, fn.writable, children, fn.array, _data_type(attribute)
+    )
+
+
+def _data_type(attribute):
+    """Return the data type of the given attribute, as named by getAttr -type."""
+
+    if attribute.hasFn(OpenMaya.MFn.kNumericAttribute):
+        fn_type = OpenMaya.MFnNumericData
+        value = OpenMaya.MFnNumericAttribute(attribute).numericType()
+        names = _NUMERIC_TYPES
+    elif attribute.hasFn(OpenMaya.MFn.kUnitAttribute):
+        fn_type = OpenMaya.MFnUnitAttribute
+        value = OpenMaya.MFnUnitAttribute(attribute).unitType()
+        names = _UNIT_TYPES
+    elif attribute.hasFn(OpenMaya.MFn.kTypedAttribute):
+        fn_type = OpenMaya.MFnData
+        value = OpenMaya.MFnTypedAttribute(attribute).attrType()
+        names = _TYPED_TYPES
+    elif attribute.hasFn(OpenMaya.MFn.kMatrixAttribute):
+        return "matrix"
+    elif attribute.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return "enum"
+    elif attribute.hasFn(OpenMaya.MFn.kMessageAttribute):
+        return "message"
+    elif attribute.hasFn(OpenMaya.MFn.kCompoundAttribute):
+        return "TdataCompound"
+    else:
+        return None
+
+    for name, data_type in names.items():
+        if getattr(fn_type, name, None) == value:
+            return data_type
+
+    return None
+
+
+def _get(node, key, find_attribute):
+    """Return the cached properties of the given attribute, or query them."""
+
+    type_key = (OpenMaya.MFnDependencyNode(node).typeName, key)
+
+    info = _static.get(type_key)
+
+    if info is None:
+        info = _get_dynamic(node).get(key)
+
+    if info is not None:
+        _stats["hits"] += 1
+        return info
+
+    _stats["misses"] += 1
+
+    attribute = find_attribute()
+
+    if attribute is None:
+        return None
+
+    info = _attribute_info(attribute)
+
+    attr_class = OpenMaya.MFnDependencyNode(node).attributeClass(attribute)
+
+    if attr_class == OpenMaya.MFnDependencyNode.kLocalDynamicAttr:
+        handle = OpenMaya.MObjectHandle(node)
+        entry = _dynamic.get(handle.hashCode())
+
+        if entry is None:
+            callback = OpenMaya.MNodeMessage.addAttributeAddedOrRemovedCallback(
+                node, _on_attribute_added_or_removed
+            )
+            entry = _dynamic[handle.hashCode()] = (handle, {}, callback)
+
+        entry[1][key] = info
+    else:
+        _static[type_key] = info
+
+    return info
+
+
+def _get_dynamic(node):
+    """Return the cached dynamic attributes of the given node."""
+
+    handle = OpenMaya.MObjectHandle(node)
+    entry = _dynamic.get(handle.hashCode())
+
+    if entry is None:
+        return {}
+
+    cached, attrs, _ = entry
+
+    if not cached.isValid() or cached.object() != node:
+        # The cached node was deleted, and a new node reused its hash code.
+        _forget([handle.hashCode()])
+        return {}
+
+    return attrs
+
+
+def _forget(keys):
+    """Forget the dynamic attributes of the given node keys, and their callbacks."""
+
+    for key in keys:
+        entry = _dynamic.pop(key, None)
+
+        if entry is not None:
+            OpenMaya.MMessage.removeCallback(entry[2])
+
+
+def _on_attribute_added_or_removed(message, plug, *args):
+    """Forget the dynamic attributes of a node whose attributes changed."""
+
+    entry = _dynamic.get(OpenMaya.MObjectHandle(plug.node()).hashCode())
+
+    if entry is not None:
+        entry[1].clear()
@@ -4,6 +4,10 @@ import atexit
 import os
 import pytest
 
+if os.environ.get("MAYA_FN_BACKEND") == "fake":
+    # Importing maya_fn installs the fake maya package.
+    import maya_fn  # noqa: F401
+
 import maya.standalone
 
 maya.standalone.initialize()
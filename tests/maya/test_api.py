@@ -2,6 +2,7 @@
 
 import pytest
 
+from maya import cmds
 from maya.api import OpenMaya
 
 import maya_fn.api
@@ -60,3 +61,256 @@ def test_get_plug_errors():
 
     with pytest.raises(TypeError):
         maya_fn.api.get_plug("persp")
+
+
+@pytest.fixture(scope="function")
+def object_cache():
+    """Enable the object cache for the duration of this test."""
+
+    maya_fn.api.enable_cache(max_size=2)
+
+    yield
+
+    maya_fn.api.disable_cache()
+
+
+def test_object_cache_hits(new_scene, object_cache):
+    """Given a cached name, the object is returned without resolving it again."""
+
+    node = cmds.createNode("transform", name="cached")
+
+    first = maya_fn.api.get_dag_path(node)
+    second = maya_fn.api.get_dag_path(node)
+
+    assert first == second
+    assert maya_fn.api.cache_info().hits == 1
+    assert maya_fn.api.cache_info().misses == 1
+
+    second.pop()
+
+    assert maya_fn.api.get_dag_path(node) == first, "Cached MDagPath was mutated"
+
+
+def test_object_cache_is_invalidated(new_scene, object_cache):
+    """Given a renamed or deleted node, its old name is resolved again."""
+
+    node = cmds.createNode("transform", name="before")
+
+    maya_fn.api.get_object(node)
+    cmds.rename(node, "after")
+
+    with pytest.raises(LookupError):
+        maya_fn.api.get_object("before")
+
+    maya_fn.api.get_object("after")
+    cmds.delete("after")
+
+    with pytest.raises(LookupError):
+        maya_fn.api.get_object("after")
+
+
+def test_object_cache_forgets_ambiguous_names(new_scene, object_cache):
+    """Given a new namesake of a cached node, the cached name is resolved again."""
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent="a")
+
+    assert maya_fn.api.get_dag_path("b").fullPathName() == "|a|b"
+
+    cmds.createNode("transform", name="b")
+
+    with pytest.raises(LookupError):
+        maya_fn.api.get_dag_path("b")
+
+    assert maya_fn.api.get_dag_path("a|b").fullPathName() == "|a|b"
+
+
+def test_object_cache_evicts_least_recently_used(new_scene, object_cache):
+    """Given more names than the cache size, the oldest name is forgotten."""
+
+    maya_fn.api.get_object("persp")
+    maya_fn.api.get_object("top")
+    maya_fn.api.get_object("persp")
+    maya_fn.api.get_object("front")
+
+    assert maya_fn.api.cache_info().size == 2
+
+    maya_fn.api.get_object("persp")
+    maya_fn.api.get_object("top")
+
+    assert maya_fn.api.cache_info().hits == 2
+
+
+@pytest.fixture(scope="function")
+def path_cache():
+    """Enable the path cache for the duration of this test."""
+
+    maya_fn.api.enable_path_cache(max_size=10)
+
+    yield
+
+    maya_fn.api.disable_path_cache()
+
+
+def test_path_cache_hits(new_scene, path_cache):
+    """Given a cached node, its path is returned without building it again."""
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent="a")
+
+    first = maya_fn.dag.full_path("b")
+    second = maya_fn.dag.full_path("b")
+
+    assert first == second == "|a|b"
+    assert first is second
+    assert maya_fn.dag.name("b") == "b"
+    assert maya_fn.plug.node("b.translate") == "|a|b"
+
+    info = maya_fn.api.path_cache_info()
+
+    assert (info.hits, info.misses, info.size) == (3, 1, 1)
+    assert info.hit_ratio == 0.75
+    assert info.memory > 0
+
+
+def test_path_cache_is_invalidated(new_scene, path_cache):
+    """Given a renamed or reparented ancestor, the paths below it are rebuilt."""
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent="a")
+    cmds.createNode("transform", name="c", parent="b")
+    cmds.createNode("transform", name="d")
+
+    assert maya_fn.dag.full_path("c") == "|a|b|c"
+    assert maya_fn.dag.partial_path("d") == "d"
+
+    cmds.rename("a", "x")
+
+    assert maya_fn.dag.full_path("c") == "|x|b|c"
+
+    cmds.parent("b", "d")
+
+    assert maya_fn.dag.full_path("c") == "|d|b|c"
+    assert maya_fn.dag.parent("c") == "|d|b"
+
+    cmds.createNode("transform", name="d", parent="x")
+
+    assert maya_fn.dag.partial_path("|d") == "|d"
+
+    cmds.delete("|d")
+
+    assert maya_fn.api.path_cache_info().size == 0
+
+
+def test_path_cache_partial_paths(new_scene, path_cache):
+    """Given a created or deleted namesake, the partial paths are rebuilt."""
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+    cmds.createNode("transform", name="c", parent="a")
+
+    assert maya_fn.dag.partial_path("|a|c") == "c"
+
+    cmds.createNode("transform", name="c", parent="b")
+
+    assert maya_fn.dag.partial_path("|a|c") == "a|c"
+
+    cmds.delete("|b|c")
+
+    assert maya_fn.dag.partial_path("|a|c") == "c"
+
+
+def test_get_objects_in_input_order():
+    """Given several objects, the function returns their MObjects in order."""
+
+    names = ["time1", "persp", "time1", "|top"]
+    nodes = maya_fn.api.get_objects(names)
+
+    assert [OpenMaya.MFnDependencyNode(n).name() for n in nodes] == [
+        "time1",
+        "persp",
+        "time1",
+        "top",
+    ]
+
+
+def test_get_dag_paths_missing_policies():
+    """Given a missing object, each policy skips, nulls or raises."""
+
+    names = ["persp", "foobar", "time1", "top"]
+
+    actual = maya_fn.api.get_dag_paths(names, missing=maya_fn.api.SKIP)
+    assert [p.fullPathName() for p in actual] == ["|persp", "|top"]
+
+    actual = maya_fn.api.get_dag_paths(names, missing=maya_fn.api.NONE)
+    assert [p and p.fullPathName() for p in actual] == ["|persp", None, None, "|top"]
+
+    with pytest.raises(LookupError):
+        maya_fn.api.get_dag_paths(names)
+
+    with pytest.raises(TypeError):
+        maya_fn.api.get_dag_paths(["persp", "time1"])
+
+    with pytest.raises(ValueError):
+        maya_fn.api.get_dag_paths(names, missing="ignore")
+
+
+def test_get_plugs():
+    """Given several plugs, the function returns their MPlugs in order."""
+
+    plugs = maya_fn.api.get_plugs(
+        ["persp.tx", "persp", "top.ty"], missing=maya_fn.api.NONE
+    )
+
+    assert plugs[0].name() == "persp.translateX"
+    assert plugs[1] is None
+    assert plugs[2].name() == "top.translateY"
+
+
+def test_classify_many(new_scene):
+    """Given objects of every kind, each one is classified without raising."""
+
+    node = cmds.createNode("transform", name="a")
+    cmds.createNode("mesh", name="aShape", parent="a")
+    deleted = maya_fn.api.get_object(cmds.createNode("network"))
+    cmds.delete(OpenMaya.MFnDependencyNode(deleted).name())
+
+    objs = [
+        "a",
+        "|a",
+        "a.vtx[0]",
+        "time1",
+        "a.translateX",
+        "a.missing",
+        "missing",
+        maya_fn.api.get_plug("time1.outTime"),
+        maya_fn.Node(node),
+        deleted,
+        42,
+    ]
+
+    assert list(maya_fn.api.classify_many(objs)) == [
+        maya_fn.api.DAG,
+        maya_fn.api.DAG,
+        maya_fn.api.COMPONENT,
+        maya_fn.api.DG,
+        maya_fn.api.PLUG,
+        maya_fn.api.MISSING,
+        maya_fn.api.MISSING,
+        maya_fn.api.PLUG,
+        maya_fn.api.DAG,
+        maya_fn.api.MISSING,
+        maya_fn.api.MISSING,
+    ]
+    assert list(maya_fn.api.exists_many(["a", "missing", "a.tx"])) == [1, 0, 1]
+
+
+def test_try_get(new_scene):
+    """Given a missing object, the try_get functions return None."""
+
+    assert maya_fn.api.try_get_object("missing") is None
+    assert maya_fn.api.try_get_object(42) is None
+    assert maya_fn.api.try_get_dag_path("time1") is None
+    assert maya_fn.api.try_get_plug("persp") is None
+    assert maya_fn.api.try_get_dag_path("persp") == maya_fn.api.get_dag_path("persp")
+    assert maya_fn.api.try_get_plug("persp.tx") == maya_fn.api.get_plug("persp.tx")
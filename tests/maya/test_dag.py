@@ -3,6 +3,7 @@
 import pytest
 
 from maya import cmds
+from maya.api import OpenMaya
 
 import maya_fn
 
@@ -54,6 +55,39 @@ def test_get_descendents():
     assert actual == expected, "descendents returned the wrong results"
 
 
+def test_get_descendents_filters(new_scene):
+    """Given traversal options, the function orders, limits and prunes the walk."""
+
+    x = cmds.createNode("transform", name="x")
+    a = cmds.createNode("transform", name="a", parent=x)
+    cmds.createNode("transform", name="b", parent=a)
+    c = cmds.createNode("transform", name="c", parent=x)
+    cmds.createNode("locator", name="cShape", parent=c)
+
+    expected = ["|x|a", "|x|c", "|x|a|b"]
+    actual = list(maya_fn.dag.descendents(x, order=maya_fn.dag.BREADTH_FIRST))
+
+    assert actual == expected, "breadth first order is wrong"
+
+    expected = ["|x|a", "|x|c"]
+    actual = list(maya_fn.dag.descendents(x, max_depth=1))
+
+    assert actual == expected, "max_depth was not respected"
+
+    expected = ["|x|c"]
+    actual = list(maya_fn.dag.descendents(x, prune=lambda p: p.endswith("|a")))
+
+    assert actual == expected, "pruned subtree was walked"
+
+    expected = ["|x|c|cShape"]
+    actual = list(maya_fn.dag.descendents(x, types=OpenMaya.MFn.kShape))
+
+    assert actual == expected, "type filter was not respected"
+
+    with pytest.raises(ValueError):
+        list(maya_fn.dag.descendents(x, order="sideways"))
+
+
 def test_get_full_path():
     """Given a valid DAG object, the function returns the its full name."""
 
@@ -132,3 +166,266 @@ def test_get_siblings():
     assert maya_fn.dag.siblings(z) == []
 
     assert set(maya_fn.dag.siblings(root)) == {"|persp", "|top", "|front", "|side"}
+
+
+def test_iter_children(new_scene):
+    """Given a node, its children are yielded lazily and counted without a list."""
+
+    root = cmds.createNode("transform", name="root")
+    a = cmds.createNode("transform", name="a", parent=root)
+    cmds.createNode("locator", name="rootShape", parent=root)
+    cmds.createNode("transform", name="b", parent=root)
+
+    children = maya_fn.dag.iter_children(root)
+
+    assert next(children) == "|root|a"
+    assert list(maya_fn.dag.iter_shapes(root)) == ["|root|rootShape"]
+    assert list(maya_fn.dag.iter_siblings(a)) == ["|root|rootShape", "|root|b"]
+    assert maya_fn.dag.child_count(root) == 3
+    assert maya_fn.dag.has_children(root)
+    assert not maya_fn.dag.has_children(a)
+
+    with pytest.raises(LookupError):
+        maya_fn.dag.iter_children("missing")
+
+
+def test_dag_index(new_scene):
+    """Given an index of the scene, queries match the module functions."""
+
+    root = cmds.createNode("transform", name="root")
+    x = cmds.createNode("transform", name="x", parent=root)
+    cmds.createNode("transform", name="a", parent=x)
+    cmds.createNode("locator", name="xShape", parent=x)
+    cmds.createNode("transform", name="y", parent=root)
+
+    with maya_fn.dag.DagIndex() as index:
+        for node in cmds.ls(type="dagNode", long=True):
+            for query in ("ancestors", "children", "parent", "shapes", "siblings"):
+                expected = getattr(maya_fn.dag, query)(node)
+                actual = getattr(index, query)(node)
+
+                if isinstance(expected, list):
+                    expected, actual = set(expected), set(actual)
+
+                assert actual == expected, "{}({}) is wrong".format(query, node)
+
+        assert index.verify() == []
+
+
+def test_dag_index_updates(new_scene):
+    """Given changes to the scene, the index is patched to match them."""
+
+    root = cmds.createNode("transform", name="root")
+    x = cmds.createNode("transform", name="x", parent=root)
+
+    with maya_fn.dag.DagIndex() as index:
+        y = cmds.createNode("transform", name="y", parent=root)
+        z = cmds.createNode("transform", name="z", parent=y)
+
+        assert index.children("|root") == ["|root|x", "|root|y"]
+
+        cmds.parent(z, x)
+        cmds.rename("|root|x", "w")
+
+        assert index.children("|root|w") == ["|root|w|z"]
+        assert index.ancestors("z") == ["|root", "|root|w"]
+
+        cmds.delete("|root|y")
+
+        assert index.siblings("w") == []
+        assert index.verify() == []
+
+        cmds.file(new=True, force=True)
+
+        assert len(index) == 8
+        assert index.verify() == []
+
+
+def test_dag_index_hash_collision(new_scene, monkeypatch):
+    """Given two nodes with the same hash, the index does not mix them up."""
+
+    key = maya_fn.dag._key
+
+    def colliding_key(node):
+        name = OpenMaya.MFnDependencyNode(node).name()
+
+        return 7 if name in ("a", "b") else key(node)
+
+    monkeypatch.setattr(maya_fn.dag, "_key", colliding_key)
+    cmds.createNode("transform", name="a")
+
+    with maya_fn.dag.DagIndex() as index:
+        cmds.createNode("transform", name="b")
+        cmds.delete("a")
+
+        assert index.parent("b") is None
+
+        with pytest.raises(LookupError):
+            index.parent("a")
+
+
+def test_matrices(new_scene):
+    """Given a root, the matrices of every transform below it are returned."""
+
+    numpy = pytest.importorskip("numpy")
+
+    root = cmds.createNode("transform", name="root")
+    a = cmds.createNode("transform", name="a", parent=root)
+    cmds.createNode("locator", name="aShape", parent=a)
+    b = cmds.createNode("transform", name="b", parent=a)
+
+    cmds.setAttr(root + ".translate", 1, 2, 3)
+    cmds.setAttr(a + ".rotateY", 90)
+    cmds.setAttr(b + ".translateX", 5)
+
+    offset = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 7, 0, 1]
+    cmds.setAttr(b + ".offsetParentMatrix", offset, type="matrix")
+
+    result = maya_fn.dag.matrices(root, local=True)
+
+    assert result.paths == ["|root", "|root|a", "|root|a|b"]
+    assert list(result.parents) == [-1, 0, 1]
+    assert result.world.shape == (3, 4, 4)
+
+    expected = [cmds.getAttr(path + ".worldMatrix[0]") for path in result.paths]
+    numpy.testing.assert_allclose(result.world.reshape(3, 16), expected, atol=1e-9)
+
+    world = maya_fn.dag.world_matrices(result.local, result.parents)
+    numpy.testing.assert_allclose(world, result.world, atol=1e-9)
+
+    result = maya_fn.dag.matrices(["|root|a|b", "|root"], world=False, local=True)
+
+    assert list(result.parents) == [-1, -1]
+    assert result.world is None
+    assert list(result.local[0, 3, :3]) == [5, 7, 0]
+
+    with pytest.raises(TypeError):
+        maya_fn.dag.matrices(["aShape"])
+
+
+def test_world_matrices():
+    """Given parents listed after their children, the world matrices are right."""
+
+    numpy = pytest.importorskip("numpy")
+
+    local = numpy.tile(numpy.eye(4), (3, 1, 1))
+    local[:, 3, 0] = [1, 2, 4]
+
+    world = maya_fn.dag.world_matrices(local, [2, -1, 1])
+
+    assert list(world[:, 3, 0]) == [7, 2, 6]
+
+    with pytest.raises(ValueError):
+        maya_fn.dag.world_matrices(local, [1, 0, -1])
+
+
+def test_reparent_many(new_scene):
+    """Given nodes and new parents, every node is moved in one undoable batch."""
+
+    cmds.undoInfo(state=True)
+    cmds.flushUndo()
+
+    a = cmds.createNode("transform", name="a")
+    b = cmds.createNode("transform", name="b", parent=a)
+    c = cmds.createNode("transform", name="c", parent=b)
+    node = maya_fn.Node(c)
+
+    paths = maya_fn.dag.reparent_many([(b, None), (node, "a"), ("|a", "b")])
+
+    assert paths == ["|b", "|b|a|c", "|b|a"]
+
+    cmds.undo()
+
+    assert cmds.ls(c, long=True) == ["|a|b|c"]
+
+    with pytest.raises(LookupError):
+        maya_fn.dag.reparent_many([("|a|b", "missing")])
+
+    with pytest.raises(TypeError):
+        maya_fn.dag.reparent_many([("|a|b", "time1")])
+
+
+def test_rename_many(new_scene):
+    """Given nodes and new names, every node is renamed and keeps its identity."""
+
+    a = cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent=a)
+    cmds.createNode("transform", name="c", parent=a)
+
+    assert maya_fn.dag.rename_many([(a, "x"), ("|a|b", "c"), ("|a|c", "b")]) == [
+        "|x",
+        "|x|c1",
+        "|x|b",
+    ]
+
+    with maya_fn.transaction():
+        assert maya_fn.dag.rename_many([("|x", "y")]) is None
+        assert cmds.objExists("|x")
+
+    assert cmds.objExists("|y")
+
+
+def test_delete_many(new_scene):
+    """Given nodes and their descendents, each node is deleted once."""
+
+    a = cmds.createNode("transform", name="a")
+    b = cmds.createNode("transform", name="b", parent=a)
+    network = cmds.createNode("network")
+
+    maya_fn.dag.delete_many([b, a, network, "|a"])
+
+    assert not cmds.objExists("a")
+    assert not cmds.objExists(network)
+
+
+def test_delete_many_hash_collision(new_scene, monkeypatch):
+    """Given nodes with the same hash, each of them is deleted."""
+
+    monkeypatch.setattr(maya_fn._util, "_key", lambda handle: 7)
+
+    a = cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent=a)
+    c = cmds.createNode("transform", name="c")
+
+    maya_fn.dag.delete_many(["|a|b", c])
+
+    assert cmds.objExists("a")
+    assert not cmds.objExists("b")
+    assert not cmds.objExists("c")
+
+
+def test_ancestry(new_scene):
+    """Given a hierarchy, ancestors and common ancestors follow its changes."""
+
+    pytest.importorskip("numpy")
+
+    a = cmds.createNode("transform", name="a")
+    b = cmds.createNode("transform", name="b", parent=a)
+    c = cmds.createNode("transform", name="c", parent=b)
+    d = cmds.createNode("transform", name="d", parent=a)
+    e = cmds.createNode("transform", name="e")
+
+    with maya_fn.dag.Ancestry() as ancestry:
+        assert ancestry.is_ancestor("|a", "|a|b|c")
+        assert ancestry.is_ancestor(b, c)
+        assert not ancestry.is_ancestor(c, b)
+        assert not ancestry.is_ancestor(b, b)
+        assert not ancestry.is_ancestor(d, c)
+        assert ancestry.depth(c) == 2
+
+        assert ancestry.lowest_common_ancestors(
+            [(c, d), (c, b), (b, c), (c, c), (c, e), ("|a|d", maya_fn.Node(b))]
+        ) == ["|a", "|a|b", "|a|b", "|a|b|c", None, "|a"]
+        assert ancestry.lowest_common_ancestors([]) == []
+
+        cmds.parent(d, c)
+
+        assert ancestry.is_ancestor("|a|b", "|a|b|c|d")
+        assert ancestry.lowest_common_ancestors([("|a|b|c|d", c)]) == ["|a|b|c"]
+
+        cmds.rename(a, "x")
+
+        assert ancestry.is_ancestor("|x", "|x|b")
+
+        with pytest.raises(LookupError):
+            ancestry.is_ancestor("|a", "|x|b")
@@ -0,0 +1,204 @@
+"""Dependency node function set test suite."""
+
+import pytest
+
+from maya import cmds
+
+import maya_fn
+
+
+def test_create_many(new_scene):
+    """Given node specs, the nodes are created with their values and connections."""
+
+    nodes = maya_fn.dg.create_many(
+        [
+            ("decomposeMatrix", "decompose", {"inputMatrix": "mult.matrixSum"}),
+            ("multMatrix", "mult", {"matrixIn": ["|persp.worldMatrix[0]"]}),
+            ("transform", "xform", {"translate": [1.0, 2.0, 3.0], "visibility": 0}),
+            "network",
+        ]
+    )
+
+    assert nodes == ["decompose", "mult", "xform", "network1"]
+
+    assert cmds.isConnected("mult.matrixSum", "decompose.inputMatrix")
+    assert cmds.isConnected("persp.worldMatrix[0]", "mult.matrixIn[0]")
+
+    assert cmds.getAttr("xform.translate") == [(1.0, 2.0, 3.0)]
+    assert cmds.getAttr("xform.visibility") is False
+
+
+def test_create_many_is_one_undo(new_scene):
+    """Given a batch of nodes, a single undo removes all of them."""
+
+    cmds.undoInfo(state=True)
+    cmds.flushUndo()
+
+    maya_fn.dg.create_many(["network", "network", "network"])
+
+    assert len(cmds.ls(type="network")) == 3
+
+    cmds.undo()
+
+    assert cmds.ls(type="network") == []
+
+
+def test_create_many_errors(new_scene):
+    """Given an invalid value, nothing is created."""
+
+    with pytest.raises(RuntimeError):
+        maya_fn.dg.create_many(
+            [("network", "a"), ("transform", "b", {"translate": "missing.output"})]
+        )
+
+    assert not cmds.objExists("a")
+    assert not cmds.objExists("b")
+
+
+def test_transaction(new_scene):
+    """Given edits in a transaction, they are applied when it exits."""
+
+    with maya_fn.transaction():
+        xform = maya_fn.dg.create("transform", name="xform", translate=[1, 2, 3])
+        add = maya_fn.dg.create("addDoubleLinear", input1=xform + ".translateX")
+        plug = maya_fn.node.add_attr(xform, longName="weight", attributeType="double")
+        maya_fn.plug.set_values(["persp.translateX"], [5.0])
+
+        assert not cmds.objExists(xform)
+        assert cmds.getAttr("persp.translateX") != 5.0
+
+    assert add == "addDoubleLinear1"
+    assert plug == "xform.weight"
+    assert cmds.getAttr("xform.translate") == [(1.0, 2.0, 3.0)]
+    assert cmds.isConnected("xform.translateX", "addDoubleLinear1.input1")
+    assert cmds.objExists("xform.weight")
+    assert cmds.getAttr("persp.translateX") == 5.0
+
+
+def test_transaction_is_one_undo(new_scene):
+    """Given a transaction, a single undo reverts every edit."""
+
+    cmds.undoInfo(state=True)
+    cmds.flushUndo()
+
+    @maya_fn.transaction()
+    def build():
+        for _ in range(3):
+            maya_fn.dg.create("network", name="net")
+
+        return maya_fn.dg.create_many(["network", ("network", "net")])
+
+    assert build() == ["network1", "net3"]
+    assert sorted(cmds.ls(type="network")) == [
+        "net",
+        "net1",
+        "net2",
+        "net3",
+        "network1",
+    ]
+
+    cmds.undo()
+
+    assert cmds.ls(type="network") == []
+
+
+def test_transaction_errors(new_scene):
+    """Given an error in a transaction, nothing is applied."""
+
+    with pytest.raises(RuntimeError):
+        with maya_fn.transaction():
+            maya_fn.dg.create("network", name="a")
+            maya_fn.dg.create("transform", name="b", translate="missing.output")
+
+    assert not cmds.objExists("a")
+
+    with pytest.raises(RuntimeError):
+        with maya_fn.transaction():
+            maya_fn.dg.create("network", name="a")
+
+            try:
+                with maya_fn.transaction():
+                    maya_fn.dg.create("network", name="c")
+                    raise ValueError()
+            except ValueError:
+                pass
+
+    assert not cmds.objExists("a")
+    assert not cmds.objExists("c")
+    assert maya_fn._modifier.current() is None
+
+
+def test_snapshot(new_scene, tmp_path):
+    """Given two states of the graph, the rewired connections are listed."""
+
+    pytest.importorskip("numpy")
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent="a")
+    cmds.createNode("addDoubleLinear", name="add")
+    cmds.connectAttr("a.tx", "add.input1")
+    cmds.connectAttr("add.output", "b.ty")
+    cmds.connectAttr("a.translate", "b.rotate")
+
+    before = maya_fn.dg.snapshot()
+
+    assert len(before) == 3
+    assert ("|a.translateX", "add.input1") in set(before.connections())
+
+    cmds.disconnectAttr("a.tx", "add.input1")
+    cmds.connectAttr("a.ty", "add.input1")
+    cmds.createNode("network", name="extra")
+    cmds.connectAttr("add.output", "extra.caching")
+
+    after = maya_fn.dg.snapshot()
+
+    assert before.diff(after) == (
+        [("add.output", "extra.caching"), ("|a.translateY", "add.input1")],
+        [("|a.translateX", "add.input1")],
+    )
+    assert after.diff(after) == ([], [])
+
+    path = str(tmp_path / "graph.snapshot")
+    before.save(path)
+    loaded = maya_fn.dg.ConnectionSnapshot.load(path)
+
+    assert loaded.nodes == before.nodes
+    assert loaded.attrs == before.attrs
+    assert loaded.edges.tolist() == before.edges.tolist()
+    assert loaded.diff(after) == before.diff(after)
+
+    subset = maya_fn.dg.snapshot(["add"])
+
+    assert sorted(subset.connections()) == [
+        ("add.output", "extra.caching"),
+        ("add.output", "|a|b.translateY"),
+        ("|a.translateY", "add.input1"),
+    ]
+
+    empty = maya_fn.dg.snapshot(["extra"]).diff(maya_fn.dg.snapshot([]))
+
+    assert empty.removed == [("add.output", "extra.caching")]
+
+    (tmp_path / "other").write_text(u"not a snapshot")
+
+    with pytest.raises(ValueError):
+        maya_fn.dg.ConnectionSnapshot.load(str(tmp_path / "other"))
+
+
+def test_snapshot_hash_collision(new_scene, monkeypatch):
+    """Given nodes with the same hash, the snapshot does not mix them up."""
+
+    pytest.importorskip("numpy")
+
+    monkeypatch.setattr(maya_fn._util, "_key", lambda handle: 7)
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+    cmds.createNode("addDoubleLinear", name="add")
+    cmds.connectAttr("a.tx", "add.input1")
+    cmds.connectAttr("add.output", "b.ty")
+
+    assert sorted(maya_fn.dg.snapshot(["add", "b"]).connections()) == [
+        ("add.output", "|b.translateY"),
+        ("|a.translateX", "add.input1"),
+    ]
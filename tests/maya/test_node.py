@@ -3,6 +3,7 @@
 import pytest
 
 from maya import cmds
+from maya.api import OpenMaya
 
 import maya_fn
 
@@ -35,3 +36,177 @@ def test_add_compound_attr():
     actual = maya_fn.node.add_attr(node, ln="buzz", p="fizz")
 
     assert expected == actual
+
+
+def test_add_attr_in_transaction(new_scene):
+    """Given a transaction, the attribute is added when it is committed."""
+
+    node = cmds.createNode("transform", name="a")
+
+    with maya_fn.transaction():
+        plug = maya_fn.node.add_attr(node, ln="weight", at="double", dv=0.5)
+
+        assert not cmds.objExists(plug)
+
+    assert plug == "|a.weight"
+    assert cmds.getAttr(plug) == 0.5
+
+    with pytest.raises(LookupError):
+        with maya_fn.transaction():
+            maya_fn.node.add_attr("missing", ln="weight")
+
+    with pytest.raises(TypeError):
+        with maya_fn.transaction():
+            maya_fn.node.add_attr(node, ln="other", dv=object())
+
+    assert not cmds.objExists("a.other")
+
+
+def test_snapshot(new_scene):
+    """Given a changed pose, only the changed plugs are listed and restored."""
+
+    pytest.importorskip("numpy")
+
+    cmds.undoInfo(state=True)
+    cmds.flushUndo()
+
+    a = cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+    add = cmds.createNode("addDoubleLinear", name="add")
+    cmds.connectAttr(add + ".output", "b.tz")
+
+    before = maya_fn.node.snapshot([a, "b", a])
+
+    assert "|a.translateX" in before.plugs()
+    assert "|a.visibility" in before.plugs()
+    assert len(before) == 2 * 10
+
+    cmds.setAttr("a.tx", 2.0)
+    cmds.setAttr("b.visibility", False)
+    cmds.setAttr("b.ry", 1e-9)
+
+    after = maya_fn.node.snapshot(["a", "b"])
+    diff = before.diff(after)
+
+    assert diff.plugs == ["|a.translateX", "|b.visibility"]
+    assert diff.before.tolist() == [0.0, 1.0]
+    assert diff.after.tolist() == [2.0, 0.0]
+    assert after.diff(before, tolerance=0.0).plugs == [
+        "|a.translateX",
+        "|b.visibility",
+        "|b.rotateY",
+    ]
+    assert maya_fn.node.snapshot(["b"]).diff(before).plugs == ["|b.visibility"]
+
+    settable = maya_fn.node.snapshot(["b"], attrs=maya_fn.node.SETTABLE)
+
+    assert "|b.translateZ" not in settable.plugs()
+    assert "|b.translateY" in settable.plugs()
+
+    cmds.setAttr("a.ty", 3.0, lock=True)
+
+    assert before.restore() == ["|a.translateY", "|b.translateZ"]
+    assert cmds.getAttr("a.tx") == 0.0
+    assert cmds.getAttr("a.ty") == 3.0
+    assert cmds.getAttr("b.visibility") is True
+
+    cmds.undo()
+
+    assert cmds.getAttr("a.tx") == 2.0
+
+    with pytest.raises(ValueError):
+        maya_fn.node.snapshot(["a"], attrs="all")
+
+
+def test_snapshot_hash_collision(new_scene, monkeypatch):
+    """Given nodes with the same hash, each of them is recorded."""
+
+    pytest.importorskip("numpy")
+
+    monkeypatch.setattr(maya_fn._util, "_key", lambda handle: 7)
+
+    a = cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+
+    result = maya_fn.node.snapshot([a, "b", a])
+
+    assert len(result) == 2 * 10
+    assert "|a.translateX" in result.plugs()
+    assert "|b.translateX" in result.plugs()
+
+
+def test_type_index(new_scene):
+    """Given an index, nodes are found by type name or MFn type as they change."""
+
+    a = cmds.createNode("transform", name="a")
+    mesh = cmds.createNode("mesh", name="aShape", parent=a)
+    add = cmds.createNode("addDoubleLinear", name="add")
+
+    with maya_fn.node.TypeIndex() as index:
+        assert index.nodes("mesh") == ["|a|aShape"]
+        assert index.nodes(OpenMaya.MFn.kMesh) == ["|a|aShape"]
+        assert "|a|aShape" in index.nodes("shape")
+        assert "|a|aShape" in index.nodes(OpenMaya.MFn.kShape)
+        assert "|a" not in index.nodes("shape")
+
+        assert index.filter([add, a, mesh], "dagNode") == ["|a", "|a|aShape"]
+        assert maya_fn.node.of_type([add, a], OpenMaya.MFn.kTransform, index=index) == [
+            "|a"
+        ]
+
+        cmds.createNode("mesh", name="bShape")
+        cmds.delete(mesh)
+
+        assert index.nodes("mesh") == [maya_fn.dag.full_path("bShape")]
+        assert index.nodes("addDoubleLinear") == ["add"]
+
+        with pytest.raises(LookupError):
+            index.filter(["missing"], "mesh")
+
+        cmds.file(new=True, force=True)
+
+        assert index.nodes("addDoubleLinear") == []
+
+    cmds.createNode("addDoubleLinear")
+
+    assert index.nodes("addDoubleLinear") == []
+
+    with pytest.raises(TypeError):
+        maya_fn.node.of_type(["persp"], OpenMaya.MFn.kTransform)
+
+
+def test_of_type(new_scene):
+    """Given nodes by name, MObject or MDagPath, those of the type are returned."""
+
+    a = cmds.createNode("transform", name="a")
+    cmds.createNode("mesh", name="aShape", parent=a)
+    cmds.createNode("addDoubleLinear", name="add")
+
+    nodes = [
+        "add",
+        maya_fn.api.get_object("a"),
+        maya_fn.api.get_dag_path("aShape"),
+        maya_fn.objects.Node("add"),
+    ]
+
+    assert maya_fn.node.of_type(nodes, "dagNode") == ["|a", "|a|aShape"]
+    assert maya_fn.node.of_type(nodes, "addDoubleLinear") == ["add"]
+    assert maya_fn.node.of_type([], "transform") == []
+
+
+def test_type_index_hash_collision(new_scene, monkeypatch):
+    """Given nodes with the same hash, the index does not mix them up."""
+
+    monkeypatch.setattr(maya_fn._util, "_key", lambda handle: 7)
+
+    a = cmds.createNode("transform", name="a")
+    add = cmds.createNode("addDoubleLinear", name="add")
+
+    with maya_fn.node.TypeIndex() as index:
+        assert index.filter([add, a], "transform") == ["|a"]
+        assert index.nodes("addDoubleLinear") == ["add"]
+
+        cmds.delete(add)
+
+        assert index.nodes("addDoubleLinear") == []
+        assert index.nodes("transform")[-1] == "|a"
@@ -0,0 +1,126 @@
+"""Test suite for the Node and Plug objects."""
+
+import pytest
+
+from maya import cmds
+from maya.api import OpenMaya
+
+import maya_fn
+
+
+def test_node_dag_queries(new_scene):
+    root = cmds.createNode("transform", name="root")
+    a = cmds.createNode("transform", name="a", parent=root)
+    b = cmds.createNode("transform", name="b", parent=root)
+    c = cmds.createNode("transform", name="c", parent=a)
+    cmds.createNode("mesh", name="cShape", parent=c)
+
+    node = maya_fn.Node(c)
+
+    assert str(node) == "|root|a|c"
+    assert node.name == "c"
+    assert node.is_dag
+    assert node.parent() == maya_fn.Node(a)
+    assert [str(each) for each in node.ancestors()] == ["|root", "|root|a"]
+    assert [str(each) for each in node.shapes()] == ["|root|a|c|cShape"]
+    assert [str(each) for each in maya_fn.Node(a).siblings()] == [
+        cmds.ls(b, long=True)[0]
+    ]
+    assert [str(each) for each in maya_fn.Node(root).descendents()] == [
+        "|root|a",
+        "|root|a|c",
+        "|root|b",
+    ]
+
+
+def test_node_follows_rename(new_scene):
+    node = maya_fn.Node(cmds.createNode("network", name="before"))
+
+    cmds.rename("before", "after")
+
+    assert str(node) == "after"
+    assert not node.is_dag
+
+
+def test_node_plug(new_scene):
+    node = maya_fn.Node(cmds.createNode("transform", name="node"))
+
+    assert str(node.plug("translate", "X")) == "|node.translateX"
+
+    with pytest.raises(LookupError):
+        node.plug("nope")
+
+
+def test_plug_connections(new_scene):
+    a = cmds.createNode("transform", name="a")
+    b = cmds.createNode("transform", name="b")
+    cmds.connectAttr("a.translate", "b.translate")
+
+    source = maya_fn.Plug("a.translate")
+    destination = maya_fn.Plug("b.translate")
+
+    assert destination.source() == source
+    assert source.destinations() == [destination]
+    assert destination.node == maya_fn.Node(b)
+    assert destination.attr == "translate"
+    assert str(source.child("translateX")) == "|a.translateX"
+    assert source.node == maya_fn.Node(a)
+
+
+def test_plug_hash_without_lookup(new_scene, monkeypatch):
+    plug = maya_fn.Plug("persp.translateX")
+
+    def add(*args):
+        raise AssertionError("The plug was looked up by name.")
+
+    monkeypatch.setattr(OpenMaya.MSelectionList, "add", add)
+
+    assert hash(plug) == hash(maya_fn.Plug(plug.mplug))
+    assert plug.attr == "translateX"
+    assert plug.name == "|persp.translateX"
+
+
+def test_plug_elements(new_scene):
+    node = cmds.createNode("network")
+    cmds.addAttr(node, longName="values", multi=True)
+    cmds.setAttr(node + ".values[0]", 1.0)
+    cmds.setAttr(node + ".values[3]", 1.0)
+
+    plug = maya_fn.Plug(node + ".values")
+
+    assert [each.attr for each in plug.elements()] == ["values[0]", "values[3]"]
+    assert plug.element(2).attr == "values[2]"
+
+
+def test_functions_accept_objects(new_scene):
+    a = maya_fn.Node(cmds.createNode("transform", name="a"))
+    b = maya_fn.Node(cmds.createNode("transform", name="b", parent="a"))
+
+    assert maya_fn.dag.parent(b) == "|a"
+    assert maya_fn.dag.children(a) == ["|a|b"]
+    assert maya_fn.plug(a, "translate") == "|a.translate"
+
+    cmds.connectAttr("a.translate", "b.translate")
+
+    assert maya_fn.plug.source(maya_fn.Plug("b.translate")) == "|a.translate"
+    assert maya_fn.plug.node(maya_fn.Plug("b.translate")) == "|a|b"
+
+
+def test_deleted_node_is_missing(new_scene):
+    node = maya_fn.Node(cmds.createNode("network"))
+
+    cmds.delete(str(node))
+
+    assert not node.is_valid
+    assert maya_fn.api.get_objects([node], missing=maya_fn.api.NONE) == [None]
+
+    with pytest.raises(LookupError):
+        maya_fn.api.get_object(node)
+
+
+def test_create_connects_plug_objects(new_scene):
+    source = maya_fn.Plug(cmds.createNode("transform", name="source") + ".translate")
+
+    maya_fn.dg.create("transform", name="target", translate=source)
+
+    assert cmds.listConnections("target.translate", plugs=True) == ["source.translate"]
@@ -123,3 +123,234 @@ def test_get_parts_on_dg_node():
     actual = maya_fn.plug.attr(plug)
 
     assert expected == actual
+
+
+def test_traverse(new_scene):
+    """Given a graph with a cycle, each reachable node is visited once."""
+
+    a = cmds.createNode("addDoubleLinear", name="a")
+    b = cmds.createNode("addDoubleLinear", name="b")
+    c = cmds.createNode("addDoubleLinear", name="c")
+    x = cmds.createNode("transform", name="x")
+
+    cmds.connectAttr(a + ".output", b + ".input1")
+    cmds.connectAttr(b + ".output", c + ".input1")
+    cmds.connectAttr(c + ".output", a + ".input1")
+    cmds.connectAttr(c + ".output", x + ".translateX")
+
+    expected = {b, c, "|" + x}
+    actual = list(maya_fn.plug.traverse(a))
+
+    assert set(actual) == expected
+    assert len(actual) == len(expected), "A node was visited twice"
+
+    expected = [b]
+    actual = list(maya_fn.plug.traverse(a + ".output", max_depth=1))
+
+    assert actual == expected
+
+    expected = ["|x"]
+    actual = list(maya_fn.plug.traverse(a, types=OpenMaya.MFn.kTransform))
+
+    assert actual == expected
+
+    expected = []
+    actual = list(maya_fn.plug.traverse(a, prune=lambda n: n == b))
+
+    assert actual == expected
+
+    expected = {a, b}
+    actual = set(maya_fn.plug.traverse(c, direction=maya_fn.plug.UPSTREAM))
+
+    assert c not in actual
+    assert expected <= actual
+
+    with pytest.raises(ValueError):
+        list(maya_fn.plug.traverse(a, level="attribute"))
+
+
+def test_traverse_max_depth(new_scene):
+    """Given a node reached by a long and a short path, the short path counts."""
+
+    a = cmds.createNode("addDoubleLinear", name="a")
+    b = cmds.createNode("addDoubleLinear", name="b")
+    c = cmds.createNode("addDoubleLinear", name="c")
+    d = cmds.createNode("addDoubleLinear", name="d")
+    x = cmds.createNode("transform", name="x")
+
+    cmds.connectAttr(a + ".output", b + ".input1")
+    cmds.connectAttr(b + ".output", c + ".input1")
+    cmds.connectAttr(a + ".output", c + ".input2")
+    cmds.connectAttr(c + ".output", d + ".input1")
+    cmds.connectAttr(c + ".output", x + ".translateX")
+
+    expected = {b, c, d, "|" + x}
+
+    for order in (maya_fn.plug.DEPTH_FIRST, maya_fn.plug.BREADTH_FIRST):
+        actual = set(maya_fn.plug.traverse(a, max_depth=2, order=order))
+
+        assert actual == expected
+
+
+def test_get_and_set_values(new_scene):
+    """Given plugs of one kind, their values are read and written as arrays."""
+
+    numpy = pytest.importorskip("numpy")
+
+    a = cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+
+    cmds.setAttr("a.translate", 1, 2, 3)
+    cmds.setAttr("b.scaleX", 4)
+
+    values = maya_fn.plug.get_values(["a.translate", "b.translate"])
+
+    assert values.shape == (2, 3)
+    assert values.tolist() == [[1, 2, 3], [0, 0, 0]]
+
+    values = maya_fn.plug.get_values(["a.worldMatrix[0]", "b.matrix"])
+
+    assert values.shape == (2, 4, 4)
+    assert values[0, 3, :3].tolist() == [1, 2, 3]
+    assert values[1, 0, 0] == 4
+
+    maya_fn.plug.set_values(["a.tx", "b.visibility"], numpy.array([5.0, 0.0]))
+
+    assert cmds.getAttr("a.tx") == 5.0
+    assert cmds.getAttr("b.visibility") is False
+
+    matrix = numpy.eye(4)
+    matrix[3, :3] = [7, 8, 9]
+
+    maya_fn.plug.set_values([maya_fn.plug(a, "offsetParentMatrix")], matrix[None])
+
+    assert maya_fn.plug.get_values(["a.worldMatrix[0]"])[0, 3, :3].tolist() == [
+        12,
+        10,
+        12,
+    ]
+
+    with pytest.raises(TypeError):
+        maya_fn.plug.get_values(["a.translate", "a.tx"])
+
+    with pytest.raises(ValueError):
+        maya_fn.plug.set_values(["a.translate"], numpy.zeros((1, 2)))
+
+
+def test_get_element_values(new_scene):
+    """Given an array plug, the values of its elements are read as an array."""
+
+    pytest.importorskip("numpy")
+
+    node = cmds.createNode("network")
+
+    cmds.addAttr(node, longName="values", multi=True)
+    cmds.setAttr(node + ".values[0]", 1.0)
+    cmds.setAttr(node + ".values[3]", 2.0)
+
+    indices, values = maya_fn.plug.get_element_values(node + ".values")
+
+    assert indices.tolist() == [0, 3]
+    assert values.tolist() == [1.0, 2.0]
+
+
+def test_connect_many(new_scene):
+    """Given pairs of plugs, every pair is connected, or none of them is."""
+
+    cmds.undoInfo(state=True)
+    cmds.flushUndo()
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+    add = cmds.createNode("addDoubleLinear", name="add")
+
+    maya_fn.plug.connect_many(
+        [("a.tx", "add.input1"), ("a.translate", "b.scale"), ("add.output", "b.ty")]
+    )
+
+    assert maya_fn.plug.source("add.input1") == "|a.translateX"
+    assert maya_fn.plug.source("|b.scale") == "|a.translate"
+    assert maya_fn.plug.source("|b.ty") == "add.output"
+
+    with pytest.raises(RuntimeError) as error:
+        maya_fn.plug.connect_many(
+            [
+                ("a.ty", "add.input2"),
+                ("a.tz", "add.input1"),
+                ("a.missing", "b.tz"),
+                ("a.matrix", "b.tz"),
+                ("a.tx", "add.output"),
+            ]
+        )
+
+    message = str(error.value)
+
+    assert len(message.splitlines()) == 5
+    assert "'add.input1' is already connected to '|a.translateX'." in message
+    assert "'a.missing' does not exist or is not a plug." in message
+    assert (
+        "'a.matrix' (matrix) cannot be connected to 'b.tz' (doubleLinear)." in message
+    )
+    assert "'add.output' cannot be connected." in message
+    assert maya_fn.plug.source("add.input2") is None
+
+    maya_fn.plug.connect_many([("a.tz", add + ".input1")], force=True)
+
+    assert maya_fn.plug.source("add.input1") == "|a.translateZ"
+
+    cmds.undo()
+
+    assert maya_fn.plug.source("add.input1") == "|a.translateX"
+
+    cmds.undo()
+
+    assert maya_fn.plug.source("add.input1") is None
+    assert maya_fn.plug.source("|b.ty") is None
+
+
+def test_connect_many_converts_units(new_scene):
+    """Given plugs of different units, a unitConversion node connects them."""
+
+    cmds.undoInfo(state=True)
+    cmds.flushUndo()
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("addDoubleLinear", name="add")
+
+    maya_fn.plug.connect_many(
+        [("add.output", "a.rx"), ("time1.outTime", "a.ry"), ("a.tx", "add.input1")]
+    )
+
+    for attr in ("rx", "ry"):
+        node = maya_fn.plug.node(maya_fn.plug.source("a." + attr))
+
+        assert cmds.nodeType(node) == "unitConversion"
+
+    assert maya_fn.plug.source("add.input1") == "|a.translateX"
+
+    cmds.undo()
+
+    assert maya_fn.plug.source("|a.rx") is None
+    assert maya_fn.plug.source("|a.ry") is None
+    assert maya_fn.plug.source("add.input1") is None
+    assert not cmds.ls(type="unitConversion")
+
+
+def test_disconnect_many(new_scene):
+    """Given connected pairs of plugs, every pair is disconnected."""
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("addDoubleLinear", name="add")
+    cmds.connectAttr("a.tx", "add.input1")
+    cmds.connectAttr("a.ty", "add.input2")
+
+    with pytest.raises(RuntimeError) as error:
+        maya_fn.plug.disconnect_many([("a.tx", "add.input1"), ("a.tz", "add.input2")])
+
+    assert "'a.tz' is not connected to 'add.input2'." in str(error.value)
+    assert maya_fn.plug.source("add.input1") == "|a.translateX"
+
+    maya_fn.plug.disconnect_many([("a.tx", "add.input1"), ("a.ty", "add.input2")])
+
+    assert maya_fn.plug.source("add.input1") is None
+    assert maya_fn.plug.source("add.input2") is None
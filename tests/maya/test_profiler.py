@@ -0,0 +1,102 @@
+"""Test suite for maya_fn.profiler."""
+
+import cProfile
+import sys
+
+import pytest
+
+from maya import cmds
+
+import maya_fn
+import maya_fn.profiler
+
+
+def test_profile_records_calls(new_scene):
+    """Given profiled calls, their counts, times and Maya calls are recorded."""
+
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b", parent="a")
+
+    with maya_fn.profiler.profile() as result:
+        maya_fn.dag.parent("b")
+        maya_fn.dag.parent("b")
+        maya_fn.plug("a", "translate")
+
+    stats = result.stats()
+
+    assert stats["dag.parent"].calls == 2
+    assert stats["dag.parent"].maya_calls > 0
+    assert stats["dag.parent"].cumulative_time >= stats["dag.parent"].self_time
+    assert stats["api.get_dag_path"].calls == 2
+    assert stats["plug.make"].calls == 1
+    assert "dag.parent" in result.report()
+
+
+def test_profile_restores_functions(new_scene):
+    """Given the end of profiling, the original functions are restored."""
+
+    parent = maya_fn.dag.parent
+    make = maya_fn.plug.make
+
+    with maya_fn.profiler.profile():
+        assert maya_fn.profiler.is_enabled()
+        assert maya_fn.dag.parent is not parent
+
+    assert not maya_fn.profiler.is_enabled()
+    assert maya_fn.dag.parent is parent
+    assert maya_fn.plug.make is make
+
+
+def test_default_profile(new_scene):
+    """Given enable and disable, only the calls in between are recorded."""
+
+    cmds.createNode("transform", name="a")
+
+    maya_fn.profiler.reset()
+    maya_fn.profiler.enable()
+
+    try:
+        maya_fn.dag.full_path("a")
+    finally:
+        maya_fn.profiler.disable()
+
+    maya_fn.dag.full_path("a")
+
+    assert maya_fn.profiler.stats()["dag.full_path"].calls == 1
+
+
+def test_profile_chains_profile_function(new_scene):
+    """Given a running profile function, it keeps receiving events."""
+
+    events = []
+
+    def previous(frame, event, arg):
+        events.append(event)
+
+    sys.setprofile(previous)
+
+    try:
+        with maya_fn.profiler.profile():
+            maya_fn.plug.make("a", "tx")
+
+        assert sys.getprofile() is previous
+    finally:
+        sys.setprofile(None)
+
+    assert "call" in events
+
+
+def test_profile_refuses_c_profiler(new_scene):
+    """Given a running cProfile, profiling does not start."""
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    try:
+        with pytest.raises(RuntimeError):
+            with maya_fn.profiler.profile():
+                pass
+    finally:
+        profiler.disable()
+
+    assert not maya_fn.profiler.is_enabled()
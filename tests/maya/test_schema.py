@@ -0,0 +1,71 @@
+"""Attribute schema test suite."""
+
+from maya import cmds
+
+import maya_fn
+
+
+def test_get_static_attribute(new_scene):
+    """Given a static attribute, its properties are cached for the node type."""
+
+    maya_fn.schema.clear()
+
+    a = cmds.createNode("transform")
+    b = cmds.createNode("transform")
+
+    info = maya_fn.schema.get(a, "translate")
+
+    assert info.writable
+    assert info.children == ("translateX", "translateY", "translateZ")
+    assert not info.multi
+    assert info.data_type == "double3"
+
+    assert maya_fn.schema.get(b, "translate") is info
+    assert maya_fn.schema.get(a, "worldMatrix[0]").data_type == "matrix"
+    assert maya_fn.schema.get(a, "worldMatrix").multi
+    assert not maya_fn.schema.get(a, "worldMatrix").writable
+    assert maya_fn.schema.get(a, "foobar") is None
+
+    stats = maya_fn.schema.cache_info()
+
+    assert stats.hits == 3
+    assert stats.misses == 3
+    assert stats.hit_ratio == 0.5
+
+
+def test_get_dynamic_attribute(new_scene):
+    """Given a dynamic attribute, its properties are cached for its node only."""
+
+    a = cmds.createNode("network")
+    b = cmds.createNode("network")
+
+    maya_fn.node.add_attr(a, ln="label", dt="string")
+
+    assert maya_fn.schema.get(a, "label").data_type == "string"
+    assert maya_fn.schema.get(b, "label") is None
+
+    cmds.deleteAttr(a, attribute="label")
+    maya_fn.node.add_attr(a, ln="label", at="double")
+
+    assert maya_fn.schema.get(a, "label").data_type == "double"
+
+
+def test_dynamic_attribute_changed_outside(new_scene):
+    """Given attributes changed through cmds, the cached properties are forgotten."""
+
+    node = cmds.createNode("network")
+    cmds.addAttr(node, longName="label", dataType="string")
+
+    assert maya_fn.schema.get(node, "label").data_type == "string"
+
+    cmds.deleteAttr(node, attribute="label")
+
+    assert maya_fn.schema.get(node, "label") is None
+
+    cmds.addAttr(node, longName="label", attributeType="double")
+
+    assert maya_fn.schema.get(node, "label").data_type == "double"
+
+    maya_fn.schema.clear()
+
+    assert maya_fn.schema.cache_info().size == 0
@@ -0,0 +1,4 @@
+"""Offline test suite config.
+
+These tests need neither Maya nor the fake backend.
+"""
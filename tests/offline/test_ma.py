@@ -0,0 +1,131 @@
+"""Test suite for maya_fn.ma."""
+
+import pytest
+
+import maya_fn.ma
+
+SCENE = u"""//Maya ASCII 2020 scene
+//Name: test.ma
+requires maya "2020";
+file -rdi 1 -ns "prop" -rfn "propRN" -op "v=0;" -typ "mayaAscii" "/assets/prop.ma";
+file -r -ns "prop" -dr 1 -rfn "propRN" -op "v=0;" -typ "mayaAscii" "/assets/prop.ma";
+currentUnit -l centimeter -a degree -t film;
+createNode transform -n "root";
+createNode transform -n "a" -p "root";
+\tsetAttr ".t" -type "double3" 1 2 -3.5 ;
+\tsetAttr -k off ".v" no;
+createNode transform -n "b" -p "root";
+createNode mesh -n "bShape" -p "|root|b";
+\tsetAttr -k off ".v";
+\tsetAttr -s 3 ".vt[0:2]"  0 0 0 1 0 0
+\t\t 0 1 0;
+createNode transform -n "c" -p "a";
+createNode transform -n "c" -p "b";
+createNode addDoubleLinear -n "add";
+\tsetAttr ".nts" -type "string" "a \\"quoted\\"; note";
+createNode transform -n "moved";
+parent -r "moved" "a|c";
+select -ne :time1;
+\tsetAttr ".o" 12;
+connectAttr "root.tx" "add.i1";
+connectAttr "add.o" "|root|a|c.tx";
+connectAttr "add.o" "b|c.ty";
+connectAttr ":time1.o" "add.i2";
+connectAttr "prop:ctrl.ty" "|root|b|c.tz";
+// ErrorNode: tolerated
+"""
+
+
+@pytest.fixture
+def scene_file(tmp_path):
+    """Write the test scene to a temporary .ma file."""
+
+    path = tmp_path / "test.ma"
+    path.write_text(SCENE)
+
+    return str(path)
+
+
+def test_hierarchy(scene_file):
+    """Given a .ma file, its DAG hierarchy can be queried."""
+
+    scene = maya_fn.ma.read(scene_file)
+
+    assert scene.node_type("bShape") == "mesh"
+    assert scene.full_path("bShape") == "|root|b|bShape"
+    assert scene.children("root") == ["|root|a", "|root|b"]
+    assert scene.shapes("|root|b") == ["|root|b|bShape"]
+    assert scene.children("b") == ["|root|b|c"]
+    assert scene.siblings("|root|a") == ["|root|b"]
+    assert scene.parent("root") is None
+    assert scene.ancestors("moved") == ["|root", "|root|a", "|root|a|c"]
+    assert scene.name("|root|a|c|moved") == "moved"
+    assert scene.nodes("transform")[:3] == ["|root", "|root|a", "|root|b"]
+
+    with pytest.raises(LookupError):
+        scene.full_path("c")
+
+    with pytest.raises(LookupError):
+        scene.full_path("missing")
+
+
+def test_connections(scene_file):
+    """Given a .ma file, its connections can be queried."""
+
+    scene = maya_fn.ma.read(scene_file)
+
+    assert scene.source("add.i1") == "|root.tx"
+    assert scene.source_node("add.i2") == "time1"
+    assert scene.destinations("add.o") == ["|root|a|c.tx", "|root|b|c.ty"]
+    assert scene.downstream("add.o") == ["|root|a|c", "|root|b|c"]
+    assert scene.source("|root|a.tx") is None
+    assert scene.node_type("prop:ctrl") is None
+    assert len(list(scene.connections())) == 5
+    assert scene.references == ["/assets/prop.ma"]
+    assert scene.requires == {"maya": "2020"}
+
+
+def test_values(scene_file):
+    """Given a .ma file, the values of the requested attributes are kept."""
+
+    scene = maya_fn.ma.read(scene_file)
+
+    assert scene.get_value("a.t") is None
+
+    scene = maya_fn.ma.read(scene_file, values=["t", "nts"])
+
+    assert scene.get_value("a.t") == [1, 2, -3.5]
+    assert scene.get_value("add.nts") == ['a "quoted"; note']
+    assert scene.get_value("a.v") is None
+
+    scene = maya_fn.ma.read(scene_file, values=True)
+
+    assert scene.get_value("a.v") == [False]
+    assert scene.get_value("bShape.vt[0:2]") == [0, 0, 0, 1, 0, 0, 0, 1, 0]
+    assert scene.get_value("time1.o") == [12]
+
+
+def test_statements(scene_file):
+    """Given a .ma file, its statements are yielded in order."""
+
+    statements = list(maya_fn.ma.statements(scene_file))
+
+    assert statements[0] == ("requires", ["maya", "2020"])
+    assert ("parent", ["-r", "moved", "a|c"]) in statements
+    assert len([s for s in statements if s[0] == "createNode"]) == 8
+
+
+def test_truncated(tmp_path):
+    """Given a .ma file cut off mid-statement, the statements before it are read."""
+
+    path = tmp_path / "truncated.ma"
+    path.write_text(
+        u'createNode transform -n "a";\n'
+        '\tsetAttr ".t" -type "double3" ' + " ".join(str(i) for i in range(1, 19))
+    )
+
+    assert maya_fn.ma.read(str(path)).node_type("a") == "transform"
+
+    scene = maya_fn.ma.read(str(path), values=True)
+
+    assert scene.get_value("a.t") == list(range(1, 19))
@@ -0,0 +1,138 @@
+"""Test suite for maya_fn.scan."""
+
+import os
+
+import pytest
+
+import maya_fn.scan
+
+PROP = u"""//Maya ASCII 2020 scene
+requires maya "2020";
+createNode transform -n "prop";
+createNode mesh -n "propShape" -p "prop";
+createNode addDoubleLinear -n "add";
+connectAttr "add.o" "prop.tx";
+"""
+
+SHOT = u"""//Maya ASCII 2020 scene
+file -r -ns "prop" -rfn "propRN" -typ "mayaAscii" "/assets/prop.ma";
+createNode transform -n "cam";
+createNode transform -n "aim" -p "cam";
+"""
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Write a tree of .ma files, and return its root."""
+
+    root = tmp_path / "scenes"
+    (root / "shots").mkdir(parents=True)
+    (root / "prop.ma").write_text(PROP)
+    (root / "shots" / "shot.ma").write_text(SHOT)
+    (root / "shots" / "notes.txt").write_text(u"")
+
+    return str(root)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_scan(files, tmp_path, workers):
+    """Given a tree of .ma files, their summaries are indexed."""
+
+    index = str(tmp_path / "index.db")
+    prop = os.path.join(files, "prop.ma")
+    shot = os.path.join(files, "shots", "shot.ma")
+
+    result = maya_fn.scan.scan([files], index, workers=workers)
+
+    assert result == (2, 0, 0, 0)
+
+    with maya_fn.scan.ScanIndex(index) as db:
+        assert db.files() == [prop, shot]
+        assert db.files("mesh") == [prop]
+        assert db.node_counts() == {"transform": 3, "mesh": 1, "addDoubleLinear": 1}
+        assert db.node_counts(shot) == {"transform": 2}
+        assert db.nodes(shot) == [
+            ("|cam", "transform", None),
+            ("|cam|aim", "transform", "|cam"),
+        ]
+        assert db.connections(prop) == [("add.o", "|prop.tx")]
+        assert db.references(shot) == ["/assets/prop.ma"]
+        assert db.referencing("/assets/prop.ma") == [shot]
+
+        with pytest.raises(LookupError):
+            db.nodes("missing.ma")
+
+
+def test_rescan(files, tmp_path):
+    """Given an index, only the changed files are read again."""
+
+    index = str(tmp_path / "index.db")
+    prop = os.path.join(files, "prop.ma")
+    shot = os.path.join(files, "shots", "shot.ma")
+
+    maya_fn.scan.scan([files], index, workers=1)
+
+    assert maya_fn.scan.scan([files], index, workers=1) == (0, 2, 0, 0)
+
+    # A new modification time alone does not rescan the file.
+    os.utime(prop, (0, 0))
+    assert maya_fn.scan.scan([files], index, workers=1) == (0, 2, 0, 0)
+
+    with open(prop, "a") as stream:
+        stream.write('createNode transform -n "extra";\n')
+
+    os.remove(shot)
+
+    assert maya_fn.scan.scan([files], index, workers=1) == (1, 0, 1, 0)
+
+    with maya_fn.scan.ScanIndex(index) as db:
+        assert db.files() == [prop]
+        assert db.node_counts(prop)["transform"] == 2
+
+
+def test_rescan_failed(files, tmp_path, monkeypatch):
+    """Given a file that could not be read, it is read again when unchanged."""
+
+    index = str(tmp_path / "index.db")
+    prop = os.path.join(files, "prop.ma")
+
+    def fail(path):
+        raise IOError("Unreadable.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(maya_fn.scan, "summarize", fail)
+
+        assert maya_fn.scan.scan([prop], index, workers=1) == (0, 0, 0, 1)
+
+    assert maya_fn.scan.scan([prop], index, workers=1) == (1, 0, 0, 0)
+
+    with maya_fn.scan.ScanIndex(index) as db:
+        assert db.errors() == {}
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Requires named pipes.")
+def test_scan_timeout(files, tmp_path):
+    """Given a file that never finishes reading, it fails with a timeout."""
+
+    index = str(tmp_path / "index.db")
+    pipe = os.path.join(files, "pipe.ma")
+    os.mkfifo(pipe)
+
+    result = maya_fn.scan.scan([files], index, workers=2, timeout=0.5)
+
+    assert result == (2, 0, 0, 1)
+
+    with maya_fn.scan.ScanIndex(index) as db:
+        assert list(db.errors()) == [pipe]
+        assert db.errors()[pipe].startswith("TimeoutError")
+
+
+def test_main(files, tmp_path, capsys):
+    """Given paths on the command line, the result is printed."""
+
+    index = str(tmp_path / "index.db")
+
+    assert maya_fn.scan.main([index, files, "--workers", "1"]) == 0
+    assert (
+        capsys.readouterr().out.strip() == "2 scanned, 0 unchanged, 0 removed, 0 failed"
+    )